@@ -0,0 +1,123 @@
+import torch
+import torch.nn as nn
+from nsoltBlockDct1dLayer import NsoltBlockDct1dLayer
+from nsoltInitialRotation1dLayer import NsoltInitialRotation1dLayer
+from nsoltAtomExtension1dLayer import NsoltAtomExtension1dLayer
+from nsoltIntermediateRotation1dLayer import NsoltIntermediateRotation1dLayer
+from nsoltChannelSeparation1dLayer import NsoltChannelSeparation1dLayer
+from nsoltLayerExceptions import InvalidNumberOfChannels, InvalidPolyPhaseOrder
+
+class NsoltAnalysis1dNetwork(nn.Module):
+    """
+    NSOLTANALYSIS1DNETWORK
+
+       1-D oversampled lapped filter bank (OLpPrFb) as
+       +dictionary/+olpprfb/OLpPuFbAnalysis1dSystem.m with the circular
+       boundary operation. A batch of sequences is processed at once.
+
+       系列入力:
+          nSamples x (Stride x nBlks)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nBlksLv1 x (nChsTotal-1)
+          nSamples x nBlksLv2 x (nChsTotal-1)
+           :
+          nSamples x nBlksLvN x (nChsTotal-1)
+          nSamples x nBlksLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        number_of_channels=[2,2],
+        decimation_factor=2,
+        polyphase_order=0,
+        number_of_vanishing_moments=1,
+        number_of_levels=1):
+        super(NsoltAnalysis1dNetwork, self).__init__()
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.polyphase_order = polyphase_order
+        self.number_of_vanishing_moments = number_of_vanishing_moments
+        self.number_of_levels = number_of_levels
+
+        # Check parameters
+        if number_of_channels[0] != number_of_channels[1]:
+            raise InvalidNumberOfChannels(
+                '[%d %d] : Currently, Type-I NSOLT is only supported, where the even and odd channel numbers should be the same.'\
+                % (number_of_channels[0],number_of_channels[1])
+            )
+        if polyphase_order%2:
+            raise InvalidPolyPhaseOrder(
+                '%d : Currently, even polyphase orders are only supported.'\
+                % polyphase_order
+            )
+
+        # Instantiation of layers
+        self.layers = nn.ModuleList()
+        for iLv in range(1,number_of_levels+1):
+            strLv = 'Lv%0d_' % iLv
+            # Initial blocks
+            layers = nn.ModuleList([
+                NsoltBlockDct1dLayer(
+                    name=strLv+'E0',
+                    decimation_factor=decimation_factor),
+                NsoltInitialRotation1dLayer(
+                    name=strLv+'V0',
+                    number_of_channels=number_of_channels,
+                    decimation_factor=decimation_factor,
+                    no_dc_leakage=(number_of_vanishing_moments==1))
+            ])
+            # Atom extension
+            for iOrder in range(2,polyphase_order+1,2):
+                layers.extend([
+                    NsoltAtomExtension1dLayer(
+                        name=strLv+'Qh'+str(iOrder-1)+'rl',
+                        number_of_channels=number_of_channels,
+                        direction='Right',
+                        target_channels='Difference'),
+                    NsoltIntermediateRotation1dLayer(
+                        name=strLv+'Vh'+str(iOrder-1),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis',
+                        mus=-1),
+                    NsoltAtomExtension1dLayer(
+                        name=strLv+'Qh'+str(iOrder)+'lu',
+                        number_of_channels=number_of_channels,
+                        direction='Left',
+                        target_channels='Sum'),
+                    NsoltIntermediateRotation1dLayer(
+                        name=strLv+'Vh'+str(iOrder),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis')
+                ])
+            # Channel separation
+            layers.append(
+                NsoltChannelSeparation1dLayer(name=strLv+'Sp')
+            )
+            self.layers.append(layers)
+
+    def forward(self,X):
+        """
+        Forward input data through the layer chain level by level.
+        """
+        Y = []
+        Z = X
+        for layers in self.layers:
+            for layer in layers[:-1]:
+                Z = layer(Z)
+            Zac, Zdc = layers[-1](Z)
+            Y.append(Zac)
+            Z = Zdc
+        Y.append(Zdc)
+        return tuple(Y)
@@ -1,29 +1,151 @@
 import torch
 import torch.nn as nn
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltChannelSeparation2dLayer import NsoltChannelSeparation2dLayer
+from nsoltLayerExceptions import InvalidNumberOfChannels, InvalidPolyPhaseOrder
+from nsoltReversible2d import ReversibleAnalysis2d
+from nsoltUtility import Direction
 
 class NsoltAnalysis2dNetwork(nn.Module):
     """
     NSOLTANALYSIS2DNETWORK
-    
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+          nSamples x nRowsLv2 x nColsLv2 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
     Requirements: Python 3.7.x, PyTorch 1.7.x
-    
+
     Copyright (c) 2021, Yasas Dulanjaya and Shogo MURAMATSU
-    
+
     All rights reserved.
-    
+
     Contact address: Shogo MURAMATSU,
         Faculty of Engineering, Niigata University,
         8050 2-no-cho Ikarashi, Nishi-ku,
         Niigata, 950-2181, JAPAN
-    
-        http://msiplab.eng.niigata-u.ac.jp/ 
+
+        http://msiplab.eng.niigata-u.ac.jp/
     """
     def __init__(self,
-        number_of_channels=[],
-        decimation_factor=[]):
+        number_of_channels=[2,2],
+        decimation_factor=[2,2],
+        polyphase_order=[0,0],
+        number_of_vanishing_moments=1,
+        number_of_levels=1,
+        reversible=False):
         super(NsoltAnalysis2dNetwork, self).__init__()
         self.number_of_channels = number_of_channels
         self.decimation_factor = decimation_factor
+        self.polyphase_order = polyphase_order
+        self.number_of_vanishing_moments = number_of_vanishing_moments
+        self.number_of_levels = number_of_levels
+        self.reversible = reversible
+
+        # Check parameters
+        if number_of_channels[0] != number_of_channels[1]:
+            raise InvalidNumberOfChannels(
+                '[%d %d] : Currently, Type-I NSOLT is only supported, where the even and odd channel numbers should be the same.'\
+                % (number_of_channels[0],number_of_channels[1])
+            )
+        if any(order%2 for order in polyphase_order):
+            raise InvalidPolyPhaseOrder(
+                '%d + %d : Currently, even polyphase orders are only supported.'\
+                % (polyphase_order[0],polyphase_order[1])
+            )
+
+        # Instantiation of layers
+        self.layers = nn.ModuleList()
+        for iLv in range(1,number_of_levels+1):
+            strLv = 'Lv%0d_' % iLv
+            # Initial blocks
+            layers = nn.ModuleList([
+                NsoltBlockDct2dLayer(
+                    name=strLv+'E0',
+                    decimation_factor=decimation_factor),
+                NsoltInitialRotation2dLayer(
+                    name=strLv+'V0',
+                    number_of_channels=number_of_channels,
+                    decimation_factor=decimation_factor,
+                    no_dc_leakage=(number_of_vanishing_moments==1))
+            ])
+            # Atom extension in horizontal
+            for iOrderH in range(2,polyphase_order[Direction.HORIZONTAL]+1,2):
+                layers.extend([
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qh'+str(iOrderH-1)+'rl',
+                        number_of_channels=number_of_channels,
+                        direction='Right',
+                        target_channels='Difference'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vh'+str(iOrderH-1),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis',
+                        mus=-1),
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qh'+str(iOrderH)+'lu',
+                        number_of_channels=number_of_channels,
+                        direction='Left',
+                        target_channels='Sum'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vh'+str(iOrderH),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis')
+                ])
+            # Atom extension in vertical
+            for iOrderV in range(2,polyphase_order[Direction.VERTICAL]+1,2):
+                layers.extend([
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qv'+str(iOrderV-1)+'dl',
+                        number_of_channels=number_of_channels,
+                        direction='Down',
+                        target_channels='Difference'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vv'+str(iOrderV-1),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis',
+                        mus=-1),
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qv'+str(iOrderV)+'uu',
+                        number_of_channels=number_of_channels,
+                        direction='Up',
+                        target_channels='Sum'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vv'+str(iOrderV),
+                        number_of_channels=number_of_channels,
+                        mode='Analysis')
+                ])
+            # Channel separation
+            layers.append(
+                NsoltChannelSeparation2dLayer(name=strLv+'Sp')
+            )
+            self.layers.append(layers)
+
+    def forward(self,X):
+        if self.reversible and torch.is_grad_enabled():
+            return ReversibleAnalysis2d.apply(self,X,*self.parameters())
+        return self.forward_layers(X)
 
-    def forward(self,x):
-        return x
+    def forward_layers(self,X):
+        """
+        Forward input data through the layer chain level by level.
+        """
+        Y = []
+        Z = X
+        for layers in self.layers:
+            for layer in layers[:-1]:
+                Z = layer(Z)
+            Zac, Zdc = layers[-1](Z)
+            Y.append(Zac)
+            Z = Zdc.unsqueeze(dim=1)
+        Y.append(Zdc)
+        return tuple(Y)
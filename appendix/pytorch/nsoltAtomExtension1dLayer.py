@@ -0,0 +1,89 @@
+import torch
+import torch.nn as nn
+import torch.autograd as autograd
+from nsoltLayerExceptions import InvalidDirection, InvalidTargetChannels
+from nsoltAtomExtension3dLayer import fused_atom_extension
+
+class NsoltAtomExtension1dLayer(nn.Module):
+    """
+    NSOLTATOMEXTENSION1DLAYER
+        入力:
+            nSamples x nBlks x nChsTotal
+
+        出力:
+            nSamples x nBlks x nChsTotal
+
+        The butterfly, the circular shift of the target channels by one
+        block and the second butterfly are fused into one pass.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+                    Faculty of Engineering, Niigata University,
+                    8050 2-no-cho Ikarashi, Nishi-ku,
+                    Niigata, 950-2181, JAPAN
+
+    http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+            name='',
+            number_of_channels=[],
+            direction='',
+            target_channels=''):
+        super(NsoltAtomExtension1dLayer, self).__init__()
+        self.number_of_channels = number_of_channels
+        self.name = name
+
+        # Target channels
+        if target_channels in { 'Sum', 'Difference' }:
+            self.target_channels = target_channels
+        else:
+            raise InvalidTargetChannels(
+                '%s : Target should be either of Sum or Difference'\
+                % target_channels
+            )
+
+        # Shift direction
+        if direction in { 'Right', 'Left' }:
+            self.direction = direction
+        else:
+            raise InvalidDirection(
+                '%s : Direction should be either of Right or Left'\
+                % direction
+            )
+
+        # Description
+        self.description = direction \
+            + " shift the " \
+            + target_channels.lower() \
+            + "-channel Coefs. " \
+            + "(ps,pa) = (" \
+            + str(number_of_channels[0]) + "," \
+            + str(number_of_channels[1]) + ")"
+        self.type = ''
+
+    def forward(self,X):
+        shift = 1 if self.direction == 'Right' else -1
+        # Atom extension function
+        atomext = AtomExtension1d.apply
+
+        return atomext(X,self.number_of_channels[0],
+            self.target_channels == 'Difference',shift)
+
+class AtomExtension1d(autograd.Function):
+    @staticmethod
+    def forward(ctx, input, ps, is_difference, shift):
+        ctx.ps, ctx.is_difference, ctx.shift = ps, is_difference, shift
+        return fused_atom_extension(input,ps,is_difference,shift,1)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        grad_input = None
+        if ctx.needs_input_grad[0]:
+            grad_input = fused_atom_extension(grad_output,
+                ctx.ps,ctx.is_difference,-ctx.shift,1)
+        return grad_input, None, None, None
@@ -0,0 +1,115 @@
+import torch
+import torch.nn as nn
+import torch.autograd as autograd
+from nsoltLayerExceptions import InvalidDirection, InvalidTargetChannels
+
+class NsoltAtomExtension3dLayer(nn.Module):
+    """
+    NSOLTATOMEXTENSION3DLAYER
+        コンポーネント別に入力(nComponents=1のみサポート):
+            nSamples x nRows x nCols x nLays x nChsTotal
+
+        コンポーネント別に出力(nComponents=1のみサポート):
+            nSamples x nRows x nCols x nLays x nChsTotal
+
+        The butterfly, the shift of the target channels and the second
+        butterfly are fused into one pass without in-place updates, so that
+        only the target half is rolled.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+                    Faculty of Engineering, Niigata University,
+                    8050 2-no-cho Ikarashi, Nishi-ku,
+                    Niigata, 950-2181, JAPAN
+
+    http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+            name='',
+            number_of_channels=[],
+            direction='',
+            target_channels=''):
+        super(NsoltAtomExtension3dLayer, self).__init__()
+        self.number_of_channels = number_of_channels
+        self.name = name
+
+        # Target channels
+        if target_channels in { 'Sum', 'Difference' }:
+            self.target_channels = target_channels
+        else:
+            raise InvalidTargetChannels(
+                '%s : Target should be either of Sum or Difference'\
+                % target_channels
+            )
+
+        # Shift direction
+        if direction in { 'Right', 'Left', 'Down', 'Up', 'Back', 'Front' }:
+            self.direction = direction
+        else:
+            raise InvalidDirection(
+                '%s : Direction should be either of Right, Left, Down, Up, Back or Front'\
+                % direction
+            )
+
+        # Description
+        self.description = direction \
+            + " shift the " \
+            + target_channels.lower() \
+            + "-channel Coefs. " \
+            + "(ps,pa) = (" \
+            + str(number_of_channels[0]) + "," \
+            + str(number_of_channels[1]) + ")"
+        self.type = ''
+
+    def forward(self,X):
+        # Shift direction
+        if self.direction == 'Right':
+            shift, dim = 1, 2
+        elif self.direction == 'Left':
+            shift, dim = -1, 2
+        elif self.direction == 'Down':
+            shift, dim = 1, 1
+        elif self.direction == 'Up':
+            shift, dim = -1, 1
+        elif self.direction == 'Back':
+            shift, dim = 1, 3
+        else:
+            shift, dim = -1, 3
+        # Atom extension function
+        atomext = AtomExtension3d.apply
+
+        return atomext(X,self.number_of_channels[0],
+            self.target_channels == 'Difference',shift,dim)
+
+class AtomExtension3d(autograd.Function):
+    @staticmethod
+    def forward(ctx, input, ps, is_difference, shift, dim):
+        ctx.ps, ctx.is_difference, ctx.shift, ctx.dim = ps, is_difference, shift, dim
+        return fused_atom_extension(input,ps,is_difference,shift,dim)
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        grad_input = None
+        if ctx.needs_input_grad[0]:
+            grad_input = fused_atom_extension(grad_output,
+                ctx.ps,ctx.is_difference,-ctx.shift,ctx.dim)
+        return grad_input, None, None, None, None
+
+def fused_atom_extension(X,ps,is_difference,shift,dim):
+    """
+    Block butterfly, shift of the target channels and block butterfly
+    """
+    Xs = X[...,:ps]
+    Xa = X[...,ps:]
+    Ys = Xs+Xa
+    Yd = Xs-Xa
+    if is_difference:
+        Yd = torch.roll(Yd,shifts=shift,dims=dim)
+    else:
+        Ys = torch.roll(Ys,shifts=shift,dims=dim)
+    return torch.cat((Ys+Yd,Ys-Yd),dim=-1)/2.
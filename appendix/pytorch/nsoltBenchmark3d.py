@@ -0,0 +1,114 @@
+import time
+import torch
+import torch.nn as nn
+from nsoltUtility import Direction
+from nsoltBlockDct3dLayer import NsoltBlockDct3dLayer
+from nsoltBlockIdct3dLayer import NsoltBlockIdct3dLayer
+from nsoltInitialRotation3dLayer import NsoltInitialRotation3dLayer
+from nsoltFinalRotation3dLayer import NsoltFinalRotation3dLayer
+from nsoltAtomExtension3dLayer import NsoltAtomExtension3dLayer
+from nsoltIntermediateRotation3dLayer import NsoltIntermediateRotation3dLayer
+from nsoltChannelSeparation3dLayer import NsoltChannelSeparation3dLayer
+from nsoltChannelConcatenation3dLayer import NsoltChannelConcatenation3dLayer
+
+def nsoltlayers3d(number_of_channels=[4,4],
+    decimation_factor=[2,2,2],
+    polyphase_order=[0,0,0]):
+    """
+    Analysis and synthesis layers of a single-level volumetric NSOLT
+
+       Returns two nn.ModuleList of the layers in the order of execution,
+       where the extensions are in horizontal, vertical and depth order.
+       The synthesis layers have the same names with '~' and share no
+       parameters with the analysis ones.
+    """
+    extensions = []
+    for key, dirs in ( (Direction.HORIZONTAL, ('h','Right','Left','rl','lu')),
+        (Direction.VERTICAL, ('v','Down','Up','dl','uu')),
+        (Direction.DEPTH, ('d','Back','Front','bl','fu')) ):
+        axis, dirF, dirB, lower, upper = dirs
+        for iOrder in range(2,polyphase_order[key]+1,2):
+            extensions.append(('Q'+axis+str(iOrder-1)+lower,dirF,dirB,'Difference'))
+            extensions.append(('V'+axis+str(iOrder-1),-1))
+            extensions.append(('Q'+axis+str(iOrder)+upper,dirB,dirF,'Sum'))
+            extensions.append(('V'+axis+str(iOrder),1))
+
+    analysislayers = nn.ModuleList([
+        NsoltBlockDct3dLayer(name='E0',decimation_factor=decimation_factor),
+        NsoltInitialRotation3dLayer(name='V0',
+            number_of_channels=number_of_channels,
+            decimation_factor=decimation_factor) ])
+    synthesislayers = nn.ModuleList([
+        NsoltChannelConcatenation3dLayer(name='Cn') ])
+    for extension in extensions:
+        if len(extension) > 2:
+            name, dirF, dirB, target = extension
+            analysislayers.append(NsoltAtomExtension3dLayer(name=name,
+                number_of_channels=number_of_channels,
+                direction=dirF,target_channels=target))
+        else:
+            name, mus = extension
+            analysislayers.append(NsoltIntermediateRotation3dLayer(name=name,
+                number_of_channels=number_of_channels,
+                mode='Analysis',mus=mus))
+    for extension in reversed(extensions):
+        if len(extension) > 2:
+            name, dirF, dirB, target = extension
+            synthesislayers.append(NsoltAtomExtension3dLayer(name=name+'~',
+                number_of_channels=number_of_channels,
+                direction=dirB,target_channels=target))
+        else:
+            name, mus = extension
+            synthesislayers.append(NsoltIntermediateRotation3dLayer(name=name+'~',
+                number_of_channels=number_of_channels,
+                mode='Synthesis',mus=mus))
+    analysislayers.append(NsoltChannelSeparation3dLayer(name='Sp'))
+    synthesislayers.extend([
+        NsoltFinalRotation3dLayer(name='V0~',
+            number_of_channels=number_of_channels,
+            decimation_factor=decimation_factor),
+        NsoltBlockIdct3dLayer(name='E0~',decimation_factor=decimation_factor) ])
+    return analysislayers, synthesislayers
+
+def benchmark(layers,X,number_of_voxels=None,number_of_trials=3):
+    """
+    Elapsed time of each layer applied in turn to X
+
+       X is a volume or a tuple of inputs of the first layer. Returns a
+       list of the metrics of the best trial for each layer, i.e. name,
+       elapsed time and voxels per second, where 'number_of_voxels' is
+       the number of elements of X by default.
+    """
+    nVoxels = X.numel() if number_of_voxels is None else number_of_voxels
+    results = []
+    with torch.no_grad():
+        for layer in layers:
+            args = X if isinstance(X,tuple) else (X,)
+            best = None
+            for iTrial in range(number_of_trials):
+                start = time.perf_counter()
+                Y = layer(*args)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best,elapsed)
+            results.append({ 'name': layer.name, 'elapsed': best,
+                'voxels_per_second': nVoxels/best })
+            X = Y
+    return results
+
+if __name__ == '__main__':
+    analysislayers, synthesislayers = nsoltlayers3d(
+        number_of_channels=[4, 4],
+        decimation_factor=[2, 2, 2],
+        polyphase_order=[2, 2, 2])
+    for angles in analysislayers.parameters():
+        angles.data = torch.randn_like(angles)
+    X = torch.rand(1,1,256,256,256)
+    print('layer      elapsed[ms]  Mvoxels/s')
+    with torch.no_grad():
+        Y = nn.Sequential(*analysislayers)(X)
+    results = benchmark(analysislayers,X) \
+        + benchmark(synthesislayers,Y,number_of_voxels=X.numel())
+    for metrics in results:
+        print('%-9s  %11.2f  %9.2f' % (metrics['name'],
+            metrics['elapsed']*1e3,metrics['voxels_per_second']/1e6))
+    print('total      %11.2f' % (sum([ metrics['elapsed'] for metrics in results ])*1e3))
@@ -0,0 +1,64 @@
+import torch
+import torch.nn as nn
+import math
+import functools
+
+class NsoltBlockDct1dLayer(nn.Module):
+    """
+    NSOLTBLOCKDCT1DLAYER
+
+       系列入力:
+          nSamples x (Stride x nBlks)
+
+       出力:
+          nSamples x nBlks x nDecs
+
+       The blocks are transformed by a single GEMM with the basis matrix
+       of block_dct_matrix1d.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name='',
+        decimation_factor=2
+        ):
+        super(NsoltBlockDct1dLayer, self).__init__()
+        self.decimation_factor = decimation_factor
+        self.name = name
+        self.description = "Block DCT of size " \
+            + str(self.decimation_factor)
+        self.register_buffer('basis',block_dct_matrix1d(decimation_factor),persistent=False)
+
+    def forward(self,X):
+        nSamples = X.size(0)
+        dec = self.decimation_factor
+        nblks = X.size(1)//dec
+        return (X.reshape(nSamples,nblks,dec) @ self.basis.to(X.dtype).T)
+
+def block_dct_matrix1d(decimation_factor):
+    """
+    Basis matrix of the 1D block DCT
+
+       Each row is an orthonormal DCT-II basis, where the even frequencies
+       precede the odd ones.
+    """
+    return block_dct_matrix1d_(decimation_factor).clone()
+
+@functools.lru_cache(maxsize=None)
+def block_dct_matrix1d_(dec):
+    C = torch.tensor([ [ (math.sqrt(1./dec) if k == 0 else math.sqrt(2./dec)) \
+        * math.cos(math.pi*(2*n+1)*k/(2*dec)) for n in range(dec) ]
+        for k in range(dec) ],dtype=torch.double)
+    return torch.cat((C[0::2,:],C[1::2,:]),dim=0)
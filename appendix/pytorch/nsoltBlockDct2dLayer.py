@@ -52,10 +52,12 @@ class NsoltBlockDct2dLayer(nn.Module):
         nrows = int(math.ceil(height/stride[Direction.VERTICAL]))
         ncols = int(math.ceil(width/stride[Direction.HORIZONTAL]))
         ndecs = stride[0]*stride[1] #math.prod(stride)
+        # Block extraction (nSamples x nComponents x nrows x ncols) x decV x decH
+        decV = stride[Direction.VERTICAL]
+        decH = stride[Direction.HORIZONTAL]
+        V = X.reshape(-1,nrows,decV,ncols,decH).permute(0,1,3,2,4).reshape(-1,decV,decH)
         # Block DCT (nSamples x nComponents x nrows x ncols) x decV x decH
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(X.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(V,norm='ortho')
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         cee = Y[:,0::2,0::2].reshape(Y.size(0),-1)
         coo = Y[:,1::2,1::2].reshape(Y.size(0),-1)
@@ -0,0 +1,91 @@
+import torch
+import torch.nn as nn
+import math
+import functools
+from nsoltUtility import Direction
+
+class NsoltBlockDct3dLayer(nn.Module):
+    """
+    NSOLTBLOCKDCT3DLAYER
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols) x (Stride(3)xnLays)
+
+       コンポーネント別に出力(nComponents):
+          nSamples x nRows x nCols x nLays x nDecs
+
+       The blocks are transformed by a single GEMM with the rearranged
+       basis matrix of block_dct_matrix3d.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name='',
+        decimation_factor=[],
+        number_of_components=1
+        ):
+        super(NsoltBlockDct3dLayer, self).__init__()
+        self.decimation_factor = decimation_factor
+        self.name = name
+        self.description = "Block DCT of size " \
+            + str(self.decimation_factor[Direction.VERTICAL]) + "x" \
+            + str(self.decimation_factor[Direction.HORIZONTAL]) + "x" \
+            + str(self.decimation_factor[Direction.DEPTH])
+        self.num_outputs = number_of_components
+        self.register_buffer('basis',block_dct_matrix3d(decimation_factor),persistent=False)
+
+    def forward(self,X):
+        nComponents = self.num_outputs
+        nSamples = X.size(0)
+        decV, decH, decD = self.decimation_factor
+        nrows = X.size(2)//decV
+        ncols = X.size(3)//decH
+        nlays = X.size(4)//decD
+        ndecs = decV*decH*decD
+        # Block extraction (nSamples x nComponents x nrows x ncols x nlays) x (decV x decH x decD)
+        V = X.reshape(-1,nrows,decV,ncols,decH,nlays,decD).permute(0,1,3,5,2,4,6).reshape(-1,ndecs)
+        # Block DCT with the rearranged basis
+        A = V @ self.basis.to(X.dtype).T
+        Z = A.view(nSamples,nComponents,nrows,ncols,nlays,ndecs)
+
+        if nComponents<2:
+            return torch.squeeze(Z,dim=1)
+        else:
+            return map(lambda x: torch.squeeze(x,dim=1),torch.chunk(Z,nComponents,dim=1))
+
+def block_dct_matrix3d(decimation_factor):
+    """
+    Basis matrix of the 3D block DCT
+
+       Each row is an orthonormal DCT-II basis of a decV x decH x decD
+       block raster-scanned in the row-major order. The rows are grouped
+       by the parity of the frequencies (v,h,d) in the order of eee, eoo,
+       ooe, oeo, eeo, eoe, ooo and oee as +dcnn/nsoltBlockDct3dLayer.m
+       does, and the frequencies in each group are in the row-major order.
+    """
+    return block_dct_matrix3d_(tuple(decimation_factor)).clone()
+
+@functools.lru_cache(maxsize=None)
+def block_dct_matrix3d_(decimation_factor):
+    evenodd = []
+    for dec in decimation_factor:
+        C = torch.tensor([ [ (math.sqrt(1./dec) if k == 0 else math.sqrt(2./dec)) \
+            * math.cos(math.pi*(2*n+1)*k/(2*dec)) for n in range(dec) ]
+            for k in range(dec) ],dtype=torch.double)
+        evenodd.append((C[0::2,:], C[1::2,:]))
+    Cv, Ch, Cd = evenodd
+    parities = [ (0,0,0), (0,1,1), (1,1,0), (1,0,1), (0,0,1), (0,1,0), (1,1,1), (1,0,0) ]
+    return torch.cat([ torch.kron(Cv[pv],torch.kron(Ch[ph],Cd[pd]))
+        for pv, ph, pd in parities ],dim=0)
@@ -0,0 +1,45 @@
+import torch
+import torch.nn as nn
+from nsoltBlockDct1dLayer import block_dct_matrix1d
+
+class NsoltBlockIdct1dLayer(nn.Module):
+    """
+    NSOLTBLOCKIDCT1DLAYER
+
+       入力:
+          nSamples x nBlks x nDecs
+
+       系列出力:
+          nSamples x (Stride x nBlks)
+
+       The blocks are reconstructed by a single GEMM with the transpose of
+       the basis matrix of block_dct_matrix1d.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name='',
+        decimation_factor=2
+        ):
+        super(NsoltBlockIdct1dLayer, self).__init__()
+        self.decimation_factor = decimation_factor
+        self.name = name
+        self.description = "Block IDCT of size " \
+            + str(self.decimation_factor)
+        self.register_buffer('basis',block_dct_matrix1d(decimation_factor),persistent=False)
+
+    def forward(self,X):
+        nSamples = X.size(0)
+        return (X @ self.basis.to(X.dtype)).reshape(nSamples,-1)
@@ -41,7 +41,12 @@ class NsoltBlockIdct2dLayer(nn.Module):
         #self.type = ''
         self.num_inputs = number_of_components
 
-    def forward(self,*args):
+    def forward(self,*args,out=None):
+        """
+        The output is written in place if out, a tensor (or a view) of size
+        nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols), is
+        given.
+        """
         block_size = self.decimation_factor
         for iComponent in range(self.num_inputs):
             X = args[iComponent]
@@ -55,7 +60,15 @@ class NsoltBlockIdct2dLayer(nn.Module):
             # Reshape and return
             height = nrows * block_size[Direction.VERTICAL] 
             width = ncols * block_size[Direction.HORIZONTAL] 
-            if iComponent<1:
+            Y = Y.reshape(nsamples,nrows,ncols,
+                block_size[Direction.VERTICAL],
+                block_size[Direction.HORIZONTAL]).permute(0,1,3,2,4)
+            if out is not None:
+                out[:,iComponent].view(nsamples,nrows,
+                    block_size[Direction.VERTICAL],ncols,
+                    block_size[Direction.HORIZONTAL]).copy_(Y)
+                Z = out
+            elif iComponent<1:
                 Z = Y.reshape(nsamples,1,height,width)
             else:
                 Z = torch.cat((Z,Y.reshape(nsamples,1,height,width)),dim=1)
@@ -0,0 +1,61 @@
+import torch
+import torch.nn as nn
+from nsoltUtility import Direction
+from nsoltBlockDct3dLayer import block_dct_matrix3d
+
+class NsoltBlockIdct3dLayer(nn.Module):
+    """
+    NSOLTBLOCKIDCT3DLAYER
+
+       コンポーネント別に入力(nComponents):
+          nSamples x nRows x nCols x nLays x nDecs
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols) x (Stride(3)xnLays)
+
+       The blocks are reconstructed by a single GEMM with the transpose of
+       the basis matrix of block_dct_matrix3d.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        name='',
+        decimation_factor=[],
+        number_of_components=1
+        ):
+        super(NsoltBlockIdct3dLayer, self).__init__()
+        self.decimation_factor = decimation_factor
+        self.name = name
+        self.description = "Block IDCT of size " \
+            + str(self.decimation_factor[Direction.VERTICAL]) + "x" \
+            + str(self.decimation_factor[Direction.HORIZONTAL]) + "x" \
+            + str(self.decimation_factor[Direction.DEPTH])
+        self.num_inputs = number_of_components
+        self.register_buffer('basis',block_dct_matrix3d(decimation_factor),persistent=False)
+
+    def forward(self,*args):
+        decV, decH, decD = self.decimation_factor
+        components = []
+        for iComponent in range(self.num_inputs):
+            X = args[iComponent]
+            nsamples, nrows, ncols, nlays = X.size(0), X.size(1), X.size(2), X.size(3)
+            # Block IDCT with the rearranged basis
+            Y = X.reshape(-1,decV*decH*decD) @ self.basis.to(X.dtype)
+            # Reshape and return
+            Y = Y.view(nsamples,nrows,ncols,nlays,decV,decH,decD).permute(0,1,4,2,5,3,6)
+            components.append(Y.reshape(nsamples,1,nrows*decV,ncols*decH,nlays*decD))
+        if len(components)<2:
+            return components[0]
+        else:
+            return torch.cat(components,dim=1)
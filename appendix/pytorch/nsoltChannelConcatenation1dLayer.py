@@ -0,0 +1,36 @@
+import torch
+import torch.nn as nn
+
+class NsoltChannelConcatenation1dLayer(nn.Module):
+    """
+    NSOLTCHANNELCONCATENATION1DLAYER
+
+       ２コンポーネント入力:
+          nSamples x nBlks x (nChsTotal-1)
+          nSamples x nBlks
+
+       出力:
+          nSamples x nBlks x nChsTotal
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name=''):
+        super(NsoltChannelConcatenation1dLayer, self).__init__()
+        self.name = name
+        self.description = "Channel concatenation"
+
+    def forward(self,Xac,Xdc):
+        return torch.cat((Xdc.unsqueeze(dim=2),Xac),dim=2)
@@ -33,6 +33,7 @@ class NsoltChannelConcatenation2dLayer(nn.Module):
         self.description = "Channel concatenation"
         #self.type = ''
         #self.input_names = [ 'ac', 'dc' ]
+        self.buffer_ = None
 
     def forward(self,Xac,Xdc):
         """
@@ -47,4 +48,50 @@ class NsoltChannelConcatenation2dLayer(nn.Module):
         """
             
         # Layer forward function for prediction goes here.
+        if isdcslot_(Xac,Xdc) and not (torch.is_grad_enabled() and \
+            (Xac.requires_grad or Xdc.requires_grad)):
+            # Xdc and Xac already lie side by side in one buffer, e.g.
+            # outputs of NsoltChannelSeparation2dLayer, so that no copy
+            # is required.
+            return Xac.as_strided(dcfirstshape_(Xac),dcfirststride_(Xac),
+                Xdc.storage_offset())
         return torch.cat((Xdc.unsqueeze(dim=3),Xac),dim=3)
+
+    def allocate(self,Xac):
+        """
+        Preallocate the output buffer, whose DC slot Z[:,:,:,0] is left
+        to be written in place, e.g. by the block IDCT of the coarser
+        level.
+
+            Inputs:
+                Xac         - nSamples x nRows x nCols x (nChsTotal-1)
+            Outputs:
+                Z           - nSamples x nRows x nCols x nChsTotal
+        """
+        shape = dcfirstshape_(Xac)
+        if torch.is_grad_enabled():
+            # Buffers recorded by autograd are never reused
+            Z = Xac.new_empty(shape)
+        else:
+            Z = self.buffer_
+            if Z is None or Z.shape != shape or Z.dtype != Xac.dtype \
+                or Z.device != Xac.device:
+                Z = Xac.new_empty(shape)
+                self.buffer_ = Z
+        Z[:,:,:,1:] = Xac
+        return Z
+
+def dcfirstshape_(Xac):
+    return Xac.shape[:3] + (Xac.size(3)+1,)
+
+def dcfirststride_(Xac):
+    nChsTotal = Xac.size(3)+1
+    return (Xac.size(1)*Xac.size(2)*nChsTotal, Xac.size(2)*nChsTotal, nChsTotal, 1)
+
+def isdcslot_(Xac,Xdc):
+    return Xac.device == Xdc.device and Xac.dtype == Xdc.dtype \
+        and Xac.shape[:3] == Xdc.shape \
+        and Xac.untyped_storage().data_ptr() == Xdc.untyped_storage().data_ptr() \
+        and Xac.storage_offset() == Xdc.storage_offset()+1 \
+        and Xac.stride() == dcfirststride_(Xac) \
+        and Xdc.stride() == dcfirststride_(Xac)[:3]
@@ -0,0 +1,36 @@
+import torch
+import torch.nn as nn
+
+class NsoltChannelSeparation1dLayer(nn.Module):
+    """
+    NSOLTCHANNELSEPARATION1DLAYER
+
+       入力:
+          nSamples x nBlks x nChsTotal
+
+       ２コンポーネント出力:
+          nSamples x nBlks x (nChsTotal-1)
+          nSamples x nBlks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name=''):
+        super(NsoltChannelSeparation1dLayer, self).__init__()
+        self.name = name
+        self.description = "Channel separation"
+
+    def forward(self,X):
+        return X[:,:,1:], X[:,:,0]
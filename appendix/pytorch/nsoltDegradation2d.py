@@ -0,0 +1,778 @@
+import math
+import torch
+import torch.fft
+import torch.nn as nn
+import torch.nn.functional as F
+from nsoltUtility import Direction
+from nsoltLayerExceptions import InvalidOption
+
+class BlurSystem(nn.Module):
+    """
+    BLURSYSTEM Blur process
+
+       原画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/+linearprocess/BlurSystem.m, where the
+       convolution with the blur kernel is carried out by the rFFT and
+       adjoint(X) gives the exact adjoint, i.e. the correlation including
+       the boundary extension. The boundary option is one of
+
+          'Value'     : zero padding
+          'Symmetric' : mirror reflection including the edge
+          'Replicate' : repetition of the edge
+          'Circular'  : periodic extension
+
+       Except for 'Circular', the images are extended by kernel size - 1
+       and zero-padded to a length of small prime factors before the FFT
+       so that the cyclic convolution does not wrap around.
+       The optical transfer function (OTF) and the extension index are
+       cached for each image size, dtype and device of this kernel.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        blur_type='Identical',
+        boundary_option='Value',
+        size_of_kernel=None,
+        sigma_of_gaussian_kernel=None,
+        custom_kernel=None):
+        super(BlurSystem, self).__init__()
+        if boundary_option not in [ 'Value', 'Symmetric', 'Replicate', 'Circular' ]:
+            raise InvalidOption(
+                '%s : Invalid boundary option' % boundary_option
+            )
+        if blur_type == 'Identical':
+            kernel = torch.ones(1,1,dtype=torch.double)
+        elif blur_type == 'Average':
+            if size_of_kernel is None:
+                size_of_kernel = [ 3, 3 ]
+            kernel = averagekernel2d(size_of_kernel)
+        elif blur_type == 'Gaussian':
+            if sigma_of_gaussian_kernel is None:
+                sigma_of_gaussian_kernel = 2.0
+            if size_of_kernel is None:
+                size_of_kernel = 2*math.ceil(4*sigma_of_gaussian_kernel)+1
+            kernel = gaussiankernel2d(size_of_kernel,sigma_of_gaussian_kernel)
+        elif blur_type == 'Custom':
+            if custom_kernel is None:
+                raise InvalidOption(
+                    'CustomKernel should be specified.'
+                )
+            kernel = torch.as_tensor(custom_kernel,dtype=torch.double)
+            kernel = kernel.view(1,-1) if kernel.dim() == 1 else kernel
+        else:
+            raise InvalidOption(
+                '%s : Invalid blur type' % blur_type
+            )
+        self.blur_type = blur_type
+        self.boundary_option = boundary_option
+        self.size_of_kernel = size_of_kernel
+        self.sigma_of_gaussian_kernel = sigma_of_gaussian_kernel
+        self.blur_kernel = kernel
+        self.transfers_ = {}
+        self.lambdamaxs_ = {}
+
+    def forward(self,X):
+        if self.blur_type == 'Identical':
+            return X
+        height, width = X.shape[-2:]
+        otf, padded, indices = self.transfer_((height,width),X.dtype,X.device)
+        Y = torch.fft.irfft2(torch.fft.rfft2(self.extend_(X,indices),s=padded)*otf,s=padded)
+        return Y[...,:height,:width]
+
+    def adjoint(self,X):
+        if self.blur_type == 'Identical':
+            return X
+        height, width = X.shape[-2:]
+        otf, padded, indices = self.transfer_((height,width),X.dtype,X.device)
+        Y = torch.fft.irfft2(torch.fft.rfft2(X,s=padded)*otf.conj(),s=padded)
+        return self.extendadjoint_(Y,(height,width),indices)
+
+    def originaldimension(self,size):
+        return tuple(size)
+
+    def lambdamax(self,size):
+        """
+        Maximum eigenvalue of P^T P for the original images of the given
+        size, which is cached
+        """
+        size = tuple(size)
+        if size not in self.lambdamaxs_:
+            self.lambdamaxs_[size] = self.maxeigenvalue_(size)
+        return self.lambdamaxs_[size]
+
+    def maxeigenvalue_(self,size):
+        if self.blur_type == 'Identical':
+            return 1.
+        if self.boundary_option == 'Circular':
+            return float(self.gain_(size).max())
+        return powermethod2d(self,size)
+
+    def gain_(self,size):
+        """
+        Squared magnitude of the OTF over the full frequency grid
+        """
+        otf, padded, _ = self.transfer_(size,torch.double,torch.device('cpu'))
+        return torch.fft.fft2(torch.fft.irfft2(otf,s=padded)).abs().square()
+
+    def transfer_(self,size,dtype,device):
+        key = (tuple(size),dtype,device)
+        if key not in self.transfers_:
+            self.transfers_[key] = self.otf_(size,dtype,device)
+        return self.transfers_[key]
+
+    def otf_(self,size,dtype,device):
+        """
+        OTF of the size of the extended images, where the kernel is
+        placed so that the first nRows x nCols samples of the cyclic
+        convolution give the output
+        """
+        kernel = self.blur_kernel.to(dtype=dtype,device=device)
+        if self.boundary_option == 'Circular':
+            padded = tuple(size)
+            shift = [ (nTaps-1)//2 for nTaps in kernel.shape ]
+        else:
+            padded = tuple(fftlength_(nSmpls+nTaps-1) for nSmpls, nTaps in zip(size,kernel.shape))
+            shift = [ 0, 0 ]
+        rows, cols = [ (torch.arange(nTaps,device=device)-(nTaps-1)+offset) % nSmpls
+            for nTaps, offset, nSmpls in zip(kernel.shape,shift,padded) ]
+        psf = torch.zeros(padded,dtype=dtype,device=device).index_put_(
+            (rows.view(-1,1),cols.view(1,-1)),kernel,accumulate=True)
+        if self.boundary_option in [ 'Symmetric', 'Replicate' ]:
+            indices = [ self.extensionindex_(nSmpls,nTaps,device)
+                for nSmpls, nTaps in zip(size,kernel.shape) ]
+        else:
+            indices = None
+        return torch.fft.rfft2(psf), padded, indices
+
+    def extensionindex_(self,nSmpls,nTaps,device):
+        """
+        Index of the input sample for each sample of the extended images
+        """
+        index = torch.arange(nSmpls+nTaps-1,device=device)-(nTaps-1)//2
+        if self.boundary_option == 'Symmetric':
+            index = index % (2*nSmpls)
+            return torch.where(index < nSmpls,index,2*nSmpls-1-index)
+        return index.clamp(0,nSmpls-1)
+
+    def extend_(self,X,indices):
+        if self.boundary_option == 'Circular':
+            return X
+        if self.boundary_option == 'Value':
+            nRowsK, nColsK = self.blur_kernel.shape
+            top, left = (nRowsK-1)//2, (nColsK-1)//2
+            return F.pad(X,(left,nColsK-1-left,top,nRowsK-1-top))
+        return X.index_select(-2,indices[Direction.VERTICAL]) \
+            .index_select(-1,indices[Direction.HORIZONTAL])
+
+    def extendadjoint_(self,Y,size,indices):
+        height, width = size
+        if self.boundary_option == 'Circular':
+            return Y
+        if self.boundary_option == 'Value':
+            nRowsK, nColsK = self.blur_kernel.shape
+            top, left = (nRowsK-1)//2, (nColsK-1)//2
+            return Y[...,top:top+height,left:left+width]
+        rows, cols = indices
+        Y = Y[...,:rows.numel(),:cols.numel()]
+        Z = Y.new_zeros(*Y.shape[:-2],height,Y.size(-1)) \
+            .index_add_(Y.dim()-2,rows,Y)
+        return Z.new_zeros(*Z.shape[:-1],width) \
+            .index_add_(Z.dim()-1,cols,Z)
+
+class DecimationSystem(BlurSystem):
+    """
+    DECIMATIONSYSTEM Decimation process
+
+       原画像のバッチ入力:
+          nSamples x nComponents x (nRows x mv) x (nCols x mh)
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/+linearprocess/DecimationSystem.m, i.e. the
+       blur by BlurSystem followed by the downsampling, which is a strided
+       view of the blurred images. The adjoint upsamples to the same phase
+       as the downsampling, so that it is exact also for even-sized
+       kernels, for which DecimationSystem.m shifts the phase by one.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        decimation_factor=[2, 2],
+        blur_type='Identical',
+        boundary_option='Value',
+        size_of_gaussian_kernel=None,
+        sigma_of_gaussian_kernel=None,
+        custom_kernel=None):
+        size_of_kernel = None
+        if blur_type == 'Average':
+            size_of_kernel = decimation_factor
+        elif blur_type == 'Gaussian':
+            if size_of_gaussian_kernel is None:
+                size_of_gaussian_kernel = [ 4*factor+1 for factor in decimation_factor ]
+            if sigma_of_gaussian_kernel is None:
+                sigma_of_gaussian_kernel = max(decimation_factor)
+            size_of_kernel = size_of_gaussian_kernel
+        super(DecimationSystem, self).__init__(
+            blur_type=blur_type,
+            boundary_option=boundary_option,
+            size_of_kernel=size_of_kernel,
+            sigma_of_gaussian_kernel=sigma_of_gaussian_kernel,
+            custom_kernel=custom_kernel)
+        self.decimation_factor = decimation_factor
+        self.size_of_gaussian_kernel = size_of_gaussian_kernel
+
+    def forward(self,X):
+        decV, decH = self.decimation_factor
+        return super(DecimationSystem, self).forward(X)[...,::decV,::decH]
+
+    def adjoint(self,X):
+        decV, decH = self.decimation_factor
+        nRows, nCols = X.shape[-2:]
+        Y = X.new_zeros(*X.shape[:-2],nRows*decV,nCols*decH)
+        Y[...,::decV,::decH] = X
+        return super(DecimationSystem, self).adjoint(Y)
+
+    def originaldimension(self,size):
+        return tuple(nSmpls*factor for nSmpls, factor in zip(size,self.decimation_factor))
+
+    def maxeigenvalue_(self,size):
+        """
+        For the circular boundary, the eigenvalues are the means of the
+        squared OTF over the aliases
+        """
+        decV, decH = self.decimation_factor
+        height, width = size
+        if self.blur_type == 'Identical' or self.boundary_option != 'Circular' \
+            or height % decV or width % decH:
+            return super(DecimationSystem, self).maxeigenvalue_(size)
+        gain = self.gain_(size).view(decV,height//decV,decH,width//decH)
+        return float(gain.mean(dim=(0,2)).max())
+
+class PixelLossSystem(nn.Module):
+    """
+    PIXELLOSSSYSTEM Pixel loss process
+
+       原画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/+linearprocess/PixelLossSystem.m, where the
+       mask is common to all the samples and components. The loss type
+       'Random' draws the mask of each image size with the seed, where a
+       pixel is lost with the probability of density, and 'Specified'
+       takes the mask. The mask is kept as the buffer packed_mask of
+       eight pixels per byte and unpacked once for each dtype and device.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        loss_type='Random',
+        density=0.5,
+        seed=0,
+        mask=None):
+        super(PixelLossSystem, self).__init__()
+        self.loss_type = loss_type
+        self.density = density
+        self.seed = seed
+        self.register_buffer('packed_mask',None)
+        self.mask_size = None
+        self.masks_ = {}
+        if loss_type == 'Specified':
+            if mask is None:
+                raise InvalidOption(
+                    'Mask should be specified.'
+                )
+            self.pack_(torch.as_tensor(mask).bool())
+        elif loss_type != 'Random':
+            raise InvalidOption(
+                '%s : Invalid loss type' % loss_type
+            )
+
+    @property
+    def mask(self):
+        return unpackbits2d(self.packed_mask,self.mask_size)
+
+    def forward(self,X):
+        return X*self.mask_(X.shape[-2:],X.dtype,X.device)
+
+    def adjoint(self,X):
+        return self.forward(X)
+
+    def originaldimension(self,size):
+        return tuple(size)
+
+    def lambdamax(self,size):
+        return 1.
+
+    def mask_(self,size,dtype,device):
+        size = tuple(size)
+        if self.loss_type == 'Random' and self.mask_size != size:
+            generator = torch.Generator().manual_seed(self.seed)
+            self.pack_(torch.rand(size,generator=generator,dtype=torch.double) > self.density)
+        key = (dtype,device)
+        if key not in self.masks_:
+            self.masks_[key] = self.mask.to(dtype=dtype,device=device)
+        return self.masks_[key]
+
+    def pack_(self,mask):
+        self.packed_mask = packbits2d(mask)
+        self.mask_size = tuple(mask.shape)
+        self.masks_ = {}
+
+class CascadedLinearSystem(nn.Module):
+    """
+    CASCADEDLINEARSYSTEM Cascade of linear processes
+
+       Linear processes applied in the given order, e.g. a blur followed
+       by a pixel loss, whose adjoint applies the adjoints in the reverse
+       order.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        processes=[]):
+        super(CascadedLinearSystem, self).__init__()
+        self.processes = nn.ModuleList(processes)
+        self.lambdamaxs_ = {}
+
+    def forward(self,X):
+        for process in self.processes:
+            X = process(X)
+        return X
+
+    def adjoint(self,X):
+        for process in reversed(self.processes):
+            X = process.adjoint(X)
+        return X
+
+    def originaldimension(self,size):
+        for process in reversed(self.processes):
+            size = process.originaldimension(size)
+        return tuple(size)
+
+    def lambdamax(self,size):
+        size = tuple(size)
+        if size not in self.lambdamaxs_:
+            self.lambdamaxs_[size] = self.processes[0].lambdamax(size) \
+                if len(self.processes) == 1 else powermethod2d(self,size)
+        return self.lambdamaxs_[size]
+
+class AdditiveWhiteGaussianNoiseSystem(nn.Module):
+    """
+    ADDITIVEWHITEGAUSSIANNOISESYSTEM Additive white Gaussian noise
+
+       画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/+noiseprocess/AdditiveWhiteGaussianNoiseSystem.m,
+       i.e. imnoise(X,'gaussian',mean,variance) clipped to [0, 1]. The
+       mean and the variance are scalars or tensors of nSamples for the
+       samples. The noise of the n-th sample in a batch is drawn from the
+       Philox stream of index stream + n for the seed, and stream is
+       advanced by nSamples, so that the noise of a sample depends only
+       on the seed and its global index. Workers can generate their
+       shares in parallel by setting stream to the index of their first
+       samples. The output can be written into the buffer out.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        mean=0.,
+        variance=0.01,
+        seed=0,
+        stream=0):
+        super(AdditiveWhiteGaussianNoiseSystem, self).__init__()
+        self.mean = mean
+        self.variance = variance
+        self.seed = seed
+        self.stream = stream
+
+    def forward(self,X,out=None):
+        Z = normal2d(X.shape,self.seed,self.stream,dtype=X.dtype,device=X.device)
+        self.stream += X.size(0)
+        sigma = samplewise_(self.variance,X).sqrt()
+        out = torch.addcmul(X,Z,sigma,out=out)
+        return out.add_(samplewise_(self.mean,X)).clamp_(0.,1.)
+
+class PoissonNoiseSystem(nn.Module):
+    """
+    POISSONNOISESYSTEM Poisson noise
+
+       画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/+noiseprocess/PoissonNoiseSystem.m, where each
+       pixel is replaced by Poisson(peak X)/peak clipped to [0, 1] as
+       imnoise(X,'poisson') for the peak of 255, i.e. the photon count of
+       uint8 images. The peak is a scalar or a tensor of nSamples for the
+       samples. Each count is given by the inversion of one uniform
+       variate from the Philox streams as AdditiveWhiteGaussianNoiseSystem.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        peak=255.,
+        seed=0,
+        stream=0):
+        super(PoissonNoiseSystem, self).__init__()
+        self.peak = peak
+        self.seed = seed
+        self.stream = stream
+
+    def forward(self,X,out=None):
+        U = uniform2d(X.shape,self.seed,self.stream,device=X.device)
+        self.stream += X.size(0)
+        peak = samplewise_(self.peak,X).double()
+        counts = poisson2d(X.double().clamp(min=0.)*peak,U)
+        out = X.new_empty(X.shape) if out is None else out
+        return out.copy_(counts.div_(peak)).clamp_(0.,1.)
+
+class NoiselessSystem(nn.Module):
+    """
+    NOISELESSSYSTEM Noiseless process
+
+       Port of +degradation/+noiseprocess/NoiselessSystem.m
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def forward(self,X,out=None):
+        return X if out is None else out.copy_(X)
+
+class DegradationSystem(nn.Module):
+    """
+    DEGRADATIONSYSTEM Degradation process
+
+       原画像のバッチ入力:
+          nSamples x nComponents x nRowsOrg x nColsOrg
+
+       観測画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Port of +degradation/DegradationSystem.m, i.e. the noise process
+       applied to the output of the linear process. A list of linear
+       processes, e.g. [ DecimationSystem(...), PixelLossSystem(...) ], is
+       cascaded by CascadedLinearSystem. The observation is made in one
+       pass, where the noise is added to the output of the linear process
+       directly into the buffer out, and the linear process can be given
+       to the restoration as linear_process.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        linear_process=None,
+        noise_process=None):
+        super(DegradationSystem, self).__init__()
+        if isinstance(linear_process,(list,tuple)):
+            linear_process = CascadedLinearSystem(linear_process)
+        self.linear_process = BlurSystem() if linear_process is None else linear_process
+        self.noise_process = NoiselessSystem() if noise_process is None else noise_process
+
+    def forward(self,X,out=None):
+        return self.noise_process(self.linear_process(X),out=out)
+
+def averagekernel2d(size):
+    size = [ size, size ] if isinstance(size,int) else size
+    return torch.ones(size,dtype=torch.double)/(size[0]*size[1])
+
+def gaussiankernel2d(size,sigma):
+    """
+    Gaussian kernel as fspecial('gaussian',size,sigma)
+    """
+    size = [ size, size ] if isinstance(size,int) else size
+    y, x = [ torch.arange(nTaps,dtype=torch.double)-(nTaps-1)/2. for nTaps in size ]
+    kernel = torch.exp(-(y.view(-1,1)**2+x.view(1,-1)**2)/(2.*sigma**2))
+    kernel[kernel < torch.finfo(torch.double).eps*kernel.max()] = 0.
+    return kernel/kernel.sum()
+
+def powermethod2d(linear_process,size,tol=1e-8,max_iter=1000):
+    """
+    Maximum eigenvalue of P^T P for the original images of the given size
+    by the power method as getLambdaMax_ of AbstLinearSystem.m
+    """
+    generator = torch.Generator().manual_seed(0)
+    upst = torch.rand(1,1,*size,generator=generator,dtype=torch.double)
+    lpre = 1.
+    with torch.no_grad():
+        for _ in range(max_iter):
+            upre = upst/torch.linalg.norm(upst)
+            upst = linear_process.adjoint(linear_process(upre))
+            lpst = float(torch.sum(upst*upst)/torch.sum(upst*upre))
+            err = abs(lpst-lpre)/abs(lpre)
+            lpre = lpst
+            if err <= tol:
+                break
+    return lpst
+
+def fftlength_(length):
+    """
+    Smallest length of prime factors 2, 3 and 5 not less than the given one
+    """
+    while True:
+        residual = length
+        for factor in [ 2, 3, 5 ]:
+            while residual % factor == 0:
+                residual //= factor
+        if residual == 1:
+            return length
+        length += 1
+
+def packbits2d(mask):
+    """
+    Boolean mask packed into bytes of eight pixels in raster order
+    """
+    bits = mask.reshape(-1).to(torch.uint8)
+    bits = F.pad(bits,(0,(-bits.numel()) % 8))
+    weights = torch.tensor([ 1 << iBit for iBit in range(8) ],dtype=torch.uint8,device=mask.device)
+    return (bits.view(-1,8)*weights).sum(dim=1,dtype=torch.uint8)
+
+def unpackbits2d(packed,size):
+    shifts = torch.arange(8,dtype=torch.uint8,device=packed.device)
+    bits = (packed.unsqueeze(1) >> shifts) & 1
+    return bits.view(-1)[:size[0]*size[1]].view(size).bool()
+
+def samplewise_(value,X):
+    """
+    Scalar or tensor of nSamples broadcast over the other dimensions of X
+    """
+    value = torch.as_tensor(value,dtype=X.dtype,device=X.device)
+    return value.view(-1,*([1]*(X.dim()-1))) if value.dim() > 0 else value
+
+PHILOX_M = [ 0xD2511F53, 0xCD9E8D57 ]
+PHILOX_W = [ 0x9E3779B9, 0xBB67AE85 ]
+MASK32 = 0xFFFFFFFF
+
+def philox4x32(counter,key,rounds=10):
+    """
+    Philox-4x32 of Salmon et al. (SC'11) for the counters ... x 4 and the
+    key of two words, where the words are held in int64 tensors
+    """
+    c0, c1, c2, c3 = counter.unbind(-1)
+    k0, k1 = key
+    for _ in range(rounds):
+        hi0, lo0 = mulhilo32_(c0,PHILOX_M[0])
+        hi1, lo1 = mulhilo32_(c2,PHILOX_M[1])
+        c0, c1, c2, c3 = hi1 ^ c1 ^ k0, lo1, hi0 ^ c3 ^ k1, lo0
+        k0, k1 = (k0+PHILOX_W[0]) & MASK32, (k1+PHILOX_W[1]) & MASK32
+    return torch.stack([c0, c1, c2, c3],dim=-1)
+
+def mulhilo32_(a,b):
+    """
+    High and low words of a b, where b is split into 16-bit halves so
+    that the partial products fit in int64
+    """
+    t0 = a*(b & 0xFFFF)
+    t1 = a*(b >> 16)
+    s = t0+((t1 & 0xFFFF) << 16)
+    return (t1 >> 16)+(s >> 32), s & MASK32
+
+def randomwords2d(shape,seed=0,stream=0,device=None):
+    """
+    Random words of nSamples x nWords, nWords >= prod(shape[1:]), where
+    the n-th sample takes the counters (iBlock, 0, stream + n) of the key
+    seed, i.e. four words for each block
+    """
+    nSamples = shape[0]
+    nElements = int(torch.tensor(shape[1:]).prod())
+    nBlocks = (nElements+3)//4
+    counter = torch.zeros(nSamples,nBlocks,4,dtype=torch.long,device=device)
+    counter[...,0] = torch.arange(nBlocks,device=device) & MASK32
+    counter[...,1] = torch.arange(nBlocks,device=device) >> 32
+    streams = torch.arange(stream,stream+nSamples,device=device).view(-1,1)
+    counter[...,2] = streams & MASK32
+    counter[...,3] = streams >> 32
+    return philox4x32(counter,(seed & MASK32,(seed >> 32) & MASK32)).view(nSamples,-1)
+
+def uniform2d(shape,seed=0,stream=0,dtype=torch.double,device=None):
+    """
+    Uniform variates in (0, 1) from the Philox streams
+    """
+    nElements = int(torch.tensor(shape[1:]).prod())
+    words = randomwords2d(shape,seed,stream,device)[:,:nElements]
+    return words.to(torch.double).add_(0.5).mul_(2.**-32).to(dtype).view(shape)
+
+def normal2d(shape,seed=0,stream=0,dtype=torch.double,device=None):
+    """
+    Standard normal variates from the Philox streams by the Box-Muller
+    transform of the pairs of words
+    """
+    nElements = int(torch.tensor(shape[1:]).prod())
+    U = randomwords2d(shape,seed,stream,device).to(torch.double).add_(0.5).mul_(2.**-32)
+    U = U.view(shape[0],-1,2,2)
+    radius = U[...,0].log().mul_(-2.).sqrt_()
+    angle = U[...,1].mul(2.*math.pi)
+    Z = torch.stack([ radius*torch.cos(angle), radius*torch.sin(angle) ],dim=-1)
+    return Z.transpose(-1,-2).reshape(shape[0],-1)[:,:nElements].to(dtype).view(shape)
+
+def poisson2d(rate,U):
+    """
+    Poisson variates for the rates by the inversion of the uniform
+    variates U, where the search starts from the Cornish-Fisher
+    approximation of the quantile and only the variates not found yet
+    are updated
+    """
+    shape = rate.shape
+    rate, U = rate.reshape(-1), U.reshape(-1).to(rate.dtype)
+    z = torch.erfinv(2.*U-1.).mul_(math.sqrt(2.))
+    k = torch.floor(rate+rate.sqrt()*z+(z.square()+2.)/6.).clamp_(min=0.)
+    k.masked_fill_(rate <= 0.,0.)
+    p = torch.exp(torch.xlogy(k,rate)-rate-torch.lgamma(k+1.))
+    cdf = torch.special.gammaincc(k+1.,rate)
+    # Upward search for U > P(X <= k)
+    index = torch.nonzero(U > cdf).squeeze(1)
+    while index.numel() > 0:
+        kk = k[index]+1.
+        pp = p[index]*rate[index]/kk
+        cc = cdf[index]+pp
+        k[index], p[index], cdf[index] = kk, pp, cc
+        index = index[(U[index] > cc) & (pp > 0)]
+    # Downward search for U <= P(X <= k-1)
+    index = torch.nonzero((k > 0) & (U <= cdf-p)).squeeze(1)
+    while index.numel() > 0:
+        cc = cdf[index]-p[index]
+        kk = k[index]
+        pp = p[index]*kk/rate[index]
+        kk = kk-1.
+        k[index], p[index], cdf[index] = kk, pp, cc
+        index = index[(kk > 0) & (U[index] <= cc-pp)]
+    return k.view(shape)
+
+if __name__ == '__main__':
+    import time
+    nSamples, height, width = 16, 256, 256
+    X = torch.rand(nSamples,1,height,width)
+    processes = {
+        'BlurSystem (Gaussian, Circular)':
+            BlurSystem(blur_type='Gaussian',boundary_option='Circular'),
+        'BlurSystem (Gaussian, Symmetric)':
+            BlurSystem(blur_type='Gaussian',boundary_option='Symmetric'),
+        'DecimationSystem (Gaussian, Value)':
+            DecimationSystem(blur_type='Gaussian'),
+        'PixelLossSystem': PixelLossSystem() }
+    nReps = 20
+    with torch.no_grad():
+        for name, process in processes.items():
+            process.adjoint(process(X))
+            start = time.perf_counter()
+            for _ in range(nReps):
+                process.adjoint(process(X))
+            rate = nReps/(time.perf_counter()-start)
+            print('%s: %.1f forward/adjoint pairs/s, %.1f images/s' \
+                % (name,rate,rate*nSamples))
+        degradations = {
+            'DegradationSystem (Gaussian decimation, loss, AWGN)':
+                DegradationSystem([ DecimationSystem(blur_type='Gaussian'),
+                    PixelLossSystem() ],AdditiveWhiteGaussianNoiseSystem(
+                    variance=torch.linspace(1e-4,1e-2,nSamples))),
+            'DegradationSystem (Gaussian blur, Poisson)':
+                DegradationSystem(BlurSystem(blur_type='Gaussian'),
+                    PoissonNoiseSystem(peak=torch.linspace(10.,255.,nSamples))) }
+        for name, degradation in degradations.items():
+            out = torch.empty_like(degradation(X))
+            start = time.perf_counter()
+            for _ in range(nReps):
+                degradation(X,out=out)
+            rate = nReps/(time.perf_counter()-start)
+            print('%s: %.1f images/s' % (name,rate*nSamples))
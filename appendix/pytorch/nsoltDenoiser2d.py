@@ -0,0 +1,279 @@
+import torch
+import torch.nn as nn
+from nsoltIsta2d import softthresholding_
+
+class AbstGaussianDenoiseSystem(nn.Module):
+    """
+    ABSTGAUSSIANDENOISESYSTEM Thresholding denoiser with NSOLT
+
+       雑音画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       雑音除去画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Analysis, thresholding and synthesis in one module, where the
+       thresholding(coef,threshold,tmp) given by the subclass, e.g.
+       softthresholding_, is applied in place to the coefficients given
+       by the analyzer, so that no copy of the coefficients is made. The
+       scratch buffers of the thresholding are kept for each shape of
+       the coefficients.
+
+       As +restoration/+denoiser/AbstGaussianDenoiseSystem.m, the
+       threshold is sigma^2. The sigma is a scalar or a tensor that
+       broadcasts to nLevels x nChsTotal, whose channel 0 is the DC,
+       which is thresholded only at the coarsest level, e.g. a tensor of
+       nLevels x 1 for the thresholds of the levels. All the components
+       of all the samples are denoised in parallel, and stream() denoises
+       a stream of frames in batches.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analyzer,
+        synthesizer,
+        sigma=0.,
+        thresholding=softthresholding_):
+        super(AbstGaussianDenoiseSystem, self).__init__()
+        self.analyzer = analyzer
+        self.synthesizer = synthesizer
+        self.sigma = sigma
+        self.thresholding = thresholding
+        self.buffers_ = {}
+
+    @torch.no_grad()
+    def forward(self,X):
+        nSamples, nComponents, height, width = X.shape
+        coefs = self.analyzer(X.reshape(nSamples*nComponents,1,height,width))
+        nLevels, nChsTotal = len(coefs)-1, coefs[0].size(-1)+1
+        threshold = self.thresholds(nLevels,nChsTotal,X.dtype,X.device)
+        for iLv, coef in enumerate(coefs[:-1]):
+            self.thresholding(coef,threshold[iLv,1:],self.buffer_(coef))
+        self.thresholding(coefs[-1],threshold[-1,0],self.buffer_(coefs[-1]))
+        return self.synthesizer(*coefs).view(nSamples,nComponents,height,width)
+
+    def stream(self,frames,batch_size=8):
+        """
+        Generator of the denoised frames of nComponents x nRows x nCols
+        for the iterable of frames, which are denoised in batches
+        """
+        batch = []
+        for frame in frames:
+            batch.append(frame)
+            if len(batch) == batch_size:
+                yield from self.forward(torch.stack(batch))
+                batch = []
+        if len(batch) > 0:
+            yield from self.forward(torch.stack(batch))
+
+    def thresholds(self,nLevels,nChsTotal,dtype=torch.get_default_dtype(),device=None):
+        """
+        Thresholds of nLevels x nChsTotal
+        """
+        sigma = torch.as_tensor(self.sigma,dtype=dtype,device=device)
+        return sigma.square().expand(nLevels,nChsTotal)
+
+    def buffer_(self,coef):
+        key = (coef.shape,coef.dtype,coef.device)
+        if key not in self.buffers_:
+            self.buffers_[key] = torch.empty_like(coef,memory_format=torch.contiguous_format)
+        return self.buffers_[key]
+
+class GaussianDenoiserSfth(AbstGaussianDenoiseSystem):
+    """
+    GAUSSIANDENOISERSFTH Soft-thresholding denoiser with NSOLT
+
+       Port of +restoration/+denoiser/GaussianDenoiserSfth.m with the
+       analysis and synthesis of AbstGaussianDenoiseSystem.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        analyzer,
+        synthesizer,
+        sigma=0.):
+        super(GaussianDenoiserSfth, self).__init__(
+            analyzer,
+            synthesizer,
+            sigma=sigma,
+            thresholding=softthresholding_)
+
+class GaussianDenoiserHdth(AbstGaussianDenoiseSystem):
+    """
+    GAUSSIANDENOISERHDTH Hard-thresholding denoiser with NSOLT
+
+       Port of +restoration/+denoiser/GaussianDenoiserHdth.m with the
+       analysis and synthesis of AbstGaussianDenoiseSystem.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        analyzer,
+        synthesizer,
+        sigma=0.):
+        super(GaussianDenoiserHdth, self).__init__(
+            analyzer,
+            synthesizer,
+            sigma=sigma,
+            thresholding=hardthresholding_)
+
+class CycleSpinningDenoiser2d(nn.Module):
+    """
+    CYCLESPINNINGDENOISER2D Translation-invariant denoising by cycle spinning
+
+       雑音画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       雑音除去画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       Average of the denoised images over the circular shifts, i.e.
+
+          Y = 1/S sum_s shift_s^-1(denoiser(shift_s(X)))
+
+       for the shifts (dv, dh) in shifts, or all the shifts in the grid
+       of period, which is (mv^nLevels, mh^nLevels) of the analyzer of the
+       denoiser if not given. All the shifted images are gathered into
+       the batch as the components by one index_select(), denoised at
+       once and unshifted and summed by one index_add_() of the same
+       index, where the denoiser should process the components
+       independently as AbstGaussianDenoiseSystem. The shifts are
+       processed in chunks so that the shifted images in a chunk do not
+       exceed max_elements, which also keeps the batch in the cache on
+       CPU for large images.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        denoiser,
+        period=None,
+        shifts=None,
+        max_elements=2**20):
+        super(CycleSpinningDenoiser2d, self).__init__()
+        self.denoiser = denoiser
+        if shifts is None:
+            if period is None:
+                analyzer = denoiser.analyzer
+                period = [ factor**analyzer.number_of_levels
+                    for factor in analyzer.decimation_factor ]
+            shifts = [ (dv, dh) for dv in range(period[0]) for dh in range(period[1]) ]
+        self.shifts = [ tuple(shift) for shift in shifts ]
+        self.max_elements = max_elements
+        self.indices_ = {}
+
+    @torch.no_grad()
+    def forward(self,X):
+        nSamples, nComponents, height, width = X.shape
+        nShifts = len(self.shifts)
+        nShiftsPerChunk = max(1,self.max_elements//X.numel())
+        x = X.reshape(nSamples*nComponents,height*width)
+        result = torch.zeros_like(x)
+        for iShift in range(0,nShifts,nShiftsPerChunk):
+            shifts = self.shifts[iShift:iShift+nShiftsPerChunk]
+            index = self.index_(shifts,height,width,X.device)
+            Xs = x.index_select(1,index).view(nSamples,nComponents*len(shifts),height,width)
+            Ys = self.denoiser(Xs)
+            result.index_add_(1,index,Ys.reshape(nSamples*nComponents,-1))
+        return result.div_(nShifts).view(X.shape)
+
+    def index_(self,shifts,height,width,device):
+        """
+        Index of the pixels of the shifted images, which are cached
+        """
+        key = (tuple(shifts),height,width,device)
+        if key not in self.indices_:
+            shift = torch.tensor(shifts,device=device).view(-1,2,1)
+            rows = (torch.arange(height,device=device)+shift[:,0]) % height
+            cols = (torch.arange(width,device=device)+shift[:,1]) % width
+            self.indices_[key] = (rows.unsqueeze(2)*width+cols.unsqueeze(1)).view(-1)
+        return self.indices_[key]
+
+def hardthresholding_(y,threshold,tmp):
+    """
+    In-place hard thresholding y <- y (|y| > threshold), where tmp is a
+    buffer of the size of y
+    """
+    torch.abs(y,out=tmp)
+    return y.mul_(tmp.gt_(threshold))
+
+if __name__ == '__main__':
+    import time
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    from nsoltUtility import cpparamsana2syn
+    from nsoltSimplify2d import simplifynetwork2d
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    analyzer = NsoltAnalysis2dNetwork(**config)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    synthesizer = cpparamsana2syn(NsoltSynthesis2dNetwork(**config),analyzer)
+    analyzer, synthesizer = simplifynetwork2d(analyzer), simplifynetwork2d(synthesizer)
+    frames = torch.rand(64,1,256,256)
+    for denoiser_class in [ GaussianDenoiserSfth, GaussianDenoiserHdth ]:
+        denoiser = denoiser_class(analyzer,synthesizer,sigma=0.3)
+        for batch_size in [ 1, 16 ]:
+            start = time.perf_counter()
+            for _ in denoiser.stream(frames,batch_size=batch_size):
+                pass
+            print('%s: %.1f frames/s (batch size %d)' % (denoiser_class.__name__,
+                len(frames)/(time.perf_counter()-start),batch_size))
+    denoiser = GaussianDenoiserSfth(analyzer,synthesizer,sigma=0.3)
+    spinning = CycleSpinningDenoiser2d(denoiser)
+    X = frames[:4,:,:64,:64]
+    start = time.perf_counter()
+    with torch.no_grad():
+        Y = sum(torch.roll(denoiser(torch.roll(X,(-dv,-dh),(2,3))),(dv,dh),(2,3))
+            for dv, dh in spinning.shifts)/len(spinning.shifts)
+    looped = time.perf_counter()-start
+    start = time.perf_counter()
+    spinning(X)
+    batched = time.perf_counter()-start
+    print('CycleSpinningDenoiser2d (%d shifts): %.3f s (shift by shift), %.3f s (batched)' \
+        % (len(spinning.shifts),looped,batched))
@@ -0,0 +1,105 @@
+import time
+import logging
+import torch
+import torch.nn as nn
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltFrozenConv2d import NsoltFrozenAnalysis2dNetwork, NsoltFrozenSynthesis2dNetwork
+
+logger = logging.getLogger(__name__)
+
+class NsoltDispatcher2d(nn.Module):
+    """
+    NSOLTDISPATCHER2D
+
+       Selects the faster implementation of an NSOLT analysis or synthesis
+       network, i.e. either of the layer chain ('Layers') or the frozen
+       convolutions ('Conv'), for each input shape. Both implementations
+       are measured at the first call with a new shape and the decision is
+       cached, so that the following calls go to the faster one.
+
+       While gradients are enabled, the layer chain is always used since
+       the frozen convolutions do not propagate gradients to the angles.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        network,
+        circular=True,
+        number_of_trials=3):
+        super(NsoltDispatcher2d, self).__init__()
+        self.network = network
+        self.circular = circular
+        self.number_of_trials = number_of_trials
+        self.decisions = {}
+        self.timings = {}
+        self.last_choice = None
+        self.frozen = None
+
+    def forward(self,*args):
+        if torch.is_grad_enabled():
+            self.last_choice = 'Layers'
+            return self.network(*args)
+        key = self.shape_key_(*args)
+        if key not in self.decisions:
+            self.decide_(key,*args)
+        self.last_choice = self.decisions[key]
+        return self.engine_(self.last_choice)(*args)
+
+    def reset(self):
+        """
+        Discard the frozen convolutions and the cached decisions, e.g. after
+        the angles are updated.
+        """
+        self.decisions = {}
+        self.timings = {}
+        self.last_choice = None
+        self.frozen = None
+
+    def engine_(self,choice):
+        if choice == 'Layers':
+            return self.network
+        if self.frozen is None:
+            if isinstance(self.network,NsoltSynthesis2dNetwork):
+                self.frozen = NsoltFrozenSynthesis2dNetwork(
+                    self.network,circular=self.circular)
+            else:
+                self.frozen = NsoltFrozenAnalysis2dNetwork(
+                    self.network,circular=self.circular)
+        return self.frozen
+
+    def decide_(self,key,*args):
+        timings = {}
+        for choice in ('Layers','Conv'):
+            engine = self.engine_(choice)
+            engine(*args) # Warm up
+            elapsed = float('inf')
+            for iTrial in range(self.number_of_trials):
+                synchronize_(args[0])
+                start = time.perf_counter()
+                engine(*args)
+                synchronize_(args[0])
+                elapsed = min(elapsed,time.perf_counter()-start)
+            timings[choice] = elapsed
+        self.timings[key] = timings
+        self.decisions[key] = min(timings,key=timings.get)
+        logger.debug('%s : %s (Layers %.3e s, Conv %.3e s)',
+            str(key),self.decisions[key],timings['Layers'],timings['Conv'])
+
+    @staticmethod
+    def shape_key_(*args):
+        return tuple( (tuple(X.size()),X.dtype) for X in args )
+
+def synchronize_(X):
+    if X.is_cuda:
+        torch.cuda.synchronize(X.device)
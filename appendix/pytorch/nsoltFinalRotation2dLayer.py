@@ -65,7 +65,10 @@ class NsoltFinalRotation2dLayer(nn.Module):
 
         # No DC leackage
         if self.no_dc_leakage:
-            self.orthTransW0T.mus[0] = 1
+            # Written only if changed, so that the version of mus saved
+            # for the backward of a previous call is kept
+            if self.orthTransW0T.mus[0] != 1:
+                self.orthTransW0T.mus[0] = 1
             self.orthTransW0T.angles.data[:ps-1] = \
                 torch.zeros(ps-1,dtype=self.orthTransW0T.angles.data.dtype)
 
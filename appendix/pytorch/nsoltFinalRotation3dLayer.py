@@ -0,0 +1,81 @@
+import torch
+import torch.nn as nn
+import math
+from nsoltUtility import Direction
+from orthonormalTransform import OrthonormalTransform
+
+class NsoltFinalRotation3dLayer(nn.Module):
+    """
+    NSOLTFINALROTATION3DLAYER
+
+       コンポーネント別に入力(nComponents):
+          nSamples x nRows x nCols x nLays x nChs
+
+       コンポーネント別に出力(nComponents):
+          nSamples x nRows x nCols x nLays x nDecs
+
+       All the blocks are rotated by a single GEMM with the block-diagonal
+       matrix of the leading rows of W0^T and U0^T.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        number_of_channels=[],
+        decimation_factor=[],
+        no_dc_leakage=False,
+        name=''):
+        super(NsoltFinalRotation3dLayer, self).__init__()
+        self.name = name
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.description = "NSOLT final rotation " \
+                + "(ps,pa) = (" \
+                + str(self.number_of_channels[0]) + "," \
+                + str(self.number_of_channels[1]) + "), "  \
+                + "(mv,mh,md) = (" \
+                + str(self.decimation_factor[Direction.VERTICAL]) + "," \
+                + str(self.decimation_factor[Direction.HORIZONTAL]) + "," \
+                + str(self.decimation_factor[Direction.DEPTH]) + ")"
+
+        # Instantiation of orthormal transforms
+        ps,pa = self.number_of_channels
+        self.orthTransW0T = OrthonormalTransform(n=ps,mode='Synthesis')
+        self.orthTransW0T.angles = nn.init.zeros_(self.orthTransW0T.angles)
+        self.orthTransU0T = OrthonormalTransform(n=pa,mode='Synthesis')
+        self.orthTransU0T.angles = nn.init.zeros_(self.orthTransU0T.angles)
+
+        # No DC leakage
+        self.no_dc_leakage = no_dc_leakage
+
+    def forward(self,X):
+        ps, pa = self.number_of_channels
+        stride = self.decimation_factor
+        nDecs = stride[0]*stride[1]*stride[2] # math.prod(stride)
+
+        # No DC leackage
+        if self.no_dc_leakage:
+            # Written only if changed, so that the version of mus saved
+            # for the backward of a previous call is kept
+            if self.orthTransW0T.mus[0] != 1:
+                self.orthTransW0T.mus[0] = 1
+            self.orthTransW0T.angles.data[:ps-1] = \
+                torch.zeros(ps-1,dtype=self.orthTransW0T.angles.data.dtype)
+
+        # Process
+        ms = int(math.ceil(nDecs/2.))
+        W0T = self.orthTransW0T.forward(torch.eye(ps,dtype=X.dtype))
+        U0T = self.orthTransU0T.forward(torch.eye(pa,dtype=X.dtype))
+        V0T = torch.block_diag(W0T[:ms,:],U0T[:nDecs-ms,:])
+        return X @ V0T.T
@@ -0,0 +1,235 @@
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import Direction
+
+class NsoltFrozenAnalysis2dNetwork(nn.Module):
+    """
+    NSOLTFROZENANALYSIS2DNETWORK
+
+       NsoltAnalysis2dNetwork with fixed angles frozen into a strided
+       Conv2d per tree level.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analysisnet,
+        circular=True):
+        super(NsoltFrozenAnalysis2dNetwork, self).__init__()
+        self.number_of_channels = analysisnet.number_of_channels
+        self.decimation_factor = analysisnet.decimation_factor
+        self.polyphase_order = analysisnet.polyphase_order
+        self.number_of_levels = analysisnet.number_of_levels
+        self.circular = circular
+        self.convs = nn.ModuleList([
+            analysis2conv2d(analysisnet,level=iLv,circular=circular)
+            for iLv in range(1,self.number_of_levels+1) ])
+
+    def forward(self,X):
+        Y = []
+        Z = X
+        for conv in self.convs:
+            # nSamples x nChsTotal x nRows x nCols -> nSamples x nRows x nCols x nChsTotal
+            Z = conv(Z).permute(0,2,3,1)
+            Y.append(Z[:,:,:,1:])
+            Z = Z[:,:,:,0].unsqueeze(dim=1)
+        Y.append(Z.squeeze(dim=1))
+        return tuple(Y)
+
+class NsoltFrozenSynthesis2dNetwork(nn.Module):
+    """
+    NSOLTFROZENSYNTHESIS2DNETWORK
+
+       NsoltSynthesis2dNetwork with fixed angles frozen into a strided
+       ConvTranspose2d per tree level.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesisnet,
+        circular=True):
+        super(NsoltFrozenSynthesis2dNetwork, self).__init__()
+        self.number_of_channels = synthesisnet.number_of_channels
+        self.decimation_factor = synthesisnet.decimation_factor
+        self.polyphase_order = synthesisnet.polyphase_order
+        self.number_of_levels = synthesisnet.number_of_levels
+        self.circular = circular
+        self.convs = nn.ModuleList([
+            synthesis2convtranspose2d(synthesisnet,level=iLv,circular=circular)
+            for iLv in range(1,self.number_of_levels+1) ])
+
+    def forward(self,*args):
+        nLevels = self.number_of_levels
+        Zdc = args[nLevels]
+        for iLv in range(nLevels-1,-1,-1):
+            # nSamples x nRows x nCols x nChsTotal -> nSamples x nChsTotal x nRows x nCols
+            X = torch.cat((Zdc.unsqueeze(dim=3),args[iLv]),dim=3).permute(0,3,1,2)
+            Z = self.convs[iLv](X)
+            Zdc = Z.squeeze(dim=1)
+        return Z
+
+class CircularConvTranspose2d(nn.Module):
+    """
+    CIRCULARCONVTRANSPOSE2D
+
+       ConvTranspose2d with circular extension, where the coefficients are
+       circularly padded by the blocks overlapping the image boundary.
+    """
+    def __init__(self,
+        convtranspose,
+        number_of_blocks):
+        super(CircularConvTranspose2d, self).__init__()
+        self.convtranspose = convtranspose
+        self.number_of_blocks = number_of_blocks
+
+    def forward(self,X):
+        mv,mh = self.number_of_blocks
+        return self.convtranspose(F.pad(X,(mh,mh,mv,mv),mode='circular'))
+
+def atomicimages2d(network,level=1):
+    """
+    Atomic images of an NSOLT level
+
+       Returns nChsTotal x (Stride(1)x(Ord(1)+1)) x (Stride(2)x(Ord(2)+1))
+       kernels and the padding (Stride(1)xOrd(1)/2, Stride(2)xOrd(2)/2) to
+       the upper-left of a block. Channel 0 is the DC atom. For an analysis
+       network the analysis filters are obtained as the adjoint responses,
+       and for a synthesis network the impulse responses are computed as
+       +dcnn/atomicimshow.m does.
+    """
+    nchs = network.number_of_channels
+    stride = network.decimation_factor
+    ppord = network.polyphase_order
+    nChsTotal = sum(nchs)
+    layers = network.layers[level-1]
+    param = next(network.parameters())
+    dtype, device = param.dtype, param.device
+    decV = stride[Direction.VERTICAL]
+    decH = stride[Direction.HORIZONTAL]
+
+    # Patch size with a margin of 2 blocks in each side
+    MARGIN = 2
+    nrows = ppord[Direction.VERTICAL]+1+2*MARGIN
+    ncols = ppord[Direction.HORIZONTAL]+1+2*MARGIN
+    r0, c0 = nrows//2, ncols//2
+    padding = (decV*ppord[Direction.VERTICAL]//2,
+        decH*ppord[Direction.HORIZONTAL]//2)
+    top = r0*decV-padding[Direction.VERTICAL]
+    left = c0*decH-padding[Direction.HORIZONTAL]
+    kernel_size = (2*padding[Direction.VERTICAL]+decV,
+        2*padding[Direction.HORIZONTAL]+decH)
+
+    atoms = torch.empty(nChsTotal,kernel_size[0],kernel_size[1],dtype=dtype,device=device)
+    if isinstance(network,NsoltSynthesis2dNetwork):
+        # Impulse responses of synthesis layers
+        with torch.no_grad():
+            for iCh in range(nChsTotal):
+                Y = torch.zeros(1,nrows,ncols,nChsTotal,dtype=dtype,device=device)
+                Y[0,r0,c0,iCh] = 1.
+                Z = layers[0](Y[:,:,:,1:],Y[:,:,:,0])
+                for layer in layers[1:]:
+                    Z = layer(Z)
+                atoms[iCh] = Z[0,0,top:top+kernel_size[0],left:left+kernel_size[1]]
+    else:
+        # Adjoint responses of analysis layers
+        with torch.enable_grad():
+            for iCh in range(nChsTotal):
+                X = torch.zeros(1,1,nrows*decV,ncols*decH,dtype=dtype,device=device,
+                    requires_grad=True)
+                Z = X
+                for layer in layers[:-1]:
+                    Z = layer(Z)
+                dLdX, = torch.autograd.grad(Z[0,r0,c0,iCh],X)
+                atoms[iCh] = dLdX[0,0,top:top+kernel_size[0],left:left+kernel_size[1]]
+    return atoms, padding
+
+def analysis2conv2d(analysisnet,level=1,circular=True):
+    """
+    Freeze a level of NsoltAnalysis2dNetwork into Conv2d
+
+       nSamples x 1 x (Stride(1)xnRows) x (Stride(2)xnCols) ->
+       nSamples x nChsTotal x nRows x nCols
+    """
+    atoms, padding = atomicimages2d(analysisnet,level)
+    nChsTotal = atoms.size(0)
+    conv = nn.Conv2d(
+        in_channels=1,
+        out_channels=nChsTotal,
+        kernel_size=tuple(atoms.shape[1:]),
+        stride=tuple(analysisnet.decimation_factor),
+        padding=padding,
+        padding_mode='circular' if circular else 'zeros',
+        bias=False).to(dtype=atoms.dtype,device=atoms.device)
+    conv.weight.data = atoms.unsqueeze(dim=1)
+    conv.weight.requires_grad_(False)
+    return conv
+
+def synthesis2convtranspose2d(synthesisnet,level=1,circular=True):
+    """
+    Freeze a level of NsoltSynthesis2dNetwork into ConvTranspose2d
+
+       nSamples x nChsTotal x nRows x nCols ->
+       nSamples x 1 x (Stride(1)xnRows) x (Stride(2)xnCols)
+    """
+    atoms, padding = atomicimages2d(synthesisnet,level)
+    nChsTotal = atoms.size(0)
+    stride = synthesisnet.decimation_factor
+    # Number of blocks overlapping the boundary
+    nBlocks = tuple( -(-padding[iDim]//stride[iDim]) for iDim in range(2) )
+    if circular:
+        cropping = tuple( nBlocks[iDim]*stride[iDim]+padding[iDim] for iDim in range(2) )
+    else:
+        cropping = padding
+    convtranspose = nn.ConvTranspose2d(
+        in_channels=nChsTotal,
+        out_channels=1,
+        kernel_size=tuple(atoms.shape[1:]),
+        stride=tuple(stride),
+        padding=cropping,
+        bias=False).to(dtype=atoms.dtype,device=atoms.device)
+    convtranspose.weight.data = atoms.unsqueeze(dim=1)
+    convtranspose.weight.requires_grad_(False)
+    if circular:
+        return CircularConvTranspose2d(convtranspose,nBlocks)
+    return convtranspose
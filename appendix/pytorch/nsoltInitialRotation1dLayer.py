@@ -0,0 +1,76 @@
+import torch
+import torch.nn as nn
+import math
+from orthonormalTransform import OrthonormalTransform
+
+class NsoltInitialRotation1dLayer(nn.Module):
+    """
+    NSOLTINITIALROTATION1DLAYER
+
+       入力:
+          nSamples x nBlks x nDecs
+
+       出力:
+          nSamples x nBlks x nChs
+
+       All the blocks are rotated by a single GEMM with the block-diagonal
+       matrix diag(W0,U0) on the channel axis.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        number_of_channels=[],
+        decimation_factor=2,
+        no_dc_leakage=False,
+        name=''):
+        super(NsoltInitialRotation1dLayer, self).__init__()
+        self.name = name
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.description = "NSOLT initial rotation " \
+                + "(ps,pa) = (" \
+                + str(self.number_of_channels[0]) + "," \
+                + str(self.number_of_channels[1]) + "), "  \
+                + "m = " + str(self.decimation_factor)
+
+        # Instantiation of orthormal transforms
+        ps,pa = self.number_of_channels
+        self.orthTransW0 = OrthonormalTransform(n=ps,mode='Analysis')
+        self.orthTransW0.angles = nn.init.zeros_(self.orthTransW0.angles)
+        self.orthTransU0 = OrthonormalTransform(n=pa,mode='Analysis')
+        self.orthTransU0.angles = nn.init.zeros_(self.orthTransU0.angles)
+
+        # No DC leakage
+        self.no_dc_leakage = no_dc_leakage
+
+    def forward(self,X):
+        ps, pa = self.number_of_channels
+        nDecs = self.decimation_factor
+
+        # No DC leackage
+        if self.no_dc_leakage:
+            # Written only if changed, so that the version of mus saved
+            # for the backward of a previous call is kept
+            if self.orthTransW0.mus[0] != 1:
+                self.orthTransW0.mus[0] = 1
+            self.orthTransW0.angles.data[:ps-1] = \
+                torch.zeros(ps-1,dtype=self.orthTransW0.angles.data.dtype)
+
+        # Process
+        ms = int(math.ceil(nDecs/2.))
+        W0 = self.orthTransW0.forward(torch.eye(ps,dtype=X.dtype))
+        U0 = self.orthTransU0.forward(torch.eye(pa,dtype=X.dtype))
+        V0 = torch.block_diag(W0[:,:ms],U0[:,:nDecs-ms])
+        return X @ V0.T
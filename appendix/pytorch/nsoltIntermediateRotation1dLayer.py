@@ -0,0 +1,60 @@
+import torch
+import torch.nn as nn
+from orthonormalTransform import OrthonormalTransform
+
+class NsoltIntermediateRotation1dLayer(nn.Module):
+    """
+    NSOLTINTERMEDIATEROTATION1DLAYER
+
+       入力:
+          nSamples x nBlks x nChs
+
+       出力:
+          nSamples x nBlks x nChs
+
+       The difference channels of all the blocks are rotated by a single
+       GEMM with Un on the channel axis.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        number_of_channels=[],
+        mode='Synthesis',
+        mus=1,
+        name=''):
+        super(NsoltIntermediateRotation1dLayer, self).__init__()
+        self.name = name
+        self.number_of_channels = number_of_channels
+        self.description = mode \
+                + " NSOLT intermediate rotation " \
+                + "(ps,pa) = (" \
+                + str(self.number_of_channels[0]) + "," \
+                + str(self.number_of_channels[1]) + ")"
+
+        # Instantiation of orthormal transforms
+        ps,pa = self.number_of_channels
+        self.orthTransUn = OrthonormalTransform(n=pa,mus=mus,mode=mode)
+        self.orthTransUn.angles = nn.init.zeros_(self.orthTransUn.angles)
+
+    def forward(self,X):
+        ps,pa = self.number_of_channels
+
+        # Process
+        Un = self.orthTransUn.forward(torch.eye(pa,dtype=X.dtype))
+        return torch.cat((X[:,:,:ps],X[:,:,ps:] @ Un.T),dim=-1)
+
+    @property
+    def mode(self):
+        return self.orthTransUn.mode
@@ -31,6 +31,7 @@ class NsoltIntermediateRotation2dLayer(nn.Module):
     def __init__(self,
         number_of_channels=[],
         mode='Synthesis',
+        mus=1,
         name=''):
         super(NsoltIntermediateRotation2dLayer, self).__init__()
         self.name = name
@@ -43,7 +44,7 @@ class NsoltIntermediateRotation2dLayer(nn.Module):
 
         # Instantiation of orthormal transforms
         ps,pa = self.number_of_channels                
-        self.orthTransUn = OrthonormalTransform(n=pa,mode=mode)
+        self.orthTransUn = OrthonormalTransform(n=pa,mus=mus,mode=mode)
         self.orthTransUn.angles = nn.init.zeros_(self.orthTransUn.angles)
 
     def forward(self,X):
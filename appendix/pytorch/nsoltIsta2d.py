@@ -0,0 +1,295 @@
+import math
+import torch
+import torch.nn as nn
+from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
+from nsoltSubbandDeserialization2dLayer import NsoltSubbandDeserialization2dLayer
+
+class IstaImRestoration2d(nn.Module):
+    """
+    ISTAIMRESTORATION2D ISTA-based image restoration with NSOLT
+
+       劣化画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       復元画像のバッチ出力:
+          nSamples x nComponents x nRowsOrg x nColsOrg
+
+       Port of +restoration/+ista/IstaImRestoration2d.m, which solves
+
+          min_y 1/2||x - P D y||^2 + lambda ||y||_1
+
+       with the synthesizer D of a Parseval tight NSOLT and its adjoint,
+       i.e. the analyzer, as the dictionary. The linear process P is a
+       module whose forward and adjoint(X) give P and P^T, and which may
+       provide originaldimension(size), the size (nRowsOrg, nColsOrg) of
+       the original images for the observed ones of size (nRows, nCols),
+       and lambdamax(size), the maximum eigenvalue of P^T P for the
+       original images, e.g. the processes in nsoltDegradation2d. P is the
+       identity if not given.
+
+       All the components of all the samples are restored in parallel.
+       The coefficients are serialized into a buffer of
+       nImages x nElements and soft-thresholded in place. Each image
+       stops independently when
+
+          ||y^(n) - y^(n-1)||^2/||y^(n)||^2 <= eps0
+
+       or after max_iter iterations, and is dropped from the batch. The
+       number of iterations is stored in number_of_iterations. For
+       throughput, the networks simplified by simplifynetwork2d can be
+       given as the dictionary.
+
+       The step monitor, e.g. StepMonitoringSystem, is reset before the
+       iterations, called with the results of the images not converged
+       yet and their index after each iteration, and finished with the
+       final result. No monitoring is made if it is not given.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        adj_of_synthesizer,
+        linear_process=None,
+        lambda_=0.,
+        eps0=1e-6,
+        max_iter=1000,
+        step_monitor=None):
+        super(IstaImRestoration2d, self).__init__()
+        self.synthesizer = synthesizer
+        self.adj_of_synthesizer = adj_of_synthesizer
+        self.linear_process = linear_process
+        self.lambda_ = lambda_
+        self.eps0 = eps0
+        self.max_iter = max_iter
+        self.step_monitor = step_monitor
+        self.number_of_iterations = None
+
+    @torch.no_grad()
+    def forward(self,X):
+        nSamples, nComponents, height, width = X.shape
+        nImages = nSamples*nComponents
+        x = X.reshape(nImages,1,height,width)
+        height, width = self.original_dimension_ = self.originaldimension_((height,width))
+        config = { 'original_dimension': [height, width],
+            'number_of_channels': self.synthesizer.number_of_channels,
+            'decimation_factor': self.synthesizer.decimation_factor,
+            'number_of_levels': self.synthesizer.number_of_levels }
+        self.serializer_ = NsoltSubbandSerialization2dLayer(**config)
+        self.deserializer_ = NsoltSubbandDeserialization2dLayer(**config)
+        self.reciprocal_l_ = self.stepsize_((height,width),X.dtype,X.device)
+
+        # Thresholds of the images
+        lambda_ = torch.as_tensor(self.lambda_,dtype=X.dtype,device=X.device)
+        if lambda_.dim() > 0:
+            lambda_ = lambda_.reshape(nSamples,1).expand(nSamples,nComponents)
+        threshold = (lambda_*self.reciprocal_l_).expand(nSamples,nComponents) \
+            .reshape(nImages,1).clone()
+
+        # Iteration over the batch of images not converged yet
+        state = self.initialize_(x,threshold)
+        if self.step_monitor is not None:
+            self.step_monitor.reset(nImages,X.dtype,X.device)
+        result = x.new_empty(nImages,1,height,width)
+        nItrs = torch.zeros(nImages,dtype=torch.long)
+        active = torch.arange(nImages,device=X.device)
+        nItr = 0
+        while active.numel() > 0:
+            nItr += 1
+            err = self.iterate_(state)
+            if self.step_monitor is not None:
+                self.step_monitor(state['hu'],active)
+            done = err <= self.eps0 if nItr < self.max_iter \
+                else torch.ones_like(err,dtype=torch.bool)
+            if bool(done.any()):
+                result[active[done]] = state['hu'][done]
+                nItrs[active[done].cpu()] = nItr
+                keep = ~done
+                active = active[keep]
+                state = { key: value[keep] for key, value in state.items() }
+        self.number_of_iterations = nItrs.view(nSamples,nComponents)
+        if self.step_monitor is not None:
+            self.step_monitor.finish(result)
+        return result.view(nSamples,nComponents,height,width)
+
+    def stepsize_(self,size,dtype,device):
+        """
+        Reciprocal of the Lipschitz constant, where the frame bound of a
+        Parseval tight NSOLT is one
+        """
+        return 1./lipschitzconstant2d(self.linear_process,size,dtype,device)
+
+    def initialize_(self,x,threshold):
+        """
+        State of the images, each of which is indexed by the first dimension
+        """
+        hu = self.adjoint_(x)
+        y = self.analyze_(hu)
+        return { 'x': x, 'threshold': threshold, 'hu': hu,
+            'r': self.process_(hu)-x, 'y': y,
+            'ypre': torch.empty_like(y), 'v': torch.empty_like(y),
+            'tmp': torch.empty_like(y) }
+
+    def iterate_(self,state):
+        """
+        y <- soft(y - (1/L) D^T P^T r), hu <- D y and r <- P hu - x
+
+           Returns the relative change of y of each image.
+        """
+        y, ynew, tmp = state['y'], state['ypre'], state['tmp']
+        v = self.analyze_(self.adjoint_(state['r']),out=state['v'])
+        torch.add(y,v,alpha=-self.reciprocal_l_,out=ynew)
+        softthresholding_(ynew,state['threshold'],tmp)
+        err = relativechange_(ynew,y,tmp)
+        state['y'], state['ypre'] = ynew, y
+        self.synthesize_(state)
+        return err
+
+    def analyze_(self,h,out=None):
+        return self.serializer_(*self.adj_of_synthesizer(h),out=out) \
+            .view(h.size(0),-1)
+
+    def synthesize_(self,state):
+        state['hu'] = self.synthesizer(*self.deserializer_(state['y']))
+        state['r'] = self.process_(state['hu'])-state['x']
+
+    def originaldimension_(self,size):
+        if hasattr(self.linear_process,'originaldimension'):
+            return tuple(self.linear_process.originaldimension(size))
+        return tuple(size)
+
+    def process_(self,X):
+        return X if self.linear_process is None else self.linear_process(X)
+
+    def adjoint_(self,X):
+        return X if self.linear_process is None else self.linear_process.adjoint(X)
+
+class FistaImRestoration2d(IstaImRestoration2d):
+    """
+    FISTAIMRESTORATION2D FISTA-based image restoration with NSOLT
+
+       劣化画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       復元画像のバッチ出力:
+          nSamples x nComponents x nRowsOrg x nColsOrg
+
+       Port of +restoration/+ista/FistaImRestoration2d.m with the same
+       batched execution as IstaImRestoration2d. The momentum is shared
+       by the images, which start together.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def initialize_(self,x,threshold):
+        state = super(FistaImRestoration2d, self).initialize_(x,threshold)
+        state['wpre'] = state['y'].clone()
+        state['w'] = torch.zeros_like(state['y'])
+        self.tpre_ = 1.
+        return state
+
+    def iterate_(self,state):
+        """
+        w <- soft(y - (1/L) D^T P^T r), y <- w + tau (w - wpre),
+        hu <- D y and r <- P hu - x
+        """
+        y, ynew, tmp = state['y'], state['ypre'], state['tmp']
+        w, wpre = state['w'], state['wpre']
+        t = (1.+math.sqrt(1.+4.*self.tpre_**2))/2.
+        tau = (self.tpre_-1.)/t
+        v = self.analyze_(self.adjoint_(state['r']),out=state['v'])
+        torch.add(y,v,alpha=-self.reciprocal_l_,out=w)
+        softthresholding_(w,state['threshold'],tmp)
+        torch.sub(w,wpre,out=ynew)
+        ynew.mul_(tau).add_(w)
+        err = relativechange_(ynew,y,tmp)
+        state['y'], state['ypre'] = ynew, y
+        state['w'], state['wpre'] = wpre, w
+        self.tpre_ = t
+        self.synthesize_(state)
+        return err
+
+def lipschitzconstant2d(linear_process,size,dtype=torch.get_default_dtype(),
+    device=None,number_of_iterations=100):
+    """
+    Maximum eigenvalue of P^T P for images of the given size
+
+       Given by linear_process.lambdamax(size) if it is provided, or
+       estimated by the power iteration otherwise.
+    """
+    if linear_process is None:
+        return 1.
+    if hasattr(linear_process,'lambdamax'):
+        return float(linear_process.lambdamax(size))
+    generator = torch.Generator().manual_seed(0)
+    u = torch.randn(1,1,*size,generator=generator,dtype=dtype).to(device)
+    value = 0.
+    with torch.no_grad():
+        for _ in range(number_of_iterations):
+            u = u/torch.linalg.norm(u)
+            v = linear_process.adjoint(linear_process(u))
+            value = float(torch.sum(u*v))
+            u = v
+    return value
+
+def softthresholding_(y,threshold,tmp):
+    """
+    In-place soft thresholding y <- y - clamp(y,-threshold,threshold),
+    where tmp is a buffer of the size of y
+    """
+    torch.clamp(y,min=-threshold,max=threshold,out=tmp)
+    return y.sub_(tmp)
+
+def relativechange_(ynew,y,tmp):
+    torch.sub(ynew,y,out=tmp)
+    diff = tmp.square_().sum(dim=1)
+    norm = ynew.square().sum(dim=1)
+    return torch.where(norm > 0,diff/norm,diff)
+
+if __name__ == '__main__':
+    import time
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    from nsoltUtility import cpparamsana2syn
+    from nsoltSimplify2d import simplifynetwork2d
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    analyzer = NsoltAnalysis2dNetwork(**config)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    synthesizer = cpparamsana2syn(NsoltSynthesis2dNetwork(**config),analyzer)
+    analyzer, synthesizer = simplifynetwork2d(analyzer), simplifynetwork2d(synthesizer)
+    nSamples = 32
+    X = torch.rand(nSamples,1,128,128)+0.1*torch.randn(nSamples,1,128,128)
+    for solver_class in [ IstaImRestoration2d, FistaImRestoration2d ]:
+        solver = solver_class(synthesizer,analyzer,lambda_=0.05,eps0=1e-5,max_iter=100)
+        start = time.perf_counter()
+        for X1 in X.split(1):
+            solver(X1)
+        single = nSamples/(time.perf_counter()-start)
+        start = time.perf_counter()
+        solver(X)
+        batched = nSamples/(time.perf_counter()-start)
+        print('%s: %.1f images/s (one by one), %.1f images/s (batched)' \
+            % (solver_class.__name__,single,batched))
@@ -13,3 +13,23 @@ class InvalidMode(Exception):
 class InvalidMus(Exception):
     def __init__(self,msg):
         super().__init__(self,msg)
+
+class InvalidNumberOfChannels(Exception):
+    def __init__(self,msg):
+        super().__init__(self,msg)
+
+class InvalidPolyPhaseOrder(Exception):
+    def __init__(self,msg):
+        super().__init__(self,msg)
+
+class InvalidTileSize(Exception):
+    def __init__(self,msg):
+        super().__init__(self,msg)
+
+class InvalidMixture(Exception):
+    def __init__(self,msg):
+        super().__init__(self,msg)
+
+class InvalidOption(Exception):
+    def __init__(self,msg):
+        super().__init__(self,msg)
@@ -0,0 +1,156 @@
+import os
+import numpy as np
+import torch
+from nsoltOlsOla2d import Analysis2dOlsWrapper, Synthesis2dOlsWrapper
+from nsoltSubbandDeserialization2dLayer import NsoltSubbandDeserialization2dLayer
+
+class MemmapAnalysis2d:
+    """
+    MEMMAPANALYSIS2D
+
+       Out-of-core analysis of an image larger than memory. The input is
+       read from a numpy.memmap, an .npy file or a raw file, and the
+       coefficients are written into a memory-mapped file laid out as
+       NsoltSubbandSerialization2dLayer does, i.e. by the subband offset
+       index. The image is processed by Analysis2dOlsWrapper, so that only
+       the pages of the active tile are touched.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       １コンポーネント出力 (ファイル):
+          nSamples x nElements
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analyzer,
+        tile_size=[256, 256],
+        pad_size=None):
+        self.wrapper = Analysis2dOlsWrapper(analyzer,
+            tile_size=tile_size,pad_size=pad_size)
+        self.dtype = next(analyzer.parameters()).dtype
+
+    def __call__(self,src,dst,shape=None,dtype=None):
+        """
+        Analyze 'src' and write the serialized coefficients into 'dst'
+
+           'shape' and 'dtype' are required only for a raw input file.
+           Returns the coefficients as nSamples x 1 x 1 x nElements
+           mapped on 'dst'.
+        """
+        X = open_memmap2d(src,shape=shape,dtype=dtype)
+        nSamples, height, width = X.size(0), X.size(2), X.size(3)
+        deserializer = deserializer_(self.wrapper,[height, width])
+        Y = create_memmap2d(dst,(nSamples, deserializer.number_of_elements),self.dtype)
+        with torch.no_grad():
+            self.wrapper(X,out=deserializer(torch.from_numpy(Y)))
+        Y.flush()
+        return torch.from_numpy(Y).view(nSamples,1,1,-1)
+
+class MemmapSynthesis2d:
+    """
+    MEMMAPSYNTHESIS2D
+
+       Out-of-core synthesis from serialized coefficients in a memory-mapped
+       file, e.g. written by MemmapAnalysis2d. The subbands are read through
+       views by the subband offset index and the image is written tile by
+       tile into a memory-mapped file by Synthesis2dOlsWrapper.
+
+       １コンポーネント入力 (ファイル):
+          nSamples x nElements
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        original_dimension,
+        tile_size=[256, 256],
+        pad_size=None):
+        self.wrapper = Synthesis2dOlsWrapper(synthesizer,
+            tile_size=tile_size,pad_size=pad_size)
+        self.original_dimension = original_dimension
+        self.dtype = next(synthesizer.parameters()).dtype
+
+    def __call__(self,src,dst,number_of_samples=None):
+        """
+        Synthesize the serialized coefficients in 'src' into 'dst'
+
+           'number_of_samples' is required only for a raw input file.
+           Returns the image mapped on 'dst'.
+        """
+        deserializer = deserializer_(self.wrapper,self.original_dimension)
+        nElements = deserializer.number_of_elements
+        shape = None if number_of_samples is None else (number_of_samples, nElements)
+        Y = open_memmap2d(src,shape=shape,dtype=self.dtype)
+        nSamples = Y.size(0)
+        height, width = self.original_dimension
+        Z = create_memmap2d(dst,(nSamples, 1, height, width),self.dtype)
+        with torch.no_grad():
+            self.wrapper(*deserializer(Y),out=torch.from_numpy(Z))
+        Z.flush()
+        return torch.from_numpy(Z)
+
+def open_memmap2d(src,shape=None,dtype=None):
+    """
+    Tensor mapped on an array file without loading it
+
+       'src' is a numpy.memmap, an .npy file or a raw file with 'shape'
+       and 'dtype'. Files are mapped copy-on-write, so that the source is
+       never modified. A tensor is returned as it is.
+    """
+    if isinstance(src,torch.Tensor):
+        return src
+    if isinstance(src,np.ndarray):
+        return torch.from_numpy(src)
+    if os.fspath(src).endswith('.npy'):
+        array = np.load(src,mmap_mode='c')
+    else:
+        array = np.memmap(src,dtype=numpy_dtype_(dtype),mode='c',shape=tuple(shape))
+    return torch.from_numpy(array)
+
+def create_memmap2d(dst,shape,dtype):
+    """
+    Create an .npy or a raw file mapped on memory
+    """
+    if os.fspath(dst).endswith('.npy'):
+        return np.lib.format.open_memmap(dst,mode='w+',
+            dtype=numpy_dtype_(dtype),shape=tuple(shape))
+    return np.memmap(dst,dtype=numpy_dtype_(dtype),mode='w+',shape=tuple(shape))
+
+def numpy_dtype_(dtype):
+    if isinstance(dtype,torch.dtype):
+        return torch.empty(0,dtype=dtype).numpy().dtype
+    return np.dtype(dtype)
+
+def deserializer_(wrapper,original_dimension):
+    return NsoltSubbandDeserialization2dLayer(
+        original_dimension=original_dimension,
+        number_of_channels=wrapper.number_of_channels,
+        decimation_factor=wrapper.decimation_factor,
+        number_of_levels=wrapper.number_of_levels)
@@ -0,0 +1,337 @@
+import math
+import time
+import torch
+import torch.nn as nn
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltFinalRotation2dLayer import NsoltFinalRotation2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltChannelSeparation2dLayer import NsoltChannelSeparation2dLayer
+from nsoltChannelConcatenation2dLayer import NsoltChannelConcatenation2dLayer
+from nsoltLayerExceptions import InvalidMixture
+
+class MixtureOfUnitaryAnalysis2dNetwork(nn.Module):
+    """
+    MIXTUREOFUNITARYANALYSIS2DNETWORK
+
+       Mixture of unitary NSOLT analysis networks as
+       +dictionary/+mixture/MixtureOfUnitaryAnalysisSystem.m, where the
+       coefficients of the K networks are stacked and normalized by
+       1/sqrt(K).
+
+       The K networks run in lockstep on a leading mixture axis. The block
+       DCT of the first level is shared, the initial rotations of the first
+       level are a single GEMM with the stacked matrices, the other
+       rotations are batched GEMMs and each atom extension is a single
+       pass over all the networks.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          K x nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          K x nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          K x nSamples x nRowsLvN x nColsLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        unitary_analyzer_set=[]):
+        super(MixtureOfUnitaryAnalysis2dNetwork, self).__init__()
+        check_mixture_(unitary_analyzer_set)
+        self.unitary_analyzer_set = nn.ModuleList(unitary_analyzer_set)
+        self.number_of_analyzers = len(unitary_analyzer_set)
+        self.normalization_factor = 1./math.sqrt(self.number_of_analyzers)
+        self.number_of_channels = unitary_analyzer_set[0].number_of_channels
+        self.decimation_factor = unitary_analyzer_set[0].decimation_factor
+        self.polyphase_order = unitary_analyzer_set[0].polyphase_order
+        self.number_of_levels = unitary_analyzer_set[0].number_of_levels
+
+    def forward(self,X):
+        nAnalyzers = self.number_of_analyzers
+        nSamples = X.size(0)
+        ps, pa = self.number_of_channels
+        Y = []
+        Z = X
+        for iLv in range(self.number_of_levels):
+            # Pending product of the rotations and butterflies since the last shift
+            P = None
+            for group in zip(*[ analyzer.layers[iLv]
+                for analyzer in self.unitary_analyzer_set ]):
+                layer = group[0]
+                if isinstance(layer,NsoltBlockDct2dLayer):
+                    if iLv < 1: # Shared by all the analyzers
+                        Z = layer(Z)
+                    else:
+                        Z = layer(Z.reshape(nAnalyzers*nSamples,1,Z.size(2),Z.size(3)))
+                        Z = Z.view(nAnalyzers,nSamples,*Z.shape[1:])
+                elif isinstance(layer,NsoltInitialRotation2dLayer):
+                    P = torch.stack([ initialrotationmatrix2d(layer,Z.dtype)
+                        for layer in group ])
+                    if iLv < 1:
+                        P = self.normalization_factor*P
+                elif isinstance(layer,NsoltAtomExtension2dLayer):
+                    B = butterflymatrix2d(ps,Z.dtype)
+                    Z = grouped_matmul_(Z,B @ P,nAnalyzers)
+                    shift, dim = atomextensionshift2d(layer)
+                    Z = block_shift_(Z,ps,layer.target_channels == 'Difference',shift,dim+1)
+                    P = (B/2.).expand(nAnalyzers,-1,-1)
+                elif isinstance(layer,NsoltIntermediateRotation2dLayer):
+                    P = torch.stack([ intermediaterotationmatrix2d(layer,Z.dtype)
+                        for layer in group ]) @ P
+                elif isinstance(layer,NsoltChannelSeparation2dLayer):
+                    Z = grouped_matmul_(Z,P,nAnalyzers)
+                    Y.append(Z[...,1:])
+                    Z = Z[...,0]
+        Y.append(Z)
+        return tuple(Y)
+
+class MixtureOfUnitarySynthesis2dNetwork(nn.Module):
+    """
+    MIXTUREOFUNITARYSYNTHESIS2DNETWORK
+
+       Mixture of unitary NSOLT synthesis networks as
+       +dictionary/+mixture/MixtureOfUnitarySynthesisSystem.m, where the
+       images synthesized by the K networks are summed and normalized by
+       1/sqrt(K).
+
+       The K networks run in lockstep on a leading mixture axis. The
+       rotations are batched GEMMs, and the final rotations of the first
+       level and the sum over the networks are a single GEMM followed by
+       a shared block IDCT.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          K x nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          K x nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          K x nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        unitary_synthesizer_set=[]):
+        super(MixtureOfUnitarySynthesis2dNetwork, self).__init__()
+        check_mixture_(unitary_synthesizer_set)
+        self.unitary_synthesizer_set = nn.ModuleList(unitary_synthesizer_set)
+        self.number_of_synthesizers = len(unitary_synthesizer_set)
+        self.normalization_factor = 1./math.sqrt(self.number_of_synthesizers)
+        self.number_of_channels = unitary_synthesizer_set[0].number_of_channels
+        self.decimation_factor = unitary_synthesizer_set[0].decimation_factor
+        self.polyphase_order = unitary_synthesizer_set[0].polyphase_order
+        self.number_of_levels = unitary_synthesizer_set[0].number_of_levels
+
+    def forward(self,*args):
+        nSynthesizers = self.number_of_synthesizers
+        nLevels = self.number_of_levels
+        nSamples = args[nLevels].size(1)
+        ps, pa = self.number_of_channels
+        Zdc = args[nLevels]
+        for iLv in range(nLevels-1,-1,-1):
+            # Pending product of the rotations and butterflies since the last shift
+            P = None
+            for group in zip(*[ synthesizer.layers[iLv]
+                for synthesizer in self.unitary_synthesizer_set ]):
+                layer = group[0]
+                if isinstance(layer,NsoltChannelConcatenation2dLayer):
+                    Z = torch.cat((Zdc.unsqueeze(dim=-1),args[iLv]),dim=-1)
+                    P = torch.eye(ps+pa,dtype=Z.dtype).expand(nSynthesizers,-1,-1)
+                elif isinstance(layer,NsoltIntermediateRotation2dLayer):
+                    P = torch.stack([ intermediaterotationmatrix2d(layer,Z.dtype)
+                        for layer in group ]) @ P
+                elif isinstance(layer,NsoltAtomExtension2dLayer):
+                    B = butterflymatrix2d(ps,Z.dtype)
+                    Z = grouped_matmul_(Z,B @ P,nSynthesizers)
+                    shift, dim = atomextensionshift2d(layer)
+                    Z = block_shift_(Z,ps,layer.target_channels == 'Difference',shift,dim+1)
+                    P = (B/2.).expand(nSynthesizers,-1,-1)
+                elif isinstance(layer,NsoltFinalRotation2dLayer):
+                    P = torch.stack([ finalrotationmatrix2d(layer,Z.dtype)
+                        for layer in group ]) @ P
+                    if iLv < 1: # Single GEMM with the sum over the synthesizers
+                        P = self.normalization_factor*P
+                        nrows, ncols = Z.shape[2:4]
+                        nDecs = P.size(1)
+                        Z = Z.permute(1,2,3,0,4).reshape(-1,nSynthesizers*(ps+pa)) \
+                            @ P.permute(1,0,2).reshape(nDecs,-1).T
+                        Z = Z.view(nSamples,nrows,ncols,nDecs)
+                    else:
+                        Z = grouped_matmul_(Z,P,nSynthesizers)
+                        Z = Z.view(nSynthesizers*nSamples,*Z.shape[2:])
+                elif isinstance(layer,NsoltBlockIdct2dLayer):
+                    Z = layer(Z)
+                    if iLv > 0:
+                        Zdc = Z.view(nSynthesizers,nSamples,*Z.shape[2:])
+        return Z
+
+def check_mixture_(networks):
+    if len(networks) < 1:
+        raise InvalidMixture('At least one network should be given.')
+    for attr in ( 'number_of_channels', 'decimation_factor',
+        'polyphase_order', 'number_of_levels' ):
+        values = [ getattr(network,attr) for network in networks ]
+        if any(value != values[0] for value in values[1:]):
+            raise InvalidMixture(
+                '%s : The networks should have the same configuration.' % attr
+            )
+
+def initialrotationmatrix2d(layer,dtype):
+    """
+    Matrix of NsoltInitialRotation2dLayer, i.e. nChsTotal x nDecs
+
+       The block-diagonal matrix of the leading columns of W0 and U0.
+    """
+    ps, pa = layer.number_of_channels
+    stride = layer.decimation_factor
+    nDecs = stride[0]*stride[1]
+    if layer.no_dc_leakage:
+        # Written only if changed, so that the versions saved for the
+        # backward of a previous call are kept
+        if layer.orthTransW0.mus[0] != 1:
+            layer.orthTransW0.mus[0] = 1
+        if bool(layer.orthTransW0.angles.data[:ps-1].any()):
+            layer.orthTransW0.angles.data[:ps-1] = 0.
+    ms = int(math.ceil(nDecs/2.))
+    W0 = layer.orthTransW0.forward(torch.eye(ps,dtype=dtype))
+    U0 = layer.orthTransU0.forward(torch.eye(pa,dtype=dtype))
+    return torch.block_diag(W0[:,:ms],U0[:,:nDecs-ms])
+
+def finalrotationmatrix2d(layer,dtype):
+    """
+    Matrix of NsoltFinalRotation2dLayer, i.e. nDecs x nChsTotal
+
+       The block-diagonal matrix of the leading rows of W0^T and U0^T.
+    """
+    ps, pa = layer.number_of_channels
+    stride = layer.decimation_factor
+    nDecs = stride[0]*stride[1]
+    if layer.no_dc_leakage:
+        # Written only if changed, so that the versions saved for the
+        # backward of a previous call are kept
+        if layer.orthTransW0T.mus[0] != 1:
+            layer.orthTransW0T.mus[0] = 1
+        if bool(layer.orthTransW0T.angles.data[:ps-1].any()):
+            layer.orthTransW0T.angles.data[:ps-1] = 0.
+    ms = int(math.ceil(nDecs/2.))
+    W0T = layer.orthTransW0T.forward(torch.eye(ps,dtype=dtype))
+    U0T = layer.orthTransU0T.forward(torch.eye(pa,dtype=dtype))
+    return torch.block_diag(W0T[:ms,:],U0T[:nDecs-ms,:])
+
+def intermediaterotationmatrix2d(layer,dtype):
+    """
+    Matrix diag(I,Un) of NsoltIntermediateRotation2dLayer
+    """
+    ps, pa = layer.number_of_channels
+    return torch.block_diag(torch.eye(ps,dtype=dtype),
+        layer.orthTransUn.forward(torch.eye(pa,dtype=dtype)))
+
+def butterflymatrix2d(ps,dtype):
+    """
+    Block butterfly [ I I ; I -I ] of Type-I NSOLT
+    """
+    I = torch.eye(ps,dtype=dtype)
+    return torch.cat((torch.cat((I,I),dim=1),torch.cat((I,-I),dim=1)),dim=0)
+
+def grouped_matmul_(Z,P,nGroups):
+    """
+    Product of the channel vectors with the matrix of each group
+
+       Z is nSamples x nRows x nCols x nIn, shared by the groups, or
+       nGroups x nSamples x nRows x nCols x nIn, and P is nGroups x nOut x
+       nIn. Returns nGroups x nSamples x nRows x nCols x nOut, where the
+       shared input is multiplied by the stacked matrices with a single
+       GEMM.
+    """
+    nOut, nIn = P.shape[1:]
+    if Z.dim() < 5:
+        Y = Z.reshape(-1,nIn) @ P.reshape(-1,nIn).T
+        return Y.view(*Z.shape[:-1],nGroups,nOut).permute(3,0,1,2,4)
+    return (Z.reshape(nGroups,-1,nIn) @ P.transpose(1,2)).view(*Z.shape[:-1],nOut)
+
+def block_shift_(Z,ps,is_difference,shift,dim):
+    """
+    Circular shift of the sum or difference channels by one block
+
+       The target half is copied with the shift and the other half as it
+       is, so that each element is read and written once.
+    """
+    Y = torch.empty_like(Z)
+    target = slice(ps,None) if is_difference else slice(None,ps)
+    other = slice(None,ps) if is_difference else slice(ps,None)
+    Y[...,other] = Z[...,other]
+    Yt, Zt = Y[...,target], Z[...,target]
+    size = Z.size(dim)
+    if shift > 0:
+        Yt.narrow(dim,1,size-1).copy_(Zt.narrow(dim,0,size-1))
+        Yt.narrow(dim,0,1).copy_(Zt.narrow(dim,size-1,1))
+    else:
+        Yt.narrow(dim,0,size-1).copy_(Zt.narrow(dim,1,size-1))
+        Yt.narrow(dim,size-1,1).copy_(Zt.narrow(dim,0,1))
+    return Y
+
+def atomextensionshift2d(layer):
+    """
+    Shift and dimension of NsoltAtomExtension2dLayer on
+    nSamples x nRows x nCols x nChsTotal
+    """
+    return { 'Right': (1,2), 'Left': (-1,2),
+        'Down': (1,1), 'Up': (-1,1) }[layer.direction]
+
+if __name__ == '__main__':
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    nAnalyzers = 4
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    analyzers = [ NsoltAnalysis2dNetwork(**config) for idx in range(nAnalyzers) ]
+    synthesizers = [ NsoltSynthesis2dNetwork(**config) for idx in range(nAnalyzers) ]
+    for angles in nn.ModuleList(analyzers+synthesizers).parameters():
+        angles.data = torch.randn_like(angles)
+    analyzer = MixtureOfUnitaryAnalysis2dNetwork(analyzers)
+    synthesizer = MixtureOfUnitarySynthesis2dNetwork(synthesizers)
+    X = torch.rand(1,1,512,512)
+
+    def elapsed(func,number_of_trials=3):
+        best = None
+        for iTrial in range(number_of_trials):
+            start = time.perf_counter()
+            func()
+            trial = time.perf_counter()-start
+            best = trial if best is None else min(best,trial)
+        return best*1e3
+
+    with torch.no_grad():
+        Y = analyzer(X)
+        print('K = %d        elapsed[ms]' % nAnalyzers)
+        print('analysis     %11.2f (K passes: %.2f)' % (elapsed(lambda: analyzer(X)),
+            elapsed(lambda: [ network(X) for network in analyzers ])))
+        print('synthesis    %11.2f (K passes: %.2f)' % (elapsed(lambda: synthesizer(*Y)),
+            elapsed(lambda: [ network(*[ subY[idx] for subY in Y ])
+                for idx, network in enumerate(synthesizers) ])))
@@ -0,0 +1,227 @@
+import numpy as np
+import torch
+import torch.nn as nn
+from nsoltLayerExceptions import InvalidTileSize
+
+class Analysis1dOlsWrapper(nn.Module):
+    """
+    ANALYSIS1DOLSWRAPPER OLS wrapper for 1-D analysis network
+
+       Chunked execution of NsoltAnalysis1dNetwork for sequences too long
+       to be held as one tensor. Each chunk is extended circularly by the
+       pad size, analyzed and cropped to its own coefficients
+       (overlap-save), so that the coefficients are identical to those of
+       the whole sequence. The source may be a tensor or a numpy array
+       such as numpy.memmap, of which only a padded chunk is read at a
+       time.
+
+       系列入力:
+          nSamples x (Stride x nBlks)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nBlksLv1 x (nChsTotal-1)
+           :
+          nSamples x nBlksLvN x (nChsTotal-1)
+          nSamples x nBlksLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analyzer,
+        chunk_size=65536,
+        pad_size=None):
+        super(Analysis1dOlsWrapper, self).__init__()
+        self.analyzer = analyzer
+        self.number_of_channels = analyzer.number_of_channels
+        self.decimation_factor = analyzer.decimation_factor
+        self.number_of_levels = analyzer.number_of_levels
+        self.chunk_size = chunk_size
+        self.pad_size = olspadsize1d(analyzer) if pad_size is None else pad_size
+        check_chunk_size_(self.chunk_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+        self.dtype = next(analyzer.parameters()).dtype
+
+    def forward(self,X,out=None):
+        if out is None:
+            out = self.allocate(X)
+        for start, subCoefs in self.stream(X):
+            subLength = sequence_length_(self,subCoefs)
+            for Y, subY in zip(chunk_coefficients_(self,out,start,subLength),subCoefs):
+                Y.copy_(subY)
+        return out
+
+    def stream(self,X):
+        """
+        Generator of (start, coefficients of the chunk) over the chunks
+        """
+        length = X.shape[1]
+        pad = self.pad_size
+        for start in range(0,length,self.chunk_size):
+            subLength = min(self.chunk_size,length-start)
+            subSeq = circular_crop1d_(X,start-pad,subLength+2*pad).to(self.dtype)
+            subCoefs = self.analyzer(subSeq)
+            yield start, tuple( Y[:,pad//factor:(pad+subLength)//factor]
+                for Y, factor in zip(subCoefs,level_factors_(self)) )
+
+    def allocate(self,X):
+        """
+        Allocate the output subbands for an input sequence
+        """
+        nSamples, length = X.shape[0], X.shape[1]
+        nChsTotal = sum(self.number_of_channels)
+        factors = level_factors_(self)
+        device = device_(X)
+        out = [ torch.empty(nSamples,length//factor,nChsTotal-1,
+            dtype=self.dtype,device=device) for factor in factors[:-1] ]
+        out.append(torch.empty(nSamples,length//factors[-1],
+            dtype=self.dtype,device=device))
+        return tuple(out)
+
+class Synthesis1dOlsWrapper(nn.Module):
+    """
+    SYNTHESIS1DOLSWRAPPER OLS wrapper for 1-D synthesis network
+
+       Chunked execution of NsoltSynthesis1dNetwork, where the
+       coefficients of each chunk are extended circularly by the pad size,
+       synthesized and cropped to the chunk (overlap-save). The result is
+       identical to that of the whole sequence.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nBlksLv1 x (nChsTotal-1)
+           :
+          nSamples x nBlksLvN x (nChsTotal-1)
+          nSamples x nBlksLvN
+
+       系列出力:
+          nSamples x (Stride x nBlks)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        chunk_size=65536,
+        pad_size=None):
+        super(Synthesis1dOlsWrapper, self).__init__()
+        self.synthesizer = synthesizer
+        self.number_of_channels = synthesizer.number_of_channels
+        self.decimation_factor = synthesizer.decimation_factor
+        self.number_of_levels = synthesizer.number_of_levels
+        self.chunk_size = chunk_size
+        self.pad_size = olspadsize1d(synthesizer) if pad_size is None else pad_size
+        check_chunk_size_(self.chunk_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+        self.dtype = next(synthesizer.parameters()).dtype
+
+    def forward(self,*args,out=None):
+        if out is None:
+            out = self.allocate(*args)
+        for start, subSeq in self.stream(*args):
+            out[:,start:start+subSeq.size(1)].copy_(subSeq)
+        return out
+
+    def stream(self,*args):
+        """
+        Generator of (start, synthesized chunk) over the chunks
+        """
+        length = sequence_length_(self,args)
+        pad = self.pad_size
+        for start in range(0,length,self.chunk_size):
+            subLength = min(self.chunk_size,length-start)
+            subCoefs = tuple( circular_crop1d_(Y,(start-pad)//factor,
+                (subLength+2*pad)//factor).to(self.dtype)
+                for Y, factor in zip(args,level_factors_(self)) )
+            subSeq = self.synthesizer(*subCoefs)
+            yield start, subSeq[:,pad:pad+subLength]
+
+    def allocate(self,*args):
+        """
+        Allocate the output sequences for input coefficients
+        """
+        return torch.empty(args[0].shape[0],sequence_length_(self,args),
+            dtype=self.dtype,device=device_(args[0]))
+
+def olspadsize1d(network):
+    """
+    Pad size of the OLS wrappers for a 1-D network
+
+       The atom support of each tree level extends (ord/2) blocks to each
+       side. The sum is rounded up to a multiple of Stride^nLevels so that
+       the chunks are aligned to the blocks of every level.
+    """
+    stride = network.decimation_factor
+    nLevels = network.number_of_levels
+    margin = (network.polyphase_order//2)*sum(
+        [ stride**iLv for iLv in range(1,nLevels+1) ])
+    unit = stride**nLevels
+    return -(-margin//unit)*unit
+
+def check_chunk_size_(chunk_size,pad_size,stride,nLevels):
+    unit = stride**nLevels
+    if chunk_size % unit or pad_size % unit:
+        raise InvalidTileSize(
+            '%d, %d : Chunk and pad sizes should be multiples of Stride^nLevels.'\
+            % (chunk_size,pad_size)
+        )
+
+def level_factors_(wrapper):
+    # Downsampling factors of Lv1 AC, ..., LvN AC and LvN DC
+    stride = wrapper.decimation_factor
+    nLevels = wrapper.number_of_levels
+    factors = [ stride**iLv for iLv in range(1,nLevels+1) ]
+    factors.append(factors[-1])
+    return factors
+
+def sequence_length_(wrapper,coefs):
+    return coefs[-1].shape[1]*level_factors_(wrapper)[-1]
+
+def chunk_coefficients_(wrapper,coefs,start,subLength):
+    # Views of the coefficients belonging to a chunk
+    return tuple( Y[:,start//factor:(start+subLength)//factor]
+        for Y, factor in zip(coefs,level_factors_(wrapper)) )
+
+def device_(X):
+    # Device of a tensor, where a numpy array such as numpy.memmap is on
+    # the CPU without ndarray.device of NumPy < 2
+    return X.device if isinstance(X,torch.Tensor) else 'cpu'
+
+def circular_crop1d_(X,start,length):
+    """
+    Crop of a tensor or a numpy array along the second axis with circular
+    extension
+
+       Only the cropped elements are read from a numpy.memmap. The crop is
+       always contiguous, so that the results do not depend on the layout
+       of the source.
+    """
+    size = X.shape[1]
+    if start >= 0 and start+length <= size:
+        index = slice(start,start+length)
+    else:
+        index = np.arange(start,start+length) % size
+    if isinstance(X,torch.Tensor):
+        if isinstance(index,np.ndarray):
+            index = torch.as_tensor(index,device=X.device)
+        return X[:,index].contiguous()
+    return torch.from_numpy(np.ascontiguousarray(X[:,index]))
@@ -0,0 +1,416 @@
+import torch
+import torch.nn as nn
+from nsoltUtility import Direction
+from nsoltLayerExceptions import InvalidTileSize
+
+class Analysis2dOlsWrapper(nn.Module):
+    """
+    ANALYSIS2DOLSWRAPPER OLS wrapper for 2-D analysis network
+
+       Tiled execution of an analysis network, where each tile is extended
+       circularly by the pad size, analyzed and cropped to the coefficients
+       of the tile (overlap-save). With the pad size covering the atom
+       support of all the tree levels, the coefficients are identical to
+       those of the whole image, while only a tile is processed at a time.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+    Reference:
+       Shogo Muramatsu and Hitoshi Kiya,
+       ''Parallel Processing Techniques for Multidimensional Sampling
+       Lattice Alteration Based on Overlap-Add and Overlap-Save Methods,''
+       IEICE Trans. on Fundamentals, Vol.E78-A, No.8, pp.939-943, Aug. 1995
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analyzer,
+        tile_size=[256, 256],
+        pad_size=None):
+        super(Analysis2dOlsWrapper, self).__init__()
+        self.analyzer = analyzer
+        self.number_of_channels = analyzer.number_of_channels
+        self.decimation_factor = analyzer.decimation_factor
+        self.number_of_levels = analyzer.number_of_levels
+        self.tile_size = tile_size
+        self.pad_size = olsolapadsize2d(analyzer) if pad_size is None else pad_size
+        check_tile_size_(self.tile_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+
+    def forward(self,X,out=None):
+        height, width = X.size(2), X.size(3)
+        if out is None:
+            out = self.allocate(X)
+        for region in tileregions2d([height, width],self.tile_size):
+            self.forward_tile(X,out,region)
+        return out
+
+    def forward_tile(self,X,out,region):
+        """
+        Analyze a tile and write its coefficients into the output subbands
+        """
+        # Only the tile is converted to the data type of the coefficients
+        subImg = split_ols_(X,region,self.pad_size).to(out[0].dtype)
+        subCoefs = self.analyzer(subImg)
+        for Y, subY in zip(tile_coefficients_(self,out,region),
+                extract_ols_(self,subCoefs,region)):
+            Y.copy_(subY)
+
+    def allocate(self,X):
+        """
+        Allocate the output subbands for an input image
+        """
+        return allocate_coefficients_(self,X.size(0),X.size(2),X.size(3),
+            dtype=X.dtype,device=X.device)
+
+class Synthesis2dOlsWrapper(nn.Module):
+    """
+    SYNTHESIS2DOLSWRAPPER OLS wrapper for 2-D synthesis network
+
+       Tiled execution of a synthesis network, where the coefficients of
+       each tile are extended circularly by the pad size, synthesized and
+       cropped to the tile (overlap-save). Since no partial images are
+       summed up, the result is identical to that of the whole image.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        tile_size=[256, 256],
+        pad_size=None):
+        super(Synthesis2dOlsWrapper, self).__init__()
+        self.synthesizer = synthesizer
+        self.number_of_channels = synthesizer.number_of_channels
+        self.decimation_factor = synthesizer.decimation_factor
+        self.number_of_levels = synthesizer.number_of_levels
+        self.tile_size = tile_size
+        self.pad_size = olsolapadsize2d(synthesizer) if pad_size is None else pad_size
+        check_tile_size_(self.tile_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+
+    def forward(self,*args,out=None):
+        height, width = image_size_(self,args)
+        if out is None:
+            out = self.allocate(*args)
+        for region in tileregions2d([height, width],self.tile_size):
+            self.forward_tile(args,out,region)
+        return out
+
+    def forward_tile(self,coefs,out,region):
+        """
+        Synthesize a tile and write it into the output image
+        """
+        top, left, subHeight, subWidth = region
+        padv, padh = self.pad_size
+        subCoefs = split_coefficients_ols_(self,coefs,region)
+        subImg = self.synthesizer(*subCoefs)
+        out[:,:,top:top+subHeight,left:left+subWidth].copy_(
+            subImg[:,:,padv:padv+subHeight,padh:padh+subWidth])
+
+    def allocate(self,*args):
+        """
+        Allocate the output image for input coefficients
+        """
+        height, width = image_size_(self,args)
+        return torch.empty(args[0].size(0),1,height,width,
+            dtype=args[0].dtype,device=args[0].device)
+
+class Synthesis2dOlaWrapper(nn.Module):
+    """
+    SYNTHESIS2DOLAWRAPPER OLA wrapper for 2-D synthesis network
+
+       Tiled execution of a synthesis network, where the coefficients of
+       each tile are zero-padded by the pad size, synthesized and added
+       to the image with circular overlaps (overlap-add) as
+       +dictionary/+olaols/Synthesis2dOlaWrapper.m does.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        tile_size=[256, 256],
+        pad_size=None):
+        super(Synthesis2dOlaWrapper, self).__init__()
+        self.synthesizer = synthesizer
+        self.number_of_channels = synthesizer.number_of_channels
+        self.decimation_factor = synthesizer.decimation_factor
+        self.number_of_levels = synthesizer.number_of_levels
+        self.tile_size = tile_size
+        self.pad_size = olsolapadsize2d(synthesizer) if pad_size is None else pad_size
+        check_tile_size_(self.tile_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+
+    def forward(self,*args,out=None):
+        nSamples = args[0].size(0)
+        height, width = image_size_(self,args)
+        if out is None:
+            out = torch.empty(nSamples,1,height,width,
+                dtype=args[0].dtype,device=args[0].device)
+        out.zero_()
+        for region in tileregions2d([height, width],self.tile_size):
+            subCoefs = tile_coefficients_(self,args,region)
+            subImg = self.synthesizer(*padding_ola_(self,subCoefs))
+            circular_ola_(out,subImg,region,self.pad_size)
+        return out
+
+class OlsOlaProcess2d(nn.Module):
+    """
+    OLSOLAPROCESS2D OLS/OLA wrapper for 2-D analysis and synthesis network
+
+       Each tile is analyzed by OLS, the cropped coefficients are
+       manipulated, e.g. thresholded, and synthesized by OLA as
+       +restoration/OlsOlaProcess2d.m does. The coefficient manipulator
+       takes and returns the tuple of the subband coefficients of a tile.
+       Without the manipulator, the process reconstructs the input.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analyzer,
+        synthesizer,
+        tile_size=[256, 256],
+        pad_size=None,
+        coefs_manipulator=None):
+        super(OlsOlaProcess2d, self).__init__()
+        self.analyzer = analyzer
+        self.synthesizer = synthesizer
+        self.coefs_manipulator = coefs_manipulator
+        self.number_of_channels = analyzer.number_of_channels
+        self.decimation_factor = analyzer.decimation_factor
+        self.number_of_levels = analyzer.number_of_levels
+        self.tile_size = tile_size
+        self.pad_size = olsolapadsize2d(analyzer) if pad_size is None else pad_size
+        check_tile_size_(self.tile_size,self.pad_size,
+            self.decimation_factor,self.number_of_levels)
+
+    def forward(self,X,out=None):
+        nSamples, height, width = X.size(0), X.size(2), X.size(3)
+        if out is None:
+            out = torch.empty_like(X)
+        out.zero_()
+        for region in tileregions2d([height, width],self.tile_size):
+            subCoefs = self.analyzer(split_ols_(X,region,self.pad_size))
+            subCoefs = extract_ols_(self,subCoefs,region)
+            if self.coefs_manipulator is not None:
+                subCoefs = self.coefs_manipulator(*subCoefs)
+            subImg = self.synthesizer(*padding_ola_(self,subCoefs))
+            circular_ola_(out,subImg,region,self.pad_size)
+        return out
+
+def olsolapadsize2d(network):
+    """
+    Pad size of OLS/OLA covering the atom support of all the tree levels
+
+       Each level extends the support by Ord/2 blocks of the level on each
+       side. The sum is rounded up to a multiple of Stride^nLevels so that
+       the tiles are aligned to the blocks of every level.
+    """
+    stride = network.decimation_factor
+    ppord = network.polyphase_order
+    nLevels = network.number_of_levels
+    padSize = []
+    for iDim in (Direction.VERTICAL, Direction.HORIZONTAL):
+        margin = (ppord[iDim]//2)*sum(
+            [ stride[iDim]**iLv for iLv in range(1,nLevels+1) ])
+        unit = stride[iDim]**nLevels
+        padSize.append(-(-margin//unit)*unit)
+    return tuple(padSize)
+
+def tileregions2d(size,tile_size):
+    """
+    Regions (top, left, height, width) of tiles covering an image
+
+       The tiles at the bottom and right edges are cut by the image size.
+    """
+    height, width = size
+    return [ (top, left, min(tile_size[Direction.VERTICAL],height-top),
+        min(tile_size[Direction.HORIZONTAL],width-left))
+        for top in range(0,height,tile_size[Direction.VERTICAL])
+        for left in range(0,width,tile_size[Direction.HORIZONTAL]) ]
+
+def check_tile_size_(tile_size,pad_size,stride,nLevels):
+    for iDim in (Direction.VERTICAL, Direction.HORIZONTAL):
+        unit = stride[iDim]**nLevels
+        if tile_size[iDim] % unit or pad_size[iDim] % unit:
+            raise InvalidTileSize(
+                '(%d,%d), (%d,%d) : Tile and pad sizes should be multiples of Stride^nLevels.'\
+                % (tile_size[0],tile_size[1],pad_size[0],pad_size[1])
+            )
+
+def level_factors_(wrapper):
+    # Downsampling factors of Lv1 AC, ..., LvN AC and LvN DC
+    stride = wrapper.decimation_factor
+    nLevels = wrapper.number_of_levels
+    factors = [ (stride[Direction.VERTICAL]**iLv, stride[Direction.HORIZONTAL]**iLv)
+        for iLv in range(1,nLevels+1) ]
+    factors.append(factors[-1])
+    return factors
+
+def image_size_(wrapper,coefs):
+    factorv, factorh = level_factors_(wrapper)[-1]
+    return coefs[-1].size(1)*factorv, coefs[-1].size(2)*factorh
+
+def allocate_coefficients_(wrapper,nSamples,height,width,dtype,device):
+    nChsTotal = sum(wrapper.number_of_channels)
+    factors = level_factors_(wrapper)
+    out = [ torch.empty(nSamples,height//factorv,width//factorh,nChsTotal-1,
+        dtype=dtype,device=device) for factorv, factorh in factors[:-1] ]
+    factorv, factorh = factors[-1]
+    out.append(torch.empty(nSamples,height//factorv,width//factorh,
+        dtype=dtype,device=device))
+    return tuple(out)
+
+def circular_crop_(X,dims,starts,lengths):
+    """
+    Crop of an array with circular extension
+
+       A view is returned if the region does not cross the boundary.
+       Otherwise, the region is split at the boundary into the pieces in
+       range, each of which is narrowed along all the dimensions before
+       it is read, e.g. from a memory-mapped array, and concatenated.
+    """
+    if len(dims) == 0:
+        return X
+    dim, start, length = dims[0], starts[0], lengths[0]
+    size = X.size(dim)
+    if start >= 0 and start+length <= size:
+        return circular_crop_(X.narrow(dim,start,length),dims[1:],starts[1:],lengths[1:])
+    pieces = []
+    start %= size
+    while length > 0:
+        subLength = min(size-start,length)
+        pieces.append(circular_crop_(X.narrow(dim,start,subLength),
+            dims[1:],starts[1:],lengths[1:]))
+        length -= subLength
+        start = 0
+    return torch.cat(pieces,dim=dim)
+
+def split_ols_(X,region,pad_size):
+    top, left, subHeight, subWidth = region
+    padv, padh = pad_size
+    return circular_crop_(X,(2, 3),(top-padv, left-padh),
+        (subHeight+2*padv, subWidth+2*padh))
+
+def tile_coefficients_(wrapper,coefs,region):
+    # Views of the coefficients belonging to a tile
+    top, left, subHeight, subWidth = region
+    return tuple( Y[:,top//factorv:(top+subHeight)//factorv,
+        left//factorh:(left+subWidth)//factorh]
+        for Y, (factorv, factorh) in zip(coefs,level_factors_(wrapper)) )
+
+def extract_ols_(wrapper,subCoefs,region):
+    # Crop the coefficients of a padded tile to those of the tile
+    _, _, subHeight, subWidth = region
+    padv, padh = wrapper.pad_size
+    return tuple( Y[:,padv//factorv:(padv+subHeight)//factorv,
+        padh//factorh:(padh+subWidth)//factorh]
+        for Y, (factorv, factorh) in zip(subCoefs,level_factors_(wrapper)) )
+
+def split_coefficients_ols_(wrapper,coefs,region):
+    # Coefficients of a tile extended circularly by the pad size
+    top, left, subHeight, subWidth = region
+    padv, padh = wrapper.pad_size
+    return tuple( circular_crop_(Y,(1, 2),
+        ((top-padv)//factorv, (left-padh)//factorh),
+        ((subHeight+2*padv)//factorv, (subWidth+2*padh)//factorh))
+        for Y, (factorv, factorh) in zip(coefs,level_factors_(wrapper)) )
+
+def padding_ola_(wrapper,subCoefs):
+    # Zero padding of the coefficients of a tile by the pad size
+    padv, padh = wrapper.pad_size
+    subCoefsPad = []
+    for Y, (factorv, factorh) in zip(subCoefs,level_factors_(wrapper)):
+        subpadv, subpadh = padv//factorv, padh//factorh
+        size = list(Y.size())
+        size[1] += 2*subpadv
+        size[2] += 2*subpadh
+        Z = torch.zeros(size,dtype=Y.dtype,device=Y.device)
+        Z[:,subpadv:subpadv+Y.size(1),subpadh:subpadh+Y.size(2)] = Y
+        subCoefsPad.append(Z)
+    return tuple(subCoefsPad)
+
+def circular_ola_(out,subImg,region,pad_size):
+    # Overlap-add of a padded tile with circular folding
+    top, left, _, _ = region
+    padv, padh = pad_size
+    nSamples, nComponents, height, width = out.size()
+    rows = torch.arange(top-padv,top-padv+subImg.size(2),device=out.device) % height
+    cols = torch.arange(left-padh,left-padh+subImg.size(3),device=out.device) % width
+    index = (rows.view(-1,1)*width + cols.view(1,-1)).view(-1)
+    out.view(nSamples,nComponents,height*width).index_add_(
+        2,index,subImg.reshape(nSamples,nComponents,-1))
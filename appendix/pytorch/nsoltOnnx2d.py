@@ -0,0 +1,284 @@
+import inspect
+import torch
+import torch.nn as nn
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltFinalRotation2dLayer import NsoltFinalRotation2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltMixture2d import initialrotationmatrix2d, finalrotationmatrix2d, \
+    intermediaterotationmatrix2d, butterflymatrix2d, atomextensionshift2d
+from nsoltUtility import Direction
+
+class NsoltLoweredAnalysis2dNetwork(nn.Module):
+    """
+    NSOLTLOWEREDANALYSIS2DNETWORK
+
+       NsoltAnalysis2dNetwork with fixed angles lowered to standard ops,
+       i.e. reshape, transpose, matmul, slice and concat, for ONNX export.
+       The block DCT and the rotations and butterflies between two block
+       shifts are precomputed into a matrix, and each shift is a pair of
+       slices concatenated.
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x 1 x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        analysisnet):
+        super(NsoltLoweredAnalysis2dNetwork, self).__init__()
+        self.number_of_channels = analysisnet.number_of_channels
+        self.decimation_factor = analysisnet.decimation_factor
+        self.polyphase_order = analysisnet.polyphase_order
+        self.number_of_levels = analysisnet.number_of_levels
+        with torch.no_grad():
+            self.levels = nn.ModuleList([ LoweredLevel2d(layers,
+                next(analysisnet.parameters()).dtype)
+                for layers in analysisnet.layers ])
+
+    def forward(self,X):
+        decV = self.decimation_factor[Direction.VERTICAL]
+        decH = self.decimation_factor[Direction.HORIZONTAL]
+        Y = []
+        Zdc = X[:,0]
+        for level in self.levels:
+            # Block extraction nSamples x nRows x nCols x nDecs
+            nSamples, height, width = Zdc.size(0), Zdc.size(1), Zdc.size(2)
+            Z = Zdc.reshape(nSamples,height//decV,decV,width//decH,decH)
+            Z = Z.permute(0,1,3,2,4).reshape(nSamples,height//decV,width//decH,decV*decH)
+            Z = level(Z)
+            Y.append(Z[:,:,:,1:])
+            Zdc = Z[:,:,:,0]
+        Y.append(Zdc)
+        return tuple(Y)
+
+class NsoltLoweredSynthesis2dNetwork(nn.Module):
+    """
+    NSOLTLOWEREDSYNTHESIS2DNETWORK
+
+       NsoltSynthesis2dNetwork with fixed angles lowered to standard ops,
+       i.e. reshape, transpose, matmul, slice and concat, for ONNX export.
+       The rotations and butterflies between two block shifts and the
+       block IDCT are precomputed into a matrix, and each shift is a pair
+       of slices concatenated.
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x 1 x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesisnet):
+        super(NsoltLoweredSynthesis2dNetwork, self).__init__()
+        self.number_of_channels = synthesisnet.number_of_channels
+        self.decimation_factor = synthesisnet.decimation_factor
+        self.polyphase_order = synthesisnet.polyphase_order
+        self.number_of_levels = synthesisnet.number_of_levels
+        with torch.no_grad():
+            self.levels = nn.ModuleList([ LoweredLevel2d(layers,
+                next(synthesisnet.parameters()).dtype)
+                for layers in synthesisnet.layers ])
+
+    def forward(self,*args):
+        decV = self.decimation_factor[Direction.VERTICAL]
+        decH = self.decimation_factor[Direction.HORIZONTAL]
+        nLevels = self.number_of_levels
+        Zdc = args[nLevels]
+        for iLv in range(nLevels-1,-1,-1):
+            Z = torch.cat((Zdc.unsqueeze(dim=3),args[iLv]),dim=3)
+            Z = self.levels[iLv](Z)
+            # Block placement nSamples x 1 x (decV x nRows) x (decH x nCols)
+            nSamples, nrows, ncols = Z.size(0), Z.size(1), Z.size(2)
+            Z = Z.reshape(nSamples,nrows,ncols,decV,decH).permute(0,1,3,2,4)
+            Zdc = Z.reshape(nSamples,nrows*decV,ncols*decH)
+        return Zdc.unsqueeze(dim=1)
+
+class LoweredLevel2d(nn.Module):
+    """
+    LOWEREDLEVEL2D
+
+       A tree level of NSOLT as matrices applied to the channel vectors of
+       nSamples x nRows x nCols x nChs with block shifts in between. The
+       channel separation and concatenation are left to the caller.
+    """
+    def __init__(self,
+        layers,
+        dtype=torch.get_default_dtype()):
+        super(LoweredLevel2d, self).__init__()
+        self.shifts = []
+        matrices = []
+        P = None
+        for layer in layers:
+            if isinstance(layer,NsoltBlockDct2dLayer):
+                M = blockdctmatrix2d(layer.decimation_factor,dtype)
+            elif isinstance(layer,NsoltBlockIdct2dLayer):
+                M = blockdctmatrix2d(layer.decimation_factor,dtype).T
+            elif isinstance(layer,NsoltInitialRotation2dLayer):
+                M = initialrotationmatrix2d(layer,dtype)
+            elif isinstance(layer,NsoltFinalRotation2dLayer):
+                M = finalrotationmatrix2d(layer,dtype)
+            elif isinstance(layer,NsoltIntermediateRotation2dLayer):
+                M = intermediaterotationmatrix2d(layer,dtype)
+            elif isinstance(layer,NsoltAtomExtension2dLayer):
+                ps = layer.number_of_channels[0]
+                B = butterflymatrix2d(ps,dtype)
+                matrices.append(B if P is None else B @ P)
+                shift, dim = atomextensionshift2d(layer)
+                self.shifts.append((ps,layer.target_channels == 'Difference',shift,dim))
+                P = B/2.
+                continue
+            else: # Channel separation and concatenation
+                continue
+            P = M if P is None else M @ P
+        matrices.append(P)
+        for iMatrix, matrix in enumerate(matrices):
+            self.register_buffer('matrix%d' % iMatrix,matrix.clone())
+
+    def forward(self,X):
+        Z = X @ self.matrix0.T
+        for iShift, shift in enumerate(self.shifts):
+            Z = blockshift2d(Z,*shift)
+            Z = Z @ getattr(self,'matrix%d' % (iShift+1)).T
+        return Z
+
+def blockdctmatrix2d(decimation_factor,dtype=torch.get_default_dtype()):
+    """
+    Matrix of NsoltBlockDct2dLayer, i.e. nDecs x nDecs
+
+       Obtained from the responses to the unit blocks, where the pixels of
+       a block are in row-major order.
+    """
+    nDecs = decimation_factor[0]*decimation_factor[1]
+    E = torch.eye(nDecs,dtype=dtype).reshape(nDecs,1,*decimation_factor)
+    with torch.no_grad():
+        D = NsoltBlockDct2dLayer(decimation_factor=decimation_factor)(E)
+    return D.reshape(nDecs,nDecs).T
+
+def blockshift2d(X,ps,is_difference,shift,dim):
+    """
+    Circular shift of the sum or difference channels by one block with
+    slices and concatenation
+    """
+    head, tail = [ slice(None) ]*X.dim(), [ slice(None) ]*X.dim()
+    head[dim], tail[dim] = (slice(-1,None), slice(None,-1)) if shift > 0 \
+        else (slice(1,None), slice(None,1))
+    Xs, Xd = X[...,:ps], X[...,ps:]
+    if is_difference:
+        Xd = torch.cat((Xd[tuple(head)],Xd[tuple(tail)]),dim=dim)
+    else:
+        Xs = torch.cat((Xs[tuple(head)],Xs[tuple(tail)]),dim=dim)
+    return torch.cat((Xs,Xd),dim=-1)
+
+def lowernetwork2d(network):
+    """
+    Lower NsoltAnalysis2dNetwork or NsoltSynthesis2dNetwork with the
+    current angles
+    """
+    if isinstance(network,NsoltSynthesis2dNetwork):
+        return NsoltLoweredSynthesis2dNetwork(network)
+    return NsoltLoweredAnalysis2dNetwork(network)
+
+def exportonnx2d(network,f,args=None,opset_version=13):
+    """
+    Export NsoltAnalysis2dNetwork or NsoltSynthesis2dNetwork to ONNX
+
+       The network is lowered with the current angles and traced with
+       'args', which is an image batch for an analysis network and a
+       tuple of the subbands for a synthesis network. By default, a
+       single image of 2x2 blocks of the coarsest level is traced. The
+       batch and spatial axes are exported as dynamic ones.
+
+       The inputs and outputs are named 'image' and 'ac_Lv1', ...,
+       'ac_LvN', 'dc_LvN'.
+    """
+    lowered = lowernetwork2d(network).eval()
+    nLevels = network.number_of_levels
+    names = [ 'ac_Lv%d' % iLv for iLv in range(1,nLevels+1) ] \
+        + [ 'dc_Lv%d' % nLevels ]
+    if args is None:
+        dtype = next(network.parameters()).dtype
+        stride = network.decimation_factor
+        if isinstance(lowered,NsoltLoweredAnalysis2dNetwork):
+            args = torch.zeros(1,1,2*stride[0]**nLevels,2*stride[1]**nLevels,dtype=dtype)
+        else:
+            nChsTotal = sum(network.number_of_channels)
+            args = tuple( torch.zeros(1,2*stride[0]**(nLevels-iLv),
+                2*stride[1]**(nLevels-iLv),nChsTotal-1,dtype=dtype)
+                for iLv in range(1,nLevels+1) ) \
+                + ( torch.zeros(1,2,2,dtype=dtype), )
+    args = args if isinstance(args,tuple) else (args,)
+    if isinstance(lowered,NsoltLoweredAnalysis2dNetwork):
+        input_names, output_names = [ 'image' ], names
+    else:
+        input_names, output_names = names, [ 'image' ]
+    dynamic_axes = { name: { 0: 'nSamples', 1: name+'_nRows', 2: name+'_nCols' }
+        for name in names }
+    dynamic_axes['image'] = { 0: 'nSamples', 2: 'height', 3: 'width' }
+    # Traced export as in the releases without the dynamo exporter
+    options = { 'dynamo': False } \
+        if 'dynamo' in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(lowered,args,f,
+            input_names=input_names,
+            output_names=output_names,
+            dynamic_axes=dynamic_axes,
+            opset_version=opset_version,
+            **options)
+    return lowered
+
+def verifyonnx2d(network,f,*args,rtol=1e-5,atol=1e-6):
+    """
+    Round-trip check of an exported ONNX model against the PyTorch forward
+
+       Runs the model in 'f' with ONNX Runtime on 'args' and returns True
+       if all the outputs are close to those of the network.
+    """
+    import onnxruntime
+    session = onnxruntime.InferenceSession(f if isinstance(f,str) else f.getvalue(),
+        providers=['CPUExecutionProvider'])
+    feeds = { node.name: arg.detach().cpu().numpy()
+        for node, arg in zip(session.get_inputs(),args) }
+    actual = session.run(None,feeds)
+    with torch.no_grad():
+        expctd = network(*args)
+    expctd = expctd if isinstance(expctd,tuple) else (expctd,)
+    return len(actual) == len(expctd) and all(
+        torch.allclose(torch.from_numpy(a),e,rtol=rtol,atol=atol)
+        for a, e in zip(actual,expctd) )
@@ -0,0 +1,213 @@
+import math
+import torch
+import torch.nn as nn
+from nsoltIsta2d import IstaImRestoration2d, softthresholding_
+from nsoltLayerExceptions import InvalidOption
+
+class IstHcSystem(IstaImRestoration2d):
+    """
+    ISTHCSYSTEM Primal-dual splitting with hard constraints
+
+       観測画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       復元画像のバッチ出力:
+          nSamples x nComponents x nRowsOrg x nColsOrg
+
+       Port of +restoration/+pds/IstHcSystem.m, which solves
+
+          min_x 1/2||v - P D x||^2 + lambda ||x||_1  s.t.  D x in C
+
+       by the primal-dual splitting with the synthesizer D of a Parseval
+       tight NSOLT and its adjoint, i.e. the analyzer, as the dictionary.
+       Each iteration is
+
+          g <- P^T (P r - v) + y
+          x <- soft(x - gamma1 D^T g, gamma1 lambda)
+          r' <- D x
+          y <- y + gamma2 (2 r' - r)
+          y <- y - gamma2 prox_C(y/gamma2)
+          r <- r'
+
+       where gamma1 = 1/L with L = lambda_max(P^T P) unless given, and C
+       is given by the metric projection, e.g. ProxBoxConstraint or
+       ProxNormBallConstraint. The dual step size
+
+          gamma2 = (1/gamma1 - L/2)/1.05
+
+       satisfies the convergence condition 1/gamma1 - gamma2 >= L/2 with
+       the margin of IstHcSystem.m, whose gamma2 = 1/(1.05 gamma1) does
+       not for gamma1 = 1/L, so that gamma1 < 2/L is required, otherwise
+       InvalidOption is raised.
+
+       The coefficients are updated in place on the serialized buffer and
+       the dual variable by the in-place proxconjugate_() of the metric
+       projection. As in IstaImRestoration2d, the images are processed in
+       parallel and each image stops independently when the RMSE between
+       the successive results gets less than or equal to eps0.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        adj_of_synthesizer,
+        metric_projection,
+        measure_process=None,
+        lambda_=0.,
+        gamma=None,
+        eps0=1e-6,
+        max_iter=1000,
+        step_monitor=None):
+        super(IstHcSystem, self).__init__(
+            synthesizer,
+            adj_of_synthesizer,
+            linear_process=measure_process,
+            lambda_=lambda_,
+            eps0=eps0,
+            max_iter=max_iter,
+            step_monitor=step_monitor)
+        self.metric_projection = metric_projection
+        self.gamma = gamma
+
+    def stepsize_(self,size,dtype,device):
+        reciprocalL = super(IstHcSystem, self).stepsize_(size,dtype,device)
+        gamma1 = reciprocalL if self.gamma is None else self.gamma
+        if gamma1 >= 2.*reciprocalL:
+            raise InvalidOption(
+                '%g : gamma should be less than 2/L = %g' % (gamma1,2.*reciprocalL)
+            )
+        self.gamma2_ = (1./gamma1-0.5/reciprocalL)/1.05
+        return gamma1
+
+    def initialize_(self,x,threshold):
+        """
+        The result, the coefficients and the dual variable start from zero
+        """
+        nElements = self.serializer_.number_of_elements
+        y = x.new_zeros(x.size(0),nElements)
+        hu = x.new_zeros(x.size(0),1,*self.original_dimension_)
+        return { 'x': x, 'threshold': threshold, 'hu': hu,
+            'dual': torch.zeros_like(hu), 'y': y, 'v': torch.empty_like(y),
+            'tmp': torch.empty_like(y), 'imtmp': torch.empty_like(hu) }
+
+    def iterate_(self,state):
+        """
+        Returns the RMSE between the successive results of each image.
+        """
+        gamma1, gamma2 = self.reciprocal_l_, self.gamma2_
+        y, tmp, dual, hupre = state['y'], state['tmp'], state['dual'], state['hu']
+        # Primal step
+        g = self.adjoint_(torch.sub(self.process_(hupre),state['x'])).add_(dual)
+        t = self.analyze_(g,out=state['v'])
+        y.sub_(t,alpha=gamma1)
+        softthresholding_(y,state['threshold'],tmp)
+        hu = self.synthesizer(*self.deserializer_(y))
+        # Dual step, y <- y + gamma2 (2 hu - hupre) followed by the prox
+        dual.add_(hu,alpha=2.*gamma2).sub_(hupre,alpha=gamma2)
+        self.metric_projection.proxconjugate_(dual,gamma2,state['imtmp'])
+        # RMSE between the successive results
+        torch.sub(hu,hupre,out=state['imtmp'])
+        err = state['imtmp'].square_().mean(dim=(1,2,3)).sqrt_()
+        state['hu'] = hu
+        return err
+
+class ProxBoxConstraint(nn.Module):
+    """
+    PROXBOXCONSTRAINT Metric projection onto [vmin, vmax]
+
+       Port of +restoration/+metricproj/ProxBoxConstraint.m
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        vmin=-math.inf,
+        vmax=math.inf):
+        super(ProxBoxConstraint, self).__init__()
+        self.vmin = vmin
+        self.vmax = vmax
+
+    def forward(self,X):
+        return torch.clamp(X,min=self.vmin,max=self.vmax)
+
+    def proxconjugate_(self,Y,gamma,tmp=None):
+        """
+        In-place Y <- Y - gamma prox(Y/gamma), i.e.
+        Y - clamp(Y,gamma vmin,gamma vmax), where tmp is a buffer of the
+        size of Y
+        """
+        tmp = torch.empty_like(Y) if tmp is None else tmp
+        torch.clamp(Y,min=gamma*self.vmin,max=gamma*self.vmax,out=tmp)
+        return Y.sub_(tmp)
+
+class ProxNormBallConstraint(nn.Module):
+    """
+    PROXNORMBALLCONSTRAINT Metric projection onto the l2-norm ball
+
+       Port of +restoration/+metricproj/ProxNormBallConstraint.m, where the
+       ball of radius eps around the center is applied to each sample
+       nSamples x ..., i.e. the norm is taken over all but the first
+       dimension.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        eps=math.inf,
+        center=0.):
+        super(ProxNormBallConstraint, self).__init__()
+        self.eps = eps
+        self.center = center
+
+    def forward(self,X):
+        Z = X-self.center
+        return self.center+Z*self.scale_(Z,self.eps)
+
+    def proxconjugate_(self,Y,gamma,tmp=None):
+        """
+        In-place Y <- Y - gamma prox(Y/gamma), i.e.
+        (Y - gamma c)(1 - min(1, gamma eps/||Y - gamma c||)), where tmp is
+        a buffer of the size of Y
+        """
+        tmp = torch.empty_like(Y) if tmp is None else tmp
+        torch.sub(Y,self.center,alpha=gamma,out=tmp)
+        scale = self.scale_(tmp,gamma*self.eps)
+        return torch.mul(tmp,scale.neg_().add_(1.),out=Y)
+
+    @staticmethod
+    def scale_(Z,radius):
+        dims = tuple(range(1,Z.dim()))
+        d = torch.linalg.vector_norm(Z,dim=dims,keepdim=True)
+        # min(1, radius/d), which is one inside the ball
+        return torch.where(d > radius,radius/d,torch.ones_like(d))
@@ -0,0 +1,313 @@
+import torch
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer, block_butterfly
+
+class PartialLineBuffer:
+    """
+    PARTIALLINEBUFFER
+
+       Vertical atom extension of a block row as +embedded/ModuleButterfly.m
+       and ModulePartialLineBuffer.m do, i.e. butterfly, one-row delay of
+       half the channels with a line buffer, and butterfly.
+
+       The extension 'Down' on the target channels delays the target
+       channels, and 'Up' on the target channels delays the others and
+       labels the output by the previous row. The first row only fills
+       the buffer.
+
+       ブロック行入力:
+          nSamples x 1 x nCols x nChsTotal
+
+       ブロック行出力:
+          nSamples x 1 x nCols x nChsTotal
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        number_of_channels=[],
+        direction='Down',
+        target_channels='Difference'):
+        self.number_of_channels = number_of_channels
+        self.direction = direction
+        self.target_channels = target_channels
+        # Delayed channels: True for the difference ones
+        isTargetDifference = target_channels == 'Difference'
+        self.is_delay_difference = isTargetDifference \
+            if direction == 'Down' else not isTargetDifference
+        self.previous_label = None
+        self.previous_cd = None
+
+    def step(self,label,X):
+        ps = self.number_of_channels[0]
+        Y = block_butterfly(X,self.number_of_channels)
+        if self.is_delay_difference:
+            cd, cn = Y[:,:,:,ps:], Y[:,:,:,:ps]
+        else:
+            cd, cn = Y[:,:,:,:ps], Y[:,:,:,ps:]
+        previousLabel, previousCd = self.previous_label, self.previous_cd
+        self.previous_label, self.previous_cd = label, cd
+        if previousCd is None:
+            return None
+        if self.is_delay_difference:
+            Y = torch.cat((cn,previousCd),dim=-1)
+        else:
+            Y = torch.cat((previousCd,cn),dim=-1)
+        Z = block_butterfly(Y,self.number_of_channels)/2.
+        return (label if self.direction == 'Down' else previousLabel), Z
+
+class RasterScanPipeline:
+    """
+    RASTERSCANPIPELINE
+
+       Vertical stages of an NSOLT level applied to block rows, where the
+       atom extensions are replaced by partial line buffers and the others,
+       i.e. rotations, are applied row by row. The first block rows are
+       kept and replayed at the end of the frame for the circular
+       extension, so the memory is O(nCols x Ord(1)).
+    """
+    def __init__(self,layers):
+        self.stages = [ PartialLineBuffer(
+            number_of_channels=layer.number_of_channels,
+            direction=layer.direction,
+            target_channels=layer.target_channels)
+            if isinstance(layer,NsoltAtomExtension2dLayer) else layer
+            for layer in layers ]
+        self.number_of_replays = sum(
+            [ isinstance(stage,PartialLineBuffer) for stage in self.stages ])
+        self.replays = []
+
+    def push(self,label,X):
+        if len(self.replays) < self.number_of_replays:
+            self.replays.append((label,X))
+        return self.process_(label,X)
+
+    def flush(self):
+        outputs = []
+        for idx in range(self.number_of_replays):
+            label, X = self.replays[idx % len(self.replays)]
+            output = self.process_(label,X)
+            if output is not None:
+                outputs.append(output)
+        self.replays = []
+        return outputs
+
+    def process_(self,label,X):
+        for stage in self.stages:
+            if isinstance(stage,PartialLineBuffer):
+                output = stage.step(label,X)
+                if output is None:
+                    return None
+                label, X = output
+            else:
+                X = stage(X)
+        return label, X
+
+class NsoltRasterScanAnalysis2d:
+    """
+    NSOLTRASTERSCANANALYSIS2D
+
+       Raster-scan streaming of NsoltAnalysis2dNetwork with line buffers.
+       Image rows are consumed from an iterable, e.g. a camera or scanner
+       feed, and each coefficient row is emitted as soon as it is final.
+       The rows depending on the bottom of the frame through the circular
+       extension are emitted at the end of the frame. Each tree level
+       keeps only Ord(1) block rows and Stride(1) image rows.
+
+       行入力:
+          nSamples x (Stride(2)xnCols)
+
+       (k, 行番号, 係数行) 出力:
+          k = 0,...,nLevels-1 : nSamples x nColsLv(k+1) x (nChsTotal-1)
+          k = nLevels         : nSamples x nColsLvN
+
+       where k is the index of the output of NsoltAnalysis2dNetwork.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,analysisnet):
+        self.network = analysisnet
+        self.number_of_levels = analysisnet.number_of_levels
+        self.decimation_factor = analysisnet.decimation_factor
+
+    def __call__(self,rows):
+        return self.stream(rows)
+
+    def stream(self,rows):
+        """
+        Generator of (k, row index, coefficient row) from image rows
+        """
+        nLevels = self.number_of_levels
+        self.pendings = [ {} for iLv in range(nLevels) ]
+        self.pipelines = [
+            RasterScanPipeline(vertical_layers_(self.network.layers[iLv][1:-1]))
+            for iLv in range(nLevels) ]
+        with torch.no_grad():
+            for label, X in enumerate(rows):
+                yield from self.push_(0,label,X)
+            # End of frame from the finest level
+            for iLv in range(nLevels):
+                for output in self.pipelines[iLv].flush():
+                    yield from self.emit_(iLv,output)
+
+    def push_(self,iLv,label,X):
+        # Block row from Stride(1) rows
+        decV = self.decimation_factor[0]
+        pending = self.pendings[iLv]
+        pending[label] = X
+        iBlk = label // decV
+        keys = range(iBlk*decV,(iBlk+1)*decV)
+        if not all([ key in pending for key in keys ]):
+            return
+        Z = torch.stack([ pending.pop(key) for key in keys ],dim=1).unsqueeze(dim=1)
+        for layer in horizontal_layers_(self.network.layers[iLv][:-1]):
+            Z = layer(Z)
+        output = self.pipelines[iLv].push(iBlk,Z)
+        if output is not None:
+            yield from self.emit_(iLv,output)
+
+    def emit_(self,iLv,output):
+        label, Z = output
+        ac, dc = self.network.layers[iLv][-1](Z)
+        yield iLv, label, ac[:,0]
+        if iLv < self.number_of_levels-1:
+            # DC rows for the coarser level
+            yield from self.push_(iLv+1,label,dc[:,0])
+        else:
+            yield iLv+1, label, dc[:,0]
+
+    def forward(self,X):
+        """
+        Whole-frame interface with the same outputs as NsoltAnalysis2dNetwork
+        """
+        return assemble_(self.stream(X[:,0,iRow] for iRow in range(X.size(2))),
+            self.number_of_levels)
+
+class NsoltRasterScanSynthesis2d:
+    """
+    NSOLTRASTERSCANSYNTHESIS2D
+
+       Raster-scan streaming of NsoltSynthesis2dNetwork with line buffers.
+       Coefficient rows are consumed in the format emitted by
+       NsoltRasterScanAnalysis2d and image rows are emitted as soon as they
+       are final. The AC rows are kept until the DC rows of the same level
+       are synthesized from the coarser level.
+
+       (k, 行番号, 係数行) 入力:
+          k = 0,...,nLevels-1 : nSamples x nColsLv(k+1) x (nChsTotal-1)
+          k = nLevels         : nSamples x nColsLvN
+
+       (行番号, 行) 出力:
+          nSamples x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,synthesisnet):
+        self.network = synthesisnet
+        self.number_of_levels = synthesisnet.number_of_levels
+        self.decimation_factor = synthesisnet.decimation_factor
+
+    def __call__(self,rows):
+        return self.stream(rows)
+
+    def stream(self,rows):
+        """
+        Generator of (row index, image row) from coefficient rows
+        """
+        nLevels = self.number_of_levels
+        self.acs = [ {} for iLv in range(nLevels) ]
+        self.dcs = [ {} for iLv in range(nLevels) ]
+        self.pipelines = [
+            RasterScanPipeline(vertical_layers_(self.network.layers[iLv][1:]))
+            for iLv in range(nLevels) ]
+        with torch.no_grad():
+            for k, label, X in rows:
+                if k < nLevels:
+                    self.acs[k][label] = X
+                    yield from self.push_(k,label)
+                else:
+                    self.dcs[nLevels-1][label] = X
+                    yield from self.push_(nLevels-1,label)
+            # End of frame from the coarsest level
+            for iLv in range(nLevels-1,-1,-1):
+                for output in self.pipelines[iLv].flush():
+                    yield from self.emit_(iLv,output)
+
+    def push_(self,iLv,label):
+        acs, dcs = self.acs[iLv], self.dcs[iLv]
+        if label not in acs or label not in dcs:
+            return
+        layers = self.network.layers[iLv]
+        Z = layers[0](acs.pop(label).unsqueeze(dim=1),dcs.pop(label).unsqueeze(dim=1))
+        output = self.pipelines[iLv].push(label,Z)
+        if output is not None:
+            yield from self.emit_(iLv,output)
+
+    def emit_(self,iLv,output):
+        decV = self.decimation_factor[0]
+        label, Z = output
+        for layer in horizontal_layers_(self.network.layers[iLv][1:]):
+            Z = layer(Z)
+        for iRow in range(decV):
+            if iLv == 0:
+                yield label*decV+iRow, Z[:,0,iRow]
+            else:
+                # DC rows of the finer level
+                self.dcs[iLv-1][label*decV+iRow] = Z[:,0,iRow]
+                yield from self.push_(iLv-1,label*decV+iRow)
+
+    def forward(self,*args):
+        """
+        Whole-frame interface with the same output as NsoltSynthesis2dNetwork
+        """
+        rows = [ (k, iRow, Y[:,iRow]) for k, Y in enumerate(args)
+            for iRow in range(Y.size(1)) ]
+        image = dict(self.stream(rows))
+        return torch.stack([ image[iRow] for iRow in range(len(image)) ],
+            dim=1).unsqueeze(dim=1)
+
+def vertical_layers_(layers):
+    return [ layer for layer in layers
+        if '_Qv' in layer.name or '_Vv' in layer.name ]
+
+def horizontal_layers_(layers):
+    return [ layer for layer in layers
+        if not ('_Qv' in layer.name or '_Vv' in layer.name) ]
+
+def assemble_(stream,nLevels):
+    subbands = [ {} for k in range(nLevels+1) ]
+    for k, label, Y in stream:
+        subbands[k][label] = Y
+    return tuple( torch.stack([ subband[iRow] for iRow in range(len(subband)) ],dim=1)
+        for subband in subbands )
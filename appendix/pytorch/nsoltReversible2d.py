@@ -0,0 +1,205 @@
+import torch
+import torch.autograd as autograd
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltUtility import OrthonormalMatrixGenerationSystem
+
+class ReversibleAnalysis2d(autograd.Function):
+    """
+    REVERSIBLEANALYSIS2D
+
+       Activation-free backpropagation through NsoltAnalysis2dNetwork.
+       Only the outputs of the network are kept for backward. The input
+       of each layer is reconstructed from its output by the inverse layer
+       and the layer is recomputed locally to obtain the gradients.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @staticmethod
+    def forward(ctx, network, input, *params):
+        ctx.network = network
+        with torch.no_grad():
+            Y = network.forward_layers(input)
+        ctx.save_for_backward(*Y)
+        return Y
+
+    @staticmethod
+    def backward(ctx, *grad_outputs):
+        network = ctx.network
+        Y = ctx.saved_tensors
+        params = list(network.parameters())
+        grad_params = [ None ]*len(params)
+        nLevels = network.number_of_levels
+        # DC output of the coarsest level
+        Zdc = Y[nLevels]
+        dLdZdc = zeros_if_none_(grad_outputs[nLevels],Zdc)
+        for iLv in range(nLevels-1,-1,-1):
+            layers = network.layers[iLv]
+            # Inverse of channel separation
+            Zac = Y[iLv]
+            dLdZac = zeros_if_none_(grad_outputs[iLv],Zac)
+            Z = torch.cat((Zdc.unsqueeze(dim=3),Zac),dim=3)
+            dLdZ = torch.cat((dLdZdc.unsqueeze(dim=3),dLdZac),dim=3)
+            for layer in reversed(layers[:-1]):
+                with torch.no_grad():
+                    X = inverse_layer_forward(layer,Z)
+                Z, dLdZ = recompute_layer_backward_(
+                    layer,X,dLdZ,params,grad_params)
+            # Input of this level is DC output of the finer level
+            Zdc = Z.squeeze(dim=1)
+            dLdZdc = dLdZ.squeeze(dim=1)
+        return (None, dLdZ, *grad_params)
+
+class ReversibleSynthesis2d(autograd.Function):
+    """
+    REVERSIBLESYNTHESIS2D
+
+       Activation-free backpropagation through NsoltSynthesis2dNetwork.
+       The final rotation V0~ is not invertible because it drops the
+       redundant channels, so only its input is kept for each level.
+       The other layers are reconstructed by the inverse layers.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @staticmethod
+    def forward(ctx, network, nInputs, *args):
+        ctx.network = network
+        nLevels = network.number_of_levels
+        inputs = args[:nInputs]
+        checkpoints = [ None ]*nLevels
+        with torch.no_grad():
+            Zdc = inputs[nLevels]
+            for iLv in range(nLevels-1,-1,-1):
+                layers = network.layers[iLv]
+                Z = layers[0](inputs[iLv],Zdc)
+                for layer in layers[1:-2]:
+                    Z = layer(Z)
+                checkpoints[iLv] = Z
+                for layer in layers[-2:]:
+                    Z = layer(Z)
+                Zdc = Z.squeeze(dim=1)
+        ctx.save_for_backward(*checkpoints)
+        ctx.nInputs = nInputs
+        return Z
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        network = ctx.network
+        checkpoints = ctx.saved_tensors
+        params = list(network.parameters())
+        grad_params = [ None ]*len(params)
+        grad_inputs = [ None ]*ctx.nInputs
+        nLevels = network.number_of_levels
+        dLdZ = grad_output
+        for iLv in range(nLevels):
+            layers = network.layers[iLv]
+            # Final rotation and block IDCT from the checkpoint
+            X, dLdX = recompute_layer_backward_(
+                layers[-2:],checkpoints[iLv],dLdZ,params,grad_params)
+            Z, dLdZ = X, dLdX
+            for layer in reversed(layers[1:-2]):
+                with torch.no_grad():
+                    X = inverse_layer_forward(layer,Z)
+                Z, dLdZ = recompute_layer_backward_(
+                    layer,X,dLdZ,params,grad_params)
+            # Inverse of channel concatenation
+            grad_inputs[iLv] = dLdZ[:,:,:,1:]
+            dLdZ = dLdZ[:,:,:,0].unsqueeze(dim=1)
+        grad_inputs[nLevels] = dLdZ.squeeze(dim=1)
+        return (None, None, *grad_inputs, *grad_params)
+
+def inverse_layer_forward(layer,Z):
+    """
+    Inverse of an invertible NSOLT layer
+    """
+    if isinstance(layer,NsoltBlockDct2dLayer):
+        return NsoltBlockIdct2dLayer(
+            decimation_factor=layer.decimation_factor)(Z)
+    elif isinstance(layer,NsoltBlockIdct2dLayer):
+        return NsoltBlockDct2dLayer(
+            decimation_factor=layer.decimation_factor)(Z)
+    elif isinstance(layer,NsoltInitialRotation2dLayer):
+        # Transposed rotations followed by removal of zero-padded channels
+        nSamples, nrows, ncols = Z.size(0), Z.size(1), Z.size(2)
+        ps,pa = layer.number_of_channels
+        stride = layer.decimation_factor
+        nDecs = stride[0]*stride[1]
+        ms = (nDecs+1)//2
+        ma = nDecs//2
+        W0 = rotation_matrix_(layer.orthTransW0,Z.dtype)
+        U0 = rotation_matrix_(layer.orthTransU0,Z.dtype)
+        Ys = W0.T @ Z[:,:,:,:ps].reshape(-1,ps).T
+        Ya = U0.T @ Z[:,:,:,ps:].reshape(-1,pa).T
+        X = torch.cat((Ys[:ms,:],Ya[:ma,:]),dim=0)
+        return X.T.reshape(nSamples,nrows,ncols,nDecs)
+    elif isinstance(layer,NsoltIntermediateRotation2dLayer):
+        ps,pa = layer.number_of_channels
+        Un = rotation_matrix_(layer.orthTransUn,Z.dtype)
+        if layer.mode == 'Analysis':
+            Un = Un.T
+        X = Z.clone()
+        Ya = Z[:,:,:,ps:].reshape(-1,pa).T
+        X[:,:,:,ps:] = (Un @ Ya).T.reshape(Z.size(0),Z.size(1),Z.size(2),pa)
+        return X
+    elif isinstance(layer,NsoltAtomExtension2dLayer):
+        opposite = { 'Right': 'Left', 'Left': 'Right', 'Down': 'Up', 'Up': 'Down' }
+        return NsoltAtomExtension2dLayer(
+            number_of_channels=layer.number_of_channels,
+            direction=opposite[layer.direction],
+            target_channels=layer.target_channels)(Z)
+    else:
+        raise TypeError('%s : Layer is not invertible' % layer.name)
+
+def rotation_matrix_(orthtrans,dtype):
+    omgs = OrthonormalMatrixGenerationSystem(dtype=dtype,partial_difference=False)
+    return omgs(orthtrans.angles.detach(),orthtrans.mus)
+
+def recompute_layer_backward_(layers,X,dLdZ,params,grad_params):
+    """
+    Recompute layer(s) from the input and accumulate the parameter gradients
+    """
+    if not isinstance(layers,(list,torch.nn.ModuleList)):
+        layers = [ layers ]
+    with torch.enable_grad():
+        X = X.detach().requires_grad_()
+        Z = X
+        for layer in layers:
+            Z = layer(Z)
+        layer_params = [ p for layer in layers for p in layer.parameters() ]
+        grads = autograd.grad(Z,[X]+layer_params,dLdZ,allow_unused=True)
+    for p, g in zip(layer_params,grads[1:]):
+        if g is None:
+            continue
+        idx = [ i for i, q in enumerate(params) if q is p ][0]
+        grad_params[idx] = g if grad_params[idx] is None else grad_params[idx] + g
+    return X.detach(), grads[0]
+
+def zeros_if_none_(grad,X):
+    return torch.zeros_like(X) if grad is None else grad
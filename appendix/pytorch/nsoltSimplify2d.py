@@ -0,0 +1,298 @@
+import math
+import torch
+import torch.nn as nn
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltFinalRotation2dLayer import NsoltFinalRotation2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltChannelConcatenation2dLayer import NsoltChannelConcatenation2dLayer
+from nsoltMixture2d import initialrotationmatrix2d, finalrotationmatrix2d, \
+    intermediaterotationmatrix2d, butterflymatrix2d, atomextensionshift2d
+from nsoltOnnx2d import blockdctmatrix2d, lowernetwork2d
+from nsoltUtility import Direction
+
+class SimplifiedLevel2d(nn.Module):
+    """
+    SIMPLIFIEDLEVEL2D
+
+       A tree level of NSOLT with fixed angles rewritten into the minimal
+       operator sequence on the channel vectors of
+       nSamples x nRows x nCols x nChs. Drop-in replacement of
+       LoweredLevel2d, where the channel separation and concatenation are
+       left to the caller.
+
+       The operators are
+          ('matmul', M)          Z = X @ M.T
+          ('shift', sum, diff)   circular shifts (rows, cols) of the sum and
+                                 difference channels in a single pass
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        layers,
+        number_of_channels,
+        dtype=torch.get_default_dtype(),
+        atol=None):
+        super(SimplifiedLevel2d, self).__init__()
+        ps, pa = number_of_channels
+        self.number_of_channels = number_of_channels
+        self.element_size = torch.tensor([],dtype=dtype).element_size()
+        atol = 64.*torch.finfo(dtype).eps if atol is None else atol
+        ops = simplifyoperators2d(operators2d(layers,dtype),ps,atol)
+        # Concatenation of the synthesis level is done by the caller
+        nConcats = sum([ isinstance(layer,NsoltChannelConcatenation2dLayer)
+            for layer in layers ])
+
+        # Cost per block of the original layers and of the operators
+        self.original_number_of_operators = len(layers)
+        self.original_flops_per_block = 0
+        self.original_elements_per_block = nConcats*(ps+pa)
+        for layer in layers:
+            flops, elements = layercost2d(layer)
+            self.original_flops_per_block += flops
+            self.original_elements_per_block += elements
+        self.number_of_operators = len(ops) + nConcats
+        self.flops_per_block = 0
+        self.elements_per_block = nConcats*(ps+pa)
+
+        # Registration of the operators
+        self.operators = []
+        for iOp, op in enumerate(ops):
+            if op[0] == 'shift':
+                self.operators.append(op)
+            else:
+                name = 'matrix%d' % iOp
+                self.register_buffer(name,op[1].clone())
+                self.operators.append(('matmul',name))
+            flops, elements = operatorcost2d(op,ps)
+            self.flops_per_block += flops
+            self.elements_per_block += elements
+
+    def forward(self,X):
+        ps = self.number_of_channels[0]
+        Z = X
+        for op in self.operators:
+            if op[0] == 'shift':
+                Z = groupshift2d(Z,ps,op[1],op[2])
+            else:
+                Z = Z @ getattr(self,op[1]).T
+        return Z
+
+def operators2d(layers,dtype=torch.get_default_dtype()):
+    """
+    Operators of a tree level in the order of execution
+
+       ('matrix', M) for the block DCT, the rotations and the butterflies,
+       and ('shift', sum, diff) for the block shifts of the atom
+       extensions, where sum and diff are the shifts (rows, cols) of the
+       sum and difference channels. The channel separation and
+       concatenation are omitted.
+    """
+    ops = []
+    for layer in layers:
+        if isinstance(layer,NsoltBlockDct2dLayer):
+            ops.append(('matrix',blockdctmatrix2d(layer.decimation_factor,dtype)))
+        elif isinstance(layer,NsoltBlockIdct2dLayer):
+            ops.append(('matrix',blockdctmatrix2d(layer.decimation_factor,dtype).T))
+        elif isinstance(layer,NsoltInitialRotation2dLayer):
+            ops.append(('matrix',initialrotationmatrix2d(layer,dtype)))
+        elif isinstance(layer,NsoltFinalRotation2dLayer):
+            ops.append(('matrix',finalrotationmatrix2d(layer,dtype)))
+        elif isinstance(layer,NsoltIntermediateRotation2dLayer):
+            ops.append(('matrix',intermediaterotationmatrix2d(layer,dtype)))
+        elif isinstance(layer,NsoltAtomExtension2dLayer):
+            B = butterflymatrix2d(layer.number_of_channels[0],dtype)
+            shift, dim = atomextensionshift2d(layer)
+            offset = [ (0,0), (0,0) ]
+            offset[layer.target_channels == 'Difference'] = \
+                (shift,0) if dim == 1 else (0,shift)
+            ops.extend([ ('matrix',B), ('shift',*offset), ('matrix',B/2.) ])
+    return ops
+
+def simplifyoperators2d(ops,ps,atol=0.):
+    """
+    Rewrite the operators into the minimal sequence
+
+       Adjacent matrices are multiplied, e.g. B B/2 = I, adjacent shifts
+       are added up and identities are removed. A matrix block-diagonal in
+       the sum and difference channels commutes with the block shifts, so
+       that it is moved across them to be merged into the nearest matrix.
+       The rules are applied until no more operator is removed.
+    """
+    ops = list(ops)
+    changed = True
+    while changed:
+        changed = False
+        # Merge of adjacent operators of the same kind
+        merged = []
+        for op in ops:
+            if merged and merged[-1][0] == op[0] == 'matrix':
+                merged[-1] = ('matrix',op[1] @ merged[-1][1])
+            elif merged and merged[-1][0] == op[0] == 'shift':
+                merged[-1] = ('shift',
+                    tuple(a+b for a, b in zip(merged[-1][1],op[1])),
+                    tuple(a+b for a, b in zip(merged[-1][2],op[2])))
+            else:
+                merged.append(op)
+        merged = [ op for op in merged if not isidentity_(op,atol) ]
+        changed = len(merged) < len(ops)
+        ops = merged
+        # Block-diagonal matrices moved across the shifts
+        for iOp, op in enumerate(ops):
+            if op[0] != 'matrix' or not isblockdiag_(op[1],ps,atol):
+                continue
+            iLeft = iOp-1
+            while iLeft >= 0 and ops[iLeft][0] == 'shift':
+                iLeft -= 1
+            iRight = iOp+1
+            while iRight < len(ops) and ops[iRight][0] == 'shift':
+                iRight += 1
+            if iLeft >= 0:
+                ops[iLeft] = ('matrix',op[1] @ ops[iLeft][1])
+            elif iRight < len(ops):
+                ops[iRight] = ('matrix',ops[iRight][1] @ op[1])
+            else:
+                continue
+            del ops[iOp]
+            changed = True
+            break
+    return ops
+
+def layercost2d(layer):
+    """
+    FLOPs and elements of the output per block of an NSOLT layer
+
+       A multiply-add is counted as two FLOPs, and the block DCT and IDCT
+       as the dense nDecs x nDecs products.
+    """
+    if isinstance(layer,(NsoltBlockDct2dLayer,NsoltBlockIdct2dLayer)):
+        nDecs = layer.decimation_factor[0]*layer.decimation_factor[1]
+        return 2*nDecs*nDecs, nDecs
+    if isinstance(layer,(NsoltInitialRotation2dLayer,NsoltFinalRotation2dLayer)):
+        ps, pa = layer.number_of_channels
+        nDecs = layer.decimation_factor[0]*layer.decimation_factor[1]
+        ms = int(math.ceil(nDecs/2.))
+        flops = 2*(ps*ms+pa*(nDecs-ms))
+        return flops, ps+pa if isinstance(layer,NsoltInitialRotation2dLayer) else nDecs
+    if isinstance(layer,NsoltIntermediateRotation2dLayer):
+        ps, pa = layer.number_of_channels
+        return 2*pa*pa, ps+pa
+    if isinstance(layer,NsoltAtomExtension2dLayer):
+        # Butterfly, block shift and butterfly with scaling
+        nChsTotal = sum(layer.number_of_channels)
+        return 3*nChsTotal, 3*nChsTotal
+    # The channel separation returns views and the concatenation is
+    # common to the original and simplified networks
+    return 0, 0
+
+def operatorcost2d(op,ps):
+    """
+    FLOPs and elements of the output per block of an operator of
+    simplifyoperators2d
+    """
+    if op[0] == 'matrix':
+        nOut, nIn = op[1].shape
+        return 2*nOut*nIn, nOut
+    return 0, ps+ps # Shift of Type-I NSOLT
+
+def groupshift2d(X,ps,sumshift,diffshift):
+    """
+    Circular shifts (rows, cols) of the sum and difference channels of
+    nSamples x nRows x nCols x nChs, written into a single output
+    """
+    Z = torch.empty_like(X)
+    nrows, ncols = X.size(1), X.size(2)
+    for channels, shift in [ (slice(None,ps),sumshift), (slice(ps,None),diffshift) ]:
+        r, c = shift[0] % nrows, shift[1] % ncols
+        for dstRows, srcRows in [ (slice(r,None),slice(None,nrows-r)),
+            (slice(None,r),slice(nrows-r,None)) ]:
+            for dstCols, srcCols in [ (slice(c,None),slice(None,ncols-c)),
+                (slice(None,c),slice(ncols-c,None)) ]:
+                Z[:,dstRows,dstCols,channels] = X[:,srcRows,srcCols,channels]
+    return Z
+
+def simplifynetwork2d(network,atol=None):
+    """
+    Simplify NsoltAnalysis2dNetwork or NsoltSynthesis2dNetwork with the
+    current angles
+
+       Returns the lowered network of lowernetwork2d whose levels are
+       replaced by SimplifiedLevel2d.
+    """
+    simplified = lowernetwork2d(network)
+    dtype = next(network.parameters()).dtype
+    with torch.no_grad():
+        simplified.levels = nn.ModuleList([ SimplifiedLevel2d(layers,
+            network.number_of_channels,dtype,atol)
+            for layers in network.layers ])
+    return simplified
+
+def simplificationreport2d(simplified,height,width,number_of_samples=1):
+    """
+    FLOPs and memory saved by simplifynetwork2d for images of
+    number_of_samples x 1 x height x width
+
+       Returns a dictionary of the pairs (original, simplified) of
+       'number_of_operators', 'flops' and 'bytes', where 'bytes' counts the
+       intermediate outputs, and of 'flops_saved' and 'bytes_saved'. The
+       FLOPs saved may be negative for general angles, since the adds of
+       the butterflies are folded into dense products, which trade
+       arithmetic for fewer passes over memory.
+    """
+    stride = simplified.decimation_factor
+    report = { 'number_of_operators': [0, 0], 'flops': [0, 0], 'bytes': [0, 0] }
+    for iLv, level in enumerate(simplified.levels,1):
+        nBlocks = number_of_samples \
+            * (height//stride[Direction.VERTICAL]**iLv) \
+            * (width//stride[Direction.HORIZONTAL]**iLv)
+        report['number_of_operators'][0] += level.original_number_of_operators
+        report['number_of_operators'][1] += level.number_of_operators
+        report['flops'][0] += nBlocks*level.original_flops_per_block
+        report['flops'][1] += nBlocks*level.flops_per_block
+        report['bytes'][0] += nBlocks*level.original_elements_per_block*level.element_size
+        report['bytes'][1] += nBlocks*level.elements_per_block*level.element_size
+    report = { key: tuple(value) for key, value in report.items() }
+    report['flops_saved'] = report['flops'][0]-report['flops'][1]
+    report['bytes_saved'] = report['bytes'][0]-report['bytes'][1]
+    return report
+
+def isidentity_(op,atol):
+    if op[0] == 'shift':
+        return not any(op[1]) and not any(op[2])
+    M = op[1]
+    return M.size(0) == M.size(1) and \
+        bool(torch.all(torch.abs(M-torch.eye(M.size(0),dtype=M.dtype)) <= atol))
+
+def isblockdiag_(M,ps,atol):
+    return M.size(0) == M.size(1) and M.size(0) > ps and \
+        bool(torch.all(torch.abs(M[:ps,ps:]) <= atol)) and \
+        bool(torch.all(torch.abs(M[ps:,:ps]) <= atol))
+
+if __name__ == '__main__':
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [4, 4], 'number_of_levels': 3 }
+    for network_class in [ NsoltAnalysis2dNetwork, NsoltSynthesis2dNetwork ]:
+        network = network_class(**config)
+        for angles in [ 'initial', 'random' ]:
+            if angles == 'random':
+                for parameter in network.parameters():
+                    parameter.data = torch.randn_like(parameter)
+            report = simplificationreport2d(simplifynetwork2d(network),512,512)
+            print('%s (%s angles)' % (network_class.__name__,angles))
+            for key, value in report.items():
+                print('  %s: %s' % (key,value))
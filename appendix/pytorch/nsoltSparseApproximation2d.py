@@ -0,0 +1,362 @@
+import torch
+import torch.nn as nn
+from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
+from nsoltSubbandDeserialization2dLayer import NsoltSubbandDeserialization2dLayer
+
+class AbstSparseApproximationSystem(nn.Module):
+    """
+    ABSTSPARSEAPPROXIMATIONSYSTEM Sparse approximation with NSOLT
+
+       原画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       近似画像のバッチ出力:
+          nSamples x nComponents x nRows x nCols
+
+       係数の出力:
+          ( Lv1 AC, ..., LvN AC, LvN DC ) of nSamples*nComponents images
+
+       Port of +sparserep/AbstSparseApproximationSystem.m with the
+       synthesizer of a Parseval tight NSOLT and its adjoint, i.e. the
+       analyzer, as the dictionary. The coefficients are serialized into
+       a buffer of nImages x nElements, and all the components of all
+       the samples are approximated in parallel. The step monitor, e.g.
+       StepMonitoringSystem, is called as in IstaImRestoration2d.
+
+       The subclasses give the state of the images by a dictionary of
+       tensors indexed by the first dimension, and iterate_() and
+       approximation_() of the state, by which iterate_until_() repeats
+       the iterations and drops each image from the batch as it stops.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        adj_of_synthesizer,
+        number_of_sparse_coefficients=1,
+        step_monitor=None):
+        super(AbstSparseApproximationSystem, self).__init__()
+        self.synthesizer = synthesizer
+        self.adj_of_synthesizer = adj_of_synthesizer
+        self.number_of_sparse_coefficients = number_of_sparse_coefficients
+        self.step_monitor = step_monitor
+        self.number_of_iterations = None
+
+    def setup_(self,X):
+        height, width = X.shape[-2:]
+        config = { 'original_dimension': [height, width],
+            'number_of_channels': self.synthesizer.number_of_channels,
+            'decimation_factor': self.synthesizer.decimation_factor,
+            'number_of_levels': self.synthesizer.number_of_levels }
+        self.serializer_ = NsoltSubbandSerialization2dLayer(**config)
+        self.deserializer_ = NsoltSubbandDeserialization2dLayer(**config)
+        if self.step_monitor is not None:
+            self.step_monitor.reset(X.size(0)*X.size(1),X.dtype,X.device)
+        return X.reshape(-1,1,height,width)
+
+    def iterate_until_(self,X,state,tolerance,max_iter):
+        """
+        Iterations of iterate_() over the batch of images not converged
+        yet, where each image stops when the error returned by iterate_()
+        gets less than tolerance or after max_iter iterations, which
+        returns the approximation and the coefficients of X
+        """
+        x, y = state['x'], state['y']
+        result = torch.empty_like(x)
+        coefs = torch.empty_like(y)
+        nItrs = torch.zeros(x.size(0),dtype=torch.long)
+        active = torch.arange(x.size(0),device=x.device)
+        nItr = 0
+        while active.numel() > 0:
+            nItr += 1
+            err = self.iterate_(state,nItr)
+            if self.step_monitor is not None:
+                self.step_monitor(self.approximation_(state),active)
+            done = err < tolerance if nItr < max_iter \
+                else torch.ones_like(err,dtype=torch.bool)
+            if bool(done.any()):
+                result[active[done]] = self.approximation_(state)[done]
+                coefs[active[done]] = state['y'][done]
+                nItrs[active[done].cpu()] = nItr
+                keep = ~done
+                active = active[keep]
+                state = { key: value[keep] for key, value in state.items() }
+        self.number_of_iterations = nItrs.view(X.shape[:2])
+        if self.step_monitor is not None:
+            self.step_monitor.finish(result)
+        return result.view(X.shape), self.deserializer_(coefs)
+
+    def analyze_(self,h,out=None):
+        return self.serializer_(*self.adj_of_synthesizer(h),out=out) \
+            .view(h.size(0),-1)
+
+    def synthesize_(self,y):
+        return self.synthesizer(*self.deserializer_(y))
+
+class IterativeHardThresholding(AbstSparseApproximationSystem):
+    """
+    ITERATIVEHARDTHRESHOLDING Iterative hard thresholding with NSOLT
+
+       Port of +sparserep/IterativeHardThresholding.m, whose iteration is
+
+          y <- H_K(y + mu D^T (x - D y))
+
+       where H_K keeps the K = number_of_sparse_coefficients largest
+       coefficients in magnitude of each image. Each image stops
+       independently when ||y^(n) - y^(n-1)||/nElements < tol_rmse or
+       after max_iter iterations, and is dropped from the batch.
+
+       Instead of sorting all the coefficients, H_K keeps the
+       coefficients not less than the threshold of the K-th largest
+       magnitude. The threshold of the previous iteration is kept, and
+       the K-th largest magnitude is selected again by kthlargest2d()
+       only for the images whose number of coefficients over the
+       threshold differs from K by more than support_tolerance*K, e.g.
+       when the support barely changes near the convergence. With the
+       default support_tolerance of zero, exactly K coefficients are
+       kept unless they tie. The selection is made in chunks of at most
+       max_elements.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        adj_of_synthesizer,
+        number_of_sparse_coefficients=1,
+        mu=(1-1e-3),
+        tol_rmse=1e-7,
+        max_iter=1000,
+        support_tolerance=0.,
+        max_elements=2**24,
+        step_monitor=None):
+        super(IterativeHardThresholding, self).__init__(
+            synthesizer,
+            adj_of_synthesizer,
+            number_of_sparse_coefficients=number_of_sparse_coefficients,
+            step_monitor=step_monitor)
+        self.mu = mu
+        self.tol_rmse = tol_rmse
+        self.max_iter = max_iter
+        self.support_tolerance = support_tolerance
+        self.max_elements = max_elements
+        self.number_of_selections = None
+
+    @torch.no_grad()
+    def forward(self,X):
+        x = self.setup_(X)
+        nImages = x.size(0)
+        nElements = self.serializer_.number_of_elements
+        self.number_of_coefficients_ = min(self.number_of_sparse_coefficients,nElements)
+
+        y = x.new_zeros(nImages,nElements)
+        state = { 'x': x, 'hu': torch.zeros_like(x), 'y': y,
+            'ypre': torch.empty_like(y), 'v': torch.empty_like(y),
+            'tmp': torch.empty_like(y),
+            'threshold': x.new_full((nImages,1),float('inf')) }
+        self.number_of_selections = 0
+        return self.iterate_until_(X,state,self.tol_rmse,self.max_iter)
+
+    def iterate_(self,state,nItr):
+        """
+        y <- H_K(y + mu D^T (x - D y)) and hu <- D y
+
+           Returns the RMSE between the successive coefficients of each
+           image.
+        """
+        y, ynew, tmp = state['y'], state['ypre'], state['tmp']
+        v = self.analyze_(torch.sub(state['x'],state['hu']),out=state['v'])
+        torch.add(y,v,alpha=self.mu,out=ynew)
+        self.hardthresholding_(ynew,state['threshold'],tmp)
+        torch.sub(ynew,y,out=tmp)
+        err = torch.linalg.vector_norm(tmp,dim=1)/y.size(1)
+        state['y'], state['ypre'] = ynew, y
+        state['hu'] = self.synthesize_(ynew)
+        return err
+
+    def approximation_(self,state):
+        return state['hu']
+
+    def hardthresholding_(self,y,threshold,tmp):
+        """
+        In-place y <- H_K(y) with the threshold of the K-th largest
+        magnitude, which is updated in place only for the images whose
+        support size with the previous one is out of the tolerance
+        """
+        nCoefs = self.number_of_coefficients_
+        torch.abs(y,out=tmp)
+        nSupports = tmp.ge(threshold).sum(dim=1)
+        stale = (nSupports-nCoefs).abs() > self.support_tolerance*nCoefs
+        if bool(stale.any()):
+            index = stale.nonzero().view(-1)
+            threshold[index] = kthlargest2d(tmp[index],nCoefs,self.max_elements)
+            self.number_of_selections += index.numel()
+        return y.mul_(tmp.ge_(threshold))
+
+class GradientPursuit(AbstSparseApproximationSystem):
+    """
+    GRADIENTPURSUIT Gradient pursuit with NSOLT
+
+       Port of +sparserep/GradientPursuit.m, which adds the coefficient
+       of the largest gradient in magnitude to the active set and steps
+       along the gradient restricted to the set, i.e.
+
+          g <- D^T r, S <- S U { argmax |g_i| }, d <- g_S
+          c <- D d, a <- <r, c>/||c||^2
+          y <- y + a d, r <- r - a c
+
+       for K = number_of_sparse_coefficients iterations, which evaluate
+       one analysis and one synthesis. The active sets are kept as the
+       index tensor of nImages x K, by which the restricted gradients are
+       gathered and scattered. As TolErr of IterativeSparseApproximater.m,
+       each image stops when the RMSE of the update a c gets less than
+       tol_err and is dropped from the batch. The number of iterations
+       of each image is stored in number_of_iterations.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        synthesizer,
+        adj_of_synthesizer,
+        number_of_sparse_coefficients=1,
+        tol_err=0.,
+        step_monitor=None):
+        super(GradientPursuit, self).__init__(
+            synthesizer,
+            adj_of_synthesizer,
+            number_of_sparse_coefficients=number_of_sparse_coefficients,
+            step_monitor=step_monitor)
+        self.tol_err = tol_err
+
+    @torch.no_grad()
+    def forward(self,X):
+        x = self.setup_(X)
+        nImages = x.size(0)
+        nElements = self.serializer_.number_of_elements
+        nCoefs = min(self.number_of_sparse_coefficients,nElements)
+
+        y = x.new_zeros(nImages,nElements)
+        state = { 'x': x, 'r': x.clone(), 'y': y,
+            'g': torch.empty_like(y), 'd': torch.empty_like(y),
+            'support': torch.empty(nImages,nCoefs,dtype=torch.long,device=X.device) }
+        return self.iterate_until_(X,state,self.tol_err,nCoefs)
+
+    def iterate_(self,state,nItr):
+        """
+        Step along the gradient restricted to the active set
+
+           Returns the RMSE of the update of each image.
+        """
+        r, y, d = state['r'], state['y'], state['d']
+        g = self.analyze_(r,out=state['g'])
+        support = state['support'][:,:nItr]
+        support[:,-1] = g.abs().argmax(dim=1)
+        d.zero_().scatter_(1,support,g.gather(1,support))
+        c = self.synthesize_(d)
+        dims = (1,2,3)
+        norm2 = c.square().sum(dim=dims)
+        a = torch.where(norm2 > 0,(r*c).sum(dim=dims)/norm2,torch.zeros_like(norm2))
+        y.addcmul_(d,a.view(-1,1))
+        r.addcmul_(c,a.view(-1,1,1,1),value=-1.)
+        return a.abs()*norm2.sqrt()/c[0].numel()**0.5
+
+    def approximation_(self,state):
+        return state['x']-state['r']
+
+def kthlargest2d(A,k,max_elements=2**24):
+    """
+    K-th largest value of each row of A of nRows x nCols as nRows x 1
+
+       Selected by kthvalue() without sorting. If A has more than
+       max_elements, the k largest values of each chunk of columns are
+       taken by topk() as the candidates, which are selected again.
+    """
+    nRows, nCols = A.shape
+    width = max(2*k,max_elements//nRows)
+    if width >= nCols:
+        return A.kthvalue(nCols-k+1,dim=1,keepdim=True).values
+    candidates = torch.cat([ chunk.topk(min(k,chunk.size(1)),dim=1,sorted=False).values
+        for chunk in A.split(width,dim=1) ],dim=1)
+    return kthlargest2d(candidates,k,max_elements)
+
+if __name__ == '__main__':
+    import time
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    from nsoltUtility import cpparamsana2syn
+    from nsoltSimplify2d import simplifynetwork2d
+    # Hard thresholding of the K largest of 4M coefficients
+    A = torch.randn(1,2**22).abs()
+    nCoefs = A.size(1)//20
+    for name, select in [ ('sort', lambda: A.sort(dim=1,descending=True).values[:,nCoefs-1:nCoefs]),
+        ('kthlargest2d', lambda: kthlargest2d(A,nCoefs)),
+        ('kthlargest2d (chunked)', lambda: kthlargest2d(A,nCoefs,max_elements=2**20)) ]:
+        start = time.perf_counter()
+        threshold = select()
+        print('%s: %.3f s' % (name,time.perf_counter()-start))
+    start = time.perf_counter()
+    int(A.ge(threshold).sum())
+    print('support size with the previous threshold: %.3f s' % (time.perf_counter()-start))
+    # Iterative hard thresholding of a batch of images
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    analyzer = NsoltAnalysis2dNetwork(**config)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    synthesizer = cpparamsana2syn(NsoltSynthesis2dNetwork(**config),analyzer)
+    analyzer, synthesizer = simplifynetwork2d(analyzer), simplifynetwork2d(synthesizer)
+    nSamples = 16
+    X = torch.rand(nSamples,1,256,256)
+    iht = IterativeHardThresholding(synthesizer,analyzer,
+        number_of_sparse_coefficients=256*256//20,tol_rmse=0.,max_iter=30)
+    start = time.perf_counter()
+    for X1 in X.split(1):
+        iht(X1)
+    single = nSamples/(time.perf_counter()-start)
+    start = time.perf_counter()
+    iht(X)
+    batched = nSamples/(time.perf_counter()-start)
+    print('IterativeHardThresholding: %.1f images/s (one by one), %.1f images/s (batched), %d selections' \
+        % (single,batched,iht.number_of_selections))
+    gp = GradientPursuit(synthesizer,analyzer,number_of_sparse_coefficients=100)
+    start = time.perf_counter()
+    for X1 in X.split(1):
+        gp(X1)
+    single = nSamples/(time.perf_counter()-start)
+    start = time.perf_counter()
+    gp(X)
+    batched = nSamples/(time.perf_counter()-start)
+    print('GradientPursuit: %.1f images/s (one by one), %.1f images/s (batched)' \
+        % (single,batched))
@@ -0,0 +1,205 @@
+import math
+import time
+import torch
+from nsoltLayerExceptions import InvalidOption
+
+class StepMonitoringSystem:
+    """
+    STEPMONITORINGSYSTEM Monitor and evaluate step results
+
+       原画像:
+          nSamples x nComponents x nRows x nCols
+
+       各ステップの結果のバッチ入力:
+          nImages x 1 x nRows x nCols
+
+       Port of +utility/StepMonitoringSystem.m for the solvers such as
+       IstaImRestoration2d, which call reset() before the iterations, the
+       monitor with the result of each iteration and finish() with the
+       final result. The MSE to the source image is evaluated every
+       period iterations, and not earlier than time_interval seconds
+       after the previous evaluation, and kept on the device of the
+       results in a buffer preallocated for max_iter iterations, so that
+       no synchronization with the host is made during the iterations.
+       The PSNR and RMSE are given by the MSE in summary(), which is
+       printed by finish() if is_verbose.
+
+       The results of the images may be given for a part of the batch by
+       the index of the images, e.g. the images not converged yet, and
+       the MSEs of the others are NaN. With evaluation_type of 'uint8',
+       the images are quantized to 8 bits before the evaluation as
+       im2uint8 of StepMonitoringSystem.m. A monitor without any metric
+       does nothing but counting the iterations.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        source_image=None,
+        max_iter=1000,
+        is_mse=False,
+        is_psnr=False,
+        is_rmse=False,
+        is_verbose=False,
+        evaluation_type='double',
+        period=1,
+        time_interval=0.):
+        if evaluation_type not in [ 'uint8', 'double' ]:
+            raise InvalidOption(
+                '%s : Invalid evaluation type' % evaluation_type
+            )
+        self.source_image = source_image
+        self.max_iter = max_iter
+        self.is_mse = is_mse
+        self.is_psnr = is_psnr
+        self.is_rmse = is_rmse
+        self.is_verbose = is_verbose
+        self.evaluation_type = evaluation_type
+        self.period = period
+        self.time_interval = time_interval
+        self.number_of_iterations = 0
+        self.number_of_records = 0
+        self.mses_ = None
+
+    @property
+    def peak_value(self):
+        return 255. if self.evaluation_type == 'uint8' else 1.
+
+    @property
+    def mses(self):
+        return self.summary()['mse']
+
+    @property
+    def psnrs(self):
+        return self.summary()['psnr']
+
+    @property
+    def rmses(self):
+        return self.summary()['rmse']
+
+    def reset(self,number_of_images=None,dtype=None,device=None):
+        """
+        Preallocation of the buffer for number_of_images images, which
+        is the number of the images of the source image if not given
+        """
+        self.number_of_iterations = 0
+        self.number_of_records = 0
+        self.time_ = -math.inf
+        if not (self.is_mse or self.is_psnr or self.is_rmse):
+            self.mses_ = None
+            return
+        source = self.source_image
+        self.source_ = self.convert_(
+            source.reshape(-1,1,*source.shape[-2:]).to(dtype=dtype,device=device))
+        nImages = self.source_.size(0) if number_of_images is None else number_of_images
+        # Evaluations at every period iterations and the final one
+        nRecords = self.max_iter//self.period+1
+        self.iterations_ = torch.zeros(nRecords,dtype=torch.long)
+        self.mses_ = self.source_.new_full((nRecords,nImages),math.nan)
+
+    def __call__(self,result,index=None):
+        self.number_of_iterations += 1
+        if self.mses_ is None or self.number_of_iterations % self.period != 0 \
+            or self.number_of_records >= self.mses_.size(0)-1:
+            return
+        if self.time_interval > 0.:
+            now = time.perf_counter()
+            if now-self.time_ < self.time_interval:
+                return
+            self.time_ = now
+        self.record_(result,index)
+
+    def finish(self,result):
+        """
+        Evaluation of the final result, which returns summary()
+        """
+        if self.mses_ is not None:
+            self.record_(result,None)
+        summary = self.summary()
+        if self.is_verbose:
+            for iRecord, nItr in enumerate(summary.get('iterations',[])):
+                line = '(% 4d) ' % nItr
+                if 'mse' in summary:
+                    line += ' MSE = %6.4g ' % summary['mse'][iRecord].nanmean()
+                if 'psnr' in summary:
+                    line += ' PSNR = %6.2f [dB] ' % summary['psnr'][iRecord].nanmean()
+                if 'rmse' in summary:
+                    line += ' RMSE = %6.4g ' % summary['rmse'][iRecord].nanmean()
+                print(line)
+        return summary
+
+    def summary(self):
+        """
+        Dictionary of the iterations of nRecords and the metrics of
+        nRecords x nImages, where the last record is of the final result
+        """
+        if self.mses_ is None:
+            return {}
+        nRecords = self.number_of_records
+        mses = self.mses_[:nRecords]
+        summary = { 'iterations': self.iterations_[:nRecords] }
+        if self.is_mse:
+            summary['mse'] = mses
+        if self.is_psnr:
+            summary['psnr'] = 10.*torch.log10(self.peak_value**2/mses)
+        if self.is_rmse:
+            summary['rmse'] = mses.sqrt()
+        return summary
+
+    def record_(self,result,index):
+        source = self.source_ if index is None else self.source_[index]
+        mse = torch.sub(self.convert_(result),source).square_().mean(dim=(1,2,3))
+        row = self.mses_[self.number_of_records]
+        if index is None:
+            row.copy_(mse)
+        else:
+            row.index_copy_(0,index,mse)
+        self.iterations_[self.number_of_records] = self.number_of_iterations
+        self.number_of_records += 1
+
+    def convert_(self,X):
+        if self.evaluation_type == 'uint8':
+            return X.clamp(0.,1.).mul(255.).round_()
+        return X
+
+if __name__ == '__main__':
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+    from nsoltUtility import cpparamsana2syn
+    from nsoltSimplify2d import simplifynetwork2d
+    from nsoltIsta2d import IstaImRestoration2d
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    analyzer = NsoltAnalysis2dNetwork(**config)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    synthesizer = cpparamsana2syn(NsoltSynthesis2dNetwork(**config),analyzer)
+    analyzer, synthesizer = simplifynetwork2d(analyzer), simplifynetwork2d(synthesizer)
+    srcImg = torch.rand(32,1,128,128)
+    obsImg = srcImg+0.1*torch.randn_like(srcImg)
+    monitors = { 'none': None,
+        'MSE/PSNR every iteration': StepMonitoringSystem(source_image=srcImg,
+            max_iter=100,is_mse=True,is_psnr=True),
+        'MSE/PSNR every 10 iterations': StepMonitoringSystem(source_image=srcImg,
+            max_iter=100,is_mse=True,is_psnr=True,period=10),
+        'MSE/PSNR every 0.1 s': StepMonitoringSystem(source_image=srcImg,
+            max_iter=100,is_mse=True,is_psnr=True,time_interval=0.1) }
+    for name, monitor in monitors.items():
+        solver = IstaImRestoration2d(synthesizer,analyzer,lambda_=0.05,eps0=0.,
+            max_iter=100,step_monitor=monitor)
+        start = time.perf_counter()
+        solver(obsImg)
+        elapsed = time.perf_counter()-start
+        nRecords = 0 if monitor is None else monitor.number_of_records
+        print('%s: %.3f s (%d records)' % (name,elapsed,nRecords))
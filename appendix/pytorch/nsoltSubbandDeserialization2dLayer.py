@@ -1,10 +1,98 @@
 import torch
 import torch.nn as nn
+from nsoltUtility import Direction, subbandoffsets2d
 
 class NsoltSubbandDeserialization2dLayer(nn.Module):
+    """
+    NSOLTSUBBANDDESERIALIZATION2DLAYER
 
-    def __init__(self):
+       １コンポーネント入力(BSSC):
+          nSamples x 1 x 1 x nElements
+
+       複数コンポーネント出力 (BSSC):（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+          nSamples x nRowsLv2 x nColsLv2 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       The outputs are strided views into the input vector given by the
+       same offset index as NsoltSubbandSerialization2dLayer, so that no
+       coefficients are copied. The outputs can be fed directly to
+       NsoltSynthesis2dNetwork.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name='',
+        original_dimension=[8, 8],
+        number_of_channels=[2, 2],
+        decimation_factor=[2, 2],
+        number_of_levels=1):
         super(NsoltSubbandDeserialization2dLayer, self).__init__()
+        self.name = name
+        self.original_dimension = original_dimension
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.number_of_levels = number_of_levels
+        self.description = "Subband deserialization " \
+                + "(h,w) = (" \
+                + str(self.original_dimension[Direction.VERTICAL]) + "," \
+                + str(self.original_dimension[Direction.HORIZONTAL]) + "), " \
+                + "lv = " \
+                + str(self.number_of_levels) + ", " \
+                + "(ps,pa) = (" \
+                + str(self.number_of_channels[0]) + "," \
+                + str(self.number_of_channels[1]) + "), " \
+                + "(mv,mh) = (" \
+                + str(self.decimation_factor[Direction.VERTICAL]) + "," \
+                + str(self.decimation_factor[Direction.HORIZONTAL]) + ")"
+
+    @property
+    def offsets(self):
+        """
+        Offset index as (offset, (nRows, nCols, nChs)) for each output
+        """
+        return subbandoffsets2d(
+            self.original_dimension,
+            self.number_of_channels,
+            self.decimation_factor,
+            self.number_of_levels)[0]
+
+    @property
+    def number_of_elements(self):
+        return subbandoffsets2d(
+            self.original_dimension,
+            self.number_of_channels,
+            self.decimation_factor,
+            self.number_of_levels)[1]
+
+    @property
+    def scales(self):
+        """
+        Scales in the serialized order, i.e. DC and AC of levels N to 1
+        """
+        return [ scale for _, scale in sorted(self.offsets) ]
 
-    def forward(self,x):
-        return x
\ No newline at end of file
+    def forward(self,X):
+        nSamples = X.size(dim=0)
+        X = X.reshape(nSamples,self.number_of_elements)
+        Y = []
+        for offset, scale in self.offsets:
+            nSubElements = scale[0]*scale[1]*scale[2]
+            Y.append(X[:,offset:offset+nSubElements].view(nSamples,*scale))
+        # DC without the channel dimension
+        Y[-1] = Y[-1].squeeze(dim=3)
+        return tuple(Y)
@@ -1,10 +1,100 @@
 import torch
 import torch.nn as nn
+from nsoltUtility import Direction, subbandoffsets2d
 
 class NsoltSubbandSerialization2dLayer(nn.Module):
+    """
+    NSOLTSUBBANDSERIALIZATION2DLAYER
 
-    def __init__(self):
+       複数コンポーネント入力 (BSSC):（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+          nSamples x nRowsLv2 x nColsLv2 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN (x 1)
+
+       １コンポーネント出力(BSSC):
+          nSamples x 1 x 1 x nElements
+
+       Each subband is written into its slice of a single flat buffer
+       given by the offset index, so that no intermediate vectors are
+       concatenated. The buffer can be supplied by the keyword 'out'.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def __init__(self,
+        name='',
+        original_dimension=[8, 8],
+        number_of_channels=[2, 2],
+        decimation_factor=[2, 2],
+        number_of_levels=1):
         super(NsoltSubbandSerialization2dLayer, self).__init__()
+        self.name = name
+        self.original_dimension = original_dimension
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.number_of_levels = number_of_levels
+        self.description = "Subband serialization " \
+                + "(h,w) = (" \
+                + str(self.original_dimension[Direction.VERTICAL]) + "," \
+                + str(self.original_dimension[Direction.HORIZONTAL]) + "), " \
+                + "lv = " \
+                + str(self.number_of_levels) + ", " \
+                + "(ps,pa) = (" \
+                + str(self.number_of_channels[0]) + "," \
+                + str(self.number_of_channels[1]) + "), " \
+                + "(mv,mh) = (" \
+                + str(self.decimation_factor[Direction.VERTICAL]) + "," \
+                + str(self.decimation_factor[Direction.HORIZONTAL]) + ")"
+
+    @property
+    def offsets(self):
+        """
+        Offset index as (offset, (nRows, nCols, nChs)) for each input
+        """
+        return subbandoffsets2d(
+            self.original_dimension,
+            self.number_of_channels,
+            self.decimation_factor,
+            self.number_of_levels)[0]
+
+    @property
+    def number_of_elements(self):
+        return subbandoffsets2d(
+            self.original_dimension,
+            self.number_of_channels,
+            self.decimation_factor,
+            self.number_of_levels)[1]
+
+    @property
+    def scales(self):
+        """
+        Scales in the serialized order, i.e. DC and AC of levels N to 1
+        """
+        return [ scale for _, scale in sorted(self.offsets) ]
 
-    def forward(self,x):
-        return x
\ No newline at end of file
+    def forward(self,*args,out=None):
+        nSamples = args[0].size(dim=0)
+        nElements = self.number_of_elements
+        if out is None:
+            out = torch.empty(nSamples,nElements,
+                dtype=args[0].dtype,device=args[0].device)
+        else:
+            out = out.view(nSamples,nElements)
+        for X, (offset, scale) in zip(args,self.offsets):
+            nSubElements = scale[0]*scale[1]*scale[2]
+            out[:,offset:offset+nSubElements].view(nSamples,*scale).copy_(
+                X.reshape(nSamples,*scale))
+        return out.view(nSamples,1,1,nElements)
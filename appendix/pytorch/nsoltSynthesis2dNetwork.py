@@ -0,0 +1,159 @@
+import torch
+import torch.nn as nn
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltFinalRotation2dLayer import NsoltFinalRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltChannelConcatenation2dLayer import NsoltChannelConcatenation2dLayer
+from nsoltLayerExceptions import InvalidNumberOfChannels, InvalidPolyPhaseOrder
+from nsoltReversible2d import ReversibleSynthesis2d
+from nsoltUtility import Direction
+
+class NsoltSynthesis2dNetwork(nn.Module):
+    """
+    NSOLTSYNTHESIS2DNETWORK
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nRowsLv1 x nColsLv1 x (nChsTotal-1)
+          nSamples x nRowsLv2 x nColsLv2 x (nChsTotal-1)
+           :
+          nSamples x nRowsLvN x nColsLvN x (nChsTotal-1)
+          nSamples x nRowsLvN x nColsLvN
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride(1)xnRows) x (Stride(2)xnCols)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Yasas Dulanjaya and Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        number_of_channels=[2,2],
+        decimation_factor=[2,2],
+        polyphase_order=[0,0],
+        number_of_vanishing_moments=1,
+        number_of_levels=1,
+        reversible=False):
+        super(NsoltSynthesis2dNetwork, self).__init__()
+        self.number_of_channels = number_of_channels
+        self.decimation_factor = decimation_factor
+        self.polyphase_order = polyphase_order
+        self.number_of_vanishing_moments = number_of_vanishing_moments
+        self.number_of_levels = number_of_levels
+        self.reversible = reversible
+
+        # Check parameters
+        if number_of_channels[0] != number_of_channels[1]:
+            raise InvalidNumberOfChannels(
+                '[%d %d] : Currently, Type-I NSOLT is only supported, where the even and odd channel numbers should be the same.'\
+                % (number_of_channels[0],number_of_channels[1])
+            )
+        if any(order%2 for order in polyphase_order):
+            raise InvalidPolyPhaseOrder(
+                '%d + %d : Currently, even polyphase orders are only supported.'\
+                % (polyphase_order[0],polyphase_order[1])
+            )
+
+        # Instantiation of layers
+        self.layers = nn.ModuleList()
+        for iLv in range(1,number_of_levels+1):
+            strLv = 'Lv%0d_' % iLv
+            # Initial blocks
+            layers = [
+                NsoltBlockIdct2dLayer(
+                    name=strLv+'E0~',
+                    decimation_factor=decimation_factor),
+                NsoltFinalRotation2dLayer(
+                    name=strLv+'V0~',
+                    number_of_channels=number_of_channels,
+                    decimation_factor=decimation_factor,
+                    no_dc_leakage=(number_of_vanishing_moments==1))
+            ]
+            # Atom extension in horizontal
+            for iOrderH in range(2,polyphase_order[Direction.HORIZONTAL]+1,2):
+                layers.extend([
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qh'+str(iOrderH-1)+'rl~',
+                        number_of_channels=number_of_channels,
+                        direction='Left',
+                        target_channels='Difference'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vh'+str(iOrderH-1)+'~',
+                        number_of_channels=number_of_channels,
+                        mode='Synthesis',
+                        mus=-1),
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qh'+str(iOrderH)+'lu~',
+                        number_of_channels=number_of_channels,
+                        direction='Right',
+                        target_channels='Sum'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vh'+str(iOrderH)+'~',
+                        number_of_channels=number_of_channels,
+                        mode='Synthesis')
+                ])
+            # Atom extension in vertical
+            for iOrderV in range(2,polyphase_order[Direction.VERTICAL]+1,2):
+                layers.extend([
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qv'+str(iOrderV-1)+'dl~',
+                        number_of_channels=number_of_channels,
+                        direction='Up',
+                        target_channels='Difference'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vv'+str(iOrderV-1)+'~',
+                        number_of_channels=number_of_channels,
+                        mode='Synthesis',
+                        mus=-1),
+                    NsoltAtomExtension2dLayer(
+                        name=strLv+'Qv'+str(iOrderV)+'uu~',
+                        number_of_channels=number_of_channels,
+                        direction='Down',
+                        target_channels='Sum'),
+                    NsoltIntermediateRotation2dLayer(
+                        name=strLv+'Vv'+str(iOrderV)+'~',
+                        number_of_channels=number_of_channels,
+                        mode='Synthesis')
+                ])
+            # Channel concatenation
+            layers.append(
+                NsoltChannelConcatenation2dLayer(name=strLv+'Cn')
+            )
+            # Layers are stored in the order of execution
+            self.layers.append(nn.ModuleList(layers[::-1]))
+
+    def forward(self,*args):
+        if self.reversible and torch.is_grad_enabled():
+            return ReversibleSynthesis2d.apply(self,len(args),*args,*self.parameters())
+        return self.forward_layers(*args)
+
+    def forward_layers(self,*args):
+        """
+        Forward input data through the layer chain from the coarsest level.
+
+        The block IDCT of each level writes its output directly into the
+        DC slot of the buffer preallocated by the channel concatenation of
+        the finer level.
+        """
+        nLevels = self.number_of_levels
+        Z = self.layers[nLevels-1][0](args[nLevels-1],args[nLevels])
+        for iLv in range(nLevels-1,-1,-1):
+            layers = self.layers[iLv]
+            for layer in layers[1:-1]:
+                Z = layer(Z)
+            if iLv > 0:
+                Zcn = self.layers[iLv-1][0].allocate(args[iLv-1])
+                Z = layers[-1](Z,out=Zcn[:,:,:,0].unsqueeze(dim=1))
+                Z = Zcn
+            else:
+                Z = layers[-1](Z)
+        return Z
@@ -0,0 +1,21 @@
+import torch
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import cpparamsana2syn
+
+def randomdictionary2d(number_of_channels=[2,2],decimation_factor=[2,2],
+    polyphase_order=[0,0],number_of_levels=1,datatype=torch.get_default_dtype()):
+    """
+    Pair of NsoltAnalysis2dNetwork of random angles and the adjoint
+    NsoltSynthesis2dNetwork for the test cases
+    """
+    config = { 'number_of_channels': number_of_channels,
+        'decimation_factor': decimation_factor,
+        'polyphase_order': polyphase_order,
+        'number_of_levels': number_of_levels }
+    analyzer = NsoltAnalysis2dNetwork(**config).to(datatype)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    synthesizer = NsoltSynthesis2dNetwork(**config).to(datatype)
+    synthesizer = cpparamsana2syn(synthesizer,analyzer)
+    return analyzer, synthesizer
@@ -0,0 +1,161 @@
+import os
+import time
+import torch
+import torch.multiprocessing as mp
+from nsoltOlsOla2d import Analysis2dOlsWrapper, Synthesis2dOlsWrapper, tileregions2d
+
+class TileScheduler2d:
+    """
+    TILESCHEDULER2D
+
+       Distributes the tiles of an OLS wrapper, i.e. Analysis2dOlsWrapper
+       or Synthesis2dOlsWrapper, over a pool of worker processes.
+
+       The wrapper, and so the network parameters, is handed to each worker
+       once when the pool starts. The input and output arrays are placed
+       in shared memory, so that a task carries only the tile regions and
+       the handles of the arrays instead of pickled pixels. Since the OLS
+       tiles write disjoint regions, the workers need no synchronization.
+
+       After each call, the throughput is recorded in 'metrics'.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        wrapper,
+        number_of_workers=None,
+        number_of_threads=1,
+        tiles_per_task=1,
+        start_method=None):
+        if not isinstance(wrapper,(Analysis2dOlsWrapper,Synthesis2dOlsWrapper)):
+            raise TypeError('%s : Only OLS wrappers are supported' % type(wrapper).__name__)
+        self.wrapper = wrapper
+        self.number_of_workers = os.cpu_count() if number_of_workers is None \
+            else number_of_workers
+        self.number_of_threads = number_of_threads
+        self.tiles_per_task = tiles_per_task
+        self.start_method = start_method
+        self.metrics = {}
+        self.pool = None
+
+    def __call__(self,*args):
+        return self.forward(*args)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self,exc_type,exc_value,traceback):
+        self.close()
+
+    def forward(self,*args):
+        if self.pool is None:
+            self.start_()
+        if isinstance(self.wrapper,Analysis2dOlsWrapper):
+            inputs = shared_(args[0])
+            out = tuple( Y.share_memory_() for Y in self.wrapper.allocate(inputs) )
+            height, width = inputs.size(2), inputs.size(3)
+        else:
+            inputs = tuple( shared_(Y) for Y in args )
+            out = self.wrapper.allocate(*inputs).share_memory_()
+            height, width = out.size(2), out.size(3)
+        regions = tileregions2d([height, width],self.wrapper.tile_size)
+        tasks = [ (inputs, out, regions[idx:idx+self.tiles_per_task])
+            for idx in range(0,len(regions),self.tiles_per_task) ]
+
+        start = time.perf_counter()
+        nTiles = sum(self.pool.imap_unordered(process_tiles_,tasks))
+        elapsed = time.perf_counter() - start
+
+        nSamples = args[0].size(0)
+        self.metrics = {
+            'workers': self.number_of_workers,
+            'tiles': nTiles,
+            'elapsed': elapsed,
+            'tiles_per_second': nTiles/elapsed,
+            'pixels_per_second': nSamples*height*width/elapsed }
+        return out
+
+    def close(self):
+        """
+        Terminate the worker processes
+        """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def start_(self):
+        context = mp.get_context(self.start_method)
+        self.pool = context.Pool(
+            processes=self.number_of_workers,
+            initializer=initialize_worker_,
+            initargs=(self.wrapper, self.number_of_threads))
+
+# Wrapper held by each worker process
+worker_wrapper_ = None
+
+def initialize_worker_(wrapper,number_of_threads):
+    global worker_wrapper_
+    torch.set_num_threads(number_of_threads)
+    worker_wrapper_ = wrapper
+
+def process_tiles_(task):
+    inputs, out, regions = task
+    with torch.no_grad():
+        for region in regions:
+            worker_wrapper_.forward_tile(inputs,out,region)
+    return len(regions)
+
+def shared_(X):
+    if X.is_shared():
+        return X
+    return torch.empty_like(X).share_memory_().copy_(X)
+
+def benchmark(wrapper,X,max_workers=None,number_of_trials=3):
+    """
+    Throughput of TileScheduler2d from 1 to max_workers workers
+
+       Returns a list of the metrics of the best trial for each number
+       of workers.
+    """
+    max_workers = os.cpu_count() if max_workers is None else max_workers
+    results = []
+    for nWorkers in range(1,max_workers+1):
+        with TileScheduler2d(wrapper,number_of_workers=nWorkers) as scheduler:
+            scheduler(X) # Warm up
+            best = None
+            for iTrial in range(number_of_trials):
+                scheduler(X)
+                if best is None or scheduler.metrics['elapsed'] < best['elapsed']:
+                    best = scheduler.metrics
+        results.append(best)
+    return results
+
+if __name__ == '__main__':
+    from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+    analyzer = NsoltAnalysis2dNetwork(
+        number_of_channels=[4, 4],
+        decimation_factor=[2, 2],
+        polyphase_order=[4, 4],
+        number_of_levels=3)
+    for angles in analyzer.parameters():
+        angles.data = torch.randn_like(angles)
+    wrapper = Analysis2dOlsWrapper(analyzer,tile_size=[256, 256])
+    X = torch.rand(1,1,2048,2048)
+    print('workers  tiles/s  Mpixels/s  speedup')
+    results = benchmark(wrapper,X)
+    for metrics in results:
+        print('%7d  %7.2f  %9.2f  %7.2f' % (metrics['workers'],
+            metrics['tiles_per_second'],metrics['pixels_per_second']/1e6,
+            results[0]['elapsed']/metrics['elapsed']))
@@ -0,0 +1,175 @@
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from torch.utils.checkpoint import checkpoint
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltIsta2d import lipschitzconstant2d
+from nsoltUtility import tieparamsana2syn
+
+class UnfoldedIsta2d(nn.Module):
+    """
+    UNFOLDEDISTA2D Deep-unfolded ISTA with NSOLT
+
+       劣化画像のバッチ入力:
+          nSamples x nComponents x nRows x nCols
+
+       復元画像のバッチ出力:
+          nSamples x nComponents x nRowsOrg x nColsOrg
+
+       ISTA of IstaImRestoration2d unrolled to number_of_iterations
+       iterations K, i.e.
+
+          hu <- P^T x, y <- D^T hu
+          y <- soft(y - (1/L) D^T P^T (P hu - x), lambda_k/L), hu <- D y
+
+       for k = 1, ..., K, where the synthesizer D and its adjoint, the
+       analyzer, are the NSOLT networks of the given configuration, whose
+       parameters are shared, and lambdas of K x nLevels x nChsTotal are
+       the thresholds of the iterations and subbands, initialized to
+       lambda_, whose channel 0 is the DC thresholded only at the
+       coarsest level. Both of them are trained by backpropagation
+       through the iterations, where the negative lambdas are clamped to
+       zero so that the thresholds stay non-negative.
+
+       With checkpointing, only the input of each iteration, i.e. hu and
+       the coefficients y, is kept for the backward and the iteration is
+       recomputed there, so that the memory for the backward grows with
+       K by one image and its coefficients instead of all the
+       intermediate results of the layers. With reversible, the
+       networks recompute their intermediate results from the outputs by
+       the inverse of the layers as NsoltAnalysis2dNetwork. The linear
+       process P is the same as of IstaImRestoration2d, whose Lipschitz
+       constant L is cached for each image size.
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+    def __init__(self,
+        number_of_channels=[2,2],
+        decimation_factor=[2,2],
+        polyphase_order=[0,0],
+        number_of_vanishing_moments=1,
+        number_of_levels=1,
+        number_of_iterations=10,
+        linear_process=None,
+        lambda_=0.,
+        checkpointing=True,
+        reversible=False):
+        super(UnfoldedIsta2d, self).__init__()
+        self.number_of_iterations = number_of_iterations
+        self.linear_process = linear_process
+        self.checkpointing = checkpointing
+        config = { 'number_of_channels': number_of_channels,
+            'decimation_factor': decimation_factor,
+            'polyphase_order': polyphase_order,
+            'number_of_vanishing_moments': number_of_vanishing_moments,
+            'number_of_levels': number_of_levels,
+            'reversible': reversible }
+        self.analyzer = NsoltAnalysis2dNetwork(**config)
+        self.synthesizer = tieparamsana2syn(NsoltSynthesis2dNetwork(**config),self.analyzer)
+        nChsTotal = sum(number_of_channels)
+        self.lambdas = nn.Parameter(
+            torch.full((number_of_iterations,number_of_levels,nChsTotal),float(lambda_)))
+        self.lipschitzconstants_ = {}
+
+    def forward(self,X):
+        nSamples, nComponents, height, width = X.shape
+        x = X.reshape(nSamples*nComponents,1,height,width)
+        height, width = self.originaldimension_((height,width))
+        reciprocalL = 1./self.lipschitzconstant_((height,width),X.dtype,X.device)
+        hu = self.adjoint_(x)
+        y = self.analyzer(hu)
+        for iItr in range(self.number_of_iterations):
+            if self.checkpointing and torch.is_grad_enabled():
+                hu, *y = checkpoint(self.iterate_,iItr,reciprocalL,x,hu,*y,
+                    use_reentrant=False,preserve_rng_state=False)
+            else:
+                hu, *y = self.iterate_(iItr,reciprocalL,x,hu,*y)
+        return hu.view(nSamples,nComponents,height,width)
+
+    def iterate_(self,iItr,reciprocalL,x,hu,*y):
+        """
+        One iteration, which returns hu and the coefficients y
+        """
+        v = self.analyzer(self.adjoint_(self.process_(hu)-x))
+        threshold = F.relu(self.lambdas[iItr])*reciprocalL
+        thresholds = [ threshold[iLv,1:] for iLv in range(len(y)-1) ] + [ threshold[-1,0] ]
+        y = [ softthresholding(subY-reciprocalL*subV,th)
+            for subY, subV, th in zip(y,v,thresholds) ]
+        return (self.synthesizer(*y), *y)
+
+    def lipschitzconstant_(self,size,dtype,device):
+        """
+        Lipschitz constant for the original images of the given size,
+        which is cached
+        """
+        if size not in self.lipschitzconstants_:
+            self.lipschitzconstants_[size] = lipschitzconstant2d(
+                self.linear_process,size,dtype,device)
+        return self.lipschitzconstants_[size]
+
+    def originaldimension_(self,size):
+        if hasattr(self.linear_process,'originaldimension'):
+            return tuple(self.linear_process.originaldimension(size))
+        return tuple(size)
+
+    def process_(self,X):
+        return X if self.linear_process is None else self.linear_process(X)
+
+    def adjoint_(self,X):
+        return X if self.linear_process is None else self.linear_process.adjoint(X)
+
+def softthresholding(y,threshold):
+    """
+    Soft thresholding sign(y) max(|y| - threshold, 0), which is
+    differentiable with respect to the threshold
+    """
+    return y.sign()*F.relu(y.abs()-threshold)
+
+def savedbytes(function,*args):
+    """
+    Output of function(*args) and the bytes of the tensors saved for the
+    backward by the function, where the tensors sharing a storage are
+    counted once
+    """
+    storages = {}
+    def pack_(tensor):
+        storage = tensor.untyped_storage()
+        storages[storage.data_ptr()] = storage.nbytes()
+        return tensor
+    with torch.autograd.graph.saved_tensors_hooks(pack_,lambda tensor: tensor):
+        output = function(*args)
+    return output, sum(storages.values())
+
+if __name__ == '__main__':
+    import time
+    config = { 'number_of_channels': [4, 4], 'decimation_factor': [2, 2],
+        'polyphase_order': [2, 2], 'number_of_levels': 2 }
+    X = torch.rand(8,1,64,64)
+    target = torch.rand_like(X)
+    modes = { 'none': (False, False), 'checkpoint': (True, False),
+        'reversible': (False, True), 'checkpoint+reversible': (True, True) }
+    print('%5s %24s %12s %10s' % ('K','mode','saved MiB','s/step'))
+    for nItrs in [ 1, 2, 4, 8, 16 ]:
+        for mode, (checkpointing, reversible) in modes.items():
+            unfolded = UnfoldedIsta2d(**config,number_of_iterations=nItrs,
+                lambda_=0.05,checkpointing=checkpointing,reversible=reversible)
+            optimizer = torch.optim.Adam(unfolded.parameters(),lr=1e-3)
+            start = time.perf_counter()
+            optimizer.zero_grad()
+            Y, nBytes = savedbytes(unfolded,X)
+            F.mse_loss(Y,target).backward()
+            optimizer.step()
+            print('%5d %24s %12.2f %10.3f' % (nItrs,mode,nBytes/2**20,
+                time.perf_counter()-start))
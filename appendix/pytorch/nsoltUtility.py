@@ -1,5 +1,6 @@
 import torch
 import math
+import functools
 
 class Direction:
     VERTICAL = 0
@@ -76,3 +77,85 @@ class OrthonormalMatrixGenerationSystem:
 
         return matrix.clone()
 
+def cpparamssyn2ana(analysisnet,synthesisnet):
+    """
+    Setting up the analysis dictionary (adjoint operator) by copying
+    synthesis dictionary parameters to the analyisis dictionary
+    """
+    copyparams_(synthesisnet,analysisnet)
+    return analysisnet
+
+def cpparamsana2syn(synthesisnet,analysisnet):
+    """
+    Setting up the synthesis dictionary (adjoint operator) by copying
+    analysis dictionary parameters to the synthesis dictionary
+    """
+    copyparams_(analysisnet,synthesisnet)
+    return synthesisnet
+
+def tieparamsana2syn(synthesisnet,analysisnet):
+    """
+    Setting up the synthesis dictionary (adjoint operator) by sharing
+    the analysis dictionary parameters with the synthesis dictionary,
+    so that the pair stays adjoint while the parameters are trained
+    """
+    dstlayers = { layer.name.replace('~',''): layer
+        for layers in synthesisnet.layers for layer in layers }
+    for layers in analysisnet.layers:
+        for layer in layers:
+            dstlayer = dstlayers.get(layer.name.replace('~',''))
+            if dstlayer is None:
+                continue
+            for (name, _), src in zip(list(dstlayer.named_parameters()),layer.parameters()):
+                *path, attr = name.split('.')
+                setattr(functools.reduce(getattr,path,dstlayer),attr,src)
+    return synthesisnet
+
+def copyparams_(srcnet,dstnet):
+    dstlayers = { layer.name.replace('~',''): layer
+        for layers in dstnet.layers for layer in layers }
+    for layers in srcnet.layers:
+        for layer in layers:
+            dstlayer = dstlayers.get(layer.name.replace('~',''))
+            if dstlayer is None:
+                continue
+            for src, dst in zip(layer.parameters(),dstlayer.parameters()):
+                dst.data = src.data.clone()
+
+def subbandoffsets2d(original_dimension,number_of_channels,decimation_factor,number_of_levels):
+    """
+    Offset index of serialized subband coefficients
+
+       Returns a tuple of (offset, scale) for each of the subbands in the
+       order of the analysis outputs, i.e. Lv1 AC, ..., LvN AC and LvN DC,
+       where the scale is (nRows, nCols, nChs), and the total number of
+       elements. The coefficients are serialized with DC first and then
+       AC of levels N to 1 as in +dcnn/nsoltSubbandSerialization2dLayer.m.
+       The table is computed once for each configuration.
+    """
+    return subbandoffsets2d_(
+        tuple(original_dimension),
+        tuple(number_of_channels),
+        tuple(decimation_factor),
+        number_of_levels)
+
+@functools.lru_cache(maxsize=None)
+def subbandoffsets2d_(original_dimension,number_of_channels,decimation_factor,number_of_levels):
+    nChsTotal = sum(number_of_channels)
+    nrows = original_dimension[Direction.VERTICAL] \
+        // (decimation_factor[Direction.VERTICAL]**number_of_levels)
+    ncols = original_dimension[Direction.HORIZONTAL] \
+        // (decimation_factor[Direction.HORIZONTAL]**number_of_levels)
+    offsets = [ None ]*(number_of_levels+1)
+    # DC of the coarsest level
+    scale = (nrows, ncols, 1)
+    offsets[number_of_levels] = (0, scale)
+    offset = nrows*ncols
+    # AC from the coarsest level to the finest one
+    for iRevLv in range(1,number_of_levels+1):
+        scale = (nrows*decimation_factor[Direction.VERTICAL]**(iRevLv-1),
+            ncols*decimation_factor[Direction.HORIZONTAL]**(iRevLv-1),
+            nChsTotal-1)
+        offsets[number_of_levels-iRevLv] = (offset, scale)
+        offset += scale[0]*scale[1]*scale[2]
+    return tuple(offsets), offset
@@ -0,0 +1,164 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltAnalysis1dNetwork import NsoltAnalysis1dNetwork
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltLayerExceptions import InvalidNumberOfChannels, InvalidPolyPhaseOrder
+
+stride = [ 1, 2, 4 ]
+ppord = [ 0, 2, 4 ]
+nlevels = [ 1, 2, 3 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltAnalysis1dNetworkTestCase(unittest.TestCase):
+    """
+    NSOLTANALYSIS1DNETWORKTESTCASE
+
+       系列入力:
+          nSamples x (Stride x nBlks)
+
+       複数コンポーネント出力:（ツリーレベル数）
+          nSamples x nBlksLv1 x (nChsTotal-1)
+           :
+          nSamples x nBlksLvN x (nChsTotal-1)
+          nSamples x nBlksLvN
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdNames = [ 'Lv1_E0', 'Lv1_V0', 'Lv1_Qh1rl', 'Lv1_Vh1',
+            'Lv1_Qh2lu', 'Lv1_Vh2', 'Lv1_Sp' ]
+
+        # Instantiation of target class
+        network = NsoltAnalysis1dNetwork(
+            number_of_channels=[2,2],
+            decimation_factor=2,
+            polyphase_order=2)
+
+        # Actual values
+        actualNames = [ layer.name for layer in network.layers[0] ]
+
+        # Evaluation
+        self.assertTrue(isinstance(network, nn.Module))
+        self.assertEqual(actualNames,expctdNames)
+
+    def testInvalidArguments(self):
+        with self.assertRaises(InvalidNumberOfChannels):
+            NsoltAnalysis1dNetwork(number_of_channels=[2,3])
+        with self.assertRaises(InvalidPolyPhaseOrder):
+            NsoltAnalysis1dNetwork(polyphase_order=1)
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testForwardWithRandomAngles(self,
+        stride, ppord, nlevels, datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 3
+        nchs = [ max(2,stride), max(2,stride) ]
+        nChsTotal = sum(nchs)
+        nblks = 8
+        X = torch.randn(nSamples,stride**nlevels*nblks,dtype=datatype)
+
+        # Expected values with the 2-D network of a single row
+        expctdNetwork = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=[1, stride],
+            polyphase_order=[0, ppord],
+            number_of_levels=nlevels).to(datatype)
+        for angles in expctdNetwork.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdZ = [ Y.squeeze(dim=1) for Y in
+                expctdNetwork.forward(X.view(nSamples,1,1,-1)) ]
+
+        # Instantiation of target class
+        network = NsoltAnalysis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for src, dst in zip(expctdNetwork.parameters(),network.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(X)
+
+        # Evaluation
+        self.assertEqual(len(actualZ),nlevels+1)
+        for iLevel in range(nlevels):
+            self.assertEqual(actualZ[iLevel].shape,
+                (nSamples,stride**(nlevels-iLevel-1)*nblks,nChsTotal-1))
+        self.assertEqual(actualZ[-1].shape,(nSamples,nblks))
+        for actual, expctd in zip(actualZ,expctdZ):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord))
+    )
+    def testBackwardWithRandomAngles(self,stride,ppord):
+        rtol,atol = 1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nlevels = 2
+        nchs = [ max(2,stride), max(2,stride) ]
+        X = torch.randn(nSamples,stride**nlevels*4,dtype=datatype,requires_grad=True)
+
+        # Expected values with the 2-D network of a single row
+        expctdNetwork = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=[1, stride],
+            polyphase_order=[0, ppord],
+            number_of_levels=nlevels).to(datatype)
+        for angles in expctdNetwork.parameters():
+            angles.data = torch.randn_like(angles)
+        Z = expctdNetwork.forward(X.view(nSamples,1,1,-1))
+        dLdZ = [ torch.randn_like(Y.squeeze(dim=1)) for Y in Z ]
+        torch.autograd.backward(Z,[ dLdY.unsqueeze(dim=1) for dLdY in dLdZ ])
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in expctdNetwork.parameters() ]
+        X.grad = None
+
+        # Instantiation of target class
+        network = NsoltAnalysis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for src, dst in zip(expctdNetwork.parameters(),network.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        Z = network.forward(X)
+        torch.autograd.backward(Z,dLdZ)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in network.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
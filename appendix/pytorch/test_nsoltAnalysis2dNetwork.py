@@ -5,9 +5,17 @@ import math
 import torch
 import torch.nn as nn
 from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltLayerExceptions import InvalidNumberOfChannels, InvalidPolyPhaseOrder
+from nsoltUtility import Direction
 
 nchs = [ [2, 2], [3, 3], [4, 4] ]
 stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [0, 2], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+height = [ 8, 16 ]
+width = [ 8, 16 ]
 
 class NsoltAnalysis2dNetworkTestCase(unittest.TestCase):
     """
@@ -52,12 +60,161 @@ class NsoltAnalysis2dNetworkTestCase(unittest.TestCase):
         self.assertEqual(actualNchs,expctdNchs)
         self.assertEqual(actualStride,expctdStride)
 
-    def testDummy(self):
-        target = NsoltAnalysis2dNetwork()
-        x = 0.0
-        valueExpctd = 0.0
-        valueActual = target.forward(x)
-        self.assertEqual(valueExpctd, valueActual)
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,height,width,datatype))
+    )
+    def testForwardGrayScale(self,
+        nchs, stride, height, width, datatype):
+        rtol,atol = 1e-5,1e-8
+
+        # Parameters
+        nSamples = 8
+        nComponents = 1
+        # Source (nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols))
+        X = torch.rand(nSamples,nComponents,height,width,dtype=datatype)
+
+        # Expected values
+        # nSamples x nRows x nCols x nDecs
+        ps,pa = nchs
+        nDecs = stride[0]*stride[1] # math.prod(stride)
+        ms,ma = int(math.ceil(nDecs/2.)),int(math.floor(nDecs/2.))
+        E0 = NsoltBlockDct2dLayer(decimation_factor=stride)
+        A = E0.forward(X)
+        nrows,ncols = A.size(1),A.size(2)
+        # Zero angles: the DCT coefficients are padded to (ps,pa) channels
+        Z = torch.zeros(nSamples,nrows,ncols,ps+pa,dtype=datatype)
+        Z[:,:,:,:ms] = A[:,:,:,:ms]
+        Z[:,:,:,ps:ps+ma] = A[:,:,:,ms:]
+        expctdZac = Z[:,:,:,1:]
+        expctdZdc = Z[:,:,:,0]
+
+        # Instantiation of target class
+        network = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride
+        )
+
+        # Actual values
+        with torch.no_grad():
+            actualZac, actualZdc = network.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZac.dtype,datatype)
+        self.assertEqual(actualZdc.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZac,expctdZac,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZdc,expctdZdc,rtol=rtol,atol=atol))
+        self.assertFalse(actualZac.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testForwardGrayScaleWithRandomAngles(self,
+        nchs, stride, ppord, nlevels, datatype):
+        rtol,atol = 1e-3,1e-6
+
+        # Parameters
+        nSamples = 8
+        nComponents = 1
+        height = 32
+        width = 32
+        # Source (nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols))
+        X = torch.rand(nSamples,nComponents,height,width,dtype=datatype)
+
+        # Expected values
+        nChsTotal = sum(nchs)
+        expctdShapes = []
+        nrows,ncols = height,width
+        for iLv in range(nlevels):
+            nrows = nrows//stride[Direction.VERTICAL]
+            ncols = ncols//stride[Direction.HORIZONTAL]
+            expctdShapes.append((nSamples,nrows,ncols,nChsTotal-1))
+        expctdShapes.append((nSamples,nrows,ncols))
+        # Parseval tight property
+        expctdEnergy = torch.sum(X**2)
+
+        # Instantiation of target class
+        network = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels
+        ).to(datatype)
+        for angles in network.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(X)
+        actualShapes = [ tuple(Z.size()) for Z in actualZ ]
+        actualEnergy = sum([ torch.sum(Z**2) for Z in actualZ ])
+
+        # Evaluation
+        self.assertEqual(actualShapes,expctdShapes)
+        self.assertTrue(torch.isclose(actualEnergy,expctdEnergy,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels))
+    )
+    def testBackwardGrayScaleReversible(self,
+        nchs, stride, ppord, nlevels):
+        rtol,atol = 1e-5,1e-8
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 4
+        nComponents = 1
+        height = 16
+        width = 16
+        # Source (nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols))
+        X = torch.rand(nSamples,nComponents,height,width,dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        network = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_vanishing_moments=0,
+            number_of_levels=nlevels
+        ).to(datatype)
+        for angles in network.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values
+        Z = network.forward(X)
+        dLdZ = [ torch.randn_like(Zi) for Zi in Z ]
+        network.zero_grad()
+        torch.autograd.backward(Z,dLdZ)
+        expctddLdX = X.grad.clone()
+        expctddLdW = [ angles.grad.clone() for angles in network.parameters() ]
+
+        # Actual values
+        network.reversible = True
+        X.grad = None
+        Z = network.forward(X)
+        network.zero_grad()
+        torch.autograd.backward(Z,dLdZ)
+        actualdLdX = X.grad
+        actualdLdW = [ angles.grad for angles in network.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actual, expctd in zip(actualdLdW,expctddLdW):
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    def testInvalidNumberOfChannels(self):
+        with self.assertRaises(InvalidNumberOfChannels):
+            NsoltAnalysis2dNetwork(
+                number_of_channels=[3,2],
+                decimation_factor=[2,2]
+            )
+
+    def testInvalidPolyPhaseOrder(self):
+        with self.assertRaises(InvalidPolyPhaseOrder):
+            NsoltAnalysis2dNetwork(
+                number_of_channels=[2,2],
+                decimation_factor=[2,2],
+                polyphase_order=[1,1]
+            )
 
 """
         % Test
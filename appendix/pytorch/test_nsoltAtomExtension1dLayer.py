@@ -0,0 +1,134 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltAtomExtension1dLayer import NsoltAtomExtension1dLayer
+from nsoltLayerExceptions import InvalidDirection, InvalidTargetChannels
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+dir = [ 'Right', 'Left' ]
+target = [ 'Sum', 'Difference' ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltAtomExtension1dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTATOMEXTENSION1DLAYERTESTCASE
+
+       入力:
+          nSamples x nBlks x nChsTotal
+
+       出力:
+          nSamples x nBlks x nChsTotal
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,dir,target))
+    )
+    def testConstructor(self,nchs,dir,target):
+        # Expected values
+        expctdName = 'Qh1rl'
+        expctdDescription = dir \
+            + " shift the " \
+            + target.lower() \
+            + "-channel Coefs. " \
+            + "(ps,pa) = (" \
+            + str(nchs[0]) + "," + str(nchs[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension1dLayer(
+            number_of_channels=nchs,
+            name=expctdName,
+            direction=dir,
+            target_channels=target)
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    def testInvalidArguments(self):
+        with self.assertRaises(InvalidDirection):
+            NsoltAtomExtension1dLayer(number_of_channels=[2,2],
+                direction='Down',target_channels='Sum')
+        with self.assertRaises(InvalidTargetChannels):
+            NsoltAtomExtension1dLayer(number_of_channels=[2,2],
+                direction='Right',target_channels='Dc')
+
+    @parameterized.expand(
+        list(itertools.product(nchs,dir,target,datatype))
+    )
+    def testPredict(self,nchs,dir,target,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nblks = 8
+        ps, pa = nchs
+        X = torch.randn(nSamples,nblks,ps+pa,dtype=datatype)
+
+        # Expected values
+        shift = 1 if dir == 'Right' else -1
+        Y = X.clone()
+        Ys, Ya = Y[:,:,:ps].clone(), Y[:,:,ps:].clone()
+        Y[:,:,:ps], Y[:,:,ps:] = Ys+Ya, Ys-Ya
+        if target == 'Difference':
+            Y[:,:,ps:] = torch.roll(Y[:,:,ps:],shifts=shift,dims=1)
+        else:
+            Y[:,:,:ps] = torch.roll(Y[:,:,:ps],shifts=shift,dims=1)
+        Ys, Ya = Y[:,:,:ps].clone(), Y[:,:,ps:].clone()
+        expctdZ = torch.cat((Ys+Ya,Ys-Ya),dim=-1)/2.
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension1dLayer(
+            number_of_channels=nchs,
+            name='Qh1',
+            direction=dir,
+            target_channels=target)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,dir,target))
+    )
+    def testGradCheck(self,nchs,dir,target):
+        datatype = torch.double
+
+        # Configuration
+        X = torch.randn(2,4,sum(nchs),dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension1dLayer(
+            number_of_channels=nchs,
+            name='Qh1',
+            direction=dir,
+            target_channels=target)
+
+        # Evaluation
+        self.assertTrue(torch.autograd.gradcheck(layer,(X,)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltAtomExtension3dLayer import NsoltAtomExtension3dLayer
+from nsoltLayerExceptions import InvalidDirection
+
+nchs = [ [3,3], [4,4] ]
+datatype = [ torch.float, torch.double ]
+nlays = [ 2, 4 ]
+dir = [ 'Right', 'Left', 'Up', 'Down', 'Back', 'Front' ]
+target = [ 'Sum', 'Difference' ]
+
+class NsoltAtomExtention3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTATOMEXTENSION3DLAYERTESTCASE
+
+        コンポーネント別に入力(nComponents=1のみサポート):
+            nSamples x nRows x nCols x nLays x nChsTotal
+
+        コンポーネント別に出力(nComponents=1のみサポート):
+            nSamples x nRows x nCols x nLays x nChsTotal
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,target))
+    )
+    def testConstructor(self,nchs,target):
+
+        # Expctd values
+        expctdName = 'Qn'
+        expctdDirection = 'Back'
+        expctdTargetChannels = target
+        expctdDescription = "Back shift the " \
+            + target.lower() \
+            + "-channel Coefs. " \
+            + "(ps,pa) = (" + str(nchs[0]) + "," + str(nchs[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension3dLayer(
+            number_of_channels=nchs,
+            name=expctdName,
+            direction=expctdDirection,
+            target_channels=expctdTargetChannels
+        )
+
+        # Actual values
+        actualName = layer.name
+        actualDirection = layer.direction
+        actualTargetChannels = layer.target_channels
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDirection,expctdDirection)
+        self.assertEqual(actualTargetChannels,expctdTargetChannels)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    def testInvalidDirection(self):
+        with self.assertRaises(InvalidDirection):
+            NsoltAtomExtension3dLayer(
+                number_of_channels=[3,3],
+                direction='Forward',
+                target_channels='Sum')
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,dir,target,datatype))
+    )
+    def testPredictGrayscale(self,
+            nchs, nlays, dir, target, datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        X = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype,requires_grad=True)
+
+        # Expected values
+        expctdZ = atomExtension3d_(X,nchs,dir,target)
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension3dLayer(
+            number_of_channels=nchs,
+            name='Qn',
+            direction=dir,
+            target_channels=target
+        )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,dir,target,datatype))
+    )
+    def testBackwardGrayscale(self,
+            nchs, nlays, dir, target, datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        X = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype)
+
+        # Expected values
+        Z = atomExtension3d_(X,nchs,dir,target)
+        Z.backward(dLdZ)
+        expctddLdX = X.grad.clone()
+        X.grad = None
+
+        # Instantiation of target class
+        layer = NsoltAtomExtension3dLayer(
+            number_of_channels=nchs,
+            name='Qn',
+            direction=dir,
+            target_channels=target
+        )
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+
+def atomExtension3d_(X,nchs,dir,target):
+    shifts = { 'Right': ( 0, 0, 1, 0 ), 'Left': ( 0, 0, -1, 0 ),
+        'Down': ( 0, 1, 0, 0 ), 'Up': ( 0, -1, 0, 0 ),
+        'Back': ( 0, 0, 0, 1 ), 'Front': ( 0, 0, 0, -1 ) }
+    ps, pa = nchs
+    # Block butterfly
+    Ys = X[:,:,:,:,:ps]
+    Ya = X[:,:,:,:,ps:]
+    Y = torch.cat((Ys+Ya, Ys-Ya),dim=-1)
+    # Block circular shift
+    if target == 'Difference':
+        Y = torch.cat((Y[:,:,:,:,:ps],
+            torch.roll(Y[:,:,:,:,ps:],shifts=shifts[dir],dims=(0,1,2,3))),dim=-1)
+    else:
+        Y = torch.cat((torch.roll(Y[:,:,:,:,:ps],shifts=shifts[dir],dims=(0,1,2,3)),
+            Y[:,:,:,:,ps:]),dim=-1)
+    # Block butterfly
+    Ys = Y[:,:,:,:,:ps]
+    Ya = Y[:,:,:,:,ps:]
+    return torch.cat((Ys+Ya, Ys-Ya),dim=-1)/2.
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltBenchmark3d import nsoltlayers3d, benchmark
+
+stride = [ [1, 1, 1], [2, 2, 2], [2, 1, 2] ]
+ppord = [ [0, 0, 0], [2, 2, 2], [4, 0, 2] ]
+
+class NsoltBenchmark3dTestCase(unittest.TestCase):
+    """
+    NSOLTBENCHMARK3DTESTCASE Test cases for the volumetric layer chains
+    and their benchmark
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord))
+    )
+    def testPerfectReconstruction(self,stride,ppord):
+        rtol,atol = 1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,8,8,8,dtype=datatype)
+
+        # Instantiation of target class
+        analysislayers, synthesislayers = nsoltlayers3d(
+            number_of_channels=[4, 4],
+            decimation_factor=stride,
+            polyphase_order=ppord)
+        analysislayers, synthesislayers = analysislayers.to(datatype), synthesislayers.to(datatype)
+        synthesisdict = { layer.name: layer for layer in synthesislayers }
+        for layer in analysislayers:
+            for angles in layer.parameters():
+                angles.data = torch.randn_like(angles)
+            if layer.name+'~' in synthesisdict:
+                for src, dst in zip(layer.parameters(),synthesisdict[layer.name+'~'].parameters()):
+                    dst.data = src.data.clone()
+
+        # Actual values
+        with torch.no_grad():
+            Y = nn.Sequential(*analysislayers)(X)
+            actualZ = synthesislayers[0](*Y)
+            for layer in synthesislayers[1:]:
+                actualZ = layer(actualZ)
+
+        # Evaluation
+        self.assertEqual(Y[0].shape,(nSamples,8//stride[0],8//stride[1],8//stride[2],7))
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    def testBenchmark(self):
+        analysislayers, _ = nsoltlayers3d(polyphase_order=[2, 2, 2])
+        X = torch.rand(1,1,16,16,16)
+
+        # Actual values
+        results = benchmark(analysislayers,X,number_of_trials=1)
+
+        # Evaluation
+        self.assertEqual([ metrics['name'] for metrics in results ],
+            [ layer.name for layer in analysislayers ])
+        self.assertTrue(all([ metrics['voxels_per_second'] > 0. for metrics in results ]))
+
+if __name__ == '__main__':
+    unittest.main()
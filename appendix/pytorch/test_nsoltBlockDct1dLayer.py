@@ -0,0 +1,124 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+import torch_dct as dct
+from nsoltBlockDct1dLayer import NsoltBlockDct1dLayer
+
+stride = [ 1, 2, 3, 4, 8 ]
+datatype = [ torch.float, torch.double ]
+nblks = [ 4, 8 ]
+
+class NsoltBlockDct1dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTBLOCKDCT1DLAYERTESTCASE
+
+       系列入力:
+          nSamples x (Stride x nBlks)
+
+       出力:
+          nSamples x nBlks x nDecs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride))
+    )
+    def testConstructor(self,stride):
+        # Expected values
+        expctdName = 'E0'
+        expctdDescription = "Block DCT of size " + str(stride)
+
+        # Instantiation of target class
+        layer = NsoltBlockDct1dLayer(
+                decimation_factor=stride,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(stride,nblks,datatype))
+    )
+    def testPredict(self,
+            stride, nblks, datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 3
+        X = torch.rand(nSamples,stride*nblks,dtype=datatype,requires_grad=True)
+
+        # Expected values
+        Y = dct.dct(X.detach().reshape(nSamples,nblks,stride),norm='ortho')
+        expctdZ = torch.cat((Y[:,:,0::2],Y[:,:,1::2]),dim=-1)
+
+        # Instantiation of target class
+        layer = NsoltBlockDct1dLayer(
+                decimation_factor=stride,
+                name='E0'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,(nSamples,nblks,stride))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testBackward(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 3
+        nblks = 4
+        X = torch.rand(nSamples,stride*nblks,dtype=datatype,requires_grad=True)
+        dLdZ = torch.rand(nSamples,nblks,stride,dtype=datatype)
+
+        # Expected values
+        dLdY = torch.zeros_like(dLdZ)
+        dLdY[:,:,0::2] = dLdZ[:,:,:(stride+1)//2]
+        dLdY[:,:,1::2] = dLdZ[:,:,(stride+1)//2:]
+        expctddLdX = dct.idct(dLdY,norm='ortho').reshape(nSamples,-1)
+
+        # Instantiation of target class
+        layer = NsoltBlockDct1dLayer(
+                decimation_factor=stride,
+                name='E0'
+            )
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -79,9 +79,7 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         ncols = int(math.ceil(width/stride[Direction.HORIZONTAL])) #.astype(int)
         ndecs =  stride[0]*stride[1] # math.prod(stride)
         # Block DCT (nSamples x nComponents x nrows x ncols) x decV x decH
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(X.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(X,stride),norm='ortho')
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         A = permuteDctCoefs_(Y)
         expctdZ = A.view(nSamples,nrows,ncols,ndecs)
@@ -119,9 +117,7 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         ncols = int(math.ceil(width/stride[Direction.HORIZONTAL])) #.astype(int)
         ndecs = stride[0]*stride[1] # math.prod(stride)
         # Block DCT (nSamples x nComponents x nrows x ncols) x decV x decH
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(X.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(X,stride),norm='ortho')
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         A = permuteDctCoefs_(Y)
         expctdZ = A.view(nSamples,nrows,ncols,ndecs)
@@ -159,9 +155,7 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         ndecs = stride[0]*stride[1] # math.prod(stride)
 
         # Block DCT (nSamples x nComponents x nrows x ncols) x decV x decH
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(X.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(X,stride),norm='ortho')
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         A = permuteDctCoefs_(Y)
         Z = A.view(nSamples,nComponents,nrows,ncols,ndecs)
@@ -210,9 +204,7 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         ndecs = stride[0]*stride[1] # math.prod(stride)
 
         # Block DCT (nSamples x nComponents x nrows x ncols) x decV x decH
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(X.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(X,stride),norm='ortho')
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         A = permuteDctCoefs_(Y)
         Z = A.view(nSamples,nComponents,nrows,ncols,ndecs)
@@ -263,7 +255,7 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         # Expected values
         A = permuteIdctCoefs_(dLdZ,stride)
         Y = dct.idct_2d(A,norm='ortho')
-        expctddLdX = Y.reshape(nSamples,nComponents,height,width)
+        expctddLdX = combineBlocks_(Y,stride,nSamples,nComponents,height,width)
         
         # Instantiation of target class
         layer = NsoltBlockDct2dLayer(
@@ -310,9 +302,9 @@ class NsoltBlockDct2dLayerTestCase(unittest.TestCase):
         Yg = dct.idct_2d(Ag,norm='ortho')
         Yb = dct.idct_2d(Ab,norm='ortho')
         expctddLdX = torch.cat((
-            Yr.reshape(nSamples,1,height,width),
-            Yg.reshape(nSamples,1,height,width),
-            Yb.reshape(nSamples,1,height,width)),dim=1)
+            combineBlocks_(Yr,stride,nSamples,1,height,width),
+            combineBlocks_(Yg,stride,nSamples,1,height,width),
+            combineBlocks_(Yb,stride,nSamples,1,height,width)),dim=1)
         
         # Instantiation of target class
         layer = NsoltBlockDct2dLayer(
@@ -365,5 +357,17 @@ def permuteIdctCoefs_(x,block_size):
     value[:,0::2,1::2] = ceo.view(nBlocks,chDecY,fhDecX)
     return value
 
+def extractBlocks_(x,block_size):
+    decV = block_size[Direction.VERTICAL]
+    decH = block_size[Direction.HORIZONTAL]
+    nrows = x.size(2)//decV
+    ncols = x.size(3)//decH
+    return x.reshape(-1,nrows,decV,ncols,decH).permute(0,1,3,2,4).reshape(-1,decV,decH)
+
+def combineBlocks_(y,block_size,nSamples,nComponents,height,width):
+    decV = block_size[Direction.VERTICAL]
+    decH = block_size[Direction.HORIZONTAL]
+    return y.reshape(nSamples,nComponents,height//decV,width//decH,decV,decH).permute(0,1,2,4,3,5).reshape(nSamples,nComponents,height,width)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,171 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+import torch_dct as dct
+from nsoltBlockDct3dLayer import NsoltBlockDct3dLayer
+from nsoltUtility import Direction
+
+stride = [ [1, 1, 1], [2, 2, 2], [2, 1, 4], [4, 4, 2] ]
+datatype = [ torch.float, torch.double ]
+height = [ 8, 16 ]
+width = [ 8, 16 ]
+depth = [ 8, 16 ]
+
+class NsoltBlockDct3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTBLOCKDCT3DLAYERTESTCASE
+
+       ベクトル配列をブロック配列を入力:
+          nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols) x (Stride[2]xnLays)
+
+       コンポーネント別に出力:
+          nSamples x nRows x nCols x nLays x nDecs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride))
+    )
+    def testConstructor(self,stride):
+        # Expected values
+        expctdName = 'E0'
+        expctdDescription = "Block DCT of size " \
+            + str(stride[Direction.VERTICAL]) + "x" \
+            + str(stride[Direction.HORIZONTAL]) + "x" \
+            + str(stride[Direction.DEPTH])
+
+        # Instantiation of target class
+        layer = NsoltBlockDct3dLayer(
+                decimation_factor=stride,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(stride,height,width,depth,datatype))
+    )
+    def testPredictGrayScale(self,
+            stride, height, width, depth, datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nComponents = 1
+        X = torch.rand(nSamples,nComponents,height,width,depth,dtype=datatype,requires_grad=True)
+
+        # Expected values
+        expctdZ = blockDct3d_(X,stride)
+
+        # Instantiation of target class
+        layer = NsoltBlockDct3dLayer(
+                decimation_factor=stride,
+                name='E0'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testPredictRgbColor(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nComponents = 3
+        X = torch.rand(nSamples,nComponents,16,8,8,dtype=datatype)
+
+        # Expected values
+        expctdZs = [ blockDct3d_(X[:,iComponent:iComponent+1],stride)
+            for iComponent in range(nComponents) ]
+
+        # Instantiation of target class
+        layer = NsoltBlockDct3dLayer(
+                decimation_factor=stride,
+                number_of_components=nComponents,
+                name='E0'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZs = list(layer.forward(X))
+
+        # Evaluation
+        self.assertEqual(len(actualZs),nComponents)
+        for actualZ, expctdZ in zip(actualZs,expctdZs):
+            self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testBackwardGrayScale(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,16,8,8,dtype=datatype,requires_grad=True)
+        nDecs = stride[0]*stride[1]*stride[2]
+        dLdZ = torch.rand(nSamples,16//stride[0],8//stride[1],8//stride[2],nDecs,dtype=datatype)
+
+        # Expected values
+        Y = blockDct3d_(X,stride)
+        Y.backward(dLdZ)
+        expctddLdX = X.grad.clone()
+        X.grad = None
+
+        # Instantiation of target class
+        layer = NsoltBlockDct3dLayer(
+                decimation_factor=stride,
+                name='E0'
+            )
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+
+def blockDct3d_(X,stride):
+    decV, decH, decD = stride
+    nSamples = X.size(0)
+    nrows, ncols, nlays = X.size(2)//decV, X.size(3)//decH, X.size(4)//decD
+    V = X.reshape(nSamples,nrows,decV,ncols,decH,nlays,decD).permute(0,1,3,5,2,4,6)
+    Y = dct.dct_3d(V,norm='ortho')
+    parity = [ slice(0,None,2), slice(1,None,2) ]
+    groups = [ (0,0,0), (0,1,1), (1,1,0), (1,0,1), (0,0,1), (0,1,0), (1,1,1), (1,0,0) ]
+    return torch.cat([ Y[:,:,:,:,parity[pv],parity[ph],parity[pd]].reshape(nSamples,nrows,ncols,nlays,-1)
+        for pv, ph, pd in groups ],dim=-1)
+
+if __name__ == '__main__':
+    unittest.main()
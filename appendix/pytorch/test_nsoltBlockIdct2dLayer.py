@@ -79,7 +79,7 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         # Expected values
         A = permuteIdctCoefs_(X,stride)
         Y = dct.idct_2d(A,norm='ortho')
-        expctdZ = Y.reshape(nSamples,nComponents,height,width)
+        expctdZ = combineBlocks_(Y,stride,nSamples,nComponents,height,width)
 
         # Instantiation of target class
         layer = NsoltBlockIdct2dLayer(
@@ -96,6 +96,44 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
         self.assertFalse(actualZ.requires_grad)
 
+    @parameterized.expand(
+        list(itertools.product(stride,height,width,datatype))
+    )
+    def testPredictGrayScaleInPlace(self,
+        stride, height, width, datatype):
+        rtol,atol = 1e-5,1e-8
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = 5
+        nrows = int(math.ceil(height/stride[Direction.VERTICAL]))
+        ncols = int(math.ceil(width/stride[Direction.HORIZONTAL]))
+        nDecs = stride[0]*stride[1] # math.prod(stride)
+        # nSamples x nRows x nCols x nDecs
+        X = torch.rand(nSamples,nrows,ncols,nDecs,dtype=datatype)
+        # DC slot of a buffer of the finer level
+        buffer = torch.zeros(nSamples,height,width,nChsTotal,dtype=datatype)
+
+        # Instantiation of target class
+        layer = NsoltBlockIdct2dLayer(
+               decimation_factor=stride,
+                name='E0~'
+            )
+
+        # Expected values
+        with torch.no_grad():
+            expctdZ = layer.forward(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X,out=buffer[:,:,:,0].unsqueeze(dim=1))
+
+        # Evaluation
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(buffer[:,:,:,0],expctdZ.squeeze(dim=1),rtol=rtol,atol=atol))
+        self.assertEqual(torch.count_nonzero(buffer[:,:,:,1:]),0)
+
     @parameterized.expand(
         list(itertools.product(stride,height,width,datatype))
     )
@@ -115,7 +153,7 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         # Expected values
         A = permuteIdctCoefs_(X,stride)
         Y = dct.idct_2d(A,norm='ortho')
-        expctdZ = Y.reshape(nSamples,nComponents,height,width)
+        expctdZ = combineBlocks_(Y,stride,nSamples,nComponents,height,width)
 
         # Instantiation of target class
         layer = NsoltBlockIdct2dLayer(
@@ -157,9 +195,9 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         Yg = dct.idct_2d(Ag,norm='ortho')
         Yb = dct.idct_2d(Ab,norm='ortho')
         expctdZ = torch.cat((
-            Yr.reshape(nSamples,1,height,width),
-            Yg.reshape(nSamples,1,height,width),
-            Yb.reshape(nSamples,1,height,width)),dim=1)
+            combineBlocks_(Yr,stride,nSamples,1,height,width),
+            combineBlocks_(Yg,stride,nSamples,1,height,width),
+            combineBlocks_(Yb,stride,nSamples,1,height,width)),dim=1)
 
             
         # Instantiation of target class
@@ -204,9 +242,9 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         Yg = dct.idct_2d(Ag,norm='ortho')
         Yb = dct.idct_2d(Ab,norm='ortho')
         expctdZ = torch.cat((
-            Yr.reshape(nSamples,1,height,width),
-            Yg.reshape(nSamples,1,height,width),
-            Yb.reshape(nSamples,1,height,width)),dim=1)
+            combineBlocks_(Yr,stride,nSamples,1,height,width),
+            combineBlocks_(Yg,stride,nSamples,1,height,width),
+            combineBlocks_(Yb,stride,nSamples,1,height,width)),dim=1)
             
         # Instantiation of target class
         layer = NsoltBlockIdct2dLayer(
@@ -242,9 +280,7 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         dLdZ = torch.rand(nSamples,nComponents,height,width,dtype=datatype)
     
         # Expected values
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(dLdZ.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(dLdZ,stride),norm='ortho')
         A = permuteDctCoefs_(Y)
         # Rearrange the DCT Coefs. (nSamples x nComponents x nrows x ncols) x (decV x decH)
         expctddLdX = A.view(nSamples,nrows,ncols,nDecs)
@@ -286,9 +322,7 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         dLdZ = torch.rand(nSamples,nComponents,height,width,dtype=datatype)
 
         # Expected values
-        arrayshape = stride.copy()
-        arrayshape.insert(0,-1)
-        Y = dct.dct_2d(dLdZ.view(arrayshape),norm='ortho')
+        Y = dct.dct_2d(extractBlocks_(dLdZ,stride),norm='ortho')
         A = permuteDctCoefs_(Y)
         # Rearrange the DCT Coefs. (nSamples x nRows x nCols x nDecs)
         Z = A.view(nSamples,nComponents,nrows,ncols,nDecs) 
@@ -347,5 +381,17 @@ def permuteIdctCoefs_(x,block_size):
     value[:,0::2,1::2] = ceo.view(nBlocks,chDecY,fhDecX)
     return value
 
+def extractBlocks_(x,block_size):
+    decV = block_size[Direction.VERTICAL]
+    decH = block_size[Direction.HORIZONTAL]
+    nrows = x.size(2)//decV
+    ncols = x.size(3)//decH
+    return x.reshape(-1,nrows,decV,ncols,decH).permute(0,1,3,2,4).reshape(-1,decV,decH)
+
+def combineBlocks_(y,block_size,nSamples,nComponents,height,width):
+    decV = block_size[Direction.VERTICAL]
+    decH = block_size[Direction.HORIZONTAL]
+    return y.reshape(nSamples,nComponents,height//decV,width//decH,decV,decH).permute(0,1,2,4,3,5).reshape(nSamples,nComponents,height,width)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,151 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltBlockDct3dLayer import NsoltBlockDct3dLayer
+from nsoltBlockIdct3dLayer import NsoltBlockIdct3dLayer
+from nsoltUtility import Direction
+
+stride = [ [1, 1, 1], [2, 2, 2], [2, 1, 4], [4, 4, 2] ]
+datatype = [ torch.float, torch.double ]
+height = [ 8, 16 ]
+width = [ 8, 16 ]
+depth = [ 8, 16 ]
+
+class NsoltBlockIdct3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTBLOCKIDCT3DLAYERTESTCASE
+
+       コンポーネント別に入力:
+          nSamples x nRows x nCols x nLays x nDecs
+
+       ベクトル配列をブロック配列にして出力:
+          nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols) x (Stride[2]xnLays)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride))
+    )
+    def testConstructor(self,stride):
+        # Expected values
+        expctdName = 'E0~'
+        expctdDescription = "Block IDCT of size " \
+            + str(stride[Direction.VERTICAL]) + "x" \
+            + str(stride[Direction.HORIZONTAL]) + "x" \
+            + str(stride[Direction.DEPTH])
+
+        # Instantiation of target class
+        layer = NsoltBlockIdct3dLayer(
+                decimation_factor=stride,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(stride,height,width,depth,datatype))
+    )
+    def testPredictGrayScale(self,
+            stride, height, width, depth, datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        expctdZ = torch.rand(nSamples,1,height,width,depth,dtype=datatype)
+        X = NsoltBlockDct3dLayer(decimation_factor=stride).forward(expctdZ)
+
+        # Instantiation of target class
+        layer = NsoltBlockIdct3dLayer(
+                decimation_factor=stride,
+                name='E0~'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testPredictRgbColor(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nComponents = 3
+        expctdZ = torch.rand(nSamples,nComponents,16,8,8,dtype=datatype)
+        Xs = NsoltBlockDct3dLayer(decimation_factor=stride,
+            number_of_components=nComponents).forward(expctdZ)
+
+        # Instantiation of target class
+        layer = NsoltBlockIdct3dLayer(
+                decimation_factor=stride,
+                number_of_components=nComponents,
+                name='E0~'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(*Xs)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testBackwardGrayScale(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nDecs = stride[0]*stride[1]*stride[2]
+        X = torch.rand(nSamples,16//stride[0],8//stride[1],8//stride[2],nDecs,
+            dtype=datatype,requires_grad=True)
+        dLdZ = torch.rand(nSamples,1,16,8,8,dtype=datatype)
+
+        # Expected values: adjoint of IDCT is DCT
+        expctddLdX = NsoltBlockDct3dLayer(decimation_factor=stride).forward(dLdZ)
+
+        # Instantiation of target class
+        layer = NsoltBlockIdct3dLayer(
+                decimation_factor=stride,
+                name='E0~'
+            )
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -88,6 +88,70 @@ class NsoltAtomExtention2dLayerTestCase(unittest.TestCase):
         self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
         self.assertFalse(actualZ.requires_grad)
 
+    @parameterized.expand(
+        list(itertools.product(nchs,nrows,ncols,datatype))
+    )
+    def testPredictWithoutCopy(self,
+        nchs,nrows,ncols,datatype):
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        # nSamples x nRows x nCols x nChsTotal
+        X = torch.randn(nSamples,nrows,ncols,nChsTotal,dtype=datatype)
+        # Outputs of channel separation
+        Xac, Xdc = X[:,:,:,1:], X[:,:,:,0]
+
+        # Expected values
+        expctdZ = X.clone()
+
+        # Instantiation of target class
+        layer = NsoltChannelConcatenation2dLayer(
+                name='Cn'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(Xac=Xac,Xdc=Xdc)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+        self.assertEqual(actualZ.data_ptr(),X.data_ptr())
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nrows,ncols,datatype))
+    )
+    def testAllocate(self,
+        nchs,nrows,ncols,datatype):
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        # nSamples x nRows x nCols x (nChsTotal-1)
+        Xac = torch.randn(nSamples,nrows,ncols,nChsTotal-1,dtype=datatype)
+        # nSamples x nRows x nCols
+        Xdc = torch.randn(nSamples,nrows,ncols,dtype=datatype)
+
+        # Expected values
+        # nSamples x nRows x nCols x nChsTotal
+        expctdZ = torch.cat((Xdc.unsqueeze(dim=3),Xac),dim=3)
+
+        # Instantiation of target class
+        layer = NsoltChannelConcatenation2dLayer(
+                name='Cn'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.allocate(Xac)
+            actualZ[:,:,:,0] = Xdc
+            # The buffer is reused while autograd is disabled
+            reusedZ = layer.allocate(Xac)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+        self.assertEqual(reusedZ.data_ptr(),actualZ.data_ptr())
+
     @parameterized.expand(
         list(itertools.product(nchs,nrows,ncols,datatype))
     )
@@ -0,0 +1,111 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltChannelConcatenation3dLayer import NsoltChannelConcatenation3dLayer
+
+nchs = [ [3, 3], [4, 4] ]
+datatype = [ torch.float, torch.double ]
+nlays = [ 2, 4 ]
+
+class NsoltChannelConcatenation3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTCHANNELCONCATENATION3DLAYERTESTCASE
+
+       ２コンポーネント入力(nComponents=2のみサポート):
+          nSamples x nRows x nCols x nLays x (nChsTotal-1)
+          nSamples x nRows x nCols x nLays
+
+       １コンポーネント出力(nComponents=1のみサポート):
+          nSamples x nRows x nCols x nLays x nChsTotal
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdName = 'Cn'
+        expctdDescription = "Channel concatenation"
+
+        # Instantiation of target class
+        layer = NsoltChannelConcatenation3dLayer(
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,datatype))
+    )
+    def testPredict(self,nchs,nlays,datatype):
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        Xac = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs)-1,dtype=datatype)
+        Xdc = torch.randn(nSamples,nrows,ncols,nlays,dtype=datatype)
+
+        # Expected values
+        expctdZ = torch.cat((Xdc.unsqueeze(dim=4),Xac),dim=4)
+
+        # Instantiation of target class
+        layer = NsoltChannelConcatenation3dLayer(
+                name='Cn'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(Xac=Xac,Xdc=Xdc)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,datatype))
+    )
+    def testBackward(self,nchs,nlays,datatype):
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        Xac = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs)-1,dtype=datatype,requires_grad=True)
+        Xdc = torch.randn(nSamples,nrows,ncols,nlays,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype)
+
+        # Expected values
+        expctddLdXac = dLdZ[:,:,:,:,1:]
+        expctddLdXdc = dLdZ[:,:,:,:,0]
+
+        # Instantiation of target class
+        layer = NsoltChannelConcatenation3dLayer(
+                name='Cn'
+            )
+
+        # Actual values
+        Z = layer.forward(Xac=Xac,Xdc=Xdc)
+        Z.backward(dLdZ)
+
+        # Evaluation
+        self.assertTrue(torch.equal(Xac.grad,expctddLdXac))
+        self.assertTrue(torch.equal(Xdc.grad,expctddLdXdc))
+
+if __name__ == '__main__':
+    unittest.main()
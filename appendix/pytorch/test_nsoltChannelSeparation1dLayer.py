@@ -0,0 +1,110 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltChannelSeparation1dLayer import NsoltChannelSeparation1dLayer
+
+nchs = [ [3, 3], [4, 4] ]
+datatype = [ torch.float, torch.double ]
+nblks = [ 4, 8 ]
+
+class NsoltChannelSeparation1dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTCHANNELSEPARATION1DLAYERTESTCASE
+
+       入力:
+          nSamples x nBlks x nChsTotal
+
+       ２コンポーネント出力:
+          nSamples x nBlks x (nChsTotal-1)
+          nSamples x nBlks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdName = 'Sp'
+        expctdDescription = "Channel separation"
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation1dLayer(
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nblks,datatype))
+    )
+    def testPredict(self,nchs,nblks,datatype):
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,nblks,sum(nchs),dtype=datatype)
+
+        # Expected values
+        expctdZac = X[:,:,1:]
+        expctdZdc = X[:,:,0]
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation1dLayer(
+                name='Sp'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZac, actualZdc = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZac.dtype,datatype)
+        self.assertEqual(actualZdc.dtype,datatype)
+        self.assertTrue(torch.equal(actualZac,expctdZac))
+        self.assertTrue(torch.equal(actualZdc,expctdZdc))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nblks,datatype))
+    )
+    def testBackward(self,nchs,nblks,datatype):
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,nblks,sum(nchs),dtype=datatype,requires_grad=True)
+        dLdZac = torch.randn(nSamples,nblks,sum(nchs)-1,dtype=datatype)
+        dLdZdc = torch.randn(nSamples,nblks,dtype=datatype)
+
+        # Expected values
+        expctddLdX = torch.cat((dLdZdc.unsqueeze(dim=2),dLdZac),dim=2)
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation1dLayer(
+                name='Sp'
+            )
+
+        # Actual values
+        Zac, Zdc = layer.forward(X)
+        torch.autograd.backward((Zac,Zdc),(dLdZac,dLdZdc))
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualdLdX,expctddLdX))
+
+if __name__ == '__main__':
+    unittest.main()
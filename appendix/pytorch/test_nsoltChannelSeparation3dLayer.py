@@ -0,0 +1,112 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltChannelSeparation3dLayer import NsoltChannelSeparation3dLayer
+
+nchs = [ [3, 3], [4, 4] ]
+datatype = [ torch.float, torch.double ]
+nlays = [ 2, 4 ]
+
+class NsoltChannelSeparation3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTCHANNELSEPARATION3DLAYERTESTCASE
+
+       １コンポーネント入力(nComponents=1のみサポート):
+          nSamples x nRows x nCols x nLays x nChsTotal
+
+       ２コンポーネント出力(nComponents=2のみサポート):
+          nSamples x nRows x nCols x nLays x (nChsTotal-1)
+          nSamples x nRows x nCols x nLays
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdName = 'Sp'
+        expctdDescription = "Channel separation"
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation3dLayer(
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,datatype))
+    )
+    def testPredict(self,nchs,nlays,datatype):
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        X = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype)
+
+        # Expected values
+        expctdZac = X[:,:,:,:,1:]
+        expctdZdc = X[:,:,:,:,0]
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation3dLayer(
+                name='Sp'
+            )
+
+        # Actual values
+        with torch.no_grad():
+            actualZac, actualZdc = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZac.dtype,datatype)
+        self.assertEqual(actualZdc.dtype,datatype)
+        self.assertTrue(torch.equal(actualZac,expctdZac))
+        self.assertTrue(torch.equal(actualZdc,expctdZdc))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nlays,datatype))
+    )
+    def testBackward(self,nchs,nlays,datatype):
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        X = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype,requires_grad=True)
+        dLdZac = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs)-1,dtype=datatype)
+        dLdZdc = torch.randn(nSamples,nrows,ncols,nlays,dtype=datatype)
+
+        # Expected values
+        expctddLdX = torch.cat((dLdZdc.unsqueeze(dim=4),dLdZac),dim=4)
+
+        # Instantiation of target class
+        layer = NsoltChannelSeparation3dLayer(
+                name='Sp'
+            )
+
+        # Actual values
+        Zac, Zdc = layer.forward(X)
+        torch.autograd.backward((Zac,Zdc),(dLdZac,dLdZdc))
+        actualdLdX = X.grad
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualdLdX,expctddLdX))
+
+if __name__ == '__main__':
+    unittest.main()
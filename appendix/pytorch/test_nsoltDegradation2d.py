@@ -0,0 +1,428 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import numpy as np
+import torch
+import torch.nn.functional as F
+from nsoltDegradation2d import BlurSystem, DecimationSystem, PixelLossSystem, \
+    CascadedLinearSystem, AdditiveWhiteGaussianNoiseSystem, PoissonNoiseSystem, \
+    NoiselessSystem, DegradationSystem, gaussiankernel2d, packbits2d, unpackbits2d, \
+    philox4x32, uniform2d, normal2d, poisson2d
+from nsoltLayerExceptions import InvalidOption
+
+boundary = [ 'Value', 'Symmetric', 'Replicate', 'Circular' ]
+kernelsize = [ [3, 3], [4, 5], [2, 1] ]
+decimation = [ [1, 1], [2, 2], [2, 3] ]
+datatype = [ torch.float, torch.double ]
+padmode = { 'Value': 'constant', 'Symmetric': 'symmetric',
+    'Replicate': 'edge', 'Circular': 'wrap' }
+
+class NsoltDegradation2dTestCase(unittest.TestCase):
+    """
+    NSOLTDEGRADATION2DTESTCASE Test cases for the degradation processes
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testGaussianKernel(self):
+        # Expected values, fspecial('gaussian',[3 3],0.5)
+        expctdK = torch.tensor([
+            [ 0.0113, 0.0838, 0.0113 ],
+            [ 0.0838, 0.6193, 0.0838 ],
+            [ 0.0113, 0.0838, 0.0113 ] ],dtype=torch.double)
+
+        # Actual values
+        actualK = gaussiankernel2d(3,0.5)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualK,expctdK,atol=1e-4))
+
+    def testInvalidOption(self):
+        with self.assertRaises(InvalidOption):
+            BlurSystem(blur_type='Motion')
+        with self.assertRaises(InvalidOption):
+            BlurSystem(blur_type='Custom')
+        with self.assertRaises(InvalidOption):
+            BlurSystem(boundary_option='Periodic')
+        with self.assertRaises(InvalidOption):
+            PixelLossSystem(loss_type='Specified')
+
+    @parameterized.expand(
+        list(itertools.product(boundary,kernelsize,datatype))
+    )
+    def testBlur(self,boundary,kernelsize,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(2,3,12,18,dtype=datatype)
+        kernel = torch.rand(kernelsize,dtype=datatype)
+
+        # Expected values
+        expctdY = conv_(X,kernel,boundary)
+
+        # Instantiation of target class
+        process = BlurSystem(blur_type='Custom',boundary_option=boundary,
+            custom_kernel=kernel)
+
+        # Actual values
+        actualY = process(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,expctdY.shape)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(boundary,decimation,datatype))
+    )
+    def testDecimation(self,boundary,decimation,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(2,3,12,18,dtype=datatype)
+        kernel = gaussiankernel2d([ 4*factor+1 for factor in decimation ],
+            max(decimation)).to(datatype)
+
+        # Expected values
+        expctdY = conv_(X,kernel,boundary)[...,::decimation[0],::decimation[1]]
+
+        # Instantiation of target class
+        process = DecimationSystem(decimation_factor=decimation,
+            blur_type='Gaussian',boundary_option=boundary)
+
+        # Actual values
+        actualY = process(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,expctdY.shape)
+        self.assertEqual(process.originaldimension(actualY.shape[-2:]),X.shape[-2:])
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(boundary,kernelsize,decimation))
+    )
+    def testAdjoint(self,boundary,kernelsize,decimation):
+        datatype = torch.double
+
+        # Parameters
+        X = torch.randn(2,1,12,18,dtype=datatype)
+        kernel = torch.rand(kernelsize,dtype=datatype)
+
+        # Instantiation of target class
+        process = DecimationSystem(decimation_factor=decimation,
+            blur_type='Custom',boundary_option=boundary,custom_kernel=kernel)
+
+        # Expected values
+        Y = torch.randn_like(process(X))
+        expctdIp = torch.sum(process(X)*Y)
+
+        # Actual values
+        actualIp = torch.sum(X*process.adjoint(Y))
+
+        # Evaluation
+        self.assertAlmostEqual(actualIp.item(),expctdIp.item())
+
+    @parameterized.expand(
+        list(itertools.product(boundary,decimation))
+    )
+    def testLambdaMax(self,boundary,decimation):
+        datatype = torch.double
+        size = (6,6)
+
+        # Instantiation of target class
+        process = DecimationSystem(decimation_factor=decimation,
+            blur_type='Custom',boundary_option=boundary,
+            custom_kernel=torch.rand(3,2,dtype=datatype))
+
+        # Expected values by the matrix of the process
+        P = process(torch.eye(size[0]*size[1],dtype=datatype).view(-1,1,*size))
+        P = P.reshape(size[0]*size[1],-1)
+        expctdL = torch.linalg.eigvalsh(P @ P.T).max().item()
+
+        # Actual values
+        actualL = process.lambdamax(size)
+
+        # Evaluation, where the power method stops at the relative change of 1e-8
+        self.assertAlmostEqual(actualL/expctdL,1.,places=5)
+        self.assertEqual(list(process.lambdamaxs_.keys()),[ size ])
+
+    def testTransferCache(self):
+        # Instantiation of target class
+        process = BlurSystem(blur_type='Gaussian',boundary_option='Symmetric')
+
+        # Actual values
+        for _ in range(3):
+            process.adjoint(process(torch.rand(2,1,16,16)))
+        process(torch.rand(2,1,16,16,dtype=torch.double))
+        process(torch.rand(2,1,8,16))
+
+        # Evaluation
+        self.assertEqual(set(process.transfers_.keys()),set([
+            ((16,16),torch.float,torch.device('cpu')),
+            ((16,16),torch.double,torch.device('cpu')),
+            ((8,16),torch.float,torch.device('cpu')) ]))
+
+    @parameterized.expand(
+        list(itertools.product([ (7,5), (8,8), (1,3) ]))
+    )
+    def testPackBits(self,size):
+        # Parameters
+        mask = torch.rand(size) > 0.5
+
+        # Actual values
+        packed = packbits2d(mask)
+
+        # Evaluation
+        self.assertEqual(packed.dtype,torch.uint8)
+        self.assertEqual(packed.numel(),(mask.numel()+7)//8)
+        self.assertTrue(torch.equal(unpackbits2d(packed,size),mask))
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testPixelLossSpecified(self,datatype):
+        # Parameters
+        X = torch.rand(2,3,12,18,dtype=datatype)
+        mask = torch.rand(12,18) > 0.3
+
+        # Expected values
+        expctdY = X*mask
+
+        # Instantiation of target class
+        process = PixelLossSystem(loss_type='Specified',mask=mask)
+
+        # Actual values
+        actualY = process(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertTrue(torch.equal(actualY,expctdY))
+        self.assertTrue(torch.equal(process.adjoint(X),expctdY))
+        self.assertEqual(process.state_dict()['packed_mask'].numel(),27)
+        self.assertEqual(process.lambdamax((12,18)),1.)
+
+    def testPixelLossRandom(self):
+        density = 0.3
+
+        # Instantiation of target class
+        process = PixelLossSystem(density=density,seed=1)
+
+        # Actual values
+        actualY = process(torch.ones(1,1,64,64))
+
+        # Evaluation
+        self.assertAlmostEqual(1.-actualY.mean().item(),density,places=1)
+        self.assertTrue(torch.equal(
+            PixelLossSystem(density=density,seed=1)(torch.ones(2,1,64,64)),
+            actualY.expand(2,1,64,64)))
+        self.assertFalse(torch.equal(
+            PixelLossSystem(density=density,seed=2)(torch.ones(1,1,64,64)),actualY))
+
+    def testPhilox(self):
+        # Parameters, the known answers of Random123
+        counter = torch.tensor([
+            [ 0, 0, 0, 0 ],
+            [ 0xffffffff, 0xffffffff, 0xffffffff, 0xffffffff ],
+            [ 0x243f6a88, 0x85a308d3, 0x13198a2e, 0x03707344 ] ])
+        key = [ (0, 0), (0xffffffff, 0xffffffff), (0xa4093822, 0x299f31d0) ]
+
+        # Expected values
+        expctdW = torch.tensor([
+            [ 0x6627e8d5, 0xe169c58d, 0xbc57ac4c, 0x9b00dbd8 ],
+            [ 0x408f276d, 0x41c83b0e, 0xa20bc7c6, 0x6d5451fd ],
+            [ 0xd16cfe09, 0x94fdcceb, 0x5001e420, 0x24126ea1 ] ])
+
+        # Actual values
+        actualW = torch.stack([ philox4x32(c,k) for c, k in zip(counter,key) ])
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualW,expctdW))
+
+    @parameterized.expand(
+        list(itertools.product([ uniform2d, normal2d ],datatype))
+    )
+    def testStreams(self,generator,datatype):
+        shape = (4,3,5,7)
+
+        # Expected values, where the samples are generated by two workers
+        expctdZ = torch.cat([
+            generator((2,*shape[1:]),seed=5,stream=10,dtype=datatype),
+            generator((2,*shape[1:]),seed=5,stream=12,dtype=datatype) ])
+
+        # Actual values
+        actualZ = generator(shape,seed=5,stream=10,dtype=datatype)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,shape)
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+        self.assertFalse(torch.equal(actualZ,generator(shape,seed=6,stream=10,dtype=datatype)))
+
+    def testNormalStatistics(self):
+        # Actual values
+        Z = normal2d((4,1,128,128),seed=1)
+
+        # Evaluation
+        self.assertAlmostEqual(Z.mean().item(),0.,places=2)
+        self.assertAlmostEqual(Z.std().item(),1.,places=2)
+
+    def testPoissonInversion(self):
+        datatype = torch.double
+
+        # Parameters
+        rate = torch.tensor([ 0., 1e-3, 0.5, 3., 30., 255., 1e4 ],dtype=datatype).repeat(1000)
+        U = uniform2d((1,rate.numel()),seed=2).view(-1)
+
+        # Actual values
+        k = poisson2d(rate,U)
+
+        # Evaluation, P(X <= k-1) < U <= P(X <= k)
+        cdf = torch.special.gammaincc(k+1.,rate)
+        cdfpre = torch.where(k > 0,torch.special.gammaincc(k.clamp(min=1.),rate),torch.zeros_like(rate))
+        self.assertTrue(torch.all(torch.eq(k,k.round())))
+        self.assertTrue(torch.all(cdfpre < U))
+        self.assertTrue(torch.all(U <= cdf+1e-12))
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testAdditiveWhiteGaussianNoise(self,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(4,2,8,8,dtype=datatype)
+        mean = 0.1
+        variance = torch.tensor([ 0., 1e-4, 1e-2, 1. ])
+
+        # Expected values
+        Z = normal2d(X.shape,seed=3,stream=0,dtype=datatype)
+        expctdY = (X+mean+variance.to(datatype).sqrt().view(-1,1,1,1)*Z).clamp(0.,1.)
+
+        # Instantiation of target class
+        noise = AdditiveWhiteGaussianNoiseSystem(mean=mean,variance=variance,seed=3)
+
+        # Actual values
+        actualY = torch.empty_like(X)
+        noise(X,out=actualY)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualY[0],(X[0]+mean).clamp(0.,1.)))
+        self.assertEqual(noise.stream,4)
+        self.assertFalse(torch.equal(noise(X),actualY))
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testPoissonNoise(self,datatype):
+        # Parameters
+        X = torch.rand(4,1,16,16,dtype=datatype)
+        peak = torch.tensor([ 1., 10., 255., 1e4 ])
+
+        # Expected values, where the workers share the samples
+        expctdY = torch.cat([
+            PoissonNoiseSystem(peak=peak[:2],seed=4,stream=0)(X[:2]),
+            PoissonNoiseSystem(peak=peak[2:],seed=4,stream=2)(X[2:]) ])
+
+        # Instantiation of target class
+        noise = PoissonNoiseSystem(peak=peak,seed=4)
+
+        # Actual values
+        actualY = noise(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertTrue(torch.equal(actualY,expctdY))
+        counts = actualY.double()*peak.double().view(-1,1,1,1)
+        self.assertTrue(torch.allclose(counts[:3],counts[:3].round()))
+        self.assertGreater((actualY[0]-X[0]).abs().mean(),(actualY[3]-X[3]).abs().mean())
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testDegradation(self,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(3,1,16,24,dtype=datatype)
+        decimation = DecimationSystem(blur_type='Gaussian')
+        loss = PixelLossSystem(density=0.2)
+        variance = torch.tensor([ 1e-4, 1e-3, 1e-2 ])
+
+        # Expected values
+        expctdY = AdditiveWhiteGaussianNoiseSystem(variance=variance,seed=7)(loss(decimation(X)))
+
+        # Instantiation of target class
+        degradation = DegradationSystem(linear_process=[ decimation, loss ],
+            noise_process=AdditiveWhiteGaussianNoiseSystem(variance=variance,seed=7))
+
+        # Actual values
+        actualY = degradation(X)
+
+        # Evaluation
+        self.assertTrue(isinstance(degradation.linear_process,CascadedLinearSystem))
+        self.assertEqual(actualY.shape,(3,1,8,12))
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertEqual(degradation.linear_process.originaldimension((8,12)),(16,24))
+
+    def testCascadedAdjoint(self):
+        datatype = torch.double
+
+        # Parameters
+        X = torch.randn(2,1,12,18,dtype=datatype)
+
+        # Instantiation of target class
+        process = CascadedLinearSystem([
+            BlurSystem(blur_type='Average',boundary_option='Symmetric'),
+            DecimationSystem(decimation_factor=[2,3]),
+            PixelLossSystem(density=0.3) ])
+
+        # Expected values
+        Y = torch.randn_like(process(X))
+        expctdIp = torch.sum(process(X)*Y)
+
+        # Actual values
+        actualIp = torch.sum(X*process.adjoint(Y))
+
+        # Evaluation
+        self.assertAlmostEqual(actualIp.item(),expctdIp.item())
+        self.assertLessEqual(process.lambdamax((12,18)),1.+1e-6)
+
+    def testNoiseless(self):
+        # Parameters
+        X = torch.rand(2,1,8,8)
+
+        # Instantiation of target class
+        degradation = DegradationSystem()
+
+        # Actual values
+        actualY = torch.empty_like(X)
+        degradation(X,out=actualY)
+
+        # Evaluation
+        self.assertTrue(isinstance(degradation.noise_process,NoiselessSystem))
+        self.assertTrue(torch.equal(actualY,X))
+        self.assertTrue(degradation(X) is X)
+
+def conv_(X,kernel,boundary):
+    nRowsK, nColsK = kernel.shape
+    top, left = (nRowsK-1)//2, (nColsK-1)//2
+    Xp = torch.from_numpy(np.pad(X.numpy(),((0,0),(0,0),
+        (top,nRowsK-1-top),(left,nColsK-1-left)),mode=padmode[boundary]))
+    Y = F.conv2d(Xp.reshape(-1,1,*Xp.shape[-2:]),kernel.flip(0,1).view(1,1,nRowsK,nColsK))
+    return Y.view(X.shape)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,244 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn.functional as F
+from nsoltDenoiser2d import GaussianDenoiserSfth, GaussianDenoiserHdth, CycleSpinningDenoiser2d
+from nsoltSimplify2d import simplifynetwork2d
+from nsoltTestUtility import randomdictionary2d
+
+stride = [ [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltDenoiser2dTestCase(unittest.TestCase):
+    """
+    NSOLTDENOISER2DTESTCASE Test cases for the thresholding denoisers
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product([ GaussianDenoiserSfth, GaussianDenoiserHdth ],datatype))
+    )
+    def testNoThreshold(self,denoiser_class,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(2,3,16,16,dtype=datatype)
+
+        # Expected values
+        expctdY = X
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        denoiser = denoiser_class(analyzer,synthesizer,sigma=0.)
+
+        # Actual values
+        actualY = denoiser(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testSoftThresholding(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        sigma = 0.3
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,ppord,nlevels,datatype)
+        denoiser = GaussianDenoiserSfth(analyzer,synthesizer,sigma=sigma)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X.reshape(4,1,height,width))
+            Y = [ F.softshrink(subY,sigma**2) for subY in Y ]
+            expctdZ = synthesizer(*Y).reshape(X.shape)
+
+        # Actual values
+        actualZ = denoiser(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testHardThresholding(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        sigma = 0.3
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,ppord,nlevels,datatype)
+        denoiser = GaussianDenoiserHdth(analyzer,synthesizer,sigma=sigma)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X.reshape(4,1,height,width))
+            Y = [ subY*(subY.abs() > sigma**2) for subY in Y ]
+            expctdZ = synthesizer(*Y).reshape(X.shape)
+
+        # Actual values
+        actualZ = denoiser(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product([ GaussianDenoiserSfth, GaussianDenoiserHdth ],[ False, True ]))
+    )
+    def testSubbandThresholds(self,denoiser_class,simplify):
+        rtol,atol = 1e-4,1e-5
+        datatype = torch.double
+
+        # Parameters
+        nLevels, nChsTotal = 2, 6
+        X = torch.rand(3,1,32,32,dtype=datatype)
+        sigma = torch.rand(nLevels,nChsTotal,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([3,3],[2,2],[2,2],nLevels,datatype)
+        if simplify:
+            analyzer, synthesizer = simplifynetwork2d(analyzer), simplifynetwork2d(synthesizer)
+        denoiser = denoiser_class(analyzer,synthesizer,sigma=sigma)
+
+        # Expected values
+        threshold = sigma**2
+        thresholds = [ threshold[0,1:], threshold[1,1:], threshold[1,0] ]
+        with torch.no_grad():
+            Y = analyzer(X)
+            if denoiser_class is GaussianDenoiserSfth:
+                Y = [ subY.sign()*(subY.abs()-th).clamp(min=0.) for subY, th in zip(Y,thresholds) ]
+            else:
+                Y = [ subY*(subY.abs() > th) for subY, th in zip(Y,thresholds) ]
+            expctdZ = synthesizer(*Y)
+
+        # Actual values
+        actualZ = denoiser(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    def testBuffers(self):
+        # Parameters
+        X = torch.rand(2,1,32,32)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,torch.float)
+        denoiser = GaussianDenoiserSfth(analyzer,synthesizer,sigma=0.2)
+
+        # Actual values
+        for _ in range(3):
+            denoiser(X)
+
+        # Evaluation, where the buffers are reused
+        self.assertEqual(len(denoiser.buffers_),3)
+
+    @parameterized.expand(
+        list(itertools.product([ 1, 3, 4 ]))
+    )
+    def testStream(self,batch_size):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        frames = torch.rand(7,2,16,16)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,torch.float)
+        denoiser = GaussianDenoiserHdth(analyzer,synthesizer,sigma=0.2)
+
+        # Expected values
+        expctdY = denoiser(frames)
+
+        # Actual values
+        actualY = list(denoiser.stream(iter(frames),batch_size=batch_size))
+
+        # Evaluation
+        self.assertEqual(len(actualY),len(frames))
+        self.assertTrue(torch.allclose(torch.stack(actualY),expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,[ 1, 5, 1000 ],datatype))
+    )
+    def testCycleSpinning(self,stride,nlevels,nShiftsPerChunk,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,[2,2],nlevels,datatype)
+        denoiser = GaussianDenoiserSfth(analyzer,synthesizer,sigma=0.3)
+        spinning = CycleSpinningDenoiser2d(denoiser,max_elements=nShiftsPerChunk*X.numel())
+
+        # Expected values
+        shifts = [ (dv, dh) for dv in range(stride[0]**nlevels)
+            for dh in range(stride[1]**nlevels) ]
+        expctdY = torch.zeros_like(X)
+        for dv, dh in shifts:
+            Xs = torch.roll(X,(-dv,-dh),(2,3))
+            expctdY += torch.roll(denoiser(Xs),(dv,dh),(2,3))
+        expctdY /= len(shifts)
+
+        # Actual values
+        actualY = spinning(X)
+
+        # Evaluation
+        self.assertEqual(spinning.shifts,shifts)
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertEqual(len(spinning.indices_),(len(shifts)+nShiftsPerChunk-1)//nShiftsPerChunk)
+
+    def testCycleSpinningShifts(self):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(1,1,16,16)
+        shifts = [ (0,0), (3,5), (-1,2) ]
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],1,torch.float)
+        denoiser = GaussianDenoiserHdth(analyzer,synthesizer,sigma=0.3)
+        spinning = CycleSpinningDenoiser2d(denoiser,shifts=shifts)
+
+        # Expected values
+        expctdY = sum(torch.roll(denoiser(torch.roll(X,(-dv,-dh),(2,3))),(dv,dh),(2,3))
+            for dv, dh in shifts)/len(shifts)
+
+        # Actual values
+        actualY = spinning(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,149 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltDispatcher2d import NsoltDispatcher2d
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [3, 3] ]
+stride = [ [1, 1], [2, 2] ]
+ppord = [ [0, 0], [2, 2] ]
+nlevels = [ 1, 2 ]
+
+class NsoltDispatcher2dTestCase(unittest.TestCase):
+    """
+    NSOLTDISPATCHER2DTESTCASE Test cases for NsoltDispatcher2d
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        network = NsoltAnalysis2dNetwork()
+        target = NsoltDispatcher2d(network)
+        self.assertTrue(isinstance(target, nn.Module))
+        self.assertEqual(target.decisions,{})
+        self.assertIsNone(target.last_choice)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels))
+    )
+    def testForwardAnalysis(self,nchs,stride,ppord,nlevels):
+        rtol,atol = 1e-4,1e-6
+
+        # Parameters
+        nSamples = 4
+        X = torch.rand(nSamples,1,32,32)
+        network = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels)
+        for angles in network.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values
+        with torch.no_grad():
+            expctdZ = network.forward(X)
+        expctdKey = (((nSamples,1,32,32),X.dtype),)
+
+        # Instantiation of target class
+        target = NsoltDispatcher2d(network)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = target.forward(X)
+            actualZ2 = target.forward(X)
+
+        # Evaluation
+        self.assertIn(expctdKey,target.decisions)
+        self.assertIn(target.decisions[expctdKey],{'Layers','Conv'})
+        self.assertEqual(target.last_choice,target.decisions[expctdKey])
+        self.assertEqual(set(target.timings[expctdKey].keys()),{'Layers','Conv'})
+        for actual, actual2, expctd in zip(actualZ,actualZ2,expctdZ):
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+            self.assertTrue(torch.allclose(actual2,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels))
+    )
+    def testForwardSynthesis(self,nchs,stride,ppord,nlevels):
+        rtol,atol = 1e-4,1e-6
+
+        # Parameters
+        nSamples = 4
+        X = torch.rand(nSamples,1,32,32)
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        network = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels)
+        network = cpparamsana2syn(network,analyzer)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+
+        # Instantiation of target class
+        target = NsoltDispatcher2d(network)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = target.forward(*Y)
+
+        # Evaluation
+        self.assertEqual(len(target.decisions),1)
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    def testGradientEnabled(self):
+
+        # Parameters
+        X = torch.rand(2,1,16,16)
+        network = NsoltAnalysis2dNetwork()
+        target = NsoltDispatcher2d(network)
+
+        # Actual values
+        Z = target.forward(X)
+
+        # Evaluation
+        self.assertEqual(target.last_choice,'Layers')
+        self.assertEqual(target.decisions,{})
+        self.assertTrue(Z[0].requires_grad)
+
+    def testReset(self):
+
+        # Parameters
+        network = NsoltAnalysis2dNetwork()
+        target = NsoltDispatcher2d(network)
+        with torch.no_grad():
+            target.forward(torch.rand(2,1,16,16))
+            target.forward(torch.rand(2,1,32,32))
+        self.assertEqual(len(target.decisions),2)
+
+        # Actual values
+        target.reset()
+
+        # Evaluation
+        self.assertEqual(target.decisions,{})
+        self.assertIsNone(target.frozen)
+
+if __name__ == '__main__':
+    unittest.main()
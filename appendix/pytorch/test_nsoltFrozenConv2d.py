@@ -0,0 +1,207 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltFrozenConv2d import NsoltFrozenAnalysis2dNetwork, NsoltFrozenSynthesis2dNetwork
+from nsoltFrozenConv2d import analysis2conv2d, synthesis2convtranspose2d, atomicimages2d
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [0, 2], [2, 2], [4, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltFrozenConv2dTestCase(unittest.TestCase):
+    """
+    NSOLTFROZENCONV2DTESTCASE Test cases for NSOLT networks frozen into
+    strided convolutions
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord))
+    )
+    def testConstructor(self,nchs,stride,ppord):
+
+        # Expected values
+        expctdKernelSize = (stride[0]*(ppord[0]+1),stride[1]*(ppord[1]+1))
+        expctdStride = tuple(stride)
+        expctdOutChannels = sum(nchs)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord)
+        conv = analysis2conv2d(analyzer)
+
+        # Evaluation
+        self.assertTrue(isinstance(conv, nn.Conv2d))
+        self.assertEqual(conv.kernel_size,expctdKernelSize)
+        self.assertEqual(conv.stride,expctdStride)
+        self.assertEqual(conv.out_channels,expctdOutChannels)
+        self.assertEqual(conv.padding_mode,'circular')
+        self.assertFalse(conv.weight.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testForwardAnalysis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-6
+
+        # Parameters
+        nSamples = 4
+        X = torch.rand(nSamples,1,32,32,dtype=datatype)
+
+        # Expected values
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdZ = analyzer.forward(X)
+
+        # Instantiation of target class
+        network = NsoltFrozenAnalysis2dNetwork(analyzer)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(X)
+
+        # Evaluation
+        self.assertEqual(len(actualZ),len(expctdZ))
+        for actual, expctd in zip(actualZ,expctdZ):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testForwardSynthesis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-6
+
+        # Parameters
+        nSamples = 4
+        X = torch.rand(nSamples,1,32,32,dtype=datatype)
+
+        # Expected values
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        synthesizer = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        network = NsoltFrozenSynthesis2dNetwork(synthesizer)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord))
+    )
+    def testAdjointAtoms(self,nchs,stride,ppord):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+
+        # Instantiation of networks
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        synthesizer = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord).to(datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+
+        # Expected values: analysis filters of the adjoint
+        expctdAtoms, expctdPadding = atomicimages2d(analyzer)
+
+        # Actual values: impulse responses of synthesis
+        actualAtoms, actualPadding = atomicimages2d(synthesizer)
+
+        # Evaluation
+        self.assertEqual(actualPadding,expctdPadding)
+        self.assertTrue(torch.allclose(actualAtoms,expctdAtoms,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord))
+    )
+    def testZeroPadding(self,nchs,stride,ppord):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+
+        # Parameters: zero borders wider than the atom support
+        nSamples = 4
+        X = torch.zeros(nSamples,1,32,32,dtype=datatype)
+        X[:,:,8:24,8:24] = torch.rand(nSamples,1,16,16,dtype=datatype)
+
+        # Instantiation of networks
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        synthesizer = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord).to(datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = analysis2conv2d(analyzer,circular=True)(X)
+            expctdZ = synthesis2convtranspose2d(synthesizer,circular=True)(expctdY)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = analysis2conv2d(analyzer,circular=False)(X)
+            actualZ = synthesis2convtranspose2d(synthesizer,circular=False)(actualY)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
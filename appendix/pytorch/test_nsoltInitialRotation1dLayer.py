@@ -0,0 +1,191 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltInitialRotation1dLayer import NsoltInitialRotation1dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ 1, 2, 4 ]
+datatype = [ torch.float, torch.double ]
+nblks = [ 4, 8 ]
+
+class NsoltInitialRotation1dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTINITIALROTATION1DLAYERTESTCASE
+
+       入力:
+          nSamples x nBlks x nDecs
+
+       出力:
+          nSamples x nBlks x nChs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testConstructor(self,
+        nchs, stride):
+
+        # Expcted values
+        expctdName = 'V0'
+        expctdDescription = "NSOLT initial rotation " \
+                + "(ps,pa) = (" \
+                + str(nchs[0]) + "," + str(nchs[1]) + "), "  \
+                + "m = " + str(stride)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation1dLayer(
+                number_of_channels=nchs,
+                decimation_factor=stride,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nblks,datatype))
+    )
+    def testPredictWithRandomAngles(self,
+        nchs, stride, nblks, datatype):
+        rtol,atol=1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,nblks,stride,dtype=datatype)
+
+        # Expected values with the 2-D layer of a single row
+        expctdLayer = NsoltInitialRotation2dLayer(
+            number_of_channels=nchs,
+            decimation_factor=[1, stride]).to(datatype)
+        for angles in expctdLayer.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdZ = expctdLayer.forward(X.unsqueeze(dim=1)).squeeze(dim=1)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation1dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            name='V0').to(datatype)
+        for src, dst in zip(expctdLayer.parameters(),layer.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,(nSamples,nblks,sum(nchs)))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testBackwardWithRandomAngles(self,
+        nchs, stride):
+        rtol,atol=1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nblks = 4
+        X = torch.randn(nSamples,nblks,stride,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,nblks,sum(nchs),dtype=datatype)
+
+        # Expected values with the 2-D layer of a single row
+        expctdLayer = NsoltInitialRotation2dLayer(
+            number_of_channels=nchs,
+            decimation_factor=[1, stride]).to(datatype)
+        for angles in expctdLayer.parameters():
+            angles.data = torch.randn_like(angles)
+        Z = expctdLayer.forward(X.unsqueeze(dim=1))
+        Z.backward(dLdZ.unsqueeze(dim=1))
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in expctdLayer.parameters() ]
+        X.grad = None
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation1dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            name='V0').to(datatype)
+        for src, dst in zip(expctdLayer.parameters(),layer.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in layer.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testBackwardTwiceWithNoDcLeakage(self,nchs,stride):
+        rtol,atol=1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,4,stride,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,4,sum(nchs),dtype=datatype)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation1dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            no_dc_leakage=True,
+            name='V0').to(datatype)
+        for angles in layer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values with a single call
+        layer.forward(X).backward(dLdZ)
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in layer.parameters() ]
+        X.grad = None
+        layer.zero_grad()
+
+        # Actual values, where the backward follows the second call
+        Z = layer.forward(X)
+        layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in layer.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,232 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import math
+import torch
+import torch.nn as nn
+from nsoltInitialRotation3dLayer import NsoltInitialRotation3dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltUtility import Direction, OrthonormalMatrixGenerationSystem
+
+nchs = [ [4, 4], [5, 5] ]
+stride = [ [1, 1, 1], [1, 2, 2], [2, 2, 2] ]
+datatype = [ torch.float, torch.double ]
+nlays = [ 2, 4 ]
+
+class NsoltInitialRotation3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTINITIALROTATION3DLAYERTESTCASE
+
+       コンポーネント別に入力(nComponents):
+          nSamples x nRows x nCols x nLays x nDecs
+
+       コンポーネント別に出力(nComponents):
+          nSamples x nRows x nCols x nLays x nChs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testConstructor(self,
+        nchs, stride):
+
+        # Expcted values
+        expctdName = 'V0'
+        expctdDescription = "NSOLT initial rotation " \
+                + "(ps,pa) = (" \
+                + str(nchs[0]) + "," + str(nchs[1]) + "), "  \
+                + "(mv,mh,md) = (" \
+                + str(stride[Direction.VERTICAL]) + "," \
+                + str(stride[Direction.HORIZONTAL]) + "," \
+                + str(stride[Direction.DEPTH]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation3dLayer(
+                number_of_channels=nchs,
+                decimation_factor=stride,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlays,datatype))
+    )
+    def testPredictGrayscaleWithRandomAngles(self,
+        nchs, stride, nlays, datatype):
+        rtol,atol=1e-5,1e-6
+        gen = OrthonormalMatrixGenerationSystem(dtype=datatype)
+
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        nDecs = stride[0]*stride[1]*stride[2]
+        nChsTotal = sum(nchs)
+        X = torch.randn(nSamples,nrows,ncols,nlays,nDecs,dtype=datatype)
+        angles = torch.randn(int((nChsTotal-2)*nChsTotal/4),dtype=datatype)
+
+        # Expected values
+        ps,pa = nchs
+        nAngsW = int(len(angles)/2)
+        angsW,angsU = angles[:nAngsW],angles[nAngsW:]
+        W0,U0 = gen(angsW),gen(angsU)
+        ms,ma = int(math.ceil(nDecs/2.)), int(math.floor(nDecs/2.))
+        Zsa = torch.zeros(nChsTotal,nrows*ncols*nlays*nSamples,dtype=datatype)
+        Ys = X[:,:,:,:,:ms].reshape(-1,ms).T
+        Zsa[:ps,:] = W0[:,:ms] @ Ys
+        if ma > 0:
+            Ya = X[:,:,:,:,ms:].reshape(-1,ma).T
+            Zsa[ps:,:] = U0[:,:ma] @ Ya
+        expctdZ = Zsa.T.reshape(nSamples,nrows,ncols,nlays,nChsTotal)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation3dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            name='V0')
+        layer.orthTransW0.angles.data = angsW
+        layer.orthTransW0.mus = 1
+        layer.orthTransU0.angles.data = angsU
+        layer.orthTransU0.mus = 1
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlays))
+    )
+    def testBackwardGrayscaleWithRandomAngles(self,
+        nchs, stride, nlays):
+        rtol,atol=1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nrows, ncols = 4, 3
+        nDecs = stride[0]*stride[1]*stride[2]
+        X = torch.randn(nSamples,nrows,ncols,nlays,nDecs,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,nrows,ncols,nlays,sum(nchs),dtype=datatype)
+
+        # Expected values with the 2-D layer on the folded layers
+        expctdLayer = NsoltInitialRotation2dLayer(
+            number_of_channels=nchs,
+            decimation_factor=[stride[0], stride[1]*stride[2]]).to(datatype)
+        for angles in expctdLayer.parameters():
+            angles.data = torch.randn_like(angles)
+        Z = expctdLayer.forward(X.reshape(nSamples,nrows,ncols*nlays,nDecs))
+        Z.backward(dLdZ.reshape(nSamples,nrows,ncols*nlays,-1))
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in expctdLayer.parameters() ]
+        X.grad = None
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation3dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            name='V0').to(datatype)
+        for src, dst in zip(expctdLayer.parameters(),layer.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        Z = layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in layer.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testGradCheck(self,nchs,stride):
+        datatype = torch.double
+
+        # Configuration
+        nSamples = 2
+        nDecs = stride[0]*stride[1]*stride[2]
+        X = torch.randn(nSamples,2,3,2,nDecs,dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation3dLayer(
+                number_of_channels=nchs,
+                decimation_factor=stride,
+                name='V0'
+            ).to(datatype)
+        for angles in layer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Evaluation
+        self.assertTrue(torch.autograd.gradcheck(layer,(X,)))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride))
+    )
+    def testBackwardTwiceWithNoDcLeakage(self,nchs,stride):
+        rtol,atol=1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nDecs = stride[0]*stride[1]*stride[2]
+        X = torch.randn(nSamples,2,3,2,nDecs,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,2,3,2,sum(nchs),dtype=datatype)
+
+        # Instantiation of target class
+        layer = NsoltInitialRotation3dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            no_dc_leakage=True,
+            name='V0').to(datatype)
+        for angles in layer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values with a single call
+        layer.forward(X).backward(dLdZ)
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in layer.parameters() ]
+        X.grad = None
+        layer.zero_grad()
+
+        # Actual values, where the backward follows the second call
+        Z = layer.forward(X)
+        layer.forward(X)
+        Z.backward(dLdZ)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in layer.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltIntermediateRotation1dLayer import NsoltIntermediateRotation1dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+mode = [ 'Analysis', 'Synthesis' ]
+mus = [ -1, 1 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltIntermediateRotation1dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTINTERMEDIATEROTATION1DLAYERTESTCASE
+
+       入力:
+          nSamples x nBlks x nChs
+
+       出力:
+          nSamples x nBlks x nChs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode))
+    )
+    def testConstructor(self,nchs,mode):
+        # Expected values
+        expctdName = 'Vh1'
+        expctdMode = mode
+        expctdDescription = mode \
+            + " NSOLT intermediate rotation " \
+            + "(ps,pa) = (" \
+            + str(nchs[0]) + "," + str(nchs[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation1dLayer(
+            number_of_channels=nchs,
+            mode=mode,
+            name=expctdName)
+
+        # Actual values
+        actualName = layer.name
+        actualMode = layer.mode
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualMode,expctdMode)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode,mus,datatype))
+    )
+    def testPredictWithRandomAngles(self,
+        nchs, mode, mus, datatype):
+        rtol,atol=1e-5,1e-6
+
+        # Parameters
+        nSamples = 2
+        nblks = 8
+        X = torch.randn(nSamples,nblks,sum(nchs),dtype=datatype)
+
+        # Expected values with the 2-D layer of a single row
+        expctdLayer = NsoltIntermediateRotation2dLayer(
+            number_of_channels=nchs,
+            mode=mode,
+            mus=mus).to(datatype)
+        for angles in expctdLayer.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdZ = expctdLayer.forward(X.unsqueeze(dim=1)).squeeze(dim=1)
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation1dLayer(
+            number_of_channels=nchs,
+            mode=mode,
+            mus=mus,
+            name='Vh1').to(datatype)
+        for src, dst in zip(expctdLayer.parameters(),layer.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode))
+    )
+    def testGradCheck(self,nchs,mode):
+        datatype = torch.double
+
+        # Configuration
+        nSamples = 2
+        X = torch.randn(nSamples,4,sum(nchs),dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation1dLayer(
+            number_of_channels=nchs,
+            mode=mode,
+            name='Vh1').to(datatype)
+        for angles in layer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Evaluation
+        self.assertTrue(torch.autograd.gradcheck(layer,(X,)))
+
+if __name__ == '__main__':
+    unittest.main()
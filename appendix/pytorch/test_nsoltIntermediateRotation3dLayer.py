@@ -0,0 +1,132 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltIntermediateRotation3dLayer import NsoltIntermediateRotation3dLayer
+from nsoltUtility import OrthonormalMatrixGenerationSystem
+
+nchs = [ [2, 2], [4, 4], [5, 5] ]
+mode = [ 'Analysis', 'Synthesis' ]
+mus = [ -1, 1 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltIntermediateRotation3dLayerTestCase(unittest.TestCase):
+    """
+    NSOLTINTERMEDIATEROTATION3DLAYERTESTCASE
+
+       コンポーネント別に入力(nComponents):
+          nSamples x nRows x nCols x nLays x nChs
+
+       コンポーネント別に出力(nComponents):
+          nSamples x nRows x nCols x nLays x nChs
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode))
+    )
+    def testConstructor(self,nchs,mode):
+
+        # Expected values
+        expctdName = 'Vn~'
+        expctdMode = mode
+        expctdDescription = mode \
+                + " NSOLT intermediate rotation " \
+                + "(ps,pa) = (" \
+                + str(nchs[0]) + "," + str(nchs[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation3dLayer(
+                number_of_channels=nchs,
+                mode=mode,
+                name=expctdName
+            )
+
+        # Actual values
+        actualName = layer.name
+        actualMode = layer.mode
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertTrue(isinstance(layer, nn.Module))
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualMode,expctdMode)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode,mus,datatype))
+    )
+    def testPredictGrayscaleWithRandomAngles(self,
+        nchs, mode, mus, datatype):
+        rtol,atol=1e-5,1e-6
+        gen = OrthonormalMatrixGenerationSystem(dtype=datatype)
+
+        # Parameters
+        nSamples = 2
+        nrows, ncols, nlays = 4, 3, 2
+        ps,pa = nchs
+        X = torch.randn(nSamples,nrows,ncols,nlays,ps+pa,dtype=datatype)
+        angles = torch.randn(int((pa-1)*pa/2),dtype=datatype)
+
+        # Expected values
+        UnT = gen(angles,mus)
+        Un = UnT if mode == 'Analysis' else UnT.T
+        Za = Un @ X[:,:,:,:,ps:].reshape(-1,pa).T
+        expctdZ = torch.cat((X[:,:,:,:,:ps],
+            Za.T.reshape(nSamples,nrows,ncols,nlays,pa)),dim=-1)
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation3dLayer(
+                number_of_channels=nchs,
+                mode=mode,
+                mus=mus,
+                name='Vn')
+        layer.orthTransUn.angles.data = angles
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode,mus))
+    )
+    def testGradCheck(self,nchs,mode,mus):
+        datatype = torch.double
+
+        # Configuration
+        nSamples = 2
+        X = torch.randn(nSamples,2,3,2,sum(nchs),dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        layer = NsoltIntermediateRotation3dLayer(
+                number_of_channels=nchs,
+                mode=mode,
+                mus=mus,
+                name='Vn'
+            ).to(datatype)
+        for angles in layer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Evaluation
+        self.assertTrue(torch.autograd.gradcheck(layer,(X,)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,245 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import math
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from nsoltIsta2d import IstaImRestoration2d, FistaImRestoration2d, lipschitzconstant2d
+from nsoltDegradation2d import DecimationSystem
+from nsoltTestUtility import randomdictionary2d
+
+stride = [ [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltIsta2dTestCase(unittest.TestCase):
+    """
+    NSOLTISTA2DTESTCASE Test cases for the batched ISTA/FISTA restoration
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testLipschitzConstant(self):
+        # Expected values
+        expctdL = 4.
+
+        # Actual values
+        actualL = lipschitzconstant2d(Scaling_(2.),(8,8),torch.double)
+
+        # Evaluation
+        self.assertAlmostEqual(actualL,expctdL)
+        self.assertEqual(lipschitzconstant2d(None,(8,8)),1.)
+
+    @parameterized.expand(
+        list(itertools.product([ IstaImRestoration2d, FistaImRestoration2d ],datatype))
+    )
+    def testNoRegularization(self,solver_class,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.rand(3,1,16,16,dtype=datatype)
+
+        # Expected values
+        expctdY = X
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        solver = solver_class(synthesizer,analyzer,lambda_=0.,max_iter=10)
+
+        # Actual values
+        actualY = solver(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertEqual(solver.number_of_iterations.shape,(3,1))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testIsta(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nIters = 5
+        lambda_ = 0.05
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        process = Masking_(torch.rand(height,width) > 0.3)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,ppord,nlevels,datatype)
+        solver = IstaImRestoration2d(synthesizer,analyzer,
+            linear_process=process,lambda_=lambda_,eps0=0.,max_iter=nIters)
+
+        # Expected values
+        with torch.no_grad():
+            x = X.reshape(4,1,height,width)
+            hu = process.adjoint(x)
+            y = analyzer(hu)
+            for _ in range(nIters):
+                v = analyzer(process.adjoint(process(hu)-x))
+                y = [ F.softshrink(subY-subV,lambda_) for subY, subV in zip(y,v) ]
+                hu = synthesizer(*y)
+            expctdY = hu.reshape(X.shape)
+
+        # Actual values
+        actualY = solver(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.all(solver.number_of_iterations == nIters))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testFista(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nIters = 5
+        lambda_ = 0.05
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        process = Masking_(torch.rand(height,width) > 0.3)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,ppord,nlevels,datatype)
+        solver = FistaImRestoration2d(synthesizer,analyzer,
+            linear_process=process,lambda_=lambda_,eps0=0.,max_iter=nIters)
+
+        # Expected values
+        with torch.no_grad():
+            x = X.reshape(4,1,height,width)
+            hu = process.adjoint(x)
+            wpre = y = analyzer(hu)
+            tpre = 1.
+            for _ in range(nIters):
+                t = (1.+math.sqrt(1.+4.*tpre**2))/2.
+                tau = (tpre-1.)/t
+                v = analyzer(process.adjoint(process(hu)-x))
+                w = [ F.softshrink(subY-subV,lambda_) for subY, subV in zip(y,v) ]
+                y = [ subW+tau*(subW-subWpre) for subW, subWpre in zip(w,wpre) ]
+                wpre, tpre = w, t
+                hu = synthesizer(*y)
+            expctdY = hu.reshape(X.shape)
+
+        # Actual values
+        actualY = solver(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testSuperResolution(self,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nIters = 5
+        lambda_ = 0.01
+        X = torch.rand(2,1,8,12,dtype=datatype)
+        process = DecimationSystem(blur_type='Gaussian',boundary_option='Circular')
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        solver = IstaImRestoration2d(synthesizer,analyzer,
+            linear_process=process,lambda_=lambda_,eps0=0.,max_iter=nIters)
+
+        # Expected values
+        L = process.lambdamax((16,24))
+        with torch.no_grad():
+            hu = process.adjoint(X)
+            y = analyzer(hu)
+            for _ in range(nIters):
+                v = analyzer(process.adjoint(process(hu)-X))
+                y = [ F.softshrink(subY-subV/L,lambda_/L) for subY, subV in zip(y,v) ]
+                hu = synthesizer(*y)
+            expctdY = hu
+
+        # Actual values
+        actualY = solver(X)
+
+        # Evaluation
+        self.assertEqual(actualY.shape,(2,1,16,24))
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product([ IstaImRestoration2d, FistaImRestoration2d ],datatype))
+    )
+    def testIndependentConvergence(self,solver_class,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters, where the images converge at different iterations
+        nSamples = 4
+        X = torch.rand(nSamples,1,32,32,dtype=datatype) \
+            * torch.tensor([0.1, 1., 0.5, 2.],dtype=datatype).view(nSamples,1,1,1)
+        lambda_ = torch.tensor([0.01, 0.1, 0.05, 0.02],dtype=datatype)
+        process = Masking_(torch.rand(32,32) > 0.3)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        solver = solver_class(synthesizer,analyzer,linear_process=process,
+            lambda_=lambda_,eps0=1e-5,max_iter=200)
+
+        # Expected values
+        expctdY = []
+        expctdIters = []
+        for iSample in range(nSamples):
+            solver.lambda_ = lambda_[iSample]
+            expctdY.append(solver(X[iSample:iSample+1]))
+            expctdIters.append(solver.number_of_iterations)
+        expctdY = torch.cat(expctdY)
+        expctdIters = torch.cat(expctdIters)
+
+        # Actual values
+        solver.lambda_ = lambda_
+        actualY = solver(X)
+        actualIters = solver.number_of_iterations
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.equal(actualIters,expctdIters))
+        self.assertGreater(len(torch.unique(actualIters)),1)
+
+class Masking_(nn.Module):
+    def __init__(self,mask):
+        super(Masking_, self).__init__()
+        self.mask = mask
+
+    def forward(self,X):
+        return X*self.mask
+
+    def adjoint(self,X):
+        return X*self.mask
+
+class Scaling_(nn.Module):
+    def __init__(self,scale):
+        super(Scaling_, self).__init__()
+        self.scale = scale
+
+    def forward(self,X):
+        return self.scale*X
+
+    def adjoint(self,X):
+        return self.scale*X
+
+if __name__ == '__main__':
+    unittest.main()
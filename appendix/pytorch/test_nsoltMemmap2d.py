@@ -0,0 +1,151 @@
+import os
+import itertools
+import tempfile
+import unittest
+from parameterized import parameterized
+import numpy as np
+import torch
+from nsoltMemmap2d import MemmapAnalysis2d, MemmapSynthesis2d, open_memmap2d
+from nsoltTestUtility import randomdictionary2d
+from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
+
+stride = [ [1, 2], [2, 2] ]
+nlevels = [ 1, 2 ]
+ext = [ '.npy', '.raw' ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltMemmap2dTestCase(unittest.TestCase):
+    """
+    NSOLTMEMMAP2DTESTCASE Test cases for out-of-core analysis and
+    synthesis with memory-mapped files
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,ext,datatype))
+    )
+    def testAnalysis(self,stride,nlevels,ext,datatype):
+        height, width = 64, 32
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,height,width,dtype=datatype)
+
+        # Expected values
+        analyzer, _ = randomdictionary2d([3, 3],stride,[2, 2],nlevels,datatype)
+        serializer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=analyzer.number_of_channels,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+        with torch.no_grad():
+            expctdY = serializer.forward(*analyzer.forward(X))
+
+        # Instantiation of target class
+        target = MemmapAnalysis2d(analyzer,tile_size=[16, 16])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir,'src'+ext)
+            dst = os.path.join(tmpdir,'dst'+ext)
+            if ext == '.npy':
+                np.save(src,X.numpy())
+            else:
+                X.numpy().tofile(src)
+
+            # Actual values
+            target(src,dst,shape=X.shape,dtype=datatype)
+            actualY = open_memmap2d(dst,shape=[nSamples, expctdY.size(3)],
+                dtype=datatype).clone()
+
+        # Evaluation: bit-identical
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertTrue(torch.equal(actualY,expctdY.view(nSamples,-1)))
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,ext,datatype))
+    )
+    def testSynthesis(self,stride,nlevels,ext,datatype):
+        height, width = 64, 32
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,height,width,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d([3, 3],stride,[2, 2],nlevels,datatype)
+        serializer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=analyzer.number_of_channels,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        target = MemmapSynthesis2d(synthesizer,[height, width],tile_size=[16, 16])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir,'src'+ext)
+            dst = os.path.join(tmpdir,'dst'+ext)
+            with torch.no_grad():
+                serializedY = serializer.forward(*Y).view(nSamples,-1).numpy()
+            if ext == '.npy':
+                np.save(src,serializedY)
+            else:
+                serializedY.tofile(src)
+
+            # Actual values
+            target(src,dst,number_of_samples=nSamples)
+            actualZ = open_memmap2d(dst,shape=X.shape,dtype=datatype).clone()
+
+        # Evaluation: bit-identical
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels))
+    )
+    def testRoundTripWithIntegerImage(self,stride,nlevels):
+        rtol,atol = 1e-10,1e-10
+        datatype = torch.double
+        height, width = 64, 32
+
+        # Parameters
+        nSamples = 1
+        X = np.random.randint(0,256,size=(nSamples,1,height,width),dtype=np.uint8)
+
+        # Instantiation of target classes
+        analyzer, synthesizer = randomdictionary2d([3, 3],stride,[2, 2],nlevels,datatype)
+        analysis = MemmapAnalysis2d(analyzer,tile_size=[16, 16])
+        synthesis = MemmapSynthesis2d(synthesizer,[height, width],tile_size=[16, 16])
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            src = os.path.join(tmpdir,'src.npy')
+            coefs = os.path.join(tmpdir,'coefs.npy')
+            dst = os.path.join(tmpdir,'dst.npy')
+            np.save(src,X)
+
+            # Actual values
+            analysis(src,coefs)
+            synthesis(coefs,dst)
+            actualZ = torch.from_numpy(np.load(dst))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,torch.from_numpy(X).to(datatype),
+            rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
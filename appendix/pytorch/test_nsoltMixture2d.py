@@ -0,0 +1,247 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import math
+import torch
+import torch.nn as nn
+from nsoltMixture2d import MixtureOfUnitaryAnalysis2dNetwork, MixtureOfUnitarySynthesis2dNetwork
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltLayerExceptions import InvalidMixture
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [4, 4] ]
+stride = [ [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2], [4, 2] ]
+nlevels = [ 1, 2 ]
+nmixtures = [ 1, 3 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltMixture2dTestCase(unittest.TestCase):
+    """
+    NSOLTMIXTURE2DTESTCASE Test cases for mixtures of unitary NSOLT
+    networks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdNumberOfAnalyzers = 3
+        expctdNormalizationFactor = 1./math.sqrt(3)
+
+        # Instantiation of target class
+        network = MixtureOfUnitaryAnalysis2dNetwork(
+            [ NsoltAnalysis2dNetwork() for idx in range(3) ])
+
+        # Actual values
+        actualNumberOfAnalyzers = network.number_of_analyzers
+        actualNormalizationFactor = network.normalization_factor
+
+        # Evaluation
+        self.assertTrue(isinstance(network, nn.Module))
+        self.assertEqual(actualNumberOfAnalyzers,expctdNumberOfAnalyzers)
+        self.assertAlmostEqual(actualNormalizationFactor,expctdNormalizationFactor)
+
+    def testInvalidMixture(self):
+        with self.assertRaises(InvalidMixture):
+            MixtureOfUnitaryAnalysis2dNetwork([])
+        with self.assertRaises(InvalidMixture):
+            MixtureOfUnitaryAnalysis2dNetwork([
+                NsoltAnalysis2dNetwork(polyphase_order=[0,0]),
+                NsoltAnalysis2dNetwork(polyphase_order=[2,2]) ])
+        with self.assertRaises(InvalidMixture):
+            MixtureOfUnitarySynthesis2dNetwork([
+                NsoltSynthesis2dNetwork(number_of_levels=1),
+                NsoltSynthesis2dNetwork(number_of_levels=2) ])
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,nmixtures,datatype))
+    )
+    def testAnalysis(self,nchs,stride,ppord,nlevels,nmixtures,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 2
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*6
+        X = torch.randn(nSamples,1,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        analyzers = mixture_(NsoltAnalysis2dNetwork,
+            nchs,stride,ppord,nlevels,nmixtures,datatype)
+        network = MixtureOfUnitaryAnalysis2dNetwork(analyzers)
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = [ torch.stack(subY)/math.sqrt(nmixtures)
+                for subY in zip(*[ analyzer(X) for analyzer in analyzers ]) ]
+
+        # Actual values
+        with torch.no_grad():
+            actualY = network(X)
+
+        # Evaluation
+        self.assertEqual(len(actualY),nlevels+1)
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,nmixtures,datatype))
+    )
+    def testSynthesis(self,nchs,stride,ppord,nlevels,nmixtures,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 2
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*6
+        X = torch.randn(nSamples,1,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        analyzers = mixture_(NsoltAnalysis2dNetwork,
+            nchs,stride,ppord,nlevels,nmixtures,datatype)
+        synthesizers = mixture_(NsoltSynthesis2dNetwork,
+            nchs,stride,ppord,nlevels,nmixtures,datatype)
+        for synthesizer, analyzer in zip(synthesizers,analyzers):
+            cpparamsana2syn(synthesizer,analyzer)
+        analyzer = MixtureOfUnitaryAnalysis2dNetwork(analyzers)
+        network = MixtureOfUnitarySynthesis2dNetwork(synthesizers)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X)
+            expctdZ = sum([ synthesizer(*[ subY[idx] for subY in Y ])
+                for idx, synthesizer in enumerate(synthesizers) ])/math.sqrt(nmixtures)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,X.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        # Parseval tight frame
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord))
+    )
+    def testBackward(self,stride,ppord):
+        rtol,atol = 1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nlevels = 2
+        nmixtures = 2
+        X = torch.randn(nSamples,1,stride[0]**nlevels*4,stride[1]**nlevels*4,
+            dtype=datatype,requires_grad=True)
+
+        # Instantiation of target class
+        analyzers = mixture_(NsoltAnalysis2dNetwork,
+            [3,3],stride,ppord,nlevels,nmixtures,datatype)
+        network = MixtureOfUnitaryAnalysis2dNetwork(analyzers)
+
+        # Expected values
+        Y = [ torch.stack(subY)/math.sqrt(nmixtures)
+            for subY in zip(*[ analyzer(X) for analyzer in analyzers ]) ]
+        dLdY = [ torch.randn_like(subY) for subY in Y ]
+        torch.autograd.backward(Y,dLdY)
+        expctddLdX = X.grad.clone()
+        expctddLdWs = [ angles.grad.clone() for angles in network.parameters() ]
+        X.grad = None
+        network.zero_grad()
+
+        # Actual values
+        Y = network(X)
+        torch.autograd.backward(Y,dLdY)
+        actualdLdX = X.grad
+        actualdLdWs = [ angles.grad for angles in network.parameters() ]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product([ MixtureOfUnitaryAnalysis2dNetwork,
+            MixtureOfUnitarySynthesis2dNetwork ]))
+    )
+    def testBackwardTwice(self,mixture_class):
+        rtol,atol = 1e-10,1e-10
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nmixtures = 2
+        network_class = NsoltAnalysis2dNetwork \
+            if mixture_class is MixtureOfUnitaryAnalysis2dNetwork \
+            else NsoltSynthesis2dNetwork
+
+        X = [ torch.randn(nSamples,1,16,16,dtype=datatype,requires_grad=True) ]
+
+        # Instantiation of target class
+        networks = mixture_(network_class,[3,3],[2,2],[2,2],2,nmixtures,datatype)
+        network = mixture_class(networks)
+        if mixture_class is MixtureOfUnitarySynthesis2dNetwork:
+            analyzer = MixtureOfUnitaryAnalysis2dNetwork(mixture_(NsoltAnalysis2dNetwork,
+                [3,3],[2,2],[2,2],2,nmixtures,datatype))
+            with torch.no_grad():
+                X = [ subY.requires_grad_() for subY in analyzer(*X) ]
+
+        # Expected values with a single call
+        Y = network(*X)
+        Y = Y if isinstance(Y,tuple) else (Y,)
+        dLdY = [ torch.randn_like(subY) for subY in Y ]
+        torch.autograd.backward(Y,dLdY)
+        expctddLdXs = [ subX.grad.clone() for subX in X ]
+        expctddLdWs = [ angles.grad.clone() for angles in network.parameters() ]
+        for subX in X:
+            subX.grad = None
+        network.zero_grad()
+
+        # Actual values, where the backward follows the second call
+        Y = network(*X)
+        network(*X)
+        Y = Y if isinstance(Y,tuple) else (Y,)
+        torch.autograd.backward(Y,dLdY)
+        actualdLdXs = [ subX.grad for subX in X ]
+        actualdLdWs = [ angles.grad for angles in network.parameters() ]
+
+        # Evaluation
+        for actualdLdX, expctddLdX in zip(actualdLdXs,expctddLdXs):
+            self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+        for actualdLdW, expctddLdW in zip(actualdLdWs,expctddLdWs):
+            self.assertTrue(torch.allclose(actualdLdW,expctddLdW,rtol=rtol,atol=atol))
+
+def mixture_(network_class,nchs,stride,ppord,nlevels,nmixtures,datatype):
+    networks = []
+    for idx in range(nmixtures):
+        network = network_class(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels,
+            number_of_vanishing_moments=idx%2).to(datatype)
+        for angles in network.parameters():
+            angles.data = torch.randn_like(angles)
+        networks.append(network)
+    return networks
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,275 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import os
+import tempfile
+import numpy as np
+import torch
+from nsoltOls1d import Analysis1dOlsWrapper, Synthesis1dOlsWrapper, olspadsize1d
+from nsoltAnalysis1dNetwork import NsoltAnalysis1dNetwork
+from nsoltSynthesis1dNetwork import NsoltSynthesis1dNetwork
+from nsoltLayerExceptions import InvalidTileSize
+from nsoltUtility import cpparamsana2syn
+
+stride = [ 1, 2, 4 ]
+ppord = [ 0, 2, 4 ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+device = [ 'cpu' ] + ([ 'cuda' ] if torch.cuda.is_available() else [])
+
+class NsoltOls1dTestCase(unittest.TestCase):
+    """
+    NSOLTOLS1DTESTCASE Test cases for chunked OLS execution of 1-D NSOLT
+    networks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels))
+    )
+    def testPadSize(self,stride,ppord,nlevels):
+
+        # Expected values
+        unit = stride**nlevels
+        margin = (ppord//2)*sum([ stride**iLv for iLv in range(1,nlevels+1) ])
+        expctdPadSize = ((margin+unit-1)//unit)*unit
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels)
+
+        # Actual values
+        actualPadSize = olspadsize1d(analyzer)
+
+        # Evaluation
+        self.assertEqual(actualPadSize,expctdPadSize)
+
+    def testInvalidChunkSize(self):
+        analyzer = NsoltAnalysis1dNetwork(decimation_factor=2,number_of_levels=2)
+        with self.assertRaises(InvalidTileSize):
+            Analysis1dOlsWrapper(analyzer,chunk_size=6)
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testAnalysis(self,stride,ppord,nlevels,datatype):
+
+        # Parameters
+        nSamples = 3
+        nchs = [ max(2,stride), max(2,stride) ]
+        unit = stride**nlevels
+        chunkSize = 8*unit
+        X = torch.randn(nSamples,5*chunkSize-3*unit,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        wrapper = Analysis1dOlsWrapper(analyzer,chunk_size=chunkSize)
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = analyzer(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = wrapper(X)
+            actualYn = wrapper(X.numpy())
+
+        # Evaluation
+        self.assertEqual(len(actualY),len(expctdY))
+        for actual, actualn, expctd in zip(actualY,actualYn,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            if datatype == torch.double:
+                self.assertTrue(torch.equal(actual,expctd))
+                self.assertTrue(torch.equal(actualn,expctd))
+            else: # GEMM blocking depends on the chunk size
+                self.assertTrue(torch.allclose(actual,expctd,rtol=1e-5,atol=1e-6))
+                self.assertTrue(torch.allclose(actualn,expctd,rtol=1e-5,atol=1e-6))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testSynthesis(self,stride,ppord,nlevels,datatype):
+
+        # Parameters
+        nSamples = 3
+        nchs = [ max(2,stride), max(2,stride) ]
+        unit = stride**nlevels
+        chunkSize = 8*unit
+        X = torch.randn(nSamples,5*chunkSize-3*unit,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        synthesizer = NsoltSynthesis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+        wrapper = Synthesis1dOlsWrapper(synthesizer,chunk_size=chunkSize)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X)
+            expctdZ = synthesizer(*Y)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = wrapper(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        if datatype == torch.double:
+            self.assertTrue(torch.equal(actualZ,expctdZ))
+        else: # GEMM blocking depends on the chunk size
+            self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=1e-5,atol=1e-6))
+
+    def testMemmap(self):
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        chunkSize = 64
+        length = 4*chunkSize
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            number_of_channels=[3,3],
+            decimation_factor=2,
+            polyphase_order=4,
+            number_of_levels=2).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        wrapper = Analysis1dOlsWrapper(analyzer,chunk_size=chunkSize)
+
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname,'x.dat')
+            X = np.memmap(filename,dtype=np.float64,mode='w+',shape=(nSamples,length))
+            X[:] = np.random.randn(nSamples,length)
+            X.flush()
+
+            # Expected values
+            with torch.no_grad():
+                expctdY = analyzer(torch.from_numpy(np.array(X)))
+
+            # Actual values
+            with torch.no_grad():
+                actualY = wrapper(X)
+            del X
+
+        # Evaluation
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertTrue(torch.equal(actual,expctd))
+
+    @parameterized.expand(
+        list(itertools.product(device))
+    )
+    def testDevice(self,device):
+        datatype = torch.double
+
+        # Parameters
+        X = torch.randn(2,64,dtype=datatype,device=device)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(decimation_factor=2,polyphase_order=2,
+            number_of_levels=2).to(dtype=datatype,device=device)
+        synthesizer = NsoltSynthesis1dNetwork(decimation_factor=2,polyphase_order=2,
+            number_of_levels=2).to(dtype=datatype,device=device)
+        anaWrapper = Analysis1dOlsWrapper(analyzer,chunk_size=16)
+        synWrapper = Synthesis1dOlsWrapper(synthesizer,chunk_size=16)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = anaWrapper(X)
+            actualZ = synWrapper(*actualY)
+        metaY = anaWrapper.allocate(X.to('meta'))
+        metaZ = synWrapper.allocate(*metaY)
+
+        # Evaluation, where the outputs follow the device of the input
+        for Y in actualY:
+            self.assertEqual(Y.device,X.device)
+        self.assertEqual(actualZ.device,X.device)
+        for Y in metaY:
+            self.assertEqual(Y.device.type,'meta')
+        self.assertEqual(metaZ.device.type,'meta')
+
+    def testNumpyDevice(self):
+        # Parameters, where the array has no device as of NumPy < 2
+        X = np.random.randn(2,64).view(NoDevice_)
+        self.assertFalse(hasattr(X,'device'))
+
+        # Instantiation of target class
+        anaWrapper = Analysis1dOlsWrapper(NsoltAnalysis1dNetwork(decimation_factor=2,
+            polyphase_order=2,number_of_levels=2).double(),chunk_size=16)
+        synWrapper = Synthesis1dOlsWrapper(NsoltSynthesis1dNetwork(decimation_factor=2,
+            polyphase_order=2,number_of_levels=2).double(),chunk_size=16)
+
+        # Actual values
+        actualY = anaWrapper.allocate(X)
+        actualZ = synWrapper.allocate(*[ Y.numpy().view(NoDevice_) for Y in actualY ])
+
+        # Evaluation
+        for Y in actualY:
+            self.assertEqual(Y.device.type,'cpu')
+        self.assertEqual(actualZ.device.type,'cpu')
+
+    def testStream(self):
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        chunkSize = 32
+        X = torch.randn(nSamples,3*chunkSize,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            decimation_factor=2,
+            polyphase_order=2,
+            number_of_levels=1).to(datatype)
+        wrapper = Analysis1dOlsWrapper(analyzer,chunk_size=chunkSize)
+
+        # Expected values
+        expctdStarts = [ 0, chunkSize, 2*chunkSize ]
+
+        # Actual values
+        with torch.no_grad():
+            chunks = list(wrapper.stream(X))
+        actualStarts = [ start for start, _ in chunks ]
+
+        # Evaluation
+        self.assertEqual(actualStarts,expctdStarts)
+        for _, subY in chunks:
+            self.assertEqual(subY[-1].shape,(nSamples,chunkSize//2))
+
+class NoDevice_(np.ndarray):
+    @property
+    def device(self):
+        raise AttributeError('device')
+
+if __name__ == '__main__':
+    unittest.main()
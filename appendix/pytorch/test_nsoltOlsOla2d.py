@@ -0,0 +1,264 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+from nsoltOlsOla2d import Analysis2dOlsWrapper, Synthesis2dOlsWrapper, Synthesis2dOlaWrapper
+from nsoltOlsOla2d import OlsOlaProcess2d, olsolapadsize2d, tileregions2d, circular_crop_
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltTestUtility import randomdictionary2d
+from nsoltLayerExceptions import InvalidTileSize
+
+nchs = [ [2, 2], [3, 3] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2], [4, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+tilesize = [ [16, 16], [24, 8] ]
+
+class NsoltOlsOla2dTestCase(unittest.TestCase):
+    """
+    NSOLTOLSOLA2DTESTCASE Test cases for OLS/OLA tiled execution of
+    NSOLT networks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels))
+    )
+    def testPadSize(self,stride,ppord,nlevels):
+
+        # Expected values
+        expctdPadSize = []
+        for iDim in range(2):
+            unit = stride[iDim]**nlevels
+            margin = (ppord[iDim]//2)*sum(
+                [ stride[iDim]**iLv for iLv in range(1,nlevels+1) ])
+            expctdPadSize.append(((margin+unit-1)//unit)*unit)
+        expctdPadSize = tuple(expctdPadSize)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis2dNetwork(
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels)
+
+        # Actual values
+        actualPadSize = olsolapadsize2d(analyzer)
+
+        # Evaluation
+        self.assertEqual(actualPadSize,expctdPadSize)
+
+    def testTileRegions(self):
+
+        # Expected values
+        expctdRegions = [ (0, 0, 16, 16), (0, 16, 16, 8),
+            (16, 0, 8, 16), (16, 16, 8, 8) ]
+
+        # Actual values
+        actualRegions = tileregions2d([24, 24],[16, 16])
+
+        # Evaluation
+        self.assertEqual(actualRegions,expctdRegions)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype,tilesize))
+    )
+    def testAnalysisOls(self,nchs,stride,ppord,nlevels,datatype,tilesize):
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,48,32,dtype=datatype)
+
+        # Expected values
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdY = analyzer.forward(X)
+
+        # Instantiation of target class
+        wrapper = Analysis2dOlsWrapper(analyzer,tile_size=tilesize)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = wrapper.forward(X)
+
+        # Evaluation: bit-identical
+        self.assertEqual(len(actualY),len(expctdY))
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.equal(actual,expctd))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype,tilesize))
+    )
+    def testSynthesisOls(self,nchs,stride,ppord,nlevels,datatype,tilesize):
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,48,32,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        wrapper = Synthesis2dOlsWrapper(synthesizer,tile_size=tilesize)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = wrapper.forward(*Y)
+
+        # Evaluation: bit-identical
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype,tilesize))
+    )
+    def testSynthesisOla(self,nchs,stride,ppord,nlevels,datatype,tilesize):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,48,32,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        wrapper = Synthesis2dOlaWrapper(synthesizer,tile_size=tilesize)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = wrapper.forward(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels))
+    )
+    def testOlsOlaProcess(self,nchs,stride,ppord,nlevels):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+        tilesize = [16, 16]
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,48,32,dtype=datatype)
+        threshold = 0.1
+        def manipulator(*args):
+            return tuple( torch.sign(Y)*torch.relu(Y.abs()-threshold) for Y in args )
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            expctdZ = synthesizer.forward(*manipulator(*analyzer.forward(X)))
+
+        # Instantiation of target class
+        process = OlsOlaProcess2d(analyzer,synthesizer,
+            tile_size=tilesize,coefs_manipulator=manipulator)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = process.forward(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels))
+    )
+    def testTileLargerThanImage(self,stride,nlevels):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+        nchs, ppord = [3, 3], [4, 4]
+
+        # Parameters: pad size exceeding the image size
+        nSamples = 2
+        X = torch.rand(nSamples,1,8,8,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            expctdY = analyzer.forward(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = Analysis2dOlsWrapper(analyzer,tile_size=[4, 4]).forward(X)
+            actualZ = Synthesis2dOlaWrapper(synthesizer,tile_size=[4, 4]).forward(*actualY)
+
+        # Evaluation
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertTrue(torch.equal(actual,expctd))
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product([ -4, 0, 12 ],[ -4, 0, 20 ],[ 8, 40 ]))
+    )
+    def testCircularCrop(self,top,left,length):
+
+        # Parameters
+        height, width = 16, 24
+        X = torch.randn(2,1,height,width)
+
+        # Expected values
+        rows = torch.arange(top,top+length) % height
+        cols = torch.arange(left,left+length) % width
+        expctdY = X[:,:,rows][:,:,:,cols]
+
+        # Actual values
+        Reading_.numels = []
+        actualY = circular_crop_(X.as_subclass(Reading_),(2, 3),(top, left),(length, length))
+
+        # Evaluation, where no more than the crop is read from the source
+        self.assertTrue(torch.equal(actualY.as_subclass(torch.Tensor),expctdY))
+        self.assertTrue(all(numel <= expctdY.numel() for numel in Reading_.numels))
+
+    def testInvalidTileSize(self):
+        analyzer = NsoltAnalysis2dNetwork(
+            decimation_factor=[2, 2],
+            number_of_levels=2)
+        with self.assertRaises(InvalidTileSize):
+            Analysis2dOlsWrapper(analyzer,tile_size=[6, 8])
+
+class Reading_(torch.Tensor):
+    # Number of the elements of the inputs of each concatenation or
+    # selection of indices
+    numels = []
+
+    @classmethod
+    def __torch_function__(cls,func,types,args=(),kwargs=None):
+        if func in ( torch.cat, torch.Tensor.index_select ):
+            inputs = args[0] if func is torch.cat else [ args[0] ]
+            cls.numels.append(sum(input.numel() for input in inputs))
+        return super().__torch_function__(func,types,args,kwargs or {})
+
+if __name__ == '__main__':
+    unittest.main()
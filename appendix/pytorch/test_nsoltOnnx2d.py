@@ -0,0 +1,179 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import importlib.util
+import io
+import warnings
+import torch
+from nsoltOnnx2d import NsoltLoweredAnalysis2dNetwork, NsoltLoweredSynthesis2dNetwork
+from nsoltOnnx2d import lowernetwork2d, exportonnx2d, verifyonnx2d, blockdctmatrix2d
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2], [4, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+isonnxavailable = importlib.util.find_spec('onnxruntime') is not None
+
+class NsoltOnnx2dTestCase(unittest.TestCase):
+    """
+    NSOLTONNX2DTESTCASE Test cases for the lowering and ONNX export of
+    NSOLT networks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride+[ [2, 4], [4, 4] ],datatype))
+    )
+    def testBlockDctMatrix(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nDecs = stride[0]*stride[1]
+        X = torch.rand(2,1,4*stride[0],3*stride[1],dtype=datatype)
+
+        # Expected values
+        expctdY = NsoltBlockDct2dLayer(decimation_factor=stride)(X)
+
+        # Actual values
+        D = blockdctmatrix2d(stride,datatype)
+        V = X.reshape(2,4,stride[0],3,stride[1]).permute(0,1,3,2,4).reshape(2,4,3,nDecs)
+        actualY = V @ D.T
+
+        # Evaluation
+        self.assertTrue(torch.allclose(D @ D.T,torch.eye(nDecs,dtype=datatype),rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testLoweredAnalysis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,1,stride[0]**nlevels*8,stride[1]**nlevels*6,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        lowered = lowernetwork2d(analyzer)
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = analyzer(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = lowered(X)
+
+        # Evaluation
+        self.assertTrue(isinstance(lowered,NsoltLoweredAnalysis2dNetwork))
+        self.assertEqual(len(actualY),len(expctdY))
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testLoweredSynthesis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 2
+        X = torch.randn(nSamples,1,stride[0]**nlevels*8,stride[1]**nlevels*6,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        synthesizer = network_(NsoltSynthesis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+        lowered = lowernetwork2d(synthesizer)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X)
+            expctdZ = synthesizer(*Y)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = lowered(*Y)
+
+        # Evaluation
+        self.assertTrue(isinstance(lowered,NsoltLoweredSynthesis2dNetwork))
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride+[ [2, 4] ],ppord,nlevels,datatype))
+    )
+    @unittest.skipUnless(isonnxavailable,'ONNX Runtime is not available')
+    def testExportAnalysis(self,stride,ppord,nlevels,datatype):
+        # Parameters
+        X = torch.randn(3,1,stride[0]**nlevels*8,stride[1]**nlevels*4,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,[4,4],stride,ppord,nlevels,datatype)
+
+        # Actual values, where the traced size differs from that of X
+        f = io.BytesIO()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            exportonnx2d(analyzer,f)
+
+        # Evaluation
+        self.assertTrue(verifyonnx2d(analyzer,f,X,rtol=1e-4,atol=1e-5))
+
+    @parameterized.expand(
+        list(itertools.product(stride+[ [2, 4] ],ppord,nlevels,datatype))
+    )
+    @unittest.skipUnless(isonnxavailable,'ONNX Runtime is not available')
+    def testExportSynthesis(self,stride,ppord,nlevels,datatype):
+        # Parameters
+        X = torch.randn(3,1,stride[0]**nlevels*8,stride[1]**nlevels*4,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,[4,4],stride,ppord,nlevels,datatype)
+        synthesizer = network_(NsoltSynthesis2dNetwork,[4,4],stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            Y = analyzer(X)
+
+        # Actual values, where the traced size differs from that of X
+        f = io.BytesIO()
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            exportonnx2d(synthesizer,f)
+
+        # Evaluation
+        self.assertTrue(verifyonnx2d(synthesizer,f,*Y,rtol=1e-4,atol=1e-5))
+
+def network_(network_class,nchs,stride,ppord,nlevels,datatype):
+    network = network_class(
+        number_of_channels=nchs,
+        decimation_factor=stride,
+        polyphase_order=ppord,
+        number_of_levels=nlevels).to(datatype)
+    for angles in network.parameters():
+        angles.data = torch.randn_like(angles)
+    return network
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import math
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from nsoltPds2d import IstHcSystem, ProxBoxConstraint, ProxNormBallConstraint
+from nsoltLayerExceptions import InvalidOption
+from nsoltTestUtility import randomdictionary2d
+
+stride = [ [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltPds2dTestCase(unittest.TestCase):
+    """
+    NSOLTPDS2DTESTCASE Test cases for the primal-dual splitting with hard
+    constraints
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product([ 0.5, 2. ],datatype))
+    )
+    def testProxBoxConstraint(self,gamma,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        X = torch.randn(4,1,8,8,dtype=datatype)
+
+        # Instantiation of target class
+        prox = ProxBoxConstraint(vmin=-0.5,vmax=1.)
+
+        # Expected values
+        expctdY = torch.minimum(torch.maximum(X,torch.tensor(-0.5,dtype=datatype)),
+            torch.tensor(1.,dtype=datatype))
+        expctdZ = X-gamma*torch.clamp(X/gamma,-0.5,1.)
+
+        # Actual values
+        actualY = prox(X)
+        actualZ = X.clone()
+        prox.proxconjugate_(actualZ,gamma)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product([ 0.5, 2. ],[ 0., 0.5 ],datatype))
+    )
+    def testProxNormBallConstraint(self,gamma,center,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters, where the first sample lies inside the ball
+        eps = 3.
+        X = torch.randn(4,1,8,8,dtype=datatype)
+        X[0] = center+0.01*X[0]
+
+        # Instantiation of target class
+        prox = ProxNormBallConstraint(eps=eps,center=center)
+
+        # Expected values
+        expctdY = []
+        for x in X:
+            d = torch.linalg.norm(x-center)
+            expctdY.append(x if d <= eps else center+(eps/d)*(x-center))
+        expctdY = torch.stack(expctdY)
+        expctdZ = torch.stack([ x-gamma*prox_(x/gamma,eps,center) for x in X ])
+
+        # Actual values
+        actualY = prox(X)
+        actualZ = X.clone()
+        prox.proxconjugate_(actualZ,gamma)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertTrue(torch.equal(actualY[0],X[0]))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testIstHc(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nIters = 5
+        lambda_ = 0.05
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        V = torch.rand(2,2,height,width,dtype=datatype)
+        process = Masking_(torch.rand(height,width) > 0.3)
+        projection = ProxBoxConstraint(vmin=0.,vmax=1.)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,ppord,nlevels,datatype)
+        solver = IstHcSystem(synthesizer,analyzer,projection,
+            measure_process=process,lambda_=lambda_,eps0=0.,max_iter=nIters)
+
+        # Expected values as in IstHcSystem.m
+        with torch.no_grad():
+            v = V.reshape(4,1,height,width)
+            gamma1 = 1.
+            gamma2 = (1./gamma1-0.5)/1.05
+            result = torch.zeros_like(v)
+            x = [ torch.zeros_like(c) for c in analyzer(result) ]
+            y = torch.zeros_like(v)
+            for _ in range(nIters):
+                g = process.adjoint(process(result)-v)+y
+                t = analyzer(g)
+                x = [ F.softshrink(c-gamma1*d,gamma1*lambda_) for c, d in zip(x,t) ]
+                resPst = synthesizer(*x)
+                y = y+gamma2*(2.*resPst-result)
+                y = y-gamma2*torch.clamp(y/gamma2,0.,1.)
+                result = resPst
+            expctdR = result.reshape(V.shape)
+
+        # Actual values
+        actualR = solver(V)
+
+        # Evaluation
+        self.assertEqual(actualR.dtype,datatype)
+        self.assertTrue(torch.allclose(actualR,expctdR,rtol=rtol,atol=atol))
+        self.assertTrue(torch.all(solver.number_of_iterations == nIters))
+
+    @parameterized.expand(
+        list(itertools.product([ 'box', 'ball' ],datatype))
+    )
+    def testConvergence(self,constraint,datatype):
+
+        # Parameters
+        nSamples = 3
+        X = torch.rand(nSamples,1,32,32,dtype=datatype)
+        process = Masking_(torch.rand(32,32) > 0.2)
+        V = process(X)+0.1*torch.randn_like(X)
+        if constraint == 'box':
+            projection = ProxBoxConstraint(vmin=0.,vmax=1.)
+        else:
+            projection = ProxNormBallConstraint(eps=10.,center=0.5)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        solver = IstHcSystem(synthesizer,analyzer,projection,
+            measure_process=process,lambda_=0.01,eps0=1e-4,max_iter=1000)
+
+        # Actual values
+        actualR = solver(V)
+
+        # Evaluation, where the constraint is satisfied at convergence
+        self.assertTrue(torch.all(solver.number_of_iterations < 1000))
+        self.assertTrue(torch.allclose(projection(actualR),actualR,rtol=0.,atol=1e-2))
+        self.assertLess(torch.mean((actualR-X)**2),torch.mean((V-X)**2))
+
+    @parameterized.expand(
+        list(itertools.product([ 2.5, 4. ],datatype))
+    )
+    def testInvalidGamma(self,gamma,datatype):
+
+        # Parameters, where L = 1 for the masking
+        V = torch.rand(1,1,16,16,dtype=datatype)
+        process = Masking_(torch.rand(16,16) > 0.2)
+        projection = ProxBoxConstraint(vmin=0.,vmax=1.)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[0,0],1,datatype)
+        solver = IstHcSystem(synthesizer,analyzer,projection,
+            measure_process=process,gamma=gamma,max_iter=1)
+
+        # Evaluation
+        with self.assertRaises(InvalidOption):
+            solver(V)
+
+class Masking_(nn.Module):
+    def __init__(self,mask):
+        super(Masking_, self).__init__()
+        self.mask = mask
+
+    def forward(self,X):
+        return X*self.mask
+
+    def adjoint(self,X):
+        return X*self.mask
+
+def prox_(x,eps,center):
+    d = torch.linalg.norm(x-center)
+    return x if d <= eps else center+(eps/d)*(x-center)
+
+if __name__ == '__main__':
+    unittest.main()
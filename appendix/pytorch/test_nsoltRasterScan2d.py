@@ -0,0 +1,166 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+from nsoltRasterScan2d import NsoltRasterScanAnalysis2d, NsoltRasterScanSynthesis2d, PartialLineBuffer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltTestUtility import randomdictionary2d
+
+nchs = [ [2, 2], [3, 3] ]
+stride = [ [1, 1], [1, 2], [2, 1], [2, 2] ]
+ppord = [ [0, 0], [2, 2], [4, 2], [2, 4] ]
+nlevels = [ 1, 2, 3 ]
+datatype = [ torch.float, torch.double ]
+dir = [ 'Down', 'Up' ]
+target = [ 'Sum', 'Difference' ]
+
+class NsoltRasterScan2dTestCase(unittest.TestCase):
+    """
+    NSOLTRASTERSCAN2DTESTCASE Test cases for raster-scan streaming NSOLT
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(nchs,dir,target))
+    )
+    def testPartialLineBuffer(self,nchs,dir,target):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        nrows = 6
+        X = torch.randn(nSamples,nrows,4,sum(nchs),dtype=datatype)
+
+        # Expected values
+        layer = NsoltAtomExtension2dLayer(
+            number_of_channels=nchs,
+            direction=dir,
+            target_channels=target)
+        expctdY = layer.forward(X.clone())
+
+        # Instantiation of target class
+        buffer = PartialLineBuffer(
+            number_of_channels=nchs,
+            direction=dir,
+            target_channels=target)
+
+        # Actual values: rows 0,...,nrows-1 followed by row 0 again
+        outputs = []
+        for iRow in list(range(nrows))+[0]:
+            output = buffer.step(iRow,X[:,iRow:iRow+1])
+            if output is not None:
+                outputs.append(output)
+
+        # Evaluation
+        self.assertEqual(len(outputs),nrows)
+        self.assertEqual(sorted([ label for label, _ in outputs ]),list(range(nrows)))
+        for label, actualY in outputs:
+            self.assertTrue(torch.allclose(actualY,expctdY[:,label:label+1],rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testAnalysis(self,nchs,stride,ppord,nlevels,datatype):
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,16,16,dtype=datatype)
+
+        # Expected values
+        analyzer, _ = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            expctdY = analyzer.forward(X)
+
+        # Instantiation of target class
+        target = NsoltRasterScanAnalysis2d(analyzer)
+
+        # Actual values
+        actualY = target.forward(X)
+
+        # Evaluation: bit-identical in double, the coarser levels in
+        # float may differ in the last bit by the size of products
+        self.assertEqual(len(actualY),len(expctdY))
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            if datatype == torch.double:
+                self.assertTrue(torch.equal(actual,expctd))
+            else:
+                self.assertTrue(torch.allclose(actual,expctd,rtol=1e-5,atol=1e-6))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testSynthesis(self,nchs,stride,ppord,nlevels,datatype):
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,16,16,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d(nchs,stride,ppord,nlevels,datatype)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        target = NsoltRasterScanSynthesis2d(synthesizer)
+
+        # Actual values
+        actualZ = target.forward(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels))
+    )
+    def testStreaming(self,stride,ppord,nlevels):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+        height, width = 128, 16
+
+        # Parameters
+        nSamples = 1
+        X = torch.rand(nSamples,1,height,width,dtype=datatype)
+        nConsumed = [ 0 ]
+        def feed():
+            for iRow in range(height):
+                nConsumed[0] += 1
+                yield X[:,0,iRow]
+
+        # Instantiation of target classes
+        analyzer, synthesizer = randomdictionary2d([3, 3],stride,ppord,nlevels,datatype)
+        analysis = NsoltRasterScanAnalysis2d(analyzer)
+        synthesis = NsoltRasterScanSynthesis2d(synthesizer)
+
+        # Actual values
+        rows = {}
+        nConsumedAtFirstRow = None
+        for iRow, row in synthesis(analysis(feed())):
+            if nConsumedAtFirstRow is None:
+                nConsumedAtFirstRow = nConsumed[0]
+            rows[iRow] = row
+        actualZ = torch.stack([ rows[iRow] for iRow in range(height) ],dim=1).unsqueeze(dim=1)
+
+        # Evaluation
+        self.assertLess(nConsumedAtFirstRow,height)
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
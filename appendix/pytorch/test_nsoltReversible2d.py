@@ -0,0 +1,137 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltReversible2d import inverse_layer_forward
+from nsoltBlockDct2dLayer import NsoltBlockDct2dLayer
+from nsoltInitialRotation2dLayer import NsoltInitialRotation2dLayer
+from nsoltIntermediateRotation2dLayer import NsoltIntermediateRotation2dLayer
+from nsoltAtomExtension2dLayer import NsoltAtomExtension2dLayer
+from nsoltChannelSeparation2dLayer import NsoltChannelSeparation2dLayer
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+mode = [ 'Analysis', 'Synthesis' ]
+dir = [ 'Right', 'Left', 'Down', 'Up' ]
+target = [ 'Sum', 'Difference' ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltReversible2dTestCase(unittest.TestCase):
+    """
+    NSOLTREVERSIBLE2DTESTCASE Test cases for inverse layers used in
+    the reversible backpropagation
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,datatype))
+    )
+    def testInverseBlockDct(self,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 8
+        X = torch.rand(nSamples,1,16,16,dtype=datatype)
+
+        # Instantiation of target layer
+        layer = NsoltBlockDct2dLayer(decimation_factor=stride)
+
+        # Actual values
+        with torch.no_grad():
+            actualX = inverse_layer_forward(layer,layer.forward(X))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualX,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,datatype))
+    )
+    def testInverseInitialRotation(self,nchs,stride,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 8
+        nDecs = stride[0]*stride[1] # math.prod(stride)
+        X = torch.randn(nSamples,4,4,nDecs,dtype=datatype)
+
+        # Instantiation of target layer
+        layer = NsoltInitialRotation2dLayer(
+            number_of_channels=nchs,
+            decimation_factor=stride)
+        layer.orthTransW0.angles.data = torch.randn_like(layer.orthTransW0.angles)
+        layer.orthTransU0.angles.data = torch.randn_like(layer.orthTransU0.angles)
+
+        # Actual values
+        with torch.no_grad():
+            actualX = inverse_layer_forward(layer,layer.forward(X))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualX,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,mode,datatype))
+    )
+    def testInverseIntermediateRotation(self,nchs,mode,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 8
+        X = torch.randn(nSamples,4,4,sum(nchs),dtype=datatype)
+
+        # Instantiation of target layer
+        layer = NsoltIntermediateRotation2dLayer(
+            number_of_channels=nchs,
+            mode=mode,
+            mus=-1)
+        layer.orthTransUn.angles.data = torch.randn_like(layer.orthTransUn.angles)
+
+        # Actual values
+        with torch.no_grad():
+            actualX = inverse_layer_forward(layer,layer.forward(X))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualX,X,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,dir,target,datatype))
+    )
+    def testInverseAtomExtension(self,nchs,dir,target,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        # Parameters
+        nSamples = 8
+        X = torch.randn(nSamples,4,4,sum(nchs),dtype=datatype)
+
+        # Instantiation of target layer
+        layer = NsoltAtomExtension2dLayer(
+            number_of_channels=nchs,
+            direction=dir,
+            target_channels=target)
+
+        # Actual values
+        with torch.no_grad():
+            actualX = inverse_layer_forward(layer,layer.forward(X.clone()))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualX,X,rtol=rtol,atol=atol))
+
+    def testNotInvertible(self):
+        layer = NsoltChannelSeparation2dLayer(name='Sp')
+        with self.assertRaises(TypeError):
+            inverse_layer_forward(layer,torch.zeros(1,2,2,4))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,223 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+from nsoltSimplify2d import SimplifiedLevel2d, simplifyoperators2d, \
+    simplifynetwork2d, simplificationreport2d, groupshift2d
+from nsoltOnnx2d import blockshift2d
+from nsoltMixture2d import butterflymatrix2d
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2], [4, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltSimplify2dTestCase(unittest.TestCase):
+    """
+    NSOLTSIMPLIFY2DTESTCASE Test cases for the algebraic simplification of
+    NSOLT networks
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testButterflies(self):
+        datatype = torch.double
+        B = butterflymatrix2d(3,datatype)
+
+        # Expected values
+        expctdM = 2.*torch.eye(6,dtype=datatype)
+
+        # Actual values
+        actualOps = simplifyoperators2d([ ('matrix',B), ('matrix',B/2.) ],3)
+        actualM = simplifyoperators2d([ ('matrix',B), ('matrix',B) ],3)[0][1]
+
+        # Evaluation
+        self.assertEqual(len(actualOps),0)
+        self.assertTrue(torch.equal(actualM,expctdM))
+
+    def testBlockDiagonalAcrossShifts(self):
+        datatype = torch.double
+        ps = 2
+        A = torch.randn(4,3,dtype=datatype)
+        C = torch.randn(4,4,dtype=datatype)
+        D = torch.block_diag(torch.randn(2,2,dtype=datatype),torch.randn(2,2,dtype=datatype))
+        ops = [ ('matrix',A), ('shift',(0,1),(0,0)), ('matrix',D),
+            ('shift',(0,0),(-1,0)), ('matrix',C) ]
+
+        # Expected values
+        expctdOps = [ ('matrix',D @ A), ('shift',(0,1),(-1,0)), ('matrix',C) ]
+
+        # Actual values
+        actualOps = simplifyoperators2d(ops,ps)
+
+        # Evaluation
+        self.assertEqual(len(actualOps),len(expctdOps))
+        for actual, expctd in zip(actualOps,expctdOps):
+            self.assertEqual(actual[0],expctd[0])
+            if actual[0] == 'matrix':
+                self.assertTrue(torch.allclose(actual[1],expctd[1]))
+            else:
+                self.assertEqual(actual[1:],expctd[1:])
+
+    @parameterized.expand(
+        list(itertools.product([ (1,0), (0,-1), (-1,1) ],[ (0,0), (1,1) ]))
+    )
+    def testGroupShift(self,sumshift,diffshift):
+        ps = 3
+        X = torch.randn(2,4,5,2*ps,dtype=torch.double)
+
+        # Expected values
+        expctdZ = X
+        for is_difference, shift in [ (False,sumshift), (True,diffshift) ]:
+            for dim, offset in zip([1,2],shift):
+                for _ in range(abs(offset)):
+                    expctdZ = blockshift2d(expctdZ,ps,is_difference,offset,dim)
+
+        # Actual values
+        actualZ = groupshift2d(X,ps,sumshift,diffshift)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testSimplifiedAnalysis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.randn(2,1,stride[0]**nlevels*8,stride[1]**nlevels*6,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        simplified = simplifynetwork2d(analyzer)
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = analyzer(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = simplified(X)
+
+        # Evaluation
+        for level in simplified.levels:
+            self.assertTrue(isinstance(level,SimplifiedLevel2d))
+        self.assertEqual(len(actualY),len(expctdY))
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testSimplifiedSynthesis(self,nchs,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        X = torch.randn(2,1,stride[0]**nlevels*8,stride[1]**nlevels*6,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = network_(NsoltAnalysis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        synthesizer = network_(NsoltSynthesis2dNetwork,nchs,stride,ppord,nlevels,datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+        simplified = simplifynetwork2d(synthesizer)
+
+        # Expected values
+        with torch.no_grad():
+            Y = analyzer(X)
+            expctdZ = synthesizer(*Y)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = simplified(*Y)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,datatype))
+    )
+    def testReport(self,nchs,stride,datatype):
+        height, width = 32, 16
+
+        # Parameters
+        nSamples = 3
+        nChsTotal = sum(nchs)
+        nDecs = stride[0]*stride[1]
+        nBlocks = nSamples*(height//stride[0])*(width//stride[1])
+        elementSize = torch.tensor([],dtype=datatype).element_size()
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride).to(datatype)
+        simplified = simplifynetwork2d(analyzer)
+
+        # Expected values, where the block DCT, the initial rotation and
+        # the channel separation turn into a product
+        expctdOperators = (3,1)
+        expctdFlops = nBlocks*2*nDecs*nChsTotal
+        expctdBytes = nBlocks*nChsTotal*elementSize
+
+        # Actual values
+        report = simplificationreport2d(simplified,height,width,nSamples)
+
+        # Evaluation
+        self.assertEqual(report['number_of_operators'],expctdOperators)
+        self.assertEqual(report['flops'][1],expctdFlops)
+        self.assertEqual(report['bytes'][1],expctdBytes)
+        self.assertEqual(report['flops_saved'],report['flops'][0]-report['flops'][1])
+        self.assertEqual(report['bytes_saved'],report['bytes'][0]-report['bytes'][1])
+        self.assertGreater(report['bytes_saved'],0)
+
+    @parameterized.expand(
+        list(itertools.product([ NsoltAnalysis2dNetwork, NsoltSynthesis2dNetwork ],ppord))
+    )
+    def testInitialAngles(self,network_class,ppord):
+
+        # Instantiation of target class
+        network = network_class(
+            number_of_channels=[3,3],
+            decimation_factor=[2,2],
+            polyphase_order=ppord,
+            number_of_levels=2)
+        simplified = simplifynetwork2d(network)
+
+        # Actual values
+        report = simplificationreport2d(simplified,64,64)
+
+        # Evaluation, where the butterflies of the identity rotations cancel
+        self.assertLess(report['number_of_operators'][1],report['number_of_operators'][0])
+        self.assertLess(report['bytes'][1],report['bytes'][0])
+
+def network_(network_class,nchs,stride,ppord,nlevels,datatype):
+    network = network_class(
+        number_of_channels=nchs,
+        decimation_factor=stride,
+        polyphase_order=ppord,
+        number_of_levels=nlevels).to(datatype)
+    for angles in network.parameters():
+        angles.data = torch.randn_like(angles)
+    return network
+
+if __name__ == '__main__':
+    unittest.main()
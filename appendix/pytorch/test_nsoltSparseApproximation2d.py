@@ -0,0 +1,262 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+from nsoltSparseApproximation2d import IterativeHardThresholding, GradientPursuit, kthlargest2d
+from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
+from nsoltSubbandDeserialization2dLayer import NsoltSubbandDeserialization2dLayer
+from nsoltTestUtility import randomdictionary2d
+
+stride = [ [1, 2], [2, 2] ]
+nlevels = [ 1, 2 ]
+nsparsecoefs = [ 1, 20, 200 ]
+datatype = [ torch.float, torch.double ]
+
+class IterativeHardThresholdingTestCase(unittest.TestCase):
+    """
+    ITERATIVEHARDTHRESHOLDINGTESTCASE Test cases for IterativeHardThresholding
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,nsparsecoefs))
+    )
+    def testIht(self,stride,nlevels,nsparsecoefs):
+        rtol,atol = 1e-5,1e-8
+        datatype = torch.double
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        mu, tolRmse, maxIter = 1-1e-3, 1e-6, 30
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,[2,2],nlevels,datatype)
+        iht = IterativeHardThresholding(synthesizer,analyzer,
+            number_of_sparse_coefficients=nsparsecoefs,mu=mu,
+            tol_rmse=tolRmse,max_iter=maxIter)
+
+        # Expected values by sorting as IterativeHardThresholding.m
+        config = { 'original_dimension': [height,width], 'number_of_channels': [2,2],
+            'decimation_factor': stride, 'number_of_levels': nlevels }
+        serializer = NsoltSubbandSerialization2dLayer(**config)
+        deserializer = NsoltSubbandDeserialization2dLayer(**config)
+        expctdY, expctdC, expctdItrs = [], [], []
+        with torch.no_grad():
+            for x in X.reshape(4,1,1,height,width):
+                result = torch.zeros_like(x)
+                coefvec = serializer(*analyzer(result)).view(-1)
+                for nItr in range(1,maxIter+1):
+                    precoefvec = coefvec
+                    gradvec = serializer(*analyzer(x-result)).view(-1)
+                    coefvec = precoefvec+mu*gradvec
+                    idxsort = coefvec.abs().argsort(descending=True)
+                    mask = torch.zeros_like(coefvec)
+                    mask[idxsort[:nsparsecoefs]] = 1.
+                    coefvec = mask*coefvec
+                    result = synthesizer(*deserializer(coefvec.view(1,-1)))
+                    if torch.linalg.norm(coefvec-precoefvec)/coefvec.numel() < tolRmse:
+                        break
+                expctdY.append(result)
+                expctdC.append(coefvec)
+                expctdItrs.append(nItr)
+        expctdY = torch.cat(expctdY).view(X.shape)
+        expctdC = torch.stack(expctdC)
+
+        # Actual values
+        actualY, coefs = iht(X)
+        actualC = serializer(*coefs).view(4,-1)
+
+        # Evaluation
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertEqual(iht.number_of_iterations.view(-1).tolist(),expctdItrs)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualC,expctdC,rtol=rtol,atol=atol))
+        self.assertTrue(((actualC != 0).sum(dim=1) <= nsparsecoefs).all())
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testWarmStart(self,datatype):
+        # Parameters
+        X = torch.rand(3,1,32,32,dtype=datatype)
+        nCoefs = 100
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        iht = IterativeHardThresholding(synthesizer,analyzer,
+            number_of_sparse_coefficients=nCoefs,tol_rmse=0.,max_iter=50)
+
+        # Actual values
+        _, coefs = iht(X)
+        nSupports = sum((coef != 0).sum(dim=tuple(range(1,coef.dim()))) for coef in coefs)
+
+        # Evaluation, where the selection is skipped for the unchanged supports
+        self.assertEqual(nSupports.tolist(),[ nCoefs ]*3)
+        self.assertLess(iht.number_of_selections,3*50)
+
+    def testSupportTolerance(self):
+        # Parameters
+        X = torch.rand(3,1,32,32,dtype=torch.double)
+        nCoefs, tolerance = 100, 0.1
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,torch.double)
+        iht = IterativeHardThresholding(synthesizer,analyzer,
+            number_of_sparse_coefficients=nCoefs,tol_rmse=0.,max_iter=50)
+        ihtTol = IterativeHardThresholding(synthesizer,analyzer,
+            number_of_sparse_coefficients=nCoefs,tol_rmse=0.,max_iter=50,
+            support_tolerance=tolerance)
+
+        # Actual values
+        iht(X)
+        _, coefs = ihtTol(X)
+        nSupports = sum((coef != 0).sum(dim=tuple(range(1,coef.dim()))) for coef in coefs)
+
+        # Evaluation
+        self.assertTrue(((nSupports-nCoefs).abs() <= tolerance*nCoefs).all())
+        self.assertLessEqual(ihtTol.number_of_selections,iht.number_of_selections)
+
+    @parameterized.expand(
+        list(itertools.product([ 1, 7, 300 ],[ 64, 1000, 2**24 ],datatype))
+    )
+    def testKthLargest(self,k,max_elements,datatype):
+        # Parameters
+        A = torch.randn(5,1000,dtype=datatype)
+
+        # Expected values
+        expctdT = A.sort(dim=1,descending=True).values[:,k-1:k]
+
+        # Actual values
+        actualT = kthlargest2d(A,k,max_elements)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualT,expctdT))
+
+class GradientPursuitTestCase(unittest.TestCase):
+    """
+    GRADIENTPURSUITTESTCASE Test cases for GradientPursuit
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,nsparsecoefs))
+    )
+    def testGp(self,stride,nlevels,nsparsecoefs):
+        rtol,atol = 1e-5,1e-8
+        datatype = torch.double
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],stride,[2,2],nlevels,datatype)
+        gp = GradientPursuit(synthesizer,analyzer,number_of_sparse_coefficients=nsparsecoefs)
+
+        # Expected values as GradientPursuit.m
+        config = { 'original_dimension': [height,width], 'number_of_channels': [2,2],
+            'decimation_factor': stride, 'number_of_levels': nlevels }
+        serializer = NsoltSubbandSerialization2dLayer(**config)
+        deserializer = NsoltSubbandDeserialization2dLayer(**config)
+        expctdY, expctdC = [], []
+        with torch.no_grad():
+            for source in X.reshape(4,1,1,height,width):
+                residual = source
+                indexSet = []
+                coefvec = 0.
+                for _ in range(nsparsecoefs):
+                    gradvec = serializer(*analyzer(residual)).view(-1)
+                    indexSet = sorted(set(indexSet) | { int(gradvec.abs().argmax()) })
+                    dirvec = torch.zeros_like(gradvec)
+                    dirvec[indexSet] = gradvec[indexSet]
+                    c = synthesizer(*deserializer(dirvec.view(1,-1)))
+                    a = torch.sum(residual*c)/torch.sum(c*c)
+                    coefvec = coefvec+a*dirvec
+                    residual = residual-a*c
+                expctdY.append(source-residual)
+                expctdC.append(coefvec)
+        expctdY = torch.cat(expctdY).view(X.shape)
+        expctdC = torch.stack(expctdC)
+
+        # Actual values
+        actualY, coefs = gp(X)
+        actualC = serializer(*coefs).view(4,-1)
+
+        # Evaluation
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertEqual(gp.number_of_iterations.view(-1).tolist(),[ nsparsecoefs ]*4)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(actualC,expctdC,rtol=rtol,atol=atol))
+        self.assertTrue(((actualC != 0).sum(dim=1) <= nsparsecoefs).all())
+
+    @parameterized.expand(
+        list(itertools.product(datatype))
+    )
+    def testBatch(self,datatype):
+        rtol,atol = 1e-4,1e-6
+
+        # Parameters
+        X = torch.rand(5,1,16,16,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        gp = GradientPursuit(synthesizer,analyzer,number_of_sparse_coefficients=30)
+
+        # Expected values
+        expctdY = torch.cat([ gp(X1)[0] for X1 in X.split(1) ])
+
+        # Actual values
+        actualY, _ = gp(X)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    def testTolErr(self):
+        # Parameters
+        X = torch.rand(2,1,16,16,dtype=torch.double)
+        X[1] = 0.
+        nCoefs = 50
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],1,torch.double)
+        gp = GradientPursuit(synthesizer,analyzer,number_of_sparse_coefficients=nCoefs,
+            tol_err=1e-3)
+
+        # Actual values
+        actualY, _ = gp(X)
+        nItrs = gp.number_of_iterations.view(-1).tolist()
+
+        # Evaluation, where the zero image stops at once
+        self.assertEqual(nItrs[1],1)
+        self.assertLessEqual(nItrs[0],nCoefs)
+        self.assertTrue(torch.equal(actualY[1],X[1]))
+
+if __name__ == '__main__':
+    unittest.main()
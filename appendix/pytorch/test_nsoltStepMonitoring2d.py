@@ -0,0 +1,225 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import math
+import torch
+from nsoltStepMonitoring2d import StepMonitoringSystem
+from nsoltIsta2d import IstaImRestoration2d, FistaImRestoration2d
+from nsoltPds2d import IstHcSystem, ProxBoxConstraint
+from nsoltSparseApproximation2d import IterativeHardThresholding, GradientPursuit
+from nsoltDegradation2d import BlurSystem
+from nsoltLayerExceptions import InvalidOption
+from nsoltTestUtility import randomdictionary2d
+
+period = [ 1, 3 ]
+evaltype = [ 'double', 'uint8' ]
+datatype = [ torch.float, torch.double ]
+
+class StepMonitoringSystemTestCase(unittest.TestCase):
+    """
+    STEPMONITORINGSYSTEMTESTCASE Test cases for StepMonitoringSystem
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(period,evaltype,datatype))
+    )
+    def testMetrics(self,period,evaltype,datatype):
+        rtol,atol = 1e-5,1e-8
+
+        # Parameters
+        nItrs = 7
+        srcImg = torch.rand(2,3,8,8,dtype=datatype)
+        resImgs = [ torch.rand(6,1,8,8,dtype=datatype) for _ in range(nItrs) ]
+        finalImg = torch.rand(6,1,8,8,dtype=datatype)
+
+        # Expected values
+        convert = (lambda x: (255.*x).round()) if evaltype == 'uint8' else (lambda x: x)
+        peak = 255. if evaltype == 'uint8' else 1.
+        mse = lambda x: (convert(x)-convert(srcImg.reshape(6,1,8,8))).square().mean(dim=(1,2,3))
+        expctdItrs = list(range(period,nItrs+1,period)) + [ nItrs ]
+        expctdMses = torch.stack([ mse(resImgs[nItr-1]) for nItr in expctdItrs[:-1] ]
+            + [ mse(finalImg) ])
+        expctdPsnrs = 10.*torch.log10(peak**2/expctdMses)
+        expctdRmses = expctdMses.sqrt()
+
+        # Instantiation of target class
+        monitor = StepMonitoringSystem(source_image=srcImg,max_iter=nItrs,
+            is_mse=True,is_psnr=True,is_rmse=True,evaluation_type=evaltype,
+            period=period)
+
+        # Actual values
+        monitor.reset(dtype=datatype)
+        for resImg in resImgs:
+            monitor(resImg)
+        summary = monitor.finish(finalImg)
+
+        # Evaluation
+        self.assertEqual(monitor.number_of_iterations,nItrs)
+        self.assertEqual(summary['iterations'].tolist(),expctdItrs)
+        self.assertEqual(summary['mse'].dtype,datatype)
+        self.assertTrue(torch.allclose(summary['mse'],expctdMses,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(monitor.psnrs,expctdPsnrs,rtol=rtol,atol=atol))
+        self.assertTrue(torch.allclose(monitor.rmses,expctdRmses,rtol=rtol,atol=atol))
+
+    def testIndex(self):
+        # Parameters
+        srcImg = torch.rand(4,1,8,8)
+        resImg = torch.rand(2,1,8,8)
+        index = torch.tensor([ 3, 1 ])
+
+        # Expected values
+        expctdMse = torch.full((4,),math.nan)
+        expctdMse[index] = (resImg-srcImg[index]).square().mean(dim=(1,2,3))
+
+        # Instantiation of target class
+        monitor = StepMonitoringSystem(source_image=srcImg,is_mse=True)
+
+        # Actual values
+        monitor.reset()
+        monitor(resImg,index)
+        actualMse = monitor.mses[0]
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualMse,expctdMse,equal_nan=True))
+
+    def testTimeInterval(self):
+        # Parameters
+        srcImg = torch.rand(1,1,8,8)
+
+        # Instantiation of target class
+        monitor = StepMonitoringSystem(source_image=srcImg,is_mse=True,
+            time_interval=3600.)
+
+        # Actual values
+        monitor.reset()
+        for _ in range(10):
+            monitor(torch.rand_like(srcImg))
+        summary = monitor.finish(srcImg)
+
+        # Evaluation, where only the first and the final results are evaluated
+        self.assertEqual(summary['iterations'].tolist(),[ 1, 10 ])
+        self.assertEqual(summary['mse'][-1].item(),0.)
+
+    def testMaxIter(self):
+        # Parameters
+        srcImg = torch.rand(1,1,8,8)
+
+        # Instantiation of target class
+        monitor = StepMonitoringSystem(source_image=srcImg,max_iter=4,is_mse=True)
+
+        # Actual values
+        monitor.reset()
+        for _ in range(10):
+            monitor(srcImg)
+        summary = monitor.finish(srcImg)
+
+        # Evaluation, where the evaluations beyond max_iter are dropped
+        self.assertEqual(summary['iterations'].tolist(),[ 1, 2, 3, 4, 10 ])
+
+    def testDisabled(self):
+        # Instantiation of target class
+        monitor = StepMonitoringSystem()
+
+        # Actual values
+        monitor.reset()
+        for _ in range(3):
+            monitor(torch.rand(1,1,8,8))
+        summary = monitor.finish(torch.rand(1,1,8,8))
+
+        # Evaluation
+        self.assertEqual(monitor.number_of_iterations,3)
+        self.assertEqual(summary,{})
+        self.assertIsNone(monitor.mses_)
+
+    def testInvalidEvaluationType(self):
+        with self.assertRaises(InvalidOption):
+            StepMonitoringSystem(evaluation_type='int16')
+
+    @parameterized.expand(
+        list(itertools.product([ IstaImRestoration2d, FistaImRestoration2d, IstHcSystem ]))
+    )
+    def testSolvers(self,solver_class):
+        rtol,atol = 1e-5,1e-7
+        datatype = torch.double
+
+        # Parameters
+        srcImg = torch.rand(2,1,16,16,dtype=datatype)
+        process = BlurSystem(blur_type='Gaussian',boundary_option='Circular')
+        obsImg = process(srcImg)+0.05*torch.randn_like(srcImg)
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        monitor = StepMonitoringSystem(source_image=srcImg,max_iter=20,is_mse=True)
+        options = { 'linear_process': process, 'lambda_': 0.01, 'eps0': 1e-5,
+            'max_iter': 20 }
+        if solver_class is IstHcSystem:
+            options['metric_projection'] = ProxBoxConstraint(vmin=0.,vmax=1.)
+            options['measure_process'] = options.pop('linear_process')
+        solver = solver_class(synthesizer,analyzer,**options)
+
+        # Expected values
+        expctdImg = solver(obsImg)
+        expctdMse = (expctdImg-srcImg).square().mean(dim=(1,2,3))
+
+        # Actual values
+        solver.step_monitor = monitor
+        actualImg = solver(obsImg)
+        summary = monitor.summary()
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualImg,expctdImg))
+        self.assertEqual(monitor.number_of_iterations,int(solver.number_of_iterations.max()))
+        self.assertTrue(torch.allclose(summary['mse'][-1],expctdMse,rtol=rtol,atol=atol))
+        for iImg, nItr in enumerate(solver.number_of_iterations.view(-1).tolist()):
+            self.assertFalse(summary['mse'][:nItr,iImg].isnan().any())
+            self.assertTrue(summary['mse'][nItr:-1,iImg].isnan().all())
+
+    @parameterized.expand(
+        list(itertools.product([ IterativeHardThresholding, GradientPursuit ]))
+    )
+    def testSparseApproximation(self,approximater_class):
+        rtol,atol = 1e-5,1e-7
+        datatype = torch.double
+
+        # Parameters
+        srcImg = torch.rand(3,1,16,16,dtype=datatype)
+        srcImg[1] = 0.
+
+        # Instantiation of target class
+        analyzer, synthesizer = randomdictionary2d([2,2],[2,2],[2,2],2,datatype)
+        monitor = StepMonitoringSystem(source_image=srcImg,max_iter=40,is_mse=True)
+        approximater = approximater_class(synthesizer,analyzer,
+            number_of_sparse_coefficients=40)
+
+        # Expected values
+        expctdImg, _ = approximater(srcImg)
+        expctdMse = (expctdImg-srcImg).square().mean(dim=(1,2,3))
+
+        # Actual values
+        approximater.step_monitor = monitor
+        actualImg, _ = approximater(srcImg)
+        summary = monitor.summary()
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualImg,expctdImg))
+        self.assertEqual(monitor.number_of_iterations,int(approximater.number_of_iterations.max()))
+        self.assertTrue(torch.allclose(summary['mse'][-1],expctdMse,rtol=rtol,atol=atol))
+        for iImg, nItr in enumerate(approximater.number_of_iterations.view(-1).tolist()):
+            self.assertFalse(summary['mse'][:nItr,iImg].isnan().any())
+            self.assertTrue(summary['mse'][nItr:-1,iImg].isnan().all())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,20 @@
+import itertools
 import unittest
+from parameterized import parameterized
 import torch
 import torch.nn as nn
 from nsoltSubbandDeserialization2dLayer import NsoltSubbandDeserialization2dLayer
+from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltUtility import cpparamsana2syn
+
+nlevels = [ 1, 2, 3 ]
+stride = [ [2, 2], [1, 2], [2, 1] ]
+nchs = [ [3, 3], [4, 4] ]
+datatype = [ torch.float, torch.double ]
+nrows = [ 4, 8, 16 ]
+ncols = [ 4, 8, 16 ]
 
 class NsoltSubbandDeserialization2dLayerTestCase(unittest.TestCase):
     """
@@ -34,12 +47,187 @@ class NsoltSubbandDeserialization2dLayerTestCase(unittest.TestCase):
         target = NsoltSubbandDeserialization2dLayer()
         self.assertTrue(isinstance(target, nn.Module))
 
-    def testForward(self):
-        target = NsoltSubbandDeserialization2dLayer()
-        x = 0.0
-        valueExpctd = 0.0
-        valueActual = target.forward(x)
-        self.assertEqual(valueExpctd, valueActual)
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels))
+    )
+    def testConstructorWithParameters(self,nchs,stride,nlevels):
+        height, width = 16, 16
+
+        # Expected values
+        expctdName = 'Sb_Dsz'
+        expctdDescription = "Subband deserialization " \
+                + "(h,w) = (" \
+                + str(height) + "," \
+                + str(width) + "), " \
+                + "lv = " \
+                + str(nlevels) + ", " \
+                + "(ps,pa) = (" \
+                + str(nchs[0]) + "," \
+                + str(nchs[1]) + "), " \
+                + "(mv,mh) = (" \
+                + str(stride[0]) + "," \
+                + str(stride[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltSubbandDeserialization2dLayer(
+            name=expctdName,
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nrows,ncols,stride,nlevels,datatype))
+    )
+    def testForward(self,nchs,nrows,ncols,stride,nlevels,datatype):
+        height = nrows*(stride[0]**nlevels)
+        width = ncols*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        expctdScales = [ (nrows, ncols, 1) ]
+        for iRevLv in range(1,nlevels+1):
+            expctdScales.append(
+                (nrows*(stride[0]**(iRevLv-1)), ncols*(stride[1]**(iRevLv-1)), nChsTotal-1))
+        nElements = sum([ s[0]*s[1]*s[2] for s in expctdScales ])
+        X = torch.randn(nSamples,1,1,nElements,dtype=datatype)
+
+        # Expected values
+        expctdZ = [ None ]*(nlevels+1)
+        sidx = 0
+        for iRevLv in range(nlevels+1):
+            scale = expctdScales[iRevLv]
+            nSubElements = scale[0]*scale[1]*scale[2]
+            expctdZ[nlevels-iRevLv] = X[:,0,0,sidx:sidx+nSubElements].reshape(nSamples,*scale).clone()
+            sidx += nSubElements
+        expctdZ[nlevels] = expctdZ[nlevels].squeeze(dim=3)
+
+        # Instantiation of target class
+        layer = NsoltSubbandDeserialization2dLayer(
+            name='Sb_Dsz',
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(X)
+        actualScales = layer.scales
+
+        # Evaluation
+        self.assertEqual(len(actualZ),nlevels+1)
+        for actual, expctd in zip(actualZ,expctdZ):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.equal(actual,expctd))
+        self.assertEqual(actualScales,expctdScales)
+
+        # Views without copies
+        X.add_(1.)
+        for actual, expctd in zip(actualZ,expctdZ):
+            self.assertTrue(torch.equal(actual,expctd+1.))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels,datatype))
+    )
+    def testBackward(self,nchs,stride,nlevels,datatype):
+        rtol,atol = 1e-5,1e-6
+        nrows, ncols = 4, 4
+        height = nrows*(stride[0]**nlevels)
+        width = ncols*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 8
+        serializer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+        nElements = serializer.number_of_elements
+        X = torch.randn(nSamples,1,1,nElements,dtype=datatype,requires_grad=True)
+        dLdZ = torch.randn(nSamples,1,1,nElements,dtype=datatype)
+
+        # Expected values: the adjoint is the serialization
+        with torch.no_grad():
+            dLdY = NsoltSubbandDeserialization2dLayer(
+                original_dimension=[height, width],
+                number_of_channels=nchs,
+                decimation_factor=stride,
+                number_of_levels=nlevels).forward(dLdZ)
+            expctddLdX = serializer.forward(*dLdY)
+
+        # Instantiation of target class
+        layer = NsoltSubbandDeserialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        Y = layer.forward(X)
+        actualdLdX, = torch.autograd.grad(Y,X,dLdY)
+
+        # Evaluation
+        self.assertEqual(actualdLdX.dtype,datatype)
+        self.assertTrue(torch.allclose(actualdLdX,expctddLdX,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels))
+    )
+    def testRoundTripWithNetworks(self,nchs,stride,nlevels):
+        rtol,atol = 1e-10,1e-12
+        datatype = torch.double
+        height = 4*(stride[0]**nlevels)
+        width = 4*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 4
+        X = torch.rand(nSamples,1,height,width,dtype=datatype)
+
+        # Instantiation of networks
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=[2, 2],
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        synthesizer = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=[2, 2],
+            number_of_levels=nlevels).to(datatype)
+        synthesizer = cpparamsana2syn(synthesizer,analyzer)
+        serializer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Instantiation of target class
+        layer = NsoltSubbandDeserialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        with torch.no_grad():
+            Y = serializer.forward(*analyzer.forward(X))
+            actualZ = synthesizer.forward(*layer.forward(Y))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,X,rtol=rtol,atol=atol))
 
 """
     properties (TestParameter)
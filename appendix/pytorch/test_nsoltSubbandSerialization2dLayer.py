@@ -1,8 +1,17 @@
+import itertools
 import unittest
+from parameterized import parameterized
 import torch
 import torch.nn as nn
 from nsoltSubbandSerialization2dLayer import NsoltSubbandSerialization2dLayer
 
+nlevels = [ 1, 2, 3 ]
+stride = [ [2, 2], [1, 2], [2, 1] ]
+nchs = [ [3, 3], [4, 4] ]
+datatype = [ torch.float, torch.double ]
+nrows = [ 4, 8, 16 ]
+ncols = [ 4, 8, 16 ]
+
 class NsoltSubbandSerialization2dLayerTestCase(unittest.TestCase):
     """
     NSOLTSUBBANDSERIALIZATION2DLAYERTESTCASE
@@ -34,12 +43,175 @@ class NsoltSubbandSerialization2dLayerTestCase(unittest.TestCase):
         target = NsoltSubbandSerialization2dLayer()
         self.assertTrue(isinstance(target, nn.Module))
 
-    def testForward(self):
-        target = NsoltSubbandSerialization2dLayer()
-        x = 0.0
-        valueExpctd = 0.0
-        valueActual = target.forward(x)
-        self.assertEqual(valueExpctd, valueActual)
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels))
+    )
+    def testConstructorWithParameters(self,nchs,stride,nlevels):
+        height, width = 16, 16
+
+        # Expected values
+        expctdName = 'Sb_Srz'
+        expctdDescription = "Subband serialization " \
+                + "(h,w) = (" \
+                + str(height) + "," \
+                + str(width) + "), " \
+                + "lv = " \
+                + str(nlevels) + ", " \
+                + "(ps,pa) = (" \
+                + str(nchs[0]) + "," \
+                + str(nchs[1]) + "), " \
+                + "(mv,mh) = (" \
+                + str(stride[0]) + "," \
+                + str(stride[1]) + ")"
+
+        # Instantiation of target class
+        layer = NsoltSubbandSerialization2dLayer(
+            name=expctdName,
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        actualName = layer.name
+        actualDescription = layer.description
+
+        # Evaluation
+        self.assertEqual(actualName,expctdName)
+        self.assertEqual(actualDescription,expctdDescription)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,nrows,ncols,stride,nlevels,datatype))
+    )
+    def testForward(self,nchs,nrows,ncols,stride,nlevels,datatype):
+        rtol,atol = 1e-5,1e-6
+
+        height = nrows*(stride[0]**nlevels)
+        width = ncols*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        X = []
+        for iLv in range(1,nlevels+1):
+            subHeight = nrows*(stride[0]**(nlevels-iLv))
+            subWidth = ncols*(stride[1]**(nlevels-iLv))
+            X.append(torch.randn(nSamples,subHeight,subWidth,nChsTotal-1,dtype=datatype))
+        X.append(torch.randn(nSamples,nrows,ncols,dtype=datatype))
+
+        # Expected values
+        expctdScales = [ (nrows, ncols, 1) ]
+        for iRevLv in range(1,nlevels+1):
+            expctdScales.append(
+                (nrows*(stride[0]**(iRevLv-1)), ncols*(stride[1]**(iRevLv-1)), nChsTotal-1))
+        nElements = sum([ s[0]*s[1]*s[2] for s in expctdScales ])
+        expctdZ = torch.cat(
+            [ X[nlevels].reshape(nSamples,-1) ] +
+            [ X[nlevels-iRevLv].reshape(nSamples,-1) for iRevLv in range(1,nlevels+1) ],
+            dim=1).view(nSamples,1,1,nElements)
+
+        # Instantiation of target class
+        layer = NsoltSubbandSerialization2dLayer(
+            name='Sb_Srz',
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(*X)
+        actualScales = layer.scales
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,expctdZ.shape)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertEqual(actualScales,expctdScales)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels,datatype))
+    )
+    def testForwardWithBuffer(self,nchs,stride,nlevels,datatype):
+        nrows, ncols = 4, 4
+        height = nrows*(stride[0]**nlevels)
+        width = ncols*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        X = []
+        for iLv in range(1,nlevels+1):
+            subHeight = nrows*(stride[0]**(nlevels-iLv))
+            subWidth = ncols*(stride[1]**(nlevels-iLv))
+            # Non-contiguous AC as the output of channel separation
+            X.append(torch.randn(nSamples,subHeight,subWidth,nChsTotal,dtype=datatype)[:,:,:,1:])
+        X.append(torch.randn(nSamples,nrows,ncols,1,dtype=datatype))
+
+        # Instantiation of target class
+        layer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+        buffer = torch.zeros(nSamples,1,1,layer.number_of_elements,dtype=datatype)
+
+        # Expected values
+        with torch.no_grad():
+            expctdZ = layer.forward(*X)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = layer.forward(*X,out=buffer)
+
+        # Evaluation
+        self.assertEqual(actualZ.data_ptr(),buffer.data_ptr())
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,nlevels,datatype))
+    )
+    def testBackward(self,nchs,stride,nlevels,datatype):
+        rtol,atol = 1e-5,1e-6
+        nrows, ncols = 4, 4
+        height = nrows*(stride[0]**nlevels)
+        width = ncols*(stride[1]**nlevels)
+
+        # Parameters
+        nSamples = 8
+        nChsTotal = sum(nchs)
+        X = []
+        for iLv in range(1,nlevels+1):
+            subHeight = nrows*(stride[0]**(nlevels-iLv))
+            subWidth = ncols*(stride[1]**(nlevels-iLv))
+            X.append(torch.randn(nSamples,subHeight,subWidth,nChsTotal-1,
+                dtype=datatype,requires_grad=True))
+        X.append(torch.randn(nSamples,nrows,ncols,dtype=datatype,requires_grad=True))
+
+        # Instantiation of target class
+        layer = NsoltSubbandSerialization2dLayer(
+            original_dimension=[height, width],
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            number_of_levels=nlevels)
+        dLdZ = torch.randn(nSamples,1,1,layer.number_of_elements,dtype=datatype)
+
+        # Expected values
+        expctdZ = torch.cat(
+            [ X[nlevels].reshape(nSamples,-1) ] +
+            [ X[nlevels-iRevLv].reshape(nSamples,-1) for iRevLv in range(1,nlevels+1) ],
+            dim=1).view(nSamples,1,1,-1)
+        expctddLdX = torch.autograd.grad(expctdZ,X,dLdZ)
+
+        # Actual values
+        actualZ = layer.forward(*X)
+        actualdLdX = torch.autograd.grad(actualZ,X,dLdZ)
+
+        # Evaluation
+        for actual, expctd in zip(actualdLdX,expctddLdX):
+            self.assertEqual(actual.dtype,datatype)
+            self.assertEqual(actual.shape,expctd.shape)
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
 
 """
     properties (TestParameter)
@@ -0,0 +1,145 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+from nsoltSynthesis1dNetwork import NsoltSynthesis1dNetwork
+from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltAnalysis1dNetwork import NsoltAnalysis1dNetwork
+from nsoltUtility import cpparamsana2syn
+
+stride = [ 1, 2, 4 ]
+ppord = [ 0, 2, 4 ]
+nlevels = [ 1, 2, 3 ]
+datatype = [ torch.float, torch.double ]
+
+class NsoltSynthesis1dNetworkTestCase(unittest.TestCase):
+    """
+    NSOLTSYNTHESIS1DNETWORKTESTCASE
+
+       複数コンポーネント入力:（ツリーレベル数）
+          nSamples x nBlksLv1 x (nChsTotal-1)
+           :
+          nSamples x nBlksLvN x (nChsTotal-1)
+          nSamples x nBlksLvN
+
+       系列出力:
+          nSamples x (Stride x nBlks)
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    def testConstructor(self):
+        # Expected values
+        expctdNames = [ 'Lv1_Cn', 'Lv1_Vh2~', 'Lv1_Qh2lu~', 'Lv1_Vh1~',
+            'Lv1_Qh1rl~', 'Lv1_V0~', 'Lv1_E0~' ]
+
+        # Instantiation of target class
+        network = NsoltSynthesis1dNetwork(
+            number_of_channels=[2,2],
+            decimation_factor=2,
+            polyphase_order=2)
+
+        # Actual values
+        actualNames = [ layer.name for layer in network.layers[0] ]
+
+        # Evaluation
+        self.assertTrue(isinstance(network, nn.Module))
+        self.assertEqual(actualNames,expctdNames)
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testForwardWithRandomAngles(self,
+        stride, ppord, nlevels, datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 3
+        nchs = [ max(2,stride), max(2,stride) ]
+        nChsTotal = sum(nchs)
+        nblks = 8
+        X = [ torch.randn(nSamples,stride**(nlevels-iLevel-1)*nblks,nChsTotal-1,dtype=datatype)
+            for iLevel in range(nlevels) ]
+        X.append(torch.randn(nSamples,nblks,dtype=datatype))
+
+        # Expected values with the 2-D network of a single row
+        expctdNetwork = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=[1, stride],
+            polyphase_order=[0, ppord],
+            number_of_levels=nlevels).to(datatype)
+        for angles in expctdNetwork.parameters():
+            angles.data = torch.randn_like(angles)
+        with torch.no_grad():
+            expctdZ = expctdNetwork.forward(
+                *[ Y.unsqueeze(dim=1) for Y in X ]).view(nSamples,-1)
+
+        # Instantiation of target class
+        network = NsoltSynthesis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for src, dst in zip(expctdNetwork.parameters(),network.parameters()):
+            dst.data = src.data.clone()
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(*X)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertEqual(actualZ.shape,(nSamples,stride**nlevels*nblks))
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testPerfectReconstruction(self,
+        stride, ppord, nlevels, datatype):
+        rtol,atol = 1e-4,1e-5
+
+        # Parameters
+        nSamples = 3
+        nchs = [ max(2,stride), max(2,stride) ]
+        X = torch.randn(nSamples,stride**nlevels*8,dtype=datatype)
+
+        # Expected values
+        expctdZ = X
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        network = NsoltSynthesis1dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels).to(datatype)
+        network = cpparamsana2syn(network,analyzer)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(*analyzer.forward(X))
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,21 @@
+import itertools
 import unittest
+from parameterized import parameterized
+import math
 import torch
 import torch.nn as nn
 from nsoltSynthesis2dNetwork import NsoltSynthesis2dNetwork
+from nsoltAnalysis2dNetwork import NsoltAnalysis2dNetwork
+from nsoltBlockIdct2dLayer import NsoltBlockIdct2dLayer
+from nsoltUtility import cpparamsana2syn
+
+nchs = [ [2, 2], [3, 3], [4, 4] ]
+stride = [ [1, 1], [1, 2], [2, 2] ]
+ppord = [ [0, 0], [0, 2], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+height = [ 8, 16 ]
+width = [ 8, 16 ]
 
 class NsoltSynthesis2dNetworkTestCase(unittest.TestCase):
     """
@@ -20,7 +34,7 @@ class NsoltSynthesis2dNetworkTestCase(unittest.TestCase):
     
         http://msiplab.eng.niigata-u.ac.jp/
     """
-    parameterized.expand(
+    @parameterized.expand(
         list(itertools.product(nchs,stride))
     )
     def testConstructor(self,
@@ -45,12 +59,195 @@ class NsoltSynthesis2dNetworkTestCase(unittest.TestCase):
         self.assertEqual(actualNchs,expctdNchs)
         self.assertEqual(actualStride,expctdStride)
 
-    def testDummy(self):
-        target = NsoltSynthesis2dNetwork()
-        x = 0.0
-        valueExpctd = 0.0
-        valueActual = target.forward(x)
-        self.assertEqual(valueExpctd, valueActual)
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,height,width,datatype))
+    )
+    def testForwardGrayScale(self,
+        nchs, stride, height, width, datatype):
+        rtol,atol = 1e-5,1e-8
+
+        # Parameters
+        nSamples = 8
+        ps,pa = nchs
+        nrows = height//stride[0]
+        ncols = width//stride[1]
+        nDecs = stride[0]*stride[1] # math.prod(stride)
+        # nSamples x nRows x nCols x (nChsTotal-1), nSamples x nRows x nCols
+        Xac = torch.randn(nSamples,nrows,ncols,ps+pa-1,dtype=datatype)
+        Xdc = torch.randn(nSamples,nrows,ncols,dtype=datatype)
+
+        # Expected values
+        # Zero angles: the first (ms,ma) coefficients are the DCT coefficients
+        ms,ma = int(math.ceil(nDecs/2.)),int(math.floor(nDecs/2.))
+        X = torch.cat((Xdc.unsqueeze(dim=3),Xac),dim=3)
+        A = torch.cat((X[:,:,:,:ms],X[:,:,:,ps:ps+ma]),dim=3)
+        E0T = NsoltBlockIdct2dLayer(decimation_factor=stride)
+        expctdZ = E0T.forward(A)
+
+        # Instantiation of target class
+        network = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride
+        )
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(Xac,Xdc)
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+        self.assertFalse(actualZ.requires_grad)
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testForwardInPlaceConcatenation(self,
+        nchs, stride, ppord, nlevels, datatype):
+
+        # Parameters
+        nSamples = 4
+        height = 16
+        width = 16
+        X = torch.rand(nSamples,1,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels
+        ).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        network = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels
+        ).to(datatype)
+        network = cpparamsana2syn(network,analyzer)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+
+        # Expected values, where channels are concatenated by copy
+        with torch.no_grad():
+            Zdc = Y[nlevels]
+            for iLv in range(nlevels-1,-1,-1):
+                layers = network.layers[iLv]
+                expctdZ = torch.cat((Zdc.unsqueeze(dim=3),Y[iLv]),dim=3)
+                for layer in layers[1:]:
+                    expctdZ = layer(expctdZ)
+                Zdc = expctdZ.squeeze(dim=1)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(*Y)
+            # Buffers are reused
+            reusedZ = network.forward(*Y)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+        self.assertTrue(torch.equal(reusedZ,expctdZ))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels,datatype))
+    )
+    def testPerfectReconstructionWithRandomAngles(self,
+        nchs, stride, ppord, nlevels, datatype):
+        rtol,atol = 1e-3,1e-5
+
+        # Parameters
+        nSamples = 8
+        nComponents = 1
+        height = 32
+        width = 32
+        # Source (nSamples x nComponents x (Stride[0]xnRows) x (Stride[1]xnCols))
+        X = torch.rand(nSamples,nComponents,height,width,dtype=datatype)
+
+        # Expected values
+        expctdZ = X
+
+        # Instantiation of target class
+        analyzer = NsoltAnalysis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels
+        ).to(datatype)
+        for angles in analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+        network = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_levels=nlevels
+        ).to(datatype)
+        network = cpparamsana2syn(network,analyzer)
+
+        # Actual values
+        with torch.no_grad():
+            actualZ = network.forward(*analyzer.forward(X))
+
+        # Evaluation
+        self.assertEqual(actualZ.dtype,datatype)
+        self.assertTrue(torch.allclose(actualZ,expctdZ,rtol=rtol,atol=atol))
+
+    @parameterized.expand(
+        list(itertools.product(nchs,stride,ppord,nlevels))
+    )
+    def testBackwardGrayScaleReversible(self,
+        nchs, stride, ppord, nlevels):
+        rtol,atol = 1e-5,1e-8
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 4
+        height = 16
+        width = 16
+        nChsTotal = sum(nchs)
+        X = []
+        nrows,ncols = height,width
+        for iLv in range(nlevels):
+            nrows = nrows//stride[0]
+            ncols = ncols//stride[1]
+            X.append(torch.randn(nSamples,nrows,ncols,nChsTotal-1,dtype=datatype,requires_grad=True))
+        X.append(torch.randn(nSamples,nrows,ncols,dtype=datatype,requires_grad=True))
+        dLdZ = torch.randn(nSamples,1,height,width,dtype=datatype)
+
+        # Instantiation of target class
+        network = NsoltSynthesis2dNetwork(
+            number_of_channels=nchs,
+            decimation_factor=stride,
+            polyphase_order=ppord,
+            number_of_vanishing_moments=0,
+            number_of_levels=nlevels
+        ).to(datatype)
+        for angles in network.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values
+        Z = network.forward(*X)
+        network.zero_grad()
+        Z.backward(dLdZ)
+        expctddLdX = [ Xi.grad.clone() for Xi in X ]
+        expctddLdW = [ angles.grad.clone() for angles in network.parameters() ]
+
+        # Actual values
+        network.reversible = True
+        for Xi in X:
+            Xi.grad = None
+        Z = network.forward(*X)
+        network.zero_grad()
+        Z.backward(dLdZ)
+        actualdLdX = [ Xi.grad for Xi in X ]
+        actualdLdW = [ angles.grad for angles in network.parameters() ]
+
+        # Evaluation
+        for actual, expctd in zip(actualdLdX,expctddLdX):
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
+        for actual, expctd in zip(actualdLdW,expctddLdW):
+            self.assertTrue(torch.allclose(actual,expctd,rtol=rtol,atol=atol))
 
 """
         % Test
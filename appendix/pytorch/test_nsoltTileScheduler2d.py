@@ -0,0 +1,107 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+from nsoltTileScheduler2d import TileScheduler2d, benchmark
+from nsoltOlsOla2d import Analysis2dOlsWrapper, Synthesis2dOlsWrapper, Synthesis2dOlaWrapper
+from nsoltTestUtility import randomdictionary2d
+
+stride = [ [1, 2], [2, 2] ]
+nlevels = [ 1, 2 ]
+tilespertask = [ 1, 3 ]
+
+class TileScheduler2dTestCase(unittest.TestCase):
+    """
+    TILESCHEDULER2DTESTCASE Test cases for the process-pool tile scheduler
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,tilespertask))
+    )
+    def testAnalysis(self,stride,nlevels,tilespertask):
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,64,32,dtype=datatype)
+
+        # Expected values
+        analyzer, _ = randomdictionary2d([3, 3],stride,[2, 2],nlevels,datatype)
+        with torch.no_grad():
+            expctdY = analyzer.forward(X)
+
+        # Instantiation of target class
+        wrapper = Analysis2dOlsWrapper(analyzer,tile_size=[16, 16])
+        with TileScheduler2d(wrapper,number_of_workers=2,
+            tiles_per_task=tilespertask) as scheduler:
+
+            # Actual values
+            actualY = scheduler(X)
+            actualMetrics = scheduler.metrics
+
+        # Evaluation
+        for actual, expctd in zip(actualY,expctdY):
+            self.assertTrue(torch.equal(actual,expctd))
+        self.assertEqual(actualMetrics['workers'],2)
+        self.assertEqual(actualMetrics['tiles'],8)
+        self.assertGreater(actualMetrics['tiles_per_second'],0.)
+
+    @parameterized.expand(
+        list(itertools.product(stride,nlevels,tilespertask))
+    )
+    def testSynthesis(self,stride,nlevels,tilespertask):
+        datatype = torch.double
+
+        # Parameters
+        nSamples = 2
+        X = torch.rand(nSamples,1,64,32,dtype=datatype)
+
+        # Expected values
+        analyzer, synthesizer = randomdictionary2d([3, 3],stride,[2, 2],nlevels,datatype)
+        with torch.no_grad():
+            Y = analyzer.forward(X)
+            expctdZ = synthesizer.forward(*Y)
+
+        # Instantiation of target class
+        wrapper = Synthesis2dOlsWrapper(synthesizer,tile_size=[16, 16])
+        with TileScheduler2d(wrapper,number_of_workers=2,
+            tiles_per_task=tilespertask) as scheduler:
+
+            # Actual values
+            actualZ = scheduler(*Y)
+
+        # Evaluation
+        self.assertTrue(torch.equal(actualZ,expctdZ))
+
+    def testBenchmark(self):
+        analyzer, _ = randomdictionary2d([3, 3],[2, 2],[2, 2],1,torch.float)
+        wrapper = Analysis2dOlsWrapper(analyzer,tile_size=[16, 16])
+        X = torch.rand(1,1,32,32)
+
+        # Actual values
+        results = benchmark(wrapper,X,max_workers=2,number_of_trials=1)
+
+        # Evaluation
+        self.assertEqual([ metrics['workers'] for metrics in results ],[1, 2])
+
+    def testOverlapAddNotSupported(self):
+        _, synthesizer = randomdictionary2d([3, 3],[2, 2],[2, 2],1,torch.float)
+        wrapper = Synthesis2dOlaWrapper(synthesizer,tile_size=[16, 16])
+        with self.assertRaises(TypeError):
+            TileScheduler2d(wrapper)
+
+if __name__ == '__main__':
+    unittest.main()
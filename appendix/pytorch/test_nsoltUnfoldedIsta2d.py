@@ -0,0 +1,224 @@
+import itertools
+import unittest
+from parameterized import parameterized
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from nsoltUnfoldedIsta2d import UnfoldedIsta2d, softthresholding, savedbytes
+from nsoltIsta2d import IstaImRestoration2d
+from nsoltDegradation2d import BlurSystem, DecimationSystem
+
+stride = [ [1, 2], [2, 2] ]
+ppord = [ [0, 0], [2, 2] ]
+nlevels = [ 1, 2 ]
+datatype = [ torch.float, torch.double ]
+
+class UnfoldedIsta2dTestCase(unittest.TestCase):
+    """
+    UNFOLDEDISTA2DTESTCASE Test cases for the deep-unfolded ISTA
+
+    Requirements: Python 3.7.x, PyTorch 1.7.x
+
+    Copyright (c) 2021, Shogo MURAMATSU
+
+    All rights reserved.
+
+    Contact address: Shogo MURAMATSU,
+        Faculty of Engineering, Niigata University,
+        8050 2-no-cho Ikarashi, Nishi-ku,
+        Niigata, 950-2181, JAPAN
+
+        http://msiplab.eng.niigata-u.ac.jp/
+    """
+
+    @parameterized.expand(
+        list(itertools.product(stride,ppord,nlevels,datatype))
+    )
+    def testIsta(self,stride,ppord,nlevels,datatype):
+        rtol,atol = 1e-3,1e-5
+
+        # Parameters
+        height = stride[0]**nlevels*8
+        width = stride[1]**nlevels*8
+        X = torch.rand(2,2,height,width,dtype=datatype)
+        nItrs = 5
+        lambda_ = 0.05
+        process = BlurSystem(blur_type='Gaussian',boundary_option='Circular')
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(number_of_channels=[2,2],decimation_factor=stride,
+            polyphase_order=ppord,number_of_levels=nlevels,number_of_iterations=nItrs,
+            linear_process=process,lambda_=lambda_).to(datatype)
+        for angles in unfolded.analyzer.parameters():
+            angles.data = torch.randn_like(angles)
+
+        # Expected values
+        ista = IstaImRestoration2d(unfolded.synthesizer,unfolded.analyzer,
+            linear_process=process,lambda_=lambda_,eps0=0.,max_iter=nItrs)
+        expctdY = ista(X)
+
+        # Actual values
+        with torch.no_grad():
+            actualY = unfolded(X)
+
+        # Evaluation
+        self.assertEqual(actualY.dtype,datatype)
+        self.assertEqual(actualY.shape,X.shape)
+        self.assertTrue(torch.allclose(actualY,expctdY,rtol=rtol,atol=atol))
+
+    def testSuperResolution(self):
+        # Parameters
+        X = torch.rand(2,1,8,8)
+        process = DecimationSystem(decimation_factor=[2,2],boundary_option='Circular')
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(number_of_iterations=2,linear_process=process)
+
+        # Actual values
+        actualY = unfolded(X)
+
+        # Evaluation
+        self.assertEqual(actualY.shape,(2,1,16,16))
+
+    def testLipschitzConstant(self):
+        # Parameters
+        X = torch.rand(2,1,16,16)
+        process = Counting_(BlurSystem(blur_type='Gaussian',boundary_option='Circular'))
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(number_of_iterations=2,linear_process=process)
+
+        # Actual values
+        with torch.no_grad():
+            unfolded(X)
+            nCalls = process.number_of_calls
+            unfolded(X)
+
+        # Evaluation, where the power iteration is made only for the first call
+        self.assertGreater(nCalls,2)
+        self.assertEqual(process.number_of_calls-nCalls,2)
+        self.assertEqual(list(unfolded.lipschitzconstants_),[ (16,16) ])
+
+    def testTiedParameters(self):
+        # Parameters
+        X = torch.rand(2,1,16,16,dtype=torch.double)
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(polyphase_order=[2,2],number_of_levels=2).double()
+        with torch.no_grad():
+            for angles in unfolded.analyzer.parameters():
+                angles.normal_()
+
+        # Actual values
+        actualY = unfolded.synthesizer(*unfolded.analyzer(X))
+        nParams = len(list(unfolded.parameters()))
+
+        # Evaluation, where the synthesizer shares the parameters
+        self.assertEqual(nParams,len(list(unfolded.analyzer.parameters()))+1)
+        self.assertTrue(torch.allclose(actualY,X))
+
+    @parameterized.expand(
+        list(itertools.product([ False, True ],[ False, True ]))
+    )
+    def testGradient(self,checkpointing,reversible):
+        rtol,atol = 1e-6,1e-9
+        datatype = torch.double
+
+        # Parameters
+        X = torch.rand(2,1,16,16,dtype=datatype)
+        target = torch.rand_like(X)
+        config = { 'polyphase_order': [2,2], 'number_of_levels': 2,
+            'number_of_iterations': 3 }
+
+        # Expected values
+        torch.manual_seed(0)
+        reference = UnfoldedIsta2d(**config,checkpointing=False).to(datatype)
+        with torch.no_grad():
+            for angles in reference.analyzer.parameters():
+                angles.normal_()
+            reference.lambdas.uniform_(0.,0.2)
+        F.mse_loss(reference(X),target).backward()
+        expctdGrads = [ param.grad for param in reference.parameters() ]
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(**config,checkpointing=checkpointing,
+            reversible=reversible).to(datatype)
+        unfolded.load_state_dict(reference.state_dict())
+
+        # Actual values
+        F.mse_loss(unfolded(X),target).backward()
+        actualGrads = [ param.grad for param in unfolded.parameters() ]
+
+        # Evaluation
+        for actualGrad, expctdGrad in zip(actualGrads,expctdGrads):
+            self.assertTrue(torch.allclose(actualGrad,expctdGrad,rtol=rtol,atol=atol))
+
+    def testNonNegativeLambdas(self):
+        # Parameters
+        X = torch.rand(2,1,16,16,dtype=torch.double)
+
+        # Instantiation of target class
+        unfolded = UnfoldedIsta2d(polyphase_order=[2,2],number_of_levels=2,
+            number_of_iterations=3,lambda_=0.).double()
+        with torch.no_grad():
+            for angles in unfolded.analyzer.parameters():
+                angles.normal_()
+
+        # Expected values
+        with torch.no_grad():
+            expctdY = unfolded(X)
+
+        # Actual values
+        with torch.no_grad():
+            unfolded.lambdas.uniform_(-1.,0.)
+            actualY = unfolded(X)
+
+        # Evaluation, where the negative lambdas act as zero thresholds
+        self.assertTrue(torch.allclose(actualY,expctdY))
+
+    def testSoftThresholding(self):
+        # Parameters
+        y = torch.randn(4,3,3,dtype=torch.double,requires_grad=True)
+        threshold = torch.tensor([0.1,0.5,1.],dtype=torch.double,requires_grad=True)
+
+        # Expected values
+        expctdZ = y.sign()*(y.abs()-threshold).clamp(min=0.)
+
+        # Actual values
+        actualZ = softthresholding(y,threshold)
+
+        # Evaluation
+        self.assertTrue(torch.allclose(actualZ,expctdZ))
+        self.assertTrue(torch.autograd.gradcheck(softthresholding,(y,threshold)))
+
+    def testSavedBytes(self):
+        # Parameters
+        X = torch.rand(2,1,32,32)
+        nItrs = [ 2, 8 ]
+
+        # Actual values
+        nBytes = {}
+        for nItr, checkpointing in itertools.product(nItrs,[ False, True ]):
+            unfolded = UnfoldedIsta2d(number_of_iterations=nItr,checkpointing=checkpointing)
+            _, nBytes[(nItr,checkpointing)] = savedbytes(unfolded,X)
+
+        # Evaluation, where the checkpoints grow slower with the iterations
+        for nItr in nItrs:
+            self.assertLess(nBytes[(nItr,True)],nBytes[(nItr,False)])
+        self.assertLess(nBytes[(8,True)]-nBytes[(2,True)],nBytes[(8,False)]-nBytes[(2,False)])
+
+class Counting_(nn.Module):
+    def __init__(self,process):
+        super(Counting_, self).__init__()
+        self.process = process
+        self.number_of_calls = 0
+
+    def forward(self,X):
+        self.number_of_calls += 1
+        return self.process(X)
+
+    def adjoint(self,X):
+        return self.process.adjoint(X)
+
+if __name__ == '__main__':
+    unittest.main()